@@ -0,0 +1,82 @@
+"""Compare the two Claude Code one-shot streaming paths.
+
+Run from the server directory:
+
+    python -m benchmarks.claude_code_streaming [--tokens 200] [--interval-ms 5] [--runs 5]
+
+A fake CLI (this interpreter running a tiny script) emits stream-json text
+deltas at a fixed interval, so the numbers measure only the reader: the
+asyncio subprocess path versus the reader thread + polled queue fallback.
+Reports time to first token and the per-token delivery delay relative to
+when the fake CLI wrote each line.
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from services.claude_code_provider import iter_cli_lines_asyncio, iter_cli_lines_thread
+
+_FAKE_CLI = """\
+import json, sys, time
+tokens, interval = int(sys.argv[1]), float(sys.argv[2])
+for i in range(tokens):
+    print(json.dumps({"type": "content_block_delta", "sent": time.time(),
+                      "delta": {"type": "text_delta", "text": "tok "}}), flush=True)
+    time.sleep(interval)
+print(json.dumps({"type": "result", "result": ""}), flush=True)
+"""
+
+
+def _percentile(values: list[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+async def _measure(reader, cmd: list[str]) -> tuple[float, list[float]]:
+    start = time.perf_counter()
+    first: float | None = None
+    delays: list[float] = []
+    async for line in reader(cmd):
+        event = json.loads(line)
+        if "sent" not in event:
+            continue
+        now = time.time()
+        if first is None:
+            first = (time.perf_counter() - start) * 1000
+        delays.append((now - event["sent"]) * 1000)
+    return first or 0.0, delays
+
+
+async def main(tokens: int, interval_ms: float, runs: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        script = Path(tmp) / "fake_claude.py"
+        script.write_text(_FAKE_CLI)
+        cmd = [sys.executable, str(script), str(tokens), str(interval_ms / 1000)]
+
+        for label, reader in (("asyncio", iter_cli_lines_asyncio), ("thread", iter_cli_lines_thread)):
+            ttfts: list[float] = []
+            delays: list[float] = []
+            for _ in range(runs):
+                ttft, run_delays = await _measure(reader, cmd)
+                ttfts.append(ttft)
+                delays.extend(run_delays)
+            print(
+                f"{label:<8} ttft p50={statistics.median(ttfts):7.1f} ms   "
+                f"token delay p50={_percentile(delays, 50):6.2f} ms  "
+                f"p95={_percentile(delays, 95):6.2f} ms  max={max(delays):6.2f} ms"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tokens", type=int, default=200)
+    parser.add_argument("--interval-ms", type=float, default=5.0)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(main(args.tokens, args.interval_ms, args.runs))
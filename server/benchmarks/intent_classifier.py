@@ -0,0 +1,124 @@
+"""Benchmark the local intent fast path against the LLM classifier.
+
+Run from the server directory:
+
+    python -m benchmarks.intent_classifier          # local tiers only
+    python -m benchmarks.intent_classifier --llm    # also call the configured AI provider
+
+Reports, over the labeled corpus in ``intent_corpus.jsonl`` (held out from
+the fast path's training seeds, so the numbers are not inflated by overlap):
+- coverage: share of messages the fast path answers without the LLM
+- accuracy on the messages it answers (a wrong fast-path answer is worse
+  than a fall-through, so this should stay at or near 100%)
+- p50/p95 latency per tier
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from pathlib import Path
+
+from config import settings
+from services.intent_classifier import classify_intent_llm
+from services.intent_fast_path import classify_local
+
+CORPUS_PATH = Path(__file__).with_name("intent_corpus.jsonl")
+
+
+def load_corpus(path: Path = CORPUS_PATH) -> list[dict]:
+    with path.open(encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def _percentile(values: list[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    idx = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[idx]
+
+
+def _latency_line(label: str, samples_ms: list[float]) -> str:
+    return (
+        f"{label:<12} p50={_percentile(samples_ms, 50):8.3f} ms  "
+        f"p95={_percentile(samples_ms, 95):8.3f} ms  "
+        f"mean={statistics.fmean(samples_ms) if samples_ms else 0.0:8.3f} ms"
+    )
+
+
+def run_local(corpus: list[dict], threshold: float) -> dict:
+    latencies: list[float] = []
+    answered = correct = 0
+    misses: list[tuple[str, str, str]] = []
+    for row in corpus:
+        start = time.perf_counter()
+        result = classify_local(row["message"])
+        latencies.append((time.perf_counter() - start) * 1000)
+        if result.confidence < threshold:
+            continue
+        answered += 1
+        if result.intent == row["intent"]:
+            correct += 1
+        else:
+            misses.append((row["message"], row["intent"], result.intent))
+    return {
+        "latencies": latencies,
+        "answered": answered,
+        "correct": correct,
+        "misses": misses,
+    }
+
+
+async def run_llm(corpus: list[dict]) -> dict:
+    from services.ai_service import AIService
+
+    ai = AIService(base_url=settings.ai_base_url, api_key=settings.ai_api_key, model=settings.ai_model)
+    latencies: list[float] = []
+    correct = 0
+    try:
+        for row in corpus:
+            start = time.perf_counter()
+            result = await classify_intent_llm(row["message"], ai)
+            latencies.append((time.perf_counter() - start) * 1000)
+            if result.intent == row["intent"]:
+                correct += 1
+    finally:
+        await ai.close()
+    return {"latencies": latencies, "correct": correct}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--llm", action="store_true", help="also benchmark the LLM classifier")
+    parser.add_argument("--threshold", type=float, default=settings.intent_fast_path_threshold)
+    parser.add_argument("--corpus", type=Path, default=CORPUS_PATH)
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.corpus)
+    total = len(corpus)
+    local = run_local(corpus, args.threshold)
+
+    print(f"Corpus: {total} labeled messages, threshold {args.threshold:.2f}")
+    print(_latency_line("fast path", local["latencies"]))
+    answered = local["answered"]
+    print(f"coverage     {answered}/{total} ({answered / total:.0%}) answered without the LLM")
+    if answered:
+        print(f"accuracy     {local['correct']}/{answered} ({local['correct'] / answered:.0%}) on answered messages")
+    for message, expected, got in local["misses"]:
+        print(f"  MISS {message!r}: expected {expected}, got {got}")
+
+    if args.llm:
+        llm = asyncio.run(run_llm(corpus))
+        print(_latency_line("llm", llm["latencies"]))
+        print(f"accuracy     {llm['correct']}/{total} ({llm['correct'] / total:.0%}) via LLM")
+        saved = sum(
+            lat for lat, row in zip(llm["latencies"], corpus)
+            if classify_local(row["message"]).confidence >= args.threshold
+        )
+        print(f"saved        {saved / 1000:.1f} s of LLM time across the corpus")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""Benchmark recall and latency of the semantic search vector index.
+
+Run from the server directory (needs numpy):
+
+    python -m benchmarks.vector_search                   # 20k synthetic notes
+    python -m benchmarks.vector_search --rows 200000     # larger index
+
+Builds a throwaway index from synthetic topical sentences embedded with the
+hashing vectorizer, then reports:
+- embedding throughput and index build time (including IVF training)
+- on-disk size of the float16 vector file
+- recall@k of the IVF index against an exact scan, per nprobe
+- p50/p95 query latency of the exact scan and of each nprobe
+"""
+
+import argparse
+import random
+import tempfile
+import time
+
+from benchmarks.intent_classifier import _latency_line
+from config import settings
+from services.embedding_service import HashingEmbedder
+from services.vector_index import VectorIndex, VectorItem
+
+_TOPICS = [
+    "dentist teeth cleaning appointment dental checkup floss",
+    "garden water plants tomatoes compost weeding seeds",
+    "invoice tax return accountant receipts budget expenses",
+    "flight hotel passport itinerary luggage airport booking",
+    "gym workout running shoes stretching marathon training",
+    "birthday party cake gifts invitations balloons guests",
+    "car service oil change tyres inspection mechanic garage",
+    "project deadline report slides meeting review manager",
+    "groceries milk bread eggs vegetables supermarket list",
+    "doctor prescription pharmacy vaccine blood test results",
+]
+_FILLER = "the a to for with about on next this and then after before".split()
+
+
+def synthetic_corpus(rows: int, seed: int = 0) -> list[str]:
+    rng = random.Random(seed)
+    topics = [t.split() for t in _TOPICS]
+    texts = []
+    for _ in range(rows):
+        words = rng.sample(rng.choice(topics), 3) + rng.sample(rng.choice(topics), 1)
+        words += rng.sample(_FILLER, 3)
+        rng.shuffle(words)
+        texts.append(" ".join(words))
+    return texts
+
+
+def _timed_queries(index: VectorIndex, queries, k: int, **kwargs) -> tuple[list, list[float]]:
+    results, latencies = [], []
+    for q in queries:
+        start = time.perf_counter()
+        results.append({h.ref for h in index.query(q, k, **kwargs)})
+        latencies.append((time.perf_counter() - start) * 1000)
+    return results, latencies
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--dim", type=int, default=settings.embedding_dim)
+    parser.add_argument("--nprobe", type=int, nargs="+", default=[1, 4, 8, 16, 32])
+    args = parser.parse_args()
+
+    embedder = HashingEmbedder(args.dim)
+    texts = synthetic_corpus(args.rows)
+    start = time.perf_counter()
+    vectors = embedder.embed(texts)
+    embed_s = time.perf_counter() - start
+    queries = embedder.embed(synthetic_corpus(args.queries, seed=1))
+
+    with tempfile.TemporaryDirectory() as directory:
+        index = VectorIndex(directory, args.dim, embedder.name, ivf_min_rows=settings.embedding_ivf_min_rows)
+        start = time.perf_counter()
+        batch = settings.embedding_batch_size * 16
+        for i in range(0, args.rows, batch):
+            index.upsert([
+                VectorItem("message", str(i + j), "", v)
+                for j, v in enumerate(vectors[i:i + batch])
+            ])
+        build_s = time.perf_counter() - start
+        stats = index.stats()
+
+        print(f"Index: {stats['rows']} rows x {args.dim} dims, {stats['lists']} IVF lists")
+        print(f"embed        {args.rows / embed_s:8.0f} texts/s")
+        print(f"build        {build_s:8.2f} s (IVF trained on {stats['trained_rows']} rows)")
+        print(f"vectors      {stats['bytes'] / 2**20:8.1f} MiB float16 memmap")
+
+        truth, exact_ms = _timed_queries(index, queries, args.k, exact=True)
+        print(_latency_line("exact", exact_ms))
+        for nprobe in args.nprobe:
+            found, ivf_ms = _timed_queries(index, queries, args.k, nprobe=nprobe)
+            recall = sum(len(f & t) for f, t in zip(found, truth)) / sum(len(t) for t in truth)
+            print(f"{_latency_line(f'nprobe={nprobe}', ivf_ms)}  recall@{args.k}={recall:.3f}")
+        index.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -15,6 +15,23 @@ class Settings(BaseSettings):
     # Database
     database_url: str = "sqlite+aiosqlite:///./data/clawchat.db"
 
+    # SQLite tuning profile, applied to every new connection
+    sqlite_tuning_enabled: bool = True
+    sqlite_journal_mode: str = "wal"
+    sqlite_synchronous: str = "normal"
+    sqlite_mmap_size: int = 268435456  # bytes (256 MiB)
+    sqlite_cache_size: int = -65536  # negative = KiB (64 MiB)
+    sqlite_temp_store: str = "memory"
+    sqlite_busy_timeout_ms: int = 5000
+    # Read-only connection pool for GET endpoints, and the serialized writer's
+    # group-commit window (writes arriving within it share one transaction)
+    db_read_pool_size: int = 5
+    db_write_batch_window_ms: int = 2
+    db_write_max_batch: int = 64
+    # Scheduler maintenance: PRAGMA optimize and WAL checkpoint intervals
+    sqlite_optimize_interval_minutes: int = 60
+    sqlite_checkpoint_interval_minutes: int = 10
+
     # Authentication
     jwt_secret: str = "change-this-to-a-random-secret-key"
     jwt_expiry_hours: int = 24
@@ -26,6 +43,91 @@ class Settings(BaseSettings):
     ai_api_key: str = ""
     ai_model: str = "llama3.2"
 
+    # AI HTTP client — connection pool, HTTP/2 (needs the "h2" package),
+    # concurrent request cap and per-call-type read timeouts in seconds
+    ai_max_connections: int = 20
+    ai_max_keepalive_connections: int = 10
+    ai_keepalive_expiry: float = 30.0
+    ai_http2: bool = False
+    ai_max_concurrency: int = 8
+    ai_connect_timeout: float = 10.0
+    ai_timeout_title: float = 15.0
+    ai_timeout_function_call: float = 30.0
+    ai_timeout_completion: float = 60.0
+    ai_timeout_stream: float = 60.0
+
+    # LLM admission control — interactive > background > scheduled
+    llm_scheduler_enabled: bool = True
+    llm_scheduler_max_concurrency: int = 4
+    llm_scheduler_background_limit: int = 2
+    llm_scheduler_scheduled_limit: int = 1
+    llm_scheduler_reserved_interactive: int = 1
+
+    # Claude Code provider — warm CLI workers (0 disables the pool).  A worker
+    # keeps its CLI session, so it is recycled after max_requests requests.
+    claude_code_pool_size: int = 2
+    claude_code_pool_max_requests: int = 1
+    claude_code_pool_max_workers: int = 4
+    claude_code_pool_health_interval: int = 30
+
+    # Local intent fast path — answer confident, common messages without an LLM call
+    intent_fast_path_enabled: bool = True
+    intent_fast_path_threshold: float = 0.85
+
+    # Start the general-chat completion while LLM intent classification runs;
+    # the stream is discarded if the classifier picks a module intent
+    speculative_chat_enabled: bool = False
+
+    # Persistent cache for deterministic utility calls (titles, classification)
+    llm_cache_enabled: bool = True
+    llm_cache_path: str = "data/llm_cache.db"
+    llm_cache_ttl_seconds: int = 86400
+    llm_cache_max_entries: int = 5000
+
+    # GET /api/todos/projects response cache (0 disables); dropped on every
+    # todo change notification, the TTL only bounds unannounced writes
+    projects_cache_ttl_seconds: int = 60
+    # Conversation list previews: read the trigger-maintained columns (true)
+    # or pick the newest message per row with a window query (false)
+    conversation_preview_denormalized: bool = True
+    # GET /api/search counts matches exactly up to this many, then reports
+    # the cap with total_capped=true
+    search_total_cap: int = 1000
+    # Last search tier: trigram matching for misspellings (needs SQLite 3.34+)
+    search_fuzzy_enabled: bool = True
+    # General-chat prompt: token budget (~4 chars per token) shared by recent
+    # turns, a rolling summary of older ones, and FTS-retrieved older messages,
+    # todos and vault notes (per-source count)
+    chat_context_token_budget: int = 3000
+    chat_context_recent_messages: int = 20
+    chat_context_retrieved_items: int = 4
+    # Older turns are folded into the summary in batches of this many (0 disables)
+    chat_summary_batch: int = 20
+    # Semantic search (needs numpy): a background worker embeds new rows and
+    # vault notes into a float16 memmap; "hashing" or a sentence-transformers
+    # model name.  IVF kicks in at ivf_min_rows, scanning nprobe lists per query
+    embedding_enabled: bool = False
+    embedding_model: str = "hashing"
+    embedding_dim: int = 384  # hashing vectorizer only; models bring their own
+    embedding_index_dir: str = "data/embeddings"
+    embedding_batch_size: int = 64
+    embedding_interval_seconds: float = 5.0
+    embedding_ivf_min_rows: int = 2000
+    embedding_ivf_nprobe: int = 8
+    embedding_min_score: float = 0.2
+    # candidates taken from each ranking before mode=hybrid fuses them
+    search_hybrid_candidates: int = 100
+    # Delta sync (GET /api/sync): change-log rows older than this are pruned
+    # with PRAGMA optimize; clients holding an older token get reset=true
+    sync_change_log_retention_days: int = 30
+
+    # WebSocket delivery — per-socket send queue length, and stream_chunk
+    # coalescing (flush after this many ms or bytes; 0 ms sends every token)
+    ws_send_queue_size: int = 256
+    ws_stream_coalesce_ms: int = 24
+    ws_stream_coalesce_bytes: int = 512
+    ws_replay_buffer_size: int = 256  # recent events kept per user for resume
+
     # File uploads
     upload_dir: str = "data/uploads"
     max_upload_size_mb: int = 10
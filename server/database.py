@@ -1,9 +1,17 @@
+import asyncio
+import logging
 import os
+import time
+from collections.abc import Awaitable, Callable, Sequence
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import TypeVar
 
-from sqlalchemy import text
+from sqlalchemy import event, inspect, text, update
 from sqlalchemy.exc import OperationalError
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.orm.attributes import set_committed_value
 
 from config import settings
 
@@ -12,9 +20,285 @@ class Base(DeclarativeBase):
     pass
 
 
+logger = logging.getLogger(__name__)
+
 engine = create_async_engine(settings.database_url, echo=False)
 async_session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 
+# ---------------------------------------------------------------------------
+# SQLite tuning profile — applied on every new DBAPI connection
+# ---------------------------------------------------------------------------
+
+
+def sqlite_pragmas() -> dict[str, str | int]:
+    """Connection pragmas from settings, in the order they are applied."""
+    if not settings.sqlite_tuning_enabled:
+        return {}
+    return {
+        # busy_timeout first so the journal_mode switch itself can wait on locks
+        "busy_timeout": settings.sqlite_busy_timeout_ms,
+        "journal_mode": settings.sqlite_journal_mode,
+        "synchronous": settings.sqlite_synchronous,
+        "mmap_size": settings.sqlite_mmap_size,
+        "cache_size": settings.sqlite_cache_size,
+        "temp_store": settings.sqlite_temp_store,
+    }
+
+
+def _apply_sqlite_pragmas(dbapi_connection, _connection_record) -> None:
+    cursor = dbapi_connection.cursor()
+    try:
+        for name, value in sqlite_pragmas().items():
+            cursor.execute(f"PRAGMA {name}={value}")
+    finally:
+        cursor.close()
+
+
+if engine.dialect.name == "sqlite":
+    event.listen(engine.sync_engine, "connect", _apply_sqlite_pragmas)
+
+
+def _is_file_sqlite(url: str) -> bool:
+    return url.startswith("sqlite") and ":memory:" not in url
+
+
+# ---------------------------------------------------------------------------
+# Read pool and serialized writer (file-backed SQLite only; an in-memory
+# database exists per connection, so everything shares ``engine`` there)
+# ---------------------------------------------------------------------------
+
+def _configure_read_connection(dbapi_connection, connection_record):
+    _apply_sqlite_pragmas(dbapi_connection, connection_record)
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA query_only=ON")
+    cursor.close()
+
+
+def _configure_write_connection(dbapi_connection, connection_record):
+    _apply_sqlite_pragmas(dbapi_connection, connection_record)
+    # Take over transaction control from the driver so BEGIN is emitted up
+    # front and SAVEPOINTs nest inside it (SQLAlchemy's pysqlite recipe).
+    dbapi_connection.isolation_level = None
+
+
+def _begin_immediate(conn):
+    conn.exec_driver_sql("BEGIN IMMEDIATE")
+
+
+def create_read_engine(url: str, pool_size: int):
+    read = create_async_engine(url, pool_size=pool_size, max_overflow=0)
+    event.listen(read.sync_engine, "connect", _configure_read_connection)
+    return read
+
+
+def create_write_engine(url: str):
+    write = create_async_engine(url, pool_size=1, max_overflow=0)
+    event.listen(write.sync_engine, "connect", _configure_write_connection)
+    event.listen(write.sync_engine, "begin", _begin_immediate)
+    return write
+
+
+if _is_file_sqlite(settings.database_url):
+    read_engine = create_read_engine(settings.database_url, settings.db_read_pool_size)
+    write_engine = create_write_engine(settings.database_url)
+else:
+    read_engine = engine
+    write_engine = engine
+
+read_session_factory = async_sessionmaker(read_engine, class_=AsyncSession, expire_on_commit=False)
+write_session_factory = async_sessionmaker(write_engine, class_=AsyncSession, expire_on_commit=False)
+
+T = TypeVar("T")
+
+
+class DatabaseWriter:
+    """Run mutations one batch at a time on a single dedicated connection.
+
+    ``run(fn)`` queues ``fn(session)`` and returns its result once committed.
+    Jobs that arrive within ``window_ms`` of each other are executed in one
+    transaction (each inside its own SAVEPOINT, so a failing job rolls back
+    alone) and committed together.  Before ``start()`` — e.g. in tests — jobs
+    run inline in their own session.
+
+    ``save(*instances)`` covers long-running background work (agents, the
+    inbox pipeline) that keeps ORM objects across LLM calls: their changed
+    columns are written by one job, so no transaction stays open meanwhile.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        window_ms: int = 2,
+        max_batch: int = 64,
+    ):
+        self.session_factory = session_factory
+        self.window = window_ms / 1000
+        self.max_batch = max_batch
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._task: asyncio.Task | None = None
+        self.batches = 0
+        self.jobs = 0
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._queue = asyncio.Queue()
+            self._task = asyncio.create_task(self._loop(), name="db-writer")
+
+    async def stop(self) -> None:
+        """Finish queued work, then stop the writer task."""
+        if self._task is None:
+            return
+        await self._queue.put(None)
+        await self._task
+        self._task = None
+
+    async def run(self, fn: Callable[[AsyncSession], Awaitable[T]]) -> T:
+        if self._task is None:
+            async with self.session_factory() as session:
+                result = await fn(session)
+                await session.commit()
+                return result
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((fn, future))
+        return await future
+
+    async def save(self, *instances: Base, new: Sequence[Base] = ()) -> None:
+        """Insert *new* rows and write the pending column changes of *instances*, in one job.
+
+        Each instance gets one UPDATE of just its changed columns, so fields
+        edited elsewhere in the meantime are kept.  The values are then marked
+        committed on the instance, so its own session (if any) never writes.
+        """
+        changes = []
+        for instance in instances:
+            state = inspect(instance)
+            values = {
+                attr.key: attr.value
+                for attr in state.attrs
+                if attr.key in state.mapper.columns and attr.history.has_changes()
+            }
+            if values:
+                changes.append((instance, state.mapper, values))
+        if not changes and not new:
+            return
+
+        async def job(session: AsyncSession) -> None:
+            session.add_all(new)
+            await session.flush()
+            for instance, mapper, values in changes:
+                [pk] = mapper.primary_key
+                await session.execute(
+                    update(mapper.class_)
+                    .where(pk == getattr(instance, pk.key))
+                    .values(**values)
+                )
+
+        await self.run(job)
+        for instance, _, values in changes:
+            for key, value in values.items():
+                set_committed_value(instance, key, value)
+
+    async def _collect(self, first) -> tuple[list, bool]:
+        batch = [first]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.window
+        while len(batch) < self.max_batch:
+            try:
+                job = self._queue.get_nowait()
+            except asyncio.QueueEmpty:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    job = await asyncio.wait_for(self._queue.get(), remaining)
+                except asyncio.TimeoutError:
+                    break
+            if job is None:
+                return batch, True
+            batch.append(job)
+        return batch, False
+
+    async def _loop(self) -> None:
+        while True:
+            job = await self._queue.get()
+            if job is None:
+                return
+            batch, stopping = await self._collect(job)
+            await self._commit_batch(batch)
+            if stopping:
+                return
+
+    async def _commit_batch(self, batch: list) -> None:
+        outcomes: list[tuple[asyncio.Future, object, BaseException | None]] = []
+        try:
+            async with self.session_factory() as session:
+                for fn, future in batch:
+                    try:
+                        async with session.begin_nested():
+                            outcomes.append((future, await fn(session), None))
+                    except Exception as exc:
+                        outcomes.append((future, None, exc))
+                await session.commit()
+        except Exception as exc:
+            logger.exception("Group commit of %d write(s) failed", len(batch))
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+        self.batches += 1
+        self.jobs += len(batch)
+        for future, result, exc in outcomes:
+            if future.done():
+                continue
+            if exc is not None:
+                future.set_exception(exc)
+            else:
+                future.set_result(result)
+
+
+db_writer = DatabaseWriter(
+    write_session_factory,
+    window_ms=settings.db_write_batch_window_ms,
+    max_batch=settings.db_write_max_batch,
+)
+
+
+_PRAGMA_REPORT = ("journal_mode", "synchronous", "mmap_size", "cache_size", "temp_store", "busy_timeout")
+
+maintenance_stats: dict[str, float | int | None] = {
+    "last_optimize_at": None,
+    "last_checkpoint_at": None,
+    "last_checkpoint_pages": None,
+    "last_vacuum_at": None,
+}
+
+
+async def read_sqlite_pragmas(session: AsyncSession) -> dict[str, str | int]:
+    """Pragma values actually in effect on *session*'s connection."""
+    values: dict[str, str | int] = {}
+    for name in _PRAGMA_REPORT:
+        values[name] = (await session.execute(text(f"PRAGMA {name}"))).scalar()
+    return values
+
+
+async def optimize_db() -> None:
+    """Let SQLite refresh query-planner statistics where they are stale."""
+    async with engine.connect() as conn:
+        await conn.execute(text("PRAGMA optimize"))
+    maintenance_stats["last_optimize_at"] = time.time()
+
+
+async def checkpoint_wal(mode: str = "PASSIVE") -> tuple[int, int, int]:
+    """Copy WAL frames back into the database file.
+
+    Returns SQLite's ``(busy, wal_pages, checkpointed_pages)``.
+    """
+    async with engine.connect() as conn:
+        row = (await conn.execute(text(f"PRAGMA wal_checkpoint({mode})"))).one()
+    maintenance_stats["last_checkpoint_at"] = time.time()
+    maintenance_stats["last_checkpoint_pages"] = row[2]
+    return row[0], row[1], row[2]
+
 # ---------------------------------------------------------------------------
 # FTS5 setup: individual DDL statements (triggers contain nested semicolons
 # so we store them as a list rather than splitting on ";")
@@ -94,43 +378,58 @@ def _ensure_data_dir():
     os.makedirs(app_settings.upload_dir, exist_ok=True)
 
 
+# (table, column, column definition) for columns added after a table first
+# shipped.  ``create_all`` never alters existing tables, so older databases
+# get them here.
+_LEGACY_COLUMNS = [
+    # -- todos --
+    ("todos", "parent_id", "TEXT REFERENCES todos(id) ON DELETE SET NULL"),
+    ("todos", "sort_order", "INTEGER NOT NULL DEFAULT 0"),
+    ("todos", "source", "TEXT"),
+    ("todos", "source_id", "TEXT"),
+    ("todos", "assignee", "TEXT"),
+    ("todos", "inbox_state", "TEXT NOT NULL DEFAULT 'none'"),
+    ("todos", "estimated_minutes", "INTEGER"),
+    ("todos", "automation_error", "TEXT"),
+    ("todos", "enabled_skills", "TEXT"),
+    ("todos", "recurrence_rule", "TEXT"),
+    ("todos", "recurrence_end", "DATETIME"),
+    ("todos", "recurrence_exceptions", "TEXT"),
+    ("todos", "recurring_source_id", "TEXT REFERENCES todos(id) ON DELETE SET NULL"),
+
+    # -- conversations --
+    ("conversations", "project_todo_id", "TEXT REFERENCES todos(id) ON DELETE SET NULL"),
+
+    # -- agent_tasks --
+    ("agent_tasks", "todo_id", "TEXT REFERENCES todos(id) ON DELETE SET NULL"),
+    ("agent_tasks", "payload_json", "TEXT"),
+    ("agent_tasks", "skill_chain", "TEXT"),
+    ("agent_tasks", "current_skill_index", "INTEGER NOT NULL DEFAULT 0"),
+]
+
+
+async def _table_columns(session: AsyncSession, table: str) -> set[str]:
+    rows = await session.execute(text(f"PRAGMA table_info({table})"))
+    return {r[1] for r in rows.fetchall()}
+
+
+async def _add_missing_columns(session: AsyncSession, columns: list[tuple[str, str, str]]):
+    """ALTER in only the columns absent from ``PRAGMA table_info``."""
+    existing: dict[str, set[str]] = {}
+    for table, column, definition in columns:
+        if table not in existing:
+            existing[table] = await _table_columns(session, table)
+        if column not in existing[table]:
+            await session.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} {definition}"))
+            existing[table].add(column)
+
+
 async def _apply_schema_corrections(session: AsyncSession):
     """Add columns that may be missing from older schemas.
 
-    Each statement is idempotent -- duplicate column errors are silently ignored.
-    Grouped by table for readability.
+    Running it against an up-to-date schema issues no DDL.
     """
-    corrections = [
-        # -- todos --
-        "ALTER TABLE todos ADD COLUMN parent_id TEXT REFERENCES todos(id) ON DELETE SET NULL",
-        "ALTER TABLE todos ADD COLUMN sort_order INTEGER NOT NULL DEFAULT 0",
-        "ALTER TABLE todos ADD COLUMN source TEXT",
-        "ALTER TABLE todos ADD COLUMN source_id TEXT",
-        "ALTER TABLE todos ADD COLUMN assignee TEXT",
-        "ALTER TABLE todos ADD COLUMN inbox_state TEXT NOT NULL DEFAULT 'none'",
-        "ALTER TABLE todos ADD COLUMN estimated_minutes INTEGER",
-        "ALTER TABLE todos ADD COLUMN automation_error TEXT",
-        "ALTER TABLE todos ADD COLUMN enabled_skills TEXT",
-        "ALTER TABLE todos ADD COLUMN recurrence_rule TEXT",
-        "ALTER TABLE todos ADD COLUMN recurrence_end DATETIME",
-        "ALTER TABLE todos ADD COLUMN recurrence_exceptions TEXT",
-        "ALTER TABLE todos ADD COLUMN recurring_source_id TEXT REFERENCES todos(id) ON DELETE SET NULL",
-
-        # -- conversations --
-        "ALTER TABLE conversations ADD COLUMN project_todo_id TEXT REFERENCES todos(id) ON DELETE SET NULL",
-
-        # -- agent_tasks --
-        "ALTER TABLE agent_tasks ADD COLUMN todo_id TEXT REFERENCES todos(id) ON DELETE SET NULL",
-        "ALTER TABLE agent_tasks ADD COLUMN payload_json TEXT",
-        "ALTER TABLE agent_tasks ADD COLUMN skill_chain TEXT",
-        "ALTER TABLE agent_tasks ADD COLUMN current_skill_index INTEGER NOT NULL DEFAULT 0",
-    ]
-
-    for stmt in corrections:
-        try:
-            await session.execute(text(stmt))
-        except (OperationalError, Exception):
-            pass  # column already exists
+    await _add_missing_columns(session, _LEGACY_COLUMNS)
     await session.commit()
 
 
@@ -150,6 +449,295 @@ async def _run_data_migrations(session: AsyncSession):
     await session.commit()
 
 
+async def _add_agent_task_todo_index(session: AsyncSession):
+    """Index behind the batched latest-plan lookup for todo lists."""
+    await session.execute(text(
+        "CREATE INDEX IF NOT EXISTS idx_agent_tasks_todo_type"
+        " ON agent_tasks (todo_id, task_type, created_at)"
+    ))
+    await session.commit()
+
+
+# Keep conversations.last_message_preview/_at in step with their newest
+# message, whichever code path writes it.
+_LAST_MESSAGE_RECOMPUTE = """UPDATE conversations SET (last_message_preview, last_message_at) = (
+            SELECT substr(m.content, 1, 100), m.created_at FROM messages m
+            WHERE m.conversation_id = conversations.id
+            ORDER BY m.created_at DESC LIMIT 1
+        )"""
+
+_LAST_MESSAGE_TRIGGERS = [
+    """CREATE TRIGGER IF NOT EXISTS messages_last_ai AFTER INSERT ON messages BEGIN
+        UPDATE conversations
+        SET last_message_preview = substr(new.content, 1, 100), last_message_at = new.created_at
+        WHERE id = new.conversation_id
+          AND (last_message_at IS NULL OR last_message_at <= new.created_at);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS messages_last_au
+        AFTER UPDATE OF content, created_at, conversation_id ON messages BEGIN
+        {_LAST_MESSAGE_RECOMPUTE} WHERE id IN (old.conversation_id, new.conversation_id);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS messages_last_ad AFTER DELETE ON messages BEGIN
+        {_LAST_MESSAGE_RECOMPUTE} WHERE id = old.conversation_id;
+    END""",
+]
+
+
+async def _denormalize_last_message(session: AsyncSession):
+    """Add last-message columns to conversations, their triggers, and backfill."""
+    await _add_missing_columns(session, [
+        ("conversations", "last_message_preview", "TEXT"),
+        ("conversations", "last_message_at", "DATETIME"),
+    ])
+    await session.execute(text(
+        "CREATE INDEX IF NOT EXISTS idx_messages_conversation_created"
+        " ON messages (conversation_id, created_at)"
+    ))
+    for stmt in _LAST_MESSAGE_TRIGGERS:
+        await session.execute(text(stmt))
+    await session.execute(text(_LAST_MESSAGE_RECOMPUTE))
+    await session.commit()
+
+
+_KEYSET_INDEXES = [
+    "CREATE INDEX IF NOT EXISTS idx_todos_created_id ON todos (created_at, id)",
+    "CREATE INDEX IF NOT EXISTS idx_todos_updated_id ON todos (updated_at, id)",
+    "CREATE INDEX IF NOT EXISTS idx_agent_tasks_parent_created"
+    " ON agent_tasks (parent_task_id, created_at, id)",
+]
+
+
+async def _add_keyset_indexes(session: AsyncSession):
+    """(sort column, id) indexes behind cursor pagination of the list endpoints."""
+    for stmt in _KEYSET_INDEXES:
+        await session.execute(text(stmt))
+    await session.commit()
+
+
+# Delta sync: every insert, update and delete on a synced table appends a row
+# to change_log.  Its AUTOINCREMENT seq is the sync token; sqlite_sequence
+# keeps the high-water mark even after old rows are pruned.
+SYNCED_TABLES = ("todos", "events", "conversations", "messages")
+
+_CHANGE_LOG_DDL = [
+    """CREATE TABLE IF NOT EXISTS change_log (
+        seq INTEGER PRIMARY KEY AUTOINCREMENT,
+        entity TEXT NOT NULL,
+        entity_id TEXT NOT NULL,
+        op TEXT NOT NULL,
+        changed_at REAL NOT NULL DEFAULT (julianday('now'))
+    )""",
+    "CREATE INDEX IF NOT EXISTS idx_change_log_changed_at ON change_log (changed_at)",
+]
+
+_CHANGE_LOG_TRIGGERS = [
+    stmt
+    for table in SYNCED_TABLES
+    for stmt in (
+        f"""CREATE TRIGGER IF NOT EXISTS {table}_log_ai AFTER INSERT ON {table} BEGIN
+            INSERT INTO change_log(entity, entity_id, op) VALUES ('{table}', new.id, 'upsert');
+        END""",
+        f"""CREATE TRIGGER IF NOT EXISTS {table}_log_au AFTER UPDATE ON {table} BEGIN
+            INSERT INTO change_log(entity, entity_id, op) VALUES ('{table}', new.id, 'upsert');
+        END""",
+        f"""CREATE TRIGGER IF NOT EXISTS {table}_log_ad AFTER DELETE ON {table} BEGIN
+            INSERT INTO change_log(entity, entity_id, op) VALUES ('{table}', old.id, 'delete');
+        END""",
+    )
+]
+
+
+async def _create_change_log(session: AsyncSession):
+    """Create the delta-sync change log and the triggers that feed it."""
+    for stmt in _CHANGE_LOG_DDL + _CHANGE_LOG_TRIGGERS:
+        await session.execute(text(stmt))
+    await session.commit()
+
+
+async def prune_change_log(retention_days: int) -> int:
+    """Drop change-log rows older than *retention_days*; returns rows deleted."""
+
+    async def prune(session: AsyncSession) -> int:
+        result = await session.execute(
+            text("DELETE FROM change_log WHERE changed_at < julianday('now') - :days"),
+            {"days": retention_days},
+        )
+        return result.rowcount
+
+    return await db_writer.run(prune)
+
+
+# Search indexes v2: each source table's FTS5 index gets prefix indexes for
+# 2- and 3-character prefixes (search-as-you-type), and — where the SQLite
+# build has the trigram tokenizer (3.34+) — a trigram shadow table that the
+# fuzzy search tier matches misspellings against.
+SEARCH_INDEXED_COLUMNS = {
+    "messages": ("content",),
+    "todos": ("title", "description"),
+    "events": ("title", "description", "location"),
+}
+
+_TRIGRAM_MIN_VERSION = (3, 34, 0)
+
+
+def _search_values(table: str, row: str) -> str:
+    return ", ".join(f"COALESCE({row}.{col}, '')" for col in SEARCH_INDEXED_COLUMNS[table])
+
+
+def _search_index_ddl(table: str, suffix: str, options: str) -> list[str]:
+    """(Re)create ``{table}{suffix}`` with *options* and fill it from *table*."""
+    index = f"{table}{suffix}"
+    names = ", ".join(SEARCH_INDEXED_COLUMNS[table])
+    return [
+        f"DROP TABLE IF EXISTS {index}",
+        f"CREATE VIRTUAL TABLE {index} USING fts5(id UNINDEXED, {names}, {options})",
+        f"INSERT INTO {index}(id, {names}) SELECT id, {_search_values(table, table)} FROM {table}",
+    ]
+
+
+def _search_index_triggers(table: str, suffix: str) -> list[str]:
+    index = f"{table}{suffix}"
+    names = ", ".join(SEARCH_INDEXED_COLUMNS[table])
+    values = _search_values(table, "new")
+    return [
+        f"""CREATE TRIGGER IF NOT EXISTS {index}_ai AFTER INSERT ON {table} BEGIN
+            INSERT INTO {index}(id, {names}) VALUES (new.id, {values});
+        END""",
+        f"""CREATE TRIGGER IF NOT EXISTS {index}_au AFTER UPDATE ON {table} BEGIN
+            DELETE FROM {index} WHERE id = old.id;
+            INSERT INTO {index}(id, {names}) VALUES (new.id, {values});
+        END""",
+        f"""CREATE TRIGGER IF NOT EXISTS {index}_ad AFTER DELETE ON {table} BEGIN
+            DELETE FROM {index} WHERE id = old.id;
+        END""",
+    ]
+
+
+async def trigram_supported(session: AsyncSession) -> bool:
+    version = (await session.execute(text("SELECT sqlite_version()"))).scalar()
+    return tuple(int(part) for part in version.split(".")[:3]) >= _TRIGRAM_MIN_VERSION
+
+
+async def refill_search_indexes(session: AsyncSession) -> list[str]:
+    """Rebuild every existing search index from its source table.
+
+    Uses the FTS5 ``'rebuild'`` command, which re-reads the external content
+    table in one pass.
+    """
+    existing = set((await session.execute(
+        text("SELECT name FROM sqlite_master WHERE type = 'table'")
+    )).scalars())
+    rebuilt = []
+    for table in SEARCH_INDEXED_COLUMNS:
+        for suffix in ("_fts", "_trigram"):
+            index = f"{table}{suffix}"
+            if index in existing:
+                await session.execute(text(f"INSERT INTO {index}({index}) VALUES ('rebuild')"))
+                rebuilt.append(index)
+    return rebuilt
+
+
+async def vacuum_db(write: AsyncEngine | None = None) -> list[str]:
+    """VACUUM the database and rebuild the search indexes it invalidates.
+
+    The external-content indexes address rows by implicit rowid, which VACUUM
+    renumbers on tables without an INTEGER PRIMARY KEY.  Both steps run on
+    the writer's connection, so no write lands between them.
+    """
+    write = write or write_engine
+    async with write.connect() as conn:
+        raw = await conn.get_raw_connection()
+        # VACUUM cannot run inside a transaction; bypass SQLAlchemy's autobegin.
+        await raw.driver_connection.execute("VACUUM")
+        session = AsyncSession(bind=conn)
+        try:
+            rebuilt = await refill_search_indexes(session)
+            await session.commit()
+        finally:
+            await session.close()
+    maintenance_stats["last_vacuum_at"] = time.time()
+    return rebuilt
+
+
+async def _prefix_and_trigram_search(session: AsyncSession):
+    """Recreate FTS tables with prefix='2 3' and add trigram shadow tables."""
+    # the v1 triggers keep feeding the recreated *_fts tables by name
+    statements = [
+        stmt for table in SEARCH_INDEXED_COLUMNS
+        for stmt in _search_index_ddl(table, "_fts", "prefix='2 3'")
+    ]
+    if await trigram_supported(session):
+        statements += [
+            stmt for table in SEARCH_INDEXED_COLUMNS
+            for stmt in (
+                _search_index_ddl(table, "_trigram", "tokenize='trigram'")
+                + _search_index_triggers(table, "_trigram")
+            )
+        ]
+    else:
+        logger.info("SQLite has no trigram tokenizer; fuzzy search tier disabled")
+    for stmt in statements:
+        await session.execute(text(stmt))
+    await session.commit()
+
+
+# Search indexes v3: external-content FTS5 tables.  The index keeps only its
+# inverted lists and reads column values back from the source table by rowid
+# (for snippet() and UNINDEXED columns), so content is stored once.  The
+# update trigger fires only when an indexed column actually changed — todo
+# status/priority/updated_at churn no longer touches the index.  VACUUM
+# renumbers the source tables' implicit rowids, so it only runs through
+# ``vacuum_db`` (``POST /api/admin/db/vacuum``), which rebuilds the indexes.
+_V1_SEARCH_TRIGGERS = [
+    f"{table}_{event}" for table in SEARCH_INDEXED_COLUMNS for event in ("ai", "au", "ad")
+]
+
+
+def _external_index_ddl(table: str, suffix: str, options: str) -> list[str]:
+    index = f"{table}{suffix}"
+    columns = SEARCH_INDEXED_COLUMNS[table]
+    names = ", ".join(columns)
+    new = ", ".join(f"new.{col}" for col in columns)
+    old = ", ".join(f"old.{col}" for col in columns)
+    changed = " OR ".join(f"old.{col} IS NOT new.{col}" for col in columns)
+    return [
+        *(f"DROP TRIGGER IF EXISTS {index}_{event}" for event in ("ai", "au", "ad")),
+        f"DROP TABLE IF EXISTS {index}",
+        f"""CREATE VIRTUAL TABLE {index} USING fts5(
+            id UNINDEXED, {names}, content='{table}', content_rowid='rowid', {options}
+        )""",
+        f"""CREATE TRIGGER {index}_ai AFTER INSERT ON {table} BEGIN
+            INSERT INTO {index}(rowid, {names}) VALUES (new.rowid, {new});
+        END""",
+        f"""CREATE TRIGGER {index}_au AFTER UPDATE OF {names} ON {table}
+        WHEN {changed} BEGIN
+            INSERT INTO {index}({index}, rowid, {names}) VALUES ('delete', old.rowid, {old});
+            INSERT INTO {index}(rowid, {names}) VALUES (new.rowid, {new});
+        END""",
+        f"""CREATE TRIGGER {index}_ad AFTER DELETE ON {table} BEGIN
+            INSERT INTO {index}({index}, rowid, {names}) VALUES ('delete', old.rowid, {old});
+        END""",
+        f"INSERT INTO {index}({index}) VALUES ('rebuild')",
+    ]
+
+
+async def _external_content_search(session: AsyncSession):
+    """Convert the FTS and trigram tables to external-content with column-aware triggers."""
+    statements = [f"DROP TRIGGER IF EXISTS {name}" for name in _V1_SEARCH_TRIGGERS]
+    statements += [
+        stmt for table in SEARCH_INDEXED_COLUMNS
+        for stmt in _external_index_ddl(table, "_fts", "prefix='2 3'")
+    ]
+    if await trigram_supported(session):
+        statements += [
+            stmt for table in SEARCH_INDEXED_COLUMNS
+            for stmt in _external_index_ddl(table, "_trigram", "tokenize='trigram'")
+        ]
+    for stmt in statements:
+        await session.execute(text(stmt))
+    await session.commit()
+
+
 async def _setup_fts(session: AsyncSession):
     """Create FTS5 virtual tables, sync triggers, and backfill missing rows."""
     for stmt in _FTS5_VIRTUAL_TABLES:
@@ -161,20 +749,116 @@ async def _setup_fts(session: AsyncSession):
     await session.commit()
 
 
+# ---------------------------------------------------------------------------
+# Versioned migrations
+#
+# Applied versions are recorded in ``schema_version``; startup runs only the
+# ones not recorded yet, in order.  Append new migrations with the next
+# version number and never renumber or edit a shipped one — write a new one.
+# Every step must be safe to re-run, since a crash between the step and its
+# version row being written replays it on the next start.
+# ---------------------------------------------------------------------------
+
+@dataclass(frozen=True)
+class Migration:
+    version: int
+    name: str
+    apply: Callable[[AsyncSession], Awaitable[None]]
+
+
+MIGRATIONS: list[Migration] = [
+    Migration(1, "legacy_columns", _apply_schema_corrections),
+    Migration(2, "assignee_to_enabled_skills", _run_data_migrations),
+    Migration(3, "fts5_search", _setup_fts),
+    Migration(4, "agent_tasks_todo_index", _add_agent_task_todo_index),
+    Migration(5, "conversation_last_message", _denormalize_last_message),
+    Migration(6, "keyset_indexes", _add_keyset_indexes),
+    Migration(7, "change_log", _create_change_log),
+    Migration(8, "fts_prefix_trigram", _prefix_and_trigram_search),
+    Migration(9, "fts_external_content", _external_content_search),
+]
+
+_SCHEMA_VERSION_DDL = """CREATE TABLE IF NOT EXISTS schema_version (
+    version INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    applied_at TEXT NOT NULL
+)"""
+
+
+async def applied_versions(session: AsyncSession) -> set[int]:
+    await session.execute(text(_SCHEMA_VERSION_DDL))
+    rows = await session.execute(text("SELECT version FROM schema_version"))
+    return {r[0] for r in rows.fetchall()}
+
+
+async def run_migrations(
+    session: AsyncSession, migrations: list[Migration] | None = None
+) -> list[int]:
+    """Apply pending migrations in version order; return the versions applied."""
+    migrations = MIGRATIONS if migrations is None else migrations
+    versions = [m.version for m in migrations]
+    if versions != sorted(set(versions)):
+        raise RuntimeError(f"Migration versions must be unique and ascending: {versions}")
+
+    done = await applied_versions(session)
+    await session.commit()
+    applied = []
+    for migration in migrations:
+        if migration.version in done:
+            continue
+        started = time.perf_counter()
+        await migration.apply(session)
+        await session.execute(
+            text("INSERT INTO schema_version (version, name, applied_at) VALUES (:v, :n, :at)"),
+            {"v": migration.version, "n": migration.name, "at": datetime.now(timezone.utc).isoformat()},
+        )
+        await session.commit()
+        applied.append(migration.version)
+        logger.info(
+            "Applied migration %d (%s) in %.1f ms",
+            migration.version, migration.name, (time.perf_counter() - started) * 1000,
+        )
+    return applied
+
+
 async def init_db():
-    """Initialize database: create tables, apply corrections, setup FTS."""
+    """Initialize database: create tables, then apply pending migrations."""
+    started = time.perf_counter()
     _ensure_data_dir()
 
     async with engine.begin() as conn:
         from models import _register_all  # noqa: F401
         await conn.run_sync(Base.metadata.create_all)
+    created = time.perf_counter()
 
     async with AsyncSession(engine) as session:
-        await _apply_schema_corrections(session)
-        await _run_data_migrations(session)
-        await _setup_fts(session)
+        applied = await run_migrations(session)
+    finished = time.perf_counter()
+
+    logger.info(
+        "Database ready in %.1f ms (create_all %.1f ms, %d migration(s) %.1f ms)",
+        (finished - started) * 1000,
+        (created - started) * 1000,
+        len(applied),
+        (finished - created) * 1000,
+    )
 
 
 async def get_db():
+    """Session for endpoints that write through it directly.
+
+    Chat turns, the scheduler and background agents run on read-pool
+    sessions and write todos, events, agent tasks and messages through
+    ``db_writer``, as do the todo, calendar and task routers.  The
+    endpoints left on this session (settings, pairing, attachments, chat
+    message CRUD, vault actions) are single short transactions that the
+    writer's ``busy_timeout`` serializes against, not worth a queue hop.
+    """
     async with async_session_factory() as session:
         yield session
+
+
+async def get_read_db():
+    """Session on the read-only pool, for endpoints that never write."""
+    async with read_session_factory() as session:
+        yield session
@@ -6,7 +6,7 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from config import settings
-from database import async_session_factory, init_db
+from database import db_writer, init_db, read_session_factory
 from exceptions import AppError, app_error_handler
 from routers import admin as admin_router
 from routers import auth as auth_router
@@ -22,10 +22,13 @@ from routers import today as today_router
 from routers import attachment as attachment_router
 from routers import obsidian as obsidian_router
 from routers import pairing as pairing_router
+from routers import sync as sync_router
 from routers import todo as todo_router
 from routers import voice as voice_router
 from services.ai_service import AIService
 from services.claude_code_provider import ClaudeCodeProvider, ClaudeCodeStatus, _find_claude_cli
+from services.llm_cache import CachedAIProvider, LLMResponseCache
+from services.llm_scheduler import LLMScheduler, Priority, ScheduledAIProvider
 from services.orchestrator import Orchestrator
 from services.scheduler import Scheduler
 from ws.handler import websocket_endpoint
@@ -37,24 +40,64 @@ logger = logging.getLogger(__name__)
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     await init_db()
+    await db_writer.start()
+
+    # Response cache for deterministic utility prompts (titles, classification)
+    llm_cache = None
+    if settings.llm_cache_enabled:
+        llm_cache = LLMResponseCache(
+            settings.llm_cache_path,
+            ttl_seconds=settings.llm_cache_ttl_seconds,
+            max_entries=settings.llm_cache_max_entries,
+        )
+    app.state.llm_cache = llm_cache
+
+    # One scheduler arbitrates both providers; cache hits skip it entirely
+    llm_scheduler = None
+    if settings.llm_scheduler_enabled:
+        llm_scheduler = LLMScheduler(
+            max_concurrency=settings.llm_scheduler_max_concurrency,
+            class_limits={
+                Priority.BACKGROUND: settings.llm_scheduler_background_limit,
+                Priority.SCHEDULED: settings.llm_scheduler_scheduled_limit,
+            },
+            reserved_interactive=settings.llm_scheduler_reserved_interactive,
+        )
+    app.state.llm_scheduler = llm_scheduler
 
     # Create AI service — relays to OpenClaw
     ai_service = AIService(
         base_url=settings.ai_base_url,
         api_key=settings.ai_api_key,
         model=settings.ai_model,
+        max_connections=settings.ai_max_connections,
+        max_keepalive_connections=settings.ai_max_keepalive_connections,
+        keepalive_expiry=settings.ai_keepalive_expiry,
+        http2=settings.ai_http2,
+        max_concurrency=settings.ai_max_concurrency,
+        connect_timeout=settings.ai_connect_timeout,
+        timeouts={
+            "title": settings.ai_timeout_title,
+            "function_call": settings.ai_timeout_function_call,
+            "completion": settings.ai_timeout_completion,
+            "stream": settings.ai_timeout_stream,
+        },
     )
+    if llm_scheduler:
+        ai_service = ScheduledAIProvider(ai_service, llm_scheduler)
+    if llm_cache:
+        ai_service = CachedAIProvider(ai_service, llm_cache, "openclaw", settings.ai_model)
     app.state.ai_service = ai_service
 
     # Create orchestrator (receives app_state so it can resolve the active AI provider at runtime)
     app.state.orchestrator = Orchestrator(
         ai_service=ai_service,
         ws_manager=ws_manager,
-        session_factory=async_session_factory,
+        session_factory=read_session_factory,
         app_state=app.state,
     )
 
-    app.state.session_factory = async_session_factory
+    app.state.session_factory = read_session_factory
 
     # Run slow startup checks concurrently instead of sequentially
     async def _check_ai() -> bool:
@@ -63,6 +106,12 @@ async def lifespan(app: FastAPI):
     async def _check_claude_code():
         import subprocess as _sp
         cc = ClaudeCodeProvider()
+        cc.configure_pool(
+            settings.claude_code_pool_size,
+            max_requests=settings.claude_code_pool_max_requests,
+            max_workers=settings.claude_code_pool_max_workers,
+            health_interval=settings.claude_code_pool_health_interval,
+        )
         cli = _find_claude_cli()
         if not cli:
             return cc, ClaudeCodeStatus.NOT_INSTALLED, None
@@ -102,6 +151,13 @@ async def lifespan(app: FastAPI):
         await asyncio.gather(_check_ai(), _check_claude_code(), _init_vault())
     )
 
+    if llm_scheduler:
+        claude_code = ScheduledAIProvider(claude_code, llm_scheduler)
+    if llm_cache:
+        claude_code = CachedAIProvider(
+            claude_code, llm_cache, "claude_code", claude_code_version or "claude-cli"
+        )
+
     app.state.ai_connected = ai_connected
     app.state.claude_code = claude_code
     app.state.claude_code_status = claude_code_status.value
@@ -116,6 +172,7 @@ async def lifespan(app: FastAPI):
     ):
         app.state.active_ai = claude_code
         app.state.active_ai_provider = "claude_code"
+        await claude_code.start_pool()
         logger.info("Active AI provider: Claude Code CLI")
     else:
         app.state.active_ai = ai_service
@@ -131,10 +188,19 @@ async def lifespan(app: FastAPI):
     push_service = PushService(settings.firebase_credentials_path)
     app.state.push_service = push_service
 
+    # Semantic search: open the vector index and keep it filled in the background
+    from services import embedding_service
+    from services.embedding_worker import EmbeddingWorker
+    app.state.embedding_worker = None
+    vector_index = embedding_service.open_index()
+    if vector_index is not None:
+        app.state.embedding_worker = EmbeddingWorker(read_session_factory, vector_index)
+        app.state.embedding_worker.start()
+
     # Start background scheduler if enabled
     if settings.enable_scheduler:
         scheduler = Scheduler(
-            session_factory=async_session_factory,
+            session_factory=read_session_factory,
             ai_service=ai_service,
             ws_manager=ws_manager,
             push_service=push_service,
@@ -150,8 +216,15 @@ async def lifespan(app: FastAPI):
     # Stop scheduler before closing AI service
     if app.state.scheduler:
         await app.state.scheduler.stop()
+    if app.state.embedding_worker:
+        await app.state.embedding_worker.stop()
+    embedding_service.close_index()
+    await db_writer.stop()
 
     await ai_service.close()
+    await claude_code.close()
+    if llm_cache:
+        llm_cache.close()
 
 
 app = FastAPI(title="ClawChat Server", version="0.1.0", lifespan=lifespan)
@@ -183,6 +256,7 @@ app.include_router(obsidian_router.router, prefix="/api/obsidian", tags=["obsidi
 app.include_router(pairing_router.router, prefix="/api/pairing", tags=["pairing"])
 app.include_router(capabilities_router.router, prefix="/api/capabilities", tags=["capabilities"])
 app.include_router(voice_router.router, prefix="/api/voice", tags=["voice"])
+app.include_router(sync_router.router, prefix="/api/sync", tags=["sync"])
 
 app.websocket("/ws")(websocket_endpoint)
 
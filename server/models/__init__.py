@@ -1,4 +1,5 @@
 from models.conversation import Conversation  # noqa: F401
+from models.conversation_summary import ConversationSummary  # noqa: F401
 from models.message import Message  # noqa: F401
 from models.todo import Todo  # noqa: F401
 from models.event import Event  # noqa: F401
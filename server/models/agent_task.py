@@ -46,4 +46,6 @@ class AgentTask(Base):
         Index("idx_agent_tasks_status", "status"),
         Index("idx_agent_tasks_conversation_id", "conversation_id"),
         Index("idx_agent_tasks_parent", "parent_task_id"),
+        Index("idx_agent_tasks_todo_type", "todo_id", "task_type", "created_at"),
+        Index("idx_agent_tasks_parent_created", "parent_task_id", "created_at", "id"),
     )
@@ -26,8 +26,20 @@ class Conversation(Base):
     project_todo_id: Mapped[str | None] = mapped_column(
         String, ForeignKey("todos.id", ondelete="SET NULL"), nullable=True
     )
+    # Maintained by triggers on messages (see database._LAST_MESSAGE_TRIGGERS)
+    last_message_preview: Mapped[str | None] = mapped_column(Text, nullable=True)
+    last_message_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
 
-    messages = relationship("Message", back_populates="conversation", lazy="selectin")
+    # Never loaded implicitly: a conversation can hold thousands of messages.
+    # Opt in with selectinload(Conversation.messages), e.g. via
+    # conversation_service.get_conversation(..., with_messages=True).
+    messages = relationship(
+        "Message",
+        back_populates="conversation",
+        lazy="raise",
+        order_by="Message.created_at",
+        cascade="all, delete-orphan",
+    )
 
     __table_args__ = (
         Index("idx_conversations_updated_at", "updated_at"),
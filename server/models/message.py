@@ -28,4 +28,5 @@ class Message(Base):
     __table_args__ = (
         Index("idx_messages_conversation_id", "conversation_id"),
         Index("idx_messages_created_at", "created_at"),
+        Index("idx_messages_conversation_created", "conversation_id", "created_at"),
     )
@@ -64,4 +64,6 @@ class Todo(Base):
         Index("idx_todos_sort_order", "sort_order"),
         Index("idx_todos_source", "source"),
         Index("idx_todos_recurrence_rule", "recurrence_rule"),
+        Index("idx_todos_created_id", "created_at", "id"),
+        Index("idx_todos_updated_id", "updated_at", "id"),
     )
@@ -32,8 +32,15 @@ from schemas.admin import (
     ClaudeCodeStatusResponse,
     AIProviderResponse,
     SwitchProviderRequest,
+    SpeculativeChatStats,
+    LLMCacheStats,
+    AIPoolStats,
+    LLMSchedulerStats,
+    ClaudeCodePoolStats,
+    SQLiteSettings,
 )
 from services import admin_service
+from services.speculative_chat import speculation_stats
 from ws.manager import ws_manager
 
 logger = logging.getLogger(__name__)
@@ -52,8 +59,13 @@ async def get_overview(
 ):
     counts_dict = await admin_service.get_table_counts(db)
     storage_dict = await admin_service.get_storage_stats(db)
+    sqlite_dict = await admin_service.get_sqlite_settings(db)
 
     scheduler = getattr(request.app.state, "scheduler", None)
+    llm_cache = getattr(request.app.state, "llm_cache", None)
+    ai_service = getattr(request.app.state, "ai_service", None)
+    pool_stats = getattr(ai_service, "pool_stats", None)
+    llm_scheduler = getattr(request.app.state, "llm_scheduler", None)
 
     active_provider = getattr(request.app.state, "active_ai_provider", "openclaw")
     ai_model = "claude (via CLI)" if active_provider == "claude_code" else settings.ai_model
@@ -74,6 +86,14 @@ async def get_overview(
         server=server,
         counts=TableCounts(**counts_dict),
         storage=StorageStats(**storage_dict),
+        speculative_chat=SpeculativeChatStats(
+            enabled=settings.speculative_chat_enabled,
+            **speculation_stats.snapshot(),
+        ),
+        llm_cache=LLMCacheStats(**await llm_cache.get_stats()) if llm_cache else None,
+        ai_pool=AIPoolStats(**pool_stats()) if callable(pool_stats) else None,
+        llm_scheduler=LLMSchedulerStats(**llm_scheduler.snapshot()) if llm_scheduler else None,
+        sqlite=SQLiteSettings(**sqlite_dict) if sqlite_dict else None,
     )
 
 
@@ -155,12 +175,13 @@ async def get_sessions(
     _user: str = Depends(get_current_user),
 ):
     connections = [
-        ActiveSession(user_id=uid, connected=True)
-        for uid in ws_manager.active_connections
+        ActiveSession(connected=True, **stats)
+        for stats in ws_manager.connection_stats()
     ]
     return SessionsResponse(
         active_connections=connections,
         total_connections=len(connections),
+        evicted_slow_consumers=ws_manager.evicted,
     )
 
 
@@ -169,10 +190,14 @@ async def disconnect_session(
     user_id: str,
     _user: str = Depends(get_current_user),
 ):
-    ws = ws_manager.active_connections.get(user_id)
-    if ws:
-        await ws.close()
+    conns = list(ws_manager.active_connections.get(user_id, []))
+    if conns:
         ws_manager.disconnect(user_id)
+        for ws in conns:
+            try:
+                await ws.close()
+            except Exception:
+                pass
         return {"status": "disconnected", "user_id": user_id}
     return {"status": "not_found", "user_id": user_id}
 
@@ -229,6 +254,14 @@ async def reindex_database(
     return ReindexResponse(status="completed", tables_reindexed=tables)
 
 
+@router.post("/db/vacuum", response_model=ReindexResponse)
+async def vacuum_database(
+    _user: str = Depends(get_current_user),
+):
+    tables = await admin_service.vacuum_database()
+    return ReindexResponse(status="completed", tables_reindexed=tables)
+
+
 @router.post("/db/backup", response_model=BackupResponse)
 async def backup_database(
     _user: str = Depends(get_current_user),
@@ -295,6 +328,7 @@ async def switch_ai_provider(
             )
         request.app.state.active_ai = claude_code
         request.app.state.active_ai_provider = "claude_code"
+        await claude_code.start_pool()
         logger.info("Switched active AI provider to Claude Code")
     else:
         request.app.state.active_ai = request.app.state.ai_service
@@ -314,11 +348,14 @@ async def get_claude_code_status(
     request: Request,
     _user: str = Depends(get_current_user),
 ):
-    """Get Claude Code CLI status and version."""
+    """Get Claude Code CLI status, version and worker pool state."""
+    claude_code = getattr(request.app.state, "claude_code", None)
+    pool = claude_code.pool_stats() if claude_code else None
     return ClaudeCodeStatusResponse(
         status=getattr(request.app.state, "claude_code_status", "unknown"),
         version=getattr(request.app.state, "claude_code_version", None),
         active=getattr(request.app.state, "active_ai_provider", "openclaw") == "claude_code",
+        pool=ClaudeCodePoolStats(**pool) if pool else None,
     )
 
 
@@ -8,7 +8,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from auth.dependencies import get_current_user
 from config import settings as app_settings
-from database import get_db
+from database import get_db, get_read_db
 from exceptions import NotFoundError, ValidationError
 from models.attachment import Attachment
 from schemas.attachment import AttachmentResponse
@@ -87,7 +87,7 @@ async def upload_attachment(
 @router.get("", response_model=list[AttachmentResponse])
 async def list_attachments(
     todo_id: str | None = Query(None),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     _user: str = Depends(get_current_user),
 ):
     q = select(Attachment).order_by(Attachment.created_at.desc())
@@ -100,7 +100,7 @@ async def list_attachments(
 @router.get("/{attachment_id}/download")
 async def download_attachment(
     attachment_id: str,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     _user: str = Depends(get_current_user),
 ):
     attachment = await db.get(Attachment, attachment_id)
@@ -5,12 +5,12 @@ from fastapi.responses import Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from auth.dependencies import get_current_user
-from database import get_db
+from database import db_writer, get_read_db
 from exceptions import NotFoundError
 from models.event import Event
 from schemas.calendar import EventCreate, EventResponse, EventUpdate
 from schemas.common import PaginatedResponse
-from services import calendar_service
+from services import calendar_service, sync_service
 from utils import apply_model_updates, deserialize_tags, make_id, serialize_tags
 from ws.manager import ws_manager
 
@@ -19,11 +19,10 @@ router = APIRouter()
 DEFAULT_USER_ID = "user"
 
 
-async def _notify_event_change():
-    await ws_manager.send_json(DEFAULT_USER_ID, {
-        "type": "module_data_changed",
-        "data": {"module": "events"},
-    })
+async def _notify_event_change(db: AsyncSession):
+    await ws_manager.send_json(
+        DEFAULT_USER_ID, await sync_service.change_notification(db, "events")
+    )
 
 
 def _event_to_response(row) -> EventResponse:
@@ -63,7 +62,7 @@ async def list_events(
     limit: int = Query(50, ge=1, le=200),
     start_after: datetime | None = None,
     start_before: datetime | None = None,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     _user: str = Depends(get_current_user),
 ):
     rows, total = await calendar_service.get_events(
@@ -77,7 +76,7 @@ async def list_events(
 
 @router.get("/export.ics")
 async def export_ics(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     _user: str = Depends(get_current_user),
 ):
     """Export all events as an iCalendar (.ics) file."""
@@ -92,7 +91,7 @@ async def export_ics(
 @router.post("", response_model=EventResponse, status_code=201)
 async def create_event(
     body: EventCreate,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     _user: str = Depends(get_current_user),
 ):
     event = Event(
@@ -108,21 +107,25 @@ async def create_event(
         recurrence_end=body.recurrence_end,
         tags=serialize_tags(body.tags),
     )
-    db.add(event)
-    await db.commit()
-    await db.refresh(event)
+
+    async def insert(session: AsyncSession) -> None:
+        session.add(event)
+        await session.flush()
+        await session.refresh(event)
+
+    await db_writer.run(insert)
 
     resp = EventResponse.model_validate(event)
     if event.tags:
         resp.tags = deserialize_tags(event.tags)
-    await _notify_event_change()
+    await _notify_event_change(db)
     return resp
 
 
 @router.get("/{event_id}", response_model=EventResponse)
 async def get_event(
     event_id: str,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     _user: str = Depends(get_current_user),
 ):
     event = await db.get(Event, event_id)
@@ -138,37 +141,43 @@ async def get_event(
 async def update_event(
     event_id: str,
     body: EventUpdate,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     _user: str = Depends(get_current_user),
 ):
-    event = await db.get(Event, event_id)
-    if not event:
-        raise NotFoundError("Event not found")
-
     data = body.model_dump(exclude_unset=True)
-    apply_model_updates(event, data)
-    await db.commit()
-    await db.refresh(event)
+
+    async def apply(session: AsyncSession) -> Event:
+        event = await session.get(Event, event_id)
+        if not event:
+            raise NotFoundError("Event not found")
+        apply_model_updates(event, data)
+        await session.flush()
+        await session.refresh(event)
+        return event
+
+    event = await db_writer.run(apply)
 
     resp = EventResponse.model_validate(event)
     if event.tags:
         resp.tags = deserialize_tags(event.tags)
-    await _notify_event_change()
+    await _notify_event_change(db)
     return resp
 
 
 @router.delete("/{event_id}", status_code=204)
 async def delete_event(
     event_id: str,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     _user: str = Depends(get_current_user),
 ):
-    event = await db.get(Event, event_id)
-    if not event:
-        raise NotFoundError("Event not found")
-    await db.delete(event)
-    await db.commit()
-    await _notify_event_change()
+    async def remove(session: AsyncSession) -> None:
+        event = await session.get(Event, event_id)
+        if not event:
+            raise NotFoundError("Event not found")
+        await session.delete(event)
+
+    await db_writer.run(remove)
+    await _notify_event_change(db)
 
 
 @router.delete("/{event_id}/occurrences/{date}", status_code=204)
@@ -176,7 +185,7 @@ async def delete_event_occurrence(
     event_id: str,
     date: str,
     mode: str = Query("this_only", pattern="^(this_only|this_and_future|all)$"),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     _user: str = Depends(get_current_user),
 ):
     """Delete a specific occurrence of a recurring event.
@@ -185,6 +194,8 @@ async def delete_event_occurrence(
           this_and_future — end recurrence before this date
           all — delete entire series
     """
-    await calendar_service.delete_event_occurrence(db, event_id, date, mode)
-    await db.commit()
-    await _notify_event_change()
+    async def remove(session: AsyncSession) -> None:
+        await calendar_service.delete_event_occurrence(session, event_id, date, mode)
+
+    await db_writer.run(remove)
+    await _notify_event_change(db)
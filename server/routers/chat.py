@@ -10,8 +10,8 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from starlette.responses import StreamingResponse
 
 from auth.dependencies import get_current_user
-from constants import SYSTEM_PROMPT
-from database import get_db
+from config import settings
+from database import db_writer, get_db, get_read_db
 from exceptions import NotFoundError
 from models.conversation import Conversation
 from models.message import Message
@@ -26,85 +26,38 @@ from schemas.chat import (
     SendMessageResponse,
 )
 from schemas.common import PaginatedResponse
+from services import chat_context_service, conversation_service
+from services.project_service import project_cache
 from utils import make_id
+from utils.pagination import after_cursor, order_by_key, page_rows
 
 router = APIRouter()
 
 
-async def _build_project_context(db: AsyncSession, project_todo_id: str) -> str:
-    """Build project context string for AI system prompt."""
-    project = await db.get(Todo, project_todo_id)
-    if not project:
-        return ""
-    # Fetch sub-tasks
-    q = select(Todo).where(Todo.parent_id == project_todo_id)
-    subtasks = (await db.execute(q)).scalars().all()
-
-    ctx = f"\n\n[Project: {project.title}]\n"
-    if project.description:
-        ctx += f"Project Notes:\n{project.description}\n"
-    if subtasks:
-        ctx += f"Tasks ({len(subtasks)}):\n"
-        for t in subtasks:
-            ctx += f"  - [{t.status}] {t.title}"
-            if t.priority != "medium":
-                ctx += f" ({t.priority})"
-            ctx += "\n"
-    return ctx
-
-
 @router.get("/conversations", response_model=PaginatedResponse[ConversationResponse])
 async def list_conversations(
     page: int = Query(1, ge=1),
     limit: int = Query(20, ge=1, le=100),
+    cursor: str | None = None,
+    include_total: bool = False,
     archived: bool = False,
     project_todo_id: str | None = None,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     _user: str = Depends(get_current_user),
 ):
-    offset = (page - 1) * limit
-
-    conditions = [Conversation.is_archived == archived]
-    if project_todo_id is not None:
-        conditions.append(Conversation.project_todo_id == project_todo_id)
-
-    count_q = select(func.count(Conversation.id)).where(*conditions)
-    total = (await db.execute(count_q)).scalar() or 0
-
-    q = (
-        select(Conversation)
-        .where(*conditions)
-        .order_by(Conversation.updated_at.desc())
-        .offset(offset)
-        .limit(limit)
+    items, total, next_cursor = await conversation_service.list_conversations(
+        db,
+        archived=archived,
+        project_todo_id=project_todo_id,
+        page=page,
+        limit=limit,
+        cursor=cursor,
+        include_total=include_total,
+        denormalized=settings.conversation_preview_denormalized,
+    )
+    return PaginatedResponse(
+        items=items, total=total, page=page, limit=limit, next_cursor=next_cursor
     )
-    rows = (await db.execute(q)).scalars().all()
-
-    items = []
-    for conv in rows:
-        # Get last message preview
-        last_msg_q = (
-            select(Message.content)
-            .where(Message.conversation_id == conv.id)
-            .order_by(Message.created_at.desc())
-            .limit(1)
-        )
-        last_msg = (await db.execute(last_msg_q)).scalar()
-        preview = last_msg[:100] if last_msg else None
-
-        items.append(
-            ConversationResponse(
-                id=conv.id,
-                title=conv.title,
-                created_at=conv.created_at,
-                updated_at=conv.updated_at,
-                is_archived=conv.is_archived,
-                last_message=preview,
-                project_todo_id=conv.project_todo_id,
-            )
-        )
-
-    return PaginatedResponse(items=items, total=total, page=page, limit=limit)
 
 
 @router.post("/conversations", response_model=ConversationResponse, status_code=201)
@@ -151,6 +104,7 @@ async def get_or_create_project_conversation(
         db.add(conv)
         await db.commit()
         await db.refresh(conv)
+        project_cache.invalidate()
 
     return ConversationResponse(
         id=conv.id,
@@ -165,20 +119,13 @@ async def get_or_create_project_conversation(
 @router.get("/conversations/{conversation_id}", response_model=ConversationDetailResponse)
 async def get_conversation(
     conversation_id: str,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     _user: str = Depends(get_current_user),
 ):
-    conv = await db.get(Conversation, conversation_id)
+    conv = await conversation_service.get_conversation(db, conversation_id, with_messages=True)
     if not conv:
         raise NotFoundError("Conversation not found")
 
-    msg_q = (
-        select(Message)
-        .where(Message.conversation_id == conversation_id)
-        .order_by(Message.created_at.asc())
-    )
-    messages = (await db.execute(msg_q)).scalars().all()
-
     return ConversationDetailResponse(
         id=conv.id,
         title=conv.title,
@@ -186,7 +133,7 @@ async def get_conversation(
         updated_at=conv.updated_at,
         is_archived=conv.is_archived,
         project_todo_id=conv.project_todo_id,
-        messages=[MessageResponse.model_validate(m) for m in messages],
+        messages=[MessageResponse.model_validate(m) for m in conv.messages],
     )
 
 
@@ -202,6 +149,8 @@ async def archive_conversation(
     conv.is_archived = True
     conv.updated_at = datetime.now(timezone.utc)
     await db.commit()
+    if conv.project_todo_id:
+        project_cache.invalidate()
     return {"message": "Conversation archived"}
 
 
@@ -227,26 +176,12 @@ async def stream_chat(
     conv.updated_at = datetime.now(timezone.utc)
     await db.commit()
 
-    # Build message history (last 20)
-    q = (
-        select(Message)
-        .where(Message.conversation_id == body.conversation_id)
-        .order_by(Message.created_at.desc())
-        .limit(20)
-    )
-    rows = (await db.execute(q)).scalars().all()
-    history = list(reversed(rows))
-
-    system_content = SYSTEM_PROMPT
-    if conv.project_todo_id:
-        system_content += await _build_project_context(db, conv.project_todo_id)
-    messages = [{"role": "system", "content": system_content}]
-    for msg in history:
-        messages.append({"role": msg.role, "content": msg.content})
+    messages = await chat_context_service.build_chat_messages(db, body.conversation_id)
 
     assistant_msg_id = make_id("msg_")
     ai_service = getattr(request.app.state, "active_ai", request.app.state.ai_service)
-    session_factory = request.app.state.session_factory
+    await chat_context_service.refresh_summary(db, body.conversation_id, ai_service)
+    needs_title = not conv.title
 
     async def event_generator():
         meta = json.dumps(
@@ -268,27 +203,30 @@ async def stream_chat(
 
         yield "data: [DONE]\n\n"
 
-        # Save assistant message with a fresh session
-        async with session_factory() as save_db:
-            assistant_msg = Message(
+        # Auto-generate title on first message, before taking the write lock
+        title = None
+        if needs_title:
+            try:
+                title = await ai_service.generate_title(body.content)
+            except Exception:
+                pass
+
+        async def save_reply(save_db: AsyncSession) -> None:
+            save_db.add(Message(
                 id=assistant_msg_id,
                 conversation_id=body.conversation_id,
                 role="assistant",
                 content=accumulated,
-            )
-            save_db.add(assistant_msg)
+            ))
             save_conv = await save_db.get(Conversation, body.conversation_id)
             if save_conv:
                 save_conv.updated_at = datetime.now(timezone.utc)
-                # Auto-generate title on first message
-                if not save_conv.title:
-                    try:
-                        title = await ai_service.generate_title(body.content)
-                        save_conv.title = title
-                        yield f"data: {json.dumps({'title_generated': title})}\n\n"
-                    except Exception:
-                        pass
-            await save_db.commit()
+                if title and not save_conv.title:
+                    save_conv.title = title
+
+        await db_writer.run(save_reply)
+        if title:
+            yield f"data: {json.dumps({'title_generated': title})}\n\n"
 
     return StreamingResponse(
         event_generator(),
@@ -343,33 +281,41 @@ async def list_messages(
     conversation_id: str,
     page: int = Query(1, ge=1),
     limit: int = Query(50, ge=1, le=200),
-    db: AsyncSession = Depends(get_db),
+    cursor: str | None = None,
+    order_dir: str = "asc",
+    include_total: bool = False,
+    db: AsyncSession = Depends(get_read_db),
     _user: str = Depends(get_current_user),
 ):
     conv = await db.get(Conversation, conversation_id)
     if not conv:
         raise NotFoundError("Conversation not found")
 
-    offset = (page - 1) * limit
-    count_q = select(func.count(Message.id)).where(
-        Message.conversation_id == conversation_id
-    )
-    total = (await db.execute(count_q)).scalar() or 0
-
+    descending = order_dir == "desc"
+    conditions = [Message.conversation_id == conversation_id]
     q = (
         select(Message)
-        .where(Message.conversation_id == conversation_id)
-        .order_by(Message.created_at.asc())
-        .offset(offset)
-        .limit(limit)
+        .where(*conditions)
+        .order_by(*order_by_key(Message.created_at, Message.id, descending))
+        .limit(limit + 1)
     )
-    rows = (await db.execute(q)).scalars().all()
+    if cursor:
+        q = q.where(after_cursor(Message.created_at, Message.id, cursor, descending))
+    else:
+        q = q.offset((page - 1) * limit)
+    rows, next_cursor = page_rows((await db.execute(q)).scalars().all(), limit, "created_at")
+
+    total = None
+    if cursor is None or include_total:
+        count_q = select(func.count(Message.id)).where(*conditions)
+        total = (await db.execute(count_q)).scalar() or 0
 
     return PaginatedResponse(
         items=[MessageResponse.model_validate(m) for m in rows],
         total=total,
         page=page,
         limit=limit,
+        next_cursor=next_cursor,
     )
 
 
@@ -389,6 +335,7 @@ async def delete_message(
         raise NotFoundError("Message not found")
 
     await db.delete(msg)
+    await chat_context_service.invalidate_summary(db, msg)
     await db.commit()
     return {"message": "Message deleted"}
 
@@ -414,6 +361,7 @@ async def edit_message(
 
     msg.content = body.content
     conv.updated_at = datetime.now(timezone.utc)
+    await chat_context_service.invalidate_summary(db, msg)
     await db.commit()
     await db.refresh(msg)
     return MessageResponse.model_validate(msg)
@@ -2,22 +2,24 @@ from fastapi import APIRouter, Depends, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from auth.dependencies import get_current_user
-from database import get_db
+from database import get_read_db
 from exceptions import ValidationError
-from schemas.common import PaginatedResponse
-from schemas.search import SearchHit
+from schemas.search import SearchResponse
 from services import search_service
 
 router = APIRouter()
 
 
-@router.get("", response_model=PaginatedResponse[SearchHit])
+@router.get("", response_model=SearchResponse)
 async def search(
     q: str = Query("", description="Search query"),
-    types: str | None = Query(None, description="Comma-separated types: messages,todos,events"),
+    types: str | None = Query(
+        None, description="Comma-separated types: messages,todos,events (and notes outside keyword mode)"
+    ),
+    mode: str = Query("keyword", pattern="^(keyword|semantic|hybrid)$"),
     page: int = Query(1, ge=1),
     limit: int = Query(20, ge=1, le=100),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     _user: str = Depends(get_current_user),
 ):
     if not q.strip():
@@ -25,6 +27,18 @@ async def search(
 
     type_list = [t.strip() for t in types.split(",") if t.strip()] if types else None
 
-    hits, total = await search_service.search(db, q.strip(), type_list, page, limit)
+    if mode == "keyword":
+        result = await search_service.search(db, q.strip(), type_list, page, limit)
+    else:
+        result = await search_service.semantic_search(db, q.strip(), type_list, page, limit, mode)
 
-    return PaginatedResponse(items=hits, total=total, page=page, limit=limit)
+    return SearchResponse(
+        items=result.hits,
+        total=result.total,
+        page=page,
+        limit=limit,
+        total_capped=result.total_capped,
+        tier=result.tier,
+        timings_ms=result.timings_ms,
+        mode=result.mode,
+    )
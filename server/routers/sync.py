@@ -0,0 +1,29 @@
+"""Delta sync: changes since a token, for clients that keep local copies."""
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from auth.dependencies import get_current_user
+from database import get_read_db
+from schemas.sync import SyncResponse
+from services import sync_service
+
+router = APIRouter()
+
+
+@router.get("", response_model=SyncResponse)
+async def sync(
+    since: str | None = Query(None, description="Token from the previous sync or WS event"),
+    limit: int = Query(500, ge=1, le=2000),
+    db: AsyncSession = Depends(get_read_db),
+    _user: str = Depends(get_current_user),
+):
+    """Return what changed since *since*.
+
+    The log only holds changes, not a snapshot: rows written before it existed
+    (migration 7) appear only once they are next modified.  A response with
+    ``reset: true`` — always the case without ``since`` — carries no entities,
+    so the client must refetch its lists from the regular endpoints and then
+    continue from the returned token.
+    """
+    return await sync_service.changes_since(db, since, limit)
@@ -3,7 +3,7 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from auth.dependencies import get_current_user
-from database import get_db
+from database import get_read_db
 from models.event import Event
 from models.todo import Todo
 from utils import deserialize_tags
@@ -13,7 +13,7 @@ router = APIRouter(tags=["tags"])
 
 @router.get("")
 async def get_tags(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     _user: str = Depends(get_current_user),
 ):
     unique_tags: set[str] = set()
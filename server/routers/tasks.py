@@ -5,12 +5,13 @@ from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from auth.dependencies import get_current_user
-from database import get_db
+from database import db_writer, get_read_db
 from exceptions import NotFoundError
 from models.agent_task import AgentTask
 from schemas.common import PaginatedResponse
 from schemas.task import AgentTaskResponse
 from services import agent_task_service
+from utils.pagination import after_cursor, order_by_key, page_rows
 
 router = APIRouter()
 
@@ -19,8 +20,10 @@ router = APIRouter()
 async def list_tasks(
     page: int = Query(1, ge=1),
     limit: int = Query(50, ge=1, le=200),
+    cursor: str | None = None,
+    include_total: bool = False,
     status: str | None = None,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     _user: str = Depends(get_current_user),
 ):
     conditions = []
@@ -29,26 +32,33 @@ async def list_tasks(
     # Only show top-level tasks (not sub-tasks)
     conditions.append(AgentTask.parent_task_id == None)  # noqa: E711
 
-    count_q = select(func.count(AgentTask.id)).where(*conditions)
-    total = (await db.execute(count_q)).scalar() or 0
-
     q = (
         select(AgentTask)
         .where(*conditions)
-        .order_by(AgentTask.created_at.desc())
-        .offset((page - 1) * limit)
-        .limit(limit)
+        .order_by(*order_by_key(AgentTask.created_at, AgentTask.id, descending=True))
+        .limit(limit + 1)
     )
-    rows = (await db.execute(q)).scalars().all()
+    if cursor:
+        q = q.where(after_cursor(AgentTask.created_at, AgentTask.id, cursor, descending=True))
+    else:
+        q = q.offset((page - 1) * limit)
+    rows, next_cursor = page_rows((await db.execute(q)).scalars().all(), limit, "created_at")
+
+    total = None
+    if cursor is None or include_total:
+        count_q = select(func.count(AgentTask.id)).where(*conditions)
+        total = (await db.execute(count_q)).scalar() or 0
 
     items = [AgentTaskResponse.model_validate(row) for row in rows]
-    return PaginatedResponse(items=items, total=total, page=page, limit=limit)
+    return PaginatedResponse(
+        items=items, total=total, page=page, limit=limit, next_cursor=next_cursor
+    )
 
 
 @router.get("/{task_id}", response_model=AgentTaskResponse)
 async def get_task(
     task_id: str,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     _user: str = Depends(get_current_user),
 ):
     task = await db.get(AgentTask, task_id)
@@ -68,7 +78,7 @@ async def get_task(
 @router.post("/{task_id}/cancel", status_code=200)
 async def cancel_task(
     task_id: str,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     _user: str = Depends(get_current_user),
 ):
     task = await db.get(AgentTask, task_id)
@@ -78,7 +88,7 @@ async def cancel_task(
     if task.status in ("queued", "running"):
         task.status = "failed"
         task.error = "Cancelled by user"
-        await db.commit()
+        await db_writer.save(task)
         return {"status": "cancelled", "task_id": task_id}
 
     return {"status": task.status, "task_id": task_id, "message": "Task already finished"}
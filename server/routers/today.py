@@ -5,15 +5,14 @@ from sqlalchemy import func, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from auth.dependencies import get_current_user
-from database import get_db
+from database import get_db, get_read_db
 from models.event import Event
 from models.todo import Todo
 from schemas.calendar import EventResponse
 from schemas.today import TodayResponse
-from schemas.todo import TodoResponse
 from services.briefing_service import generate_briefing
+from services.todo_service import build_todo_responses
 from utils import deserialize_tags
-from utils.inbox_display import get_next_action
 
 router = APIRouter(tags=["today"])
 
@@ -27,24 +26,6 @@ def _get_greeting() -> str:
     return "Good evening"
 
 
-def _todo_to_response(todo: Todo) -> TodoResponse:
-    resp = TodoResponse.model_validate(todo)
-    if todo.tags:
-        resp.tags = deserialize_tags(todo.tags)
-    resp.next_action = get_next_action(
-        todo.inbox_state or "none", todo.status or "pending"
-    )
-    if todo.source == "obsidian_project":
-        resp.sync_status = "synced"
-    elif todo.source and todo.source.startswith("obsidian"):
-        resp.sync_status = "linked"
-    if todo.source_id:
-        resp.project_label = (
-            todo.source_id.replace("_", " ").replace("-", " ").strip().title()
-        )
-    return resp
-
-
 def _event_to_response(event: Event) -> EventResponse:
     resp = EventResponse.model_validate(event)
     if event.tags:
@@ -73,7 +54,7 @@ async def get_briefing(
 
 @router.get("", response_model=TodayResponse)
 async def get_today(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     _user: str = Depends(get_current_user),
 ):
     today = date.today()
@@ -139,11 +120,17 @@ async def get_today(
     )
     needs_review_todos = (await db.execute(needs_review_q)).scalars().all()
 
+    # One batch so plan summaries for all three lists come from one query
+    responses = await build_todo_responses(
+        db, [*all_today, *overdue_tasks, *needs_review_todos]
+    )
+    n_today, n_overdue = len(all_today), len(overdue_tasks)
+
     return TodayResponse(
-        today_tasks=[_todo_to_response(t) for t in all_today],
-        overdue_tasks=[_todo_to_response(t) for t in overdue_tasks],
+        today_tasks=responses[:n_today],
+        overdue_tasks=responses[n_today:n_today + n_overdue],
         today_events=[_event_to_response(e) for e in today_events],
-        needs_review=[_todo_to_response(t) for t in needs_review_todos],
+        needs_review=responses[n_today + n_overdue:],
         inbox_count=inbox_count,
         greeting=_get_greeting(),
         date=today,
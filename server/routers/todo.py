@@ -9,19 +9,18 @@ from sqlalchemy import select as sa_select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from auth.dependencies import get_current_user
-from database import get_db
+from database import db_writer, get_read_db
 from exceptions import NotFoundError
 from models.agent_task import AgentTask
-from models.conversation import Conversation
 from models.todo import Todo
 from schemas.bulk import BulkTodoResponse, BulkTodoUpdate
 from schemas.common import PaginatedResponse
 from schemas.task import DelegateRequest, PlanApplyResponse, PlanResponse, SkillResponse
 from schemas.todo import AnswerQuestionsRequest, ProjectTodoResponse, TodoCreate, TodoResponse, TodoUpdate
-from services import inbox_pipeline_service
+from services import inbox_pipeline_service, project_service, sync_service, todo_service
 from skills import SKILL_REGISTRY, PERSONA_TO_SKILL, get_skill
-from utils import apply_model_updates, deserialize_tags, make_id, serialize_tags
-from utils.inbox_display import get_next_action
+from utils import apply_model_updates, make_id, serialize_tags
+from utils.pagination import after_cursor, order_by_key, page_rows
 from config import settings
 from services.obsidian_export_service import export_todo, remove_todo_from_vault
 from ws.manager import ws_manager
@@ -31,12 +30,12 @@ router = APIRouter()
 DEFAULT_USER_ID = "user"
 
 
-async def _notify_todo_change():
-    """Broadcast a module_data_changed event so all clients refresh todos."""
-    await ws_manager.send_json(DEFAULT_USER_ID, {
-        "type": "module_data_changed",
-        "data": {"module": "todos"},
-    })
+async def _notify_todo_change(db: AsyncSession):
+    """Broadcast a module_data_changed event, with the sync token, so clients pull the delta."""
+    project_service.project_cache.invalidate()
+    await ws_manager.send_json(
+        DEFAULT_USER_ID, await sync_service.change_notification(db, "todos")
+    )
 
 _ORDER_COLUMNS = {
     "created_at": Todo.created_at,
@@ -62,67 +61,19 @@ def _skill_label(skill_id: str) -> str:
     return _LEGACY_ASSIGNEE_LABELS.get(skill_id, skill_id.replace("_", " ").title())
 
 
-def _humanize_folder_name(source_id: str | None) -> str | None:
-    """Derive a human-readable project label from source_id (folder name)."""
-    if not source_id:
-        return None
-    return source_id.replace("_", " ").replace("-", " ").strip().title()
-
-
-def _compute_sync_status(source: str | None) -> str | None:
-    """Derive Obsidian sync status from source field."""
-    if source == "obsidian_project":
-        return "synced"
-    if source and source.startswith("obsidian"):
-        return "linked"
-    return None
-
-
-async def _enrich_todo_response(
-    todo: Todo, db: AsyncSession, *, include_plan_summary: bool = True
-) -> TodoResponse:
+async def _enrich_todo_response(todo: Todo, db: AsyncSession) -> TodoResponse:
     """Build a TodoResponse with computed display fields."""
-    resp = TodoResponse.model_validate(todo)
-    if todo.tags:
-        resp.tags = deserialize_tags(todo.tags)
-
-    # is_recurring
-    resp.is_recurring = bool(todo.recurrence_rule)
-
-    # next_action
-    resp.next_action = get_next_action(
-        todo.inbox_state or "none", todo.status or "pending"
-    )
-
-    # sync_status
-    resp.sync_status = _compute_sync_status(todo.source)
-
-    # project_label
-    resp.project_label = _humanize_folder_name(todo.source_id)
-
-    # plan_summary — only fetch when inbox_state is plan_ready
-    if include_plan_summary and todo.inbox_state == "plan_ready":
-        plan_q = (
-            sa_select(AgentTask)
-            .where(
-                AgentTask.todo_id == todo.id,
-                AgentTask.task_type == "plan_todo",
-                AgentTask.status == "completed",
-            )
-            .order_by(AgentTask.created_at.desc())
-            .limit(1)
-        )
-        plan_task = (await db.execute(plan_q)).scalar()
-        if plan_task and plan_task.payload_json:
-            payload = json.loads(plan_task.payload_json)
-            resp.plan_summary = payload.get("summary")
-
-    return resp
+    return (await todo_service.build_todo_responses(db, [todo]))[0]
 
 
-@router.get("/projects", response_model=list[ProjectTodoResponse])
+@router.get("/projects", response_model=PaginatedResponse[ProjectTodoResponse])
 async def list_projects(
-    db: AsyncSession = Depends(get_db),
+    page: int = Query(1, ge=1),
+    limit: int = Query(100, ge=1, le=500),
+    status: str | None = None,
+    source: str | None = None,
+    q: str | None = Query(None, description="Case-insensitive title filter"),
+    db: AsyncSession = Depends(get_read_db),
     _user: str = Depends(get_current_user),
 ):
     """List root todos that qualify as projects.
@@ -131,68 +82,18 @@ async def list_projects(
     an explicit source (e.g. obsidian_project).  Simple inbox captures and
     standalone tasks are excluded.
     """
-    q = (
-        select(Todo)
-        .where(Todo.parent_id.is_(None))
-        .order_by(Todo.updated_at.desc())
+    items, total = await project_service.list_projects(
+        db, status=status, source=source, search=q, page=page, limit=limit
     )
-    root_todos = (await db.execute(q)).scalars().all()
-
-    items = []
-    for todo in root_todos:
-        # Get associated conversation
-        conv_q = select(Conversation.id).where(
-            Conversation.project_todo_id == todo.id,
-            Conversation.is_archived == False,  # noqa: E712
-        ).limit(1)
-        conv_id = (await db.execute(conv_q)).scalar()
-
-        # Count subtasks
-        subtask_q = select(func.count(Todo.id)).where(Todo.parent_id == todo.id)
-        subtask_count = (await db.execute(subtask_q)).scalar() or 0
-
-        completed_q = select(func.count(Todo.id)).where(
-            Todo.parent_id == todo.id,
-            Todo.status == "completed",
-        )
-        completed_count = (await db.execute(completed_q)).scalar() or 0
-
-        # Only include as a project if it has subtasks, a conversation, or a source
-        has_subtasks = subtask_count > 0
-        has_conversation = conv_id is not None
-        has_source = bool(todo.source)
-        if not (has_subtasks or has_conversation or has_source):
-            continue
-
-        resp = ProjectTodoResponse(
-            id=todo.id,
-            title=todo.title,
-            description=todo.description,
-            status=todo.status,
-            priority=todo.priority,
-            due_date=todo.due_date,
-            completed_at=todo.completed_at,
-            tags=deserialize_tags(todo.tags) if todo.tags else None,
-            parent_id=todo.parent_id,
-            sort_order=todo.sort_order,
-            source=todo.source,
-            source_id=todo.source_id,
-            assignee=todo.assignee,
-            created_at=todo.created_at,
-            updated_at=todo.updated_at,
-            conversation_id=conv_id,
-            subtask_count=subtask_count,
-            completed_subtask_count=completed_count,
-        )
-        items.append(resp)
-
-    return items
+    return PaginatedResponse(items=items, total=total, page=page, limit=limit)
 
 
 @router.get("", response_model=PaginatedResponse[TodoResponse])
 async def list_todos(
     page: int = Query(1, ge=1),
     limit: int = Query(20, ge=1, le=1000),
+    cursor: str | None = None,
+    include_total: bool = False,
     status: str | None = None,
     priority: str | None = None,
     due_before: datetime | None = None,
@@ -200,10 +101,9 @@ async def list_todos(
     root_only: bool = False,
     order_by: str = "created_at",
     order_dir: str = "desc",
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     _user: str = Depends(get_current_user),
 ):
-    offset = (page - 1) * limit
     conditions = []
     if status:
         conditions.append(Todo.status == status)
@@ -216,78 +116,58 @@ async def list_todos(
     if root_only:
         conditions.append(Todo.parent_id.is_(None))
 
-    count_q = select(func.count(Todo.id)).where(*conditions)
-    total = (await db.execute(count_q)).scalar() or 0
-
     col = _ORDER_COLUMNS.get(order_by, Todo.created_at)
-    order_clause = col.asc() if order_dir == "asc" else col.desc()
+    descending = order_dir != "asc"
 
     q = (
         select(Todo)
         .where(*conditions)
-        .order_by(order_clause)
-        .offset(offset)
-        .limit(limit)
+        .order_by(*order_by_key(col, Todo.id, descending))
+        .limit(limit + 1)
     )
-    rows = (await db.execute(q)).scalars().all()
+    if cursor:
+        q = q.where(after_cursor(col, Todo.id, cursor, descending))
+    else:
+        q = q.offset((page - 1) * limit)
+    rows, next_cursor = page_rows((await db.execute(q)).scalars().all(), limit, col.key)
 
-    items = []
-    for row in rows:
-        resp = await _enrich_todo_response(row, db, include_plan_summary=False)
-        items.append(resp)
+    total = None
+    if cursor is None or include_total:
+        count_q = select(func.count(Todo.id)).where(*conditions)
+        total = (await db.execute(count_q)).scalar() or 0
 
-    return PaginatedResponse(items=items, total=total, page=page, limit=limit)
+    items = await todo_service.build_todo_responses(db, rows)
+    return PaginatedResponse(
+        items=items, total=total, page=page, limit=limit, next_cursor=next_cursor
+    )
 
 
 @router.patch("/bulk", response_model=BulkTodoResponse)
 async def bulk_update_todos(
     body: BulkTodoUpdate,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     _user: str = Depends(get_current_user),
 ):
-    updated = 0
-    deleted = 0
-    deleted_ids: list[str] = []
-    updated_todos: list[Todo] = []
-    errors: list[str] = []
-    for todo_id in body.ids:
-        todo = await db.get(Todo, todo_id)
-        if not todo:
-            errors.append(f"Todo {todo_id} not found")
-            continue
-        if body.delete:
-            deleted_ids.append(todo.id)
-            await db.delete(todo)
-            deleted += 1
-        else:
-            if body.status is not None:
-                todo.status = body.status
-                if body.status == "completed" and not todo.completed_at:
-                    todo.completed_at = datetime.now(timezone.utc)
-                elif body.status != "completed":
-                    todo.completed_at = None
-            if body.priority is not None:
-                todo.priority = body.priority
-            if body.tags is not None:
-                todo.tags = serialize_tags(body.tags)
-            todo.updated_at = datetime.now(timezone.utc)
-            updated_todos.append(todo)
-            updated += 1
-    await db.commit()
+    values = {}
+    if body.status is not None:
+        values["status"] = body.status
+    if body.priority is not None:
+        values["priority"] = body.priority
+    if body.tags is not None:
+        values["tags"] = serialize_tags(body.tags)
+    if "parent_id" in body.model_fields_set:
+        values["parent_id"] = body.parent_id
+
+    async def apply(session: AsyncSession):
+        return await todo_service.bulk_update_todos(
+            session, body.ids, values=values, delete_rows=body.delete, reorder=body.reorder
+        )
 
-    if settings.obsidian_vault_path:
-        for tid in deleted_ids:
-            remove_todo_from_vault(settings.obsidian_vault_path, tid)
-        for todo in updated_todos:
-            project_name = None
-            if todo.parent_id:
-                parent = await db.get(Todo, todo.parent_id)
-                if parent:
-                    project_name = parent.title
-            export_todo(settings.obsidian_vault_path, todo, project_name)
+    updated_ids, deleted_ids, errors = await db_writer.run(apply)
 
-    await _notify_todo_change()
-    return BulkTodoResponse(updated=updated, deleted=deleted, errors=errors)
+    await todo_service.export_bulk_to_vault(db, updated_ids, deleted_ids)
+    await _notify_todo_change(db)
+    return BulkTodoResponse(updated=len(updated_ids), deleted=len(deleted_ids), errors=errors)
 
 
 @router.post("", response_model=TodoResponse, status_code=201)
@@ -295,7 +175,7 @@ async def create_todo(
     body: TodoCreate,
     request: Request,
     background_tasks: BackgroundTasks,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     _user: str = Depends(get_current_user),
 ):
     todo = Todo(
@@ -316,9 +196,13 @@ async def create_todo(
         recurrence_rule=body.recurrence_rule,
         recurrence_end=body.recurrence_end,
     )
-    db.add(todo)
-    await db.commit()
-    await db.refresh(todo)
+
+    async def insert(session: AsyncSession) -> None:
+        session.add(todo)
+        await session.flush()
+        await session.refresh(todo)
+
+    await db_writer.run(insert)
 
     # Trigger inbox pipeline for quick-capture root todos
     if todo.inbox_state == "classifying" and not todo.parent_id:
@@ -339,14 +223,14 @@ async def create_todo(
                 project_name = parent.title
         export_todo(settings.obsidian_vault_path, todo, project_name)
 
-    await _notify_todo_change()
+    await _notify_todo_change(db)
     return await _enrich_todo_response(todo, db)
 
 
 @router.get("/{todo_id}", response_model=TodoResponse)
 async def get_todo(
     todo_id: str,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     _user: str = Depends(get_current_user),
 ):
     todo = await db.get(Todo, todo_id)
@@ -359,33 +243,34 @@ async def get_todo(
 async def update_todo(
     todo_id: str,
     body: TodoUpdate,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     _user: str = Depends(get_current_user),
 ):
-    todo = await db.get(Todo, todo_id)
-    if not todo:
-        raise NotFoundError("Todo not found")
-
     data = body.model_dump(exclude_unset=True)
-    apply_model_updates(todo, data)
-
-    # Auto-set completed_at when status changes to completed
-    if "status" in data:
-        if data["status"] == "completed" and not todo.completed_at:
-            todo.completed_at = datetime.now(timezone.utc)
-        elif data["status"] != "completed":
-            todo.completed_at = None
-    await db.commit()
-    await db.refresh(todo)
-
-    # Spawn next occurrence for recurring tasks on completion
-    next_todo_id = None
-    if "status" in data and data["status"] == "completed" and todo.recurrence_rule:
-        from services.todo_recurrence_service import spawn_next_occurrence
-        next_todo = await spawn_next_occurrence(db, todo)
-        if next_todo:
-            next_todo_id = next_todo.id
-            await db.commit()
+
+    async def apply(session: AsyncSession) -> tuple[Todo, str | None]:
+        todo = await session.get(Todo, todo_id)
+        if not todo:
+            raise NotFoundError("Todo not found")
+        apply_model_updates(todo, data)
+
+        # Auto-set completed_at when status changes to completed
+        if "status" in data:
+            if data["status"] == "completed" and not todo.completed_at:
+                todo.completed_at = datetime.now(timezone.utc)
+            elif data["status"] != "completed":
+                todo.completed_at = None
+        await session.flush()
+        await session.refresh(todo)
+
+        # Spawn next occurrence for recurring tasks on completion
+        next_todo = None
+        if "status" in data and data["status"] == "completed" and todo.recurrence_rule:
+            from services.todo_recurrence_service import spawn_next_occurrence
+            next_todo = await spawn_next_occurrence(session, todo)
+        return todo, next_todo.id if next_todo else None
+
+    todo, next_todo_id = await db_writer.run(apply)
 
     if settings.obsidian_vault_path:
         project_name = None
@@ -395,7 +280,7 @@ async def update_todo(
                 project_name = parent.title
         export_todo(settings.obsidian_vault_path, todo, project_name)
 
-    await _notify_todo_change()
+    await _notify_todo_change(db)
     resp = await _enrich_todo_response(todo, db)
     # Include next occurrence ID in response headers for client to pick up
     if next_todo_id:
@@ -406,20 +291,22 @@ async def update_todo(
 @router.delete("/{todo_id}", status_code=204)
 async def delete_todo(
     todo_id: str,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     _user: str = Depends(get_current_user),
 ):
-    todo = await db.get(Todo, todo_id)
-    if not todo:
-        raise NotFoundError("Todo not found")
-    deleted_id = todo.id
-    await db.delete(todo)
-    await db.commit()
+    async def remove(session: AsyncSession) -> str:
+        todo = await session.get(Todo, todo_id)
+        if not todo:
+            raise NotFoundError("Todo not found")
+        await session.delete(todo)
+        return todo.id
+
+    deleted_id = await db_writer.run(remove)
 
     if settings.obsidian_vault_path:
         remove_todo_from_vault(settings.obsidian_vault_path, deleted_id)
 
-    await _notify_todo_change()
+    await _notify_todo_change(db)
 
 
 @router.post("/{todo_id}/organize")
@@ -427,7 +314,7 @@ async def organize_todo(
     todo_id: str,
     request: Request,
     background_tasks: BackgroundTasks,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     _user: str = Depends(get_current_user),
 ):
     todo = await db.get(Todo, todo_id)
@@ -450,7 +337,7 @@ async def answer_questions(
     body: AnswerQuestionsRequest,
     request: Request,
     background_tasks: BackgroundTasks,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     _user: str = Depends(get_current_user),
 ):
     """Accept user answers to clarification questions and trigger planning."""
@@ -464,8 +351,8 @@ async def answer_questions(
     # Save answers
     todo.clarification_answers = json.dumps(body.answers)
     todo.inbox_state = "planning"
-    await db.commit()
-    await _notify_todo_change()
+    await db_writer.save(todo)
+    await _notify_todo_change(db)
 
     # Trigger planning in background with Q&A context
     ai_service = request.app.state.ai_service
@@ -484,7 +371,7 @@ async def skip_questions(
     todo_id: str,
     request: Request,
     background_tasks: BackgroundTasks,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     _user: str = Depends(get_current_user),
 ):
     """Skip clarification questions and proceed directly to planning."""
@@ -496,8 +383,8 @@ async def skip_questions(
         return {"status": "invalid_state", "todo_id": todo_id, "inbox_state": todo.inbox_state}
 
     todo.inbox_state = "planning"
-    await db.commit()
-    await _notify_todo_change()
+    await db_writer.save(todo)
+    await _notify_todo_change(db)
 
     # Trigger planning in background without Q&A context
     ai_service = request.app.state.ai_service
@@ -514,7 +401,7 @@ async def skip_questions(
 @router.get("/{todo_id}/plan/latest")
 async def get_latest_plan(
     todo_id: str,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     _user: str = Depends(get_current_user),
 ):
     q = (
@@ -556,7 +443,7 @@ async def get_latest_plan(
     assignee_raw = payload.get("suggested_assignee")
     suggested_assignee_label = _skill_label(assignee_raw) if assignee_raw else None
 
-    suggested_project_label = _humanize_folder_name(
+    suggested_project_label = todo_service.humanize_folder_name(
         payload.get("suggested_project_title")
     )
 
@@ -582,7 +469,7 @@ async def get_latest_plan(
 async def apply_plan(
     todo_id: str,
     request: Request,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     _user: str = Depends(get_current_user),
 ):
     todo = await db.get(Todo, todo_id)
@@ -621,13 +508,11 @@ async def apply_plan(
             due_date=subtask.get("due_date"),
             sort_order=index,
         )
-        db.add(child)
         created_ids.append(child.id)
         created_todos.append(child)
 
-    await db.flush()
-
     # Store dependency links as depends_on on each child todo
+    relationship_count = 0
     for index, subtask in enumerate(subtasks):
         dep_ids = [
             created_ids[dep_index]
@@ -636,6 +521,7 @@ async def apply_plan(
         ]
         if dep_ids:
             created_todos[index].depends_on = json.dumps(dep_ids)
+            relationship_count += len(dep_ids)
 
     # Apply suggested skills (preferred) or legacy assignee
     if payload.get("suggested_skills"):
@@ -676,7 +562,7 @@ async def apply_plan(
         if earliest:
             todo.due_date = earliest
 
-    await db.commit()
+    await db_writer.save(todo, new=created_todos)
 
     # Export affected todos to vault
     if settings.obsidian_vault_path:
@@ -685,7 +571,7 @@ async def apply_plan(
         for child in created_todos:
             export_todo(settings.obsidian_vault_path, child, project_name)
 
-    await _notify_todo_change()
+    await _notify_todo_change(db)
     return PlanApplyResponse(
         todo_id=todo_id,
         created_subtask_ids=created_ids,
@@ -697,15 +583,15 @@ async def apply_plan(
 @router.post("/{todo_id}/plan/dismiss")
 async def dismiss_plan(
     todo_id: str,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     _user: str = Depends(get_current_user),
 ):
     todo = await db.get(Todo, todo_id)
     if not todo:
         raise NotFoundError("Todo not found")
     todo.inbox_state = "none"
-    await db.commit()
-    await _notify_todo_change()
+    await db_writer.save(todo)
+    await _notify_todo_change(db)
     return {"status": "dismissed", "todo_id": todo_id}
 
 
@@ -714,7 +600,7 @@ async def delegate_todo(
     todo_id: str,
     body: DelegateRequest,
     request: Request,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     _user: str = Depends(get_current_user),
 ):
     # Resolve skill_id — prefer skill_id, fall back to legacy agent_type mapping.
@@ -736,8 +622,12 @@ async def delegate_todo(
         todo_id=todo.id,
         skill_chain=json.dumps([skill_id]),
     )
-    db.add(task)
-    await db.flush()
+
+    async def insert(session: AsyncSession) -> None:
+        session.add(task)
+
+    # the agent runs below, and its writes queue on db_writer
+    await db_writer.run(insert)
 
     ai_service = request.app.state.ai_service
 
@@ -759,7 +649,7 @@ async def delegate_todo(
     if skill_id not in existing:
         existing.append(skill_id)
     todo.enabled_skills = json.dumps(existing)
-    await db.commit()
+    await db_writer.save(todo)
 
     return {
         "status": "delegated",
@@ -34,10 +34,88 @@ class StorageStats(BaseModel):
     attachment_total_bytes: int
 
 
+class SpeculativeChatStats(BaseModel):
+    enabled: bool
+    started: int
+    used: int
+    wasted: int
+    waste_ratio: float
+    wasted_tokens: int
+    wasted_ms_total: float
+    saved_ms_total: float
+    avg_saved_ms: float
+
+
+class LLMCacheStats(BaseModel):
+    entries: int
+    bytes_stored: int
+    hits: int
+    misses: int
+    hit_ratio: float
+
+
+class AIPoolStats(BaseModel):
+    max_concurrency: int
+    in_flight: int
+    waiting: int
+    peak_waiting: int
+    saturation: float
+    total_requests: int
+    total_queued: int
+    avg_wait_ms: float
+    max_wait_ms: float
+    http2: bool
+    max_connections: int | None
+    max_keepalive_connections: int | None
+    open_connections: int
+    idle_connections: int
+
+
+class LLMSchedulerClassStats(BaseModel):
+    limit: int
+    in_flight: int
+    waiting: int
+    completed: int
+    preempted: int
+    avg_wait_ms: float
+    max_wait_ms: float
+
+
+class LLMSchedulerStats(BaseModel):
+    max_concurrency: int
+    reserved_interactive: int
+    in_flight: int
+    waiting: int
+    classes: dict[str, LLMSchedulerClassStats]
+
+
+class SQLiteSettings(BaseModel):
+    tuning_enabled: bool
+    # Values in effect on the serving connection (SQLite reports enums as ints:
+    # synchronous 1 = NORMAL, temp_store 2 = MEMORY)
+    journal_mode: str | None = None
+    synchronous: int | None = None
+    mmap_size: int | None = None
+    cache_size: int | None = None
+    temp_store: int | None = None
+    busy_timeout: int | None = None
+    last_optimize_at: float | None = None
+    last_checkpoint_at: float | None = None
+    last_checkpoint_pages: int | None = None
+    # Serialized writer: commits issued and writes they carried
+    write_batches: int = 0
+    write_jobs: int = 0
+
+
 class AdminOverviewResponse(BaseModel):
     server: ServerOverview
     counts: TableCounts
     storage: StorageStats
+    speculative_chat: SpeculativeChatStats
+    llm_cache: LLMCacheStats | None = None  # None when LLM_CACHE_ENABLED=false
+    ai_pool: AIPoolStats | None = None
+    llm_scheduler: LLMSchedulerStats | None = None
+    sqlite: SQLiteSettings | None = None  # None for non-SQLite databases
 
 
 # --- AI Configuration ---
@@ -88,13 +166,22 @@ class ActivityResponse(BaseModel):
 
 
 class ActiveSession(BaseModel):
+    """One WebSocket connection (a user may have several devices)."""
     user_id: str
     connected: bool
+    connected_at: float | None = None
+    queue_depth: int = 0
+    max_queue_depth: int = 0
+    queue_capacity: int = 0
+    sent: int = 0
+    coalesced: int = 0  # heartbeats / stale task_progress removed on overflow
+    dropped: int = 0  # droppable messages discarded on a full queue
 
 
 class SessionsResponse(BaseModel):
     active_connections: list[ActiveSession]
     total_connections: int
+    evicted_slow_consumers: int = 0
 
 
 # --- Server Config (read-only view) ---
@@ -163,10 +250,23 @@ class BackupResponse(BaseModel):
 # --- Claude Code / AI Provider ---
 
 
+class ClaudeCodePoolStats(BaseModel):
+    size: int
+    idle: int
+    busy: int
+    max_requests: int
+    requests: int
+    spawned: int
+    recycled: int
+    cold_starts: int
+    failures: int
+
+
 class ClaudeCodeStatusResponse(BaseModel):
     status: str  # available, not_installed, not_authenticated, error
     version: str | None = None
     active: bool  # True if Claude Code is the current active provider
+    pool: ClaudeCodePoolStats | None = None  # None until the worker pool has started
 
 
 class AIProviderResponse(BaseModel):
@@ -6,6 +6,10 @@ class BulkTodoUpdate(BaseModel):
     status: str | None = None
     priority: str | None = None
     tags: list[str] | None = None
+    # move: sent explicitly (null = make root todos); left out = unchanged
+    parent_id: str | None = None
+    # set sort_order to each id's position in ``ids``
+    reorder: bool = False
     delete: bool = False
 
 
@@ -16,6 +16,7 @@ class ConversationResponse(BaseModel):
     updated_at: datetime
     is_archived: bool
     last_message: str | None = None
+    last_message_at: datetime | None = None
     project_todo_id: str | None = None
 
     model_config = {"from_attributes": True}
@@ -37,27 +38,24 @@ class MessageResponse(BaseModel):
     @classmethod
     def _parse_metadata_json(cls, values):
         """Convert metadata_json (ORM column) to metadata (API field)."""
-        raw = None
         if hasattr(values, "metadata_json"):
+            # ORM object: convert to dict so Pydantic doesn't read the
+            # declarative ``metadata`` attribute
             raw = values.metadata_json
-        elif isinstance(values, dict):
+            return {
+                "id": values.id,
+                "conversation_id": values.conversation_id,
+                "role": values.role,
+                "content": values.content,
+                "message_type": values.message_type,
+                "intent": values.intent,
+                "created_at": values.created_at,
+                "metadata": (_json.loads(raw) if isinstance(raw, str) else raw) if raw else None,
+            }
+        if isinstance(values, dict):
             raw = values.pop("metadata_json", None)
-        if raw:
-            parsed = _json.loads(raw) if isinstance(raw, str) else raw
-            if hasattr(values, "__dict__"):
-                # ORM object: convert to dict so Pydantic can set metadata
-                d = {
-                    "id": values.id,
-                    "conversation_id": values.conversation_id,
-                    "role": values.role,
-                    "content": values.content,
-                    "message_type": values.message_type,
-                    "intent": values.intent,
-                    "created_at": values.created_at,
-                    "metadata": parsed,
-                }
-                return d
-            values["metadata"] = parsed
+            if raw:
+                values["metadata"] = _json.loads(raw) if isinstance(raw, str) else raw
         return values
 
 
@@ -7,6 +7,9 @@ T = TypeVar("T")
 
 class PaginatedResponse(BaseModel, Generic[T]):
     items: list[T]
-    total: int
+    # None when a cursor page skips the count (pass include_total=true)
+    total: int | None
     page: int
     limit: int
+    # opaque keyset cursor for the page after this one; None on the last page
+    next_cursor: str | None = None
@@ -2,11 +2,25 @@ from datetime import datetime
 
 from pydantic import BaseModel
 
+from schemas.common import PaginatedResponse
+
 
 class SearchHit(BaseModel):
-    type: str  # "message" | "todo" | "event"
+    type: str  # "message" | "todo" | "event" | "note" (vault path in id)
     id: str
     title: str | None = None
     preview: str
+    # preview with matched terms wrapped in <mark>...</mark>
+    highlight: str | None = None
     rank: float
     created_at: datetime
+
+
+class SearchResponse(PaginatedResponse[SearchHit]):
+    # true when more than SEARCH_TOTAL_CAP results matched; total is the cap
+    total_capped: bool = False
+    # tier that matched ("exact" | "prefix" | "fuzzy"), and each tried tier's time
+    tier: str | None = None
+    timings_ms: dict[str, float] = {}
+    # mode that answered; semantic and hybrid fall back to keyword without an index
+    mode: str = "keyword"
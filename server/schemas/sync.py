@@ -0,0 +1,19 @@
+from pydantic import BaseModel
+
+from schemas.calendar import EventResponse
+from schemas.chat import ConversationResponse, MessageResponse
+from schemas.todo import TodoResponse
+
+
+class SyncResponse(BaseModel):
+    token: str
+    # true when the token can't be answered from the change log; refetch lists
+    reset: bool = False
+    # more changes are waiting; call again with the returned token
+    has_more: bool = False
+    todos: list[TodoResponse] = []
+    events: list[EventResponse] = []
+    conversations: list[ConversationResponse] = []
+    messages: list[MessageResponse] = []
+    # entity ("todos", "events", ...) -> ids deleted since the token
+    deleted: dict[str, list[str]] = {}
@@ -10,6 +10,7 @@ from sqlalchemy import func, select, text
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from config import settings
+from database import db_writer, maintenance_stats, read_sqlite_pragmas, refill_search_indexes, vacuum_db
 from models.conversation import Conversation
 from models.message import Message
 from models.todo import Todo
@@ -64,6 +65,19 @@ async def get_storage_stats(db: AsyncSession) -> dict:
     }
 
 
+async def get_sqlite_settings(db: AsyncSession) -> dict | None:
+    """Return the SQLite tuning pragmas in effect plus maintenance timestamps."""
+    if db.bind.dialect.name != "sqlite":
+        return None
+    return {
+        "tuning_enabled": settings.sqlite_tuning_enabled,
+        **await read_sqlite_pragmas(db),
+        **maintenance_stats,
+        "write_batches": db_writer.batches,
+        "write_jobs": db_writer.jobs,
+    }
+
+
 def get_uptime_seconds() -> float:
     return time.time() - _start_time
 
@@ -188,22 +202,17 @@ async def purge_old_data(db: AsyncSession, target: str, older_than_days: int) ->
 
 
 async def reindex_fts(db: AsyncSession) -> list[str]:
-    """Drop and rebuild FTS5 content."""
-    tables = ["messages_fts", "todos_fts", "events_fts"]
-    for table in tables:
-        await db.execute(text(f"DELETE FROM {table}"))
-
-    backfill = [
-        "INSERT INTO messages_fts(id, content) SELECT id, content FROM messages",
-        "INSERT INTO todos_fts(id, title, description) SELECT id, title, COALESCE(description, '') FROM todos",
-        "INSERT INTO events_fts(id, title, description, location) SELECT id, title, COALESCE(description, ''), COALESCE(location, '') FROM events",
-    ]
-    for stmt in backfill:
-        await db.execute(text(stmt))
+    """Rebuild the full-text and trigram indexes from their source tables."""
+    tables = await refill_search_indexes(db)
     await db.commit()
     return tables
 
 
+async def vacuum_database() -> list[str]:
+    """Compact the database file; the search indexes are rebuilt afterwards."""
+    return await vacuum_db()
+
+
 async def backup_database() -> tuple[str, int]:
     """Copy SQLite DB to a timestamped backup file."""
     db_path = settings.database_url.split("///")[-1]
@@ -1,4 +1,8 @@
-"""Async service layer for agent task lifecycle with multi-agent coordination."""
+"""Async service layer for agent task lifecycle with multi-agent coordination.
+
+Tasks run for minutes across LLM calls, so lifecycle writes go through
+``db_writer`` as they happen; the session a task runs with only reads.
+"""
 
 import asyncio
 import json
@@ -8,8 +12,10 @@ from datetime import datetime, timezone
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from database import db_writer
 from models.agent_task import AgentTask
 from services.ai_service import AIService
+from services.llm_scheduler import Priority, with_priority
 from utils import make_id, strip_markdown_fences
 from ws.manager import ConnectionManager
 
@@ -111,29 +117,48 @@ async def get_sub_tasks(db: AsyncSession, parent_id: str) -> list[AgentTask]:
     return list((await db.execute(q)).scalars().all())
 
 
-async def mark_running(db: AsyncSession, task: AgentTask) -> None:
+async def create_sub_tasks(parent: AgentTask, definitions: list[dict]) -> list[AgentTask]:
+    """Insert the coordinator's sub-tasks in one writer job."""
+
+    async def insert(session: AsyncSession) -> list[AgentTask]:
+        return [
+            await create_task(
+                session,
+                task_type=d.get("agent_type", "general"),
+                instruction=d["instruction"],
+                conversation_id=parent.conversation_id,
+                message_id=parent.message_id,
+                parent_task_id=parent.id,
+                agent_type=d.get("agent_type", "general"),
+            )
+            for d in definitions
+        ]
+
+    return await db_writer.run(insert)
+
+
+async def mark_running(task: AgentTask) -> None:
     task.status = "running"
     task.started_at = datetime.now(timezone.utc)
-    await db.flush()
+    await db_writer.save(task)
 
 
-async def mark_completed(db: AsyncSession, task: AgentTask, result: str) -> None:
+async def mark_completed(task: AgentTask, result: str) -> None:
     task.status = "completed"
     task.result = result
     task.progress = 100
     task.completed_at = datetime.now(timezone.utc)
-    await db.flush()
+    await db_writer.save(task)
 
 
-async def mark_failed(db: AsyncSession, task: AgentTask, error: str) -> None:
+async def mark_failed(task: AgentTask, error: str) -> None:
     task.status = "failed"
     task.error = error
     task.completed_at = datetime.now(timezone.utc)
-    await db.flush()
+    await db_writer.save(task)
 
 
 async def update_progress(
-    db: AsyncSession,
     task: AgentTask,
     progress: int,
     message: str,
@@ -142,7 +167,7 @@ async def update_progress(
 ) -> None:
     task.progress = progress
     task.progress_message = message
-    await db.flush()
+    await db_writer.save(task)
 
     await ws_manager.send_json(user_id, {
         "type": "task_progress",
@@ -156,6 +181,7 @@ async def update_progress(
     })
 
 
+@with_priority(Priority.BACKGROUND)
 async def execute_task(
     db: AsyncSession,
     task: AgentTask,
@@ -176,24 +202,21 @@ async def execute_task(
         await _execute_coordinator(db, task, ai_service, ws_manager, user_id, session_factory)
         return
 
-    await mark_running(db, task)
-    await db.commit()
+    await mark_running(task)
 
     system_prompt = AGENT_PROMPTS.get(task.agent_type, AGENT_PROMPTS["general"])
 
     try:
         # Send initial progress
-        await update_progress(db, task, 10, "Starting task...", ws_manager, user_id)
-        await db.commit()
+        await update_progress(task, 10, "Starting task...", ws_manager, user_id)
 
         result = await ai_service.generate_completion(
             system_prompt=system_prompt,
             user_message=task.instruction,
         )
 
-        await update_progress(db, task, 90, "Finalizing...", ws_manager, user_id)
-        await mark_completed(db, task, result)
-        await db.commit()
+        await update_progress(task, 90, "Finalizing...", ws_manager, user_id)
+        await mark_completed(task, result)
 
         # Check if this is a sub-task and update parent
         if task.parent_task_id:
@@ -212,8 +235,7 @@ async def execute_task(
     except Exception as exc:
         logger.exception("Agent task %s failed", task.id)
         error_msg = str(exc)
-        await mark_failed(db, task, error_msg)
-        await db.commit()
+        await mark_failed(task, error_msg)
 
         if task.parent_task_id:
             await _check_parent_completion(db, task.parent_task_id, ai_service, ws_manager, user_id)
@@ -239,9 +261,8 @@ async def _execute_coordinator(
     session_factory=None,
 ) -> None:
     """Coordinator agent: decompose into sub-tasks, fire them, aggregate results."""
-    await mark_running(db, task)
-    await update_progress(db, task, 5, "Analyzing task and creating sub-tasks...", ws_manager, user_id)
-    await db.commit()
+    await mark_running(task)
+    await update_progress(task, 5, "Analyzing task and creating sub-tasks...", ws_manager, user_id)
 
     try:
         # Use AI to decompose the task
@@ -260,23 +281,9 @@ async def _execute_coordinator(
 
         task.sub_task_count = len(sub_task_defs)
         task.completed_sub_tasks = 0
-        await update_progress(db, task, 10, f"Created {len(sub_task_defs)} sub-tasks", ws_manager, user_id)
-        await db.commit()
-
-        # Create sub-tasks
-        sub_tasks = []
-        for sub_def in sub_task_defs:
-            sub = await create_task(
-                db,
-                task_type=sub_def.get("agent_type", "general"),
-                instruction=sub_def["instruction"],
-                conversation_id=task.conversation_id,
-                message_id=task.message_id,
-                parent_task_id=task.id,
-                agent_type=sub_def.get("agent_type", "general"),
-            )
-            sub_tasks.append(sub)
-        await db.commit()
+        await update_progress(task, 10, f"Created {len(sub_task_defs)} sub-tasks", ws_manager, user_id)
+
+        sub_tasks = await create_sub_tasks(task, sub_task_defs)
 
         # Fire sub-tasks concurrently
         if session_factory:
@@ -298,8 +305,7 @@ async def _execute_coordinator(
     except Exception as exc:
         logger.exception("Coordinator task %s failed", task.id)
         error_msg = str(exc)
-        await mark_failed(db, task, error_msg)
-        await db.commit()
+        await mark_failed(task, error_msg)
 
         await ws_manager.send_json(user_id, {
             "type": "task_failed",
@@ -331,8 +337,7 @@ async def _check_parent_completion(
 
     parent.completed_sub_tasks = len(completed) + len(failed)
     progress = int((parent.completed_sub_tasks / max(total, 1)) * 90) + 10
-    await update_progress(db, parent, progress, f"{len(completed)}/{total} sub-tasks completed", ws_manager, user_id)
-    await db.commit()
+    await update_progress(parent, progress, f"{len(completed)}/{total} sub-tasks completed", ws_manager, user_id)
 
     # Check if all sub-tasks are done
     if parent.completed_sub_tasks < total:
@@ -350,15 +355,13 @@ async def _check_parent_completion(
                 system_prompt="Synthesize the following sub-task results into a cohesive final response. Be comprehensive but concise.",
                 user_message=f"Original task: {parent.instruction}\n\nSub-task results:\n{results_text}",
             )
-            await mark_completed(db, parent, synthesis)
+            await mark_completed(parent, synthesis)
         except Exception:
             # Fallback: concatenate results
-            await mark_completed(db, parent, results_text)
+            await mark_completed(parent, results_text)
     else:
         error_msgs = "; ".join(s.error or "Unknown error" for s in failed)
-        await mark_failed(db, parent, f"All sub-tasks failed: {error_msgs}")
-
-    await db.commit()
+        await mark_failed(parent, f"All sub-tasks failed: {error_msgs}")
 
     status = "task_completed" if parent.status == "completed" else "task_failed"
     await ws_manager.send_json(user_id, {
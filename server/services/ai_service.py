@@ -4,9 +4,12 @@ ClawChat Server does NOT handle LLM routing or API keys.
 All AI work is delegated to OpenClaw via its /v1/chat/completions endpoint.
 """
 
+import asyncio
 import json
 import logging
+import time
 from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 
 import httpx
 
@@ -14,15 +17,113 @@ from exceptions import AIUnavailableError
 
 logger = logging.getLogger(__name__)
 
+# Read timeouts per call type (seconds).  For streams this bounds the gap
+# between chunks, not the whole response.
+DEFAULT_TIMEOUTS = {
+    "title": 15.0,
+    "function_call": 30.0,
+    "completion": 60.0,
+    "stream": 60.0,
+}
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+class ConcurrencyLimiter:
+    """Semaphore that records queueing so pool saturation can be observed."""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self._semaphore = asyncio.Semaphore(limit)
+        self.in_flight = 0
+        self.waiting = 0
+        self.peak_waiting = 0
+        self.total_acquired = 0
+        self.total_queued = 0
+        self.total_wait_ms = 0.0
+        self.max_wait_ms = 0.0
+
+    @asynccontextmanager
+    async def slot(self):
+        started = time.perf_counter()
+        queued = self._semaphore.locked()
+        self.waiting += 1
+        self.peak_waiting = max(self.peak_waiting, self.waiting)
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self.waiting -= 1
+        wait_ms = (time.perf_counter() - started) * 1000
+        self.total_acquired += 1
+        self.total_queued += int(queued)
+        self.total_wait_ms += wait_ms
+        self.max_wait_ms = max(self.max_wait_ms, wait_ms)
+        self.in_flight += 1
+        try:
+            yield
+        finally:
+            self.in_flight -= 1
+            self._semaphore.release()
+
+    def snapshot(self) -> dict:
+        return {
+            "max_concurrency": self.limit,
+            "in_flight": self.in_flight,
+            "waiting": self.waiting,
+            "peak_waiting": self.peak_waiting,
+            "saturation": round(self.in_flight / self.limit, 3) if self.limit else 0.0,
+            "total_requests": self.total_acquired,
+            "total_queued": self.total_queued,
+            "avg_wait_ms": (
+                round(self.total_wait_ms / self.total_acquired, 1) if self.total_acquired else 0.0
+            ),
+            "max_wait_ms": round(self.max_wait_ms, 1),
+        }
+
 
 class AIService:
     """Relay AI requests to OpenClaw's OpenAI-compatible API."""
 
-    def __init__(self, base_url: str, api_key: str = "", model: str = "openclaw"):
+    def __init__(
+        self,
+        base_url: str,
+        api_key: str = "",
+        model: str = "openclaw",
+        *,
+        max_connections: int = 20,
+        max_keepalive_connections: int = 10,
+        keepalive_expiry: float = 30.0,
+        http2: bool = False,
+        max_concurrency: int = 8,
+        connect_timeout: float = 10.0,
+        timeouts: dict[str, float] | None = None,
+    ):
         self.base_url = base_url.rstrip("/")
         self.api_key = api_key
         self.model = model
-        self.client = httpx.AsyncClient(timeout=httpx.Timeout(60.0, connect=10.0))
+        self.connect_timeout = connect_timeout
+        self.timeouts = {**DEFAULT_TIMEOUTS, **(timeouts or {})}
+        if http2 and not _http2_available():
+            logger.warning("AI_HTTP2 is enabled but the 'h2' package is not installed; using HTTP/1.1")
+            http2 = False
+        self.http2 = http2
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.client = httpx.AsyncClient(
+            timeout=httpx.Timeout(60.0, connect=connect_timeout),
+            limits=self.limits,
+            http2=http2,
+        )
+        self.limiter = ConcurrencyLimiter(max_concurrency)
 
     # --- Streaming chat completion ---
 
@@ -30,11 +131,12 @@ class AIService:
         headers = self._auth_headers()
 
         try:
-            async with self.client.stream(
+            async with self.limiter.slot(), self.client.stream(
                 "POST",
                 f"{self.base_url}/v1/chat/completions",
                 json={"model": self.model, "messages": messages, "stream": True},
                 headers=headers,
+                timeout=self._timeout("stream"),
             ) as response:
                 response.raise_for_status()
                 async for line in response.aiter_lines():
@@ -67,19 +169,21 @@ class AIService:
         headers = self._auth_headers()
 
         try:
-            response = await self.client.post(
-                f"{self.base_url}/v1/chat/completions",
-                json={
-                    "model": self.model,
-                    "messages": [
-                        {"role": "system", "content": system_prompt},
-                        {"role": "user", "content": user_message},
-                    ],
-                    "tools": tools,
-                    "tool_choice": tool_choice,
-                },
-                headers=headers,
-            )
+            async with self.limiter.slot():
+                response = await self.client.post(
+                    f"{self.base_url}/v1/chat/completions",
+                    json={
+                        "model": self.model,
+                        "messages": [
+                            {"role": "system", "content": system_prompt},
+                            {"role": "user", "content": user_message},
+                        ],
+                        "tools": tools,
+                        "tool_choice": tool_choice,
+                    },
+                    headers=headers,
+                    timeout=self._timeout("function_call"),
+                )
             response.raise_for_status()
             return response.json()
         except (httpx.ConnectError, httpx.ConnectTimeout) as exc:
@@ -97,7 +201,7 @@ class AIService:
             "at the start/end."
         )
         try:
-            title = await self.generate_completion(system, user_message)
+            title = await self.generate_completion(system, user_message, call_type="title")
             return title[:60] if title else "New Conversation"
         except Exception:
             logger.warning("Title generation failed, using fallback")
@@ -105,8 +209,13 @@ class AIService:
 
     # --- Non-streaming completion ---
 
-    async def generate_completion(self, system_prompt: str, user_message: str) -> str:
-        """General-purpose non-streaming LLM call via OpenClaw."""
+    async def generate_completion(
+        self, system_prompt: str, user_message: str, call_type: str = "completion"
+    ) -> str:
+        """General-purpose non-streaming LLM call via OpenClaw.
+
+        *call_type* selects the read timeout from ``self.timeouts``.
+        """
         messages = [
             {"role": "system", "content": system_prompt},
             {"role": "user", "content": user_message},
@@ -114,11 +223,13 @@ class AIService:
         headers = self._auth_headers()
 
         try:
-            resp = await self.client.post(
-                f"{self.base_url}/v1/chat/completions",
-                json={"model": self.model, "messages": messages},
-                headers=headers,
-            )
+            async with self.limiter.slot():
+                resp = await self.client.post(
+                    f"{self.base_url}/v1/chat/completions",
+                    json={"model": self.model, "messages": messages},
+                    headers=headers,
+                    timeout=self._timeout(call_type),
+                )
             resp.raise_for_status()
             data = resp.json()
             return data["choices"][0]["message"]["content"].strip()
@@ -157,8 +268,33 @@ class AIService:
     async def close(self):
         await self.client.aclose()
 
+    # --- Pool stats ---
+
+    def pool_stats(self) -> dict:
+        """Connection-pool and request-queue state for the admin API."""
+        connections = idle = 0
+        pool = getattr(getattr(self.client, "_transport", None), "_pool", None)
+        for conn in getattr(pool, "connections", None) or []:
+            connections += 1
+            try:
+                idle += int(conn.is_idle())
+            except Exception:
+                pass
+        return {
+            **self.limiter.snapshot(),
+            "http2": self.http2,
+            "max_connections": self.limits.max_connections,
+            "max_keepalive_connections": self.limits.max_keepalive_connections,
+            "open_connections": connections,
+            "idle_connections": idle,
+        }
+
     # --- Internal helpers ---
 
+    def _timeout(self, call_type: str) -> httpx.Timeout:
+        read = self.timeouts.get(call_type, self.timeouts["completion"])
+        return httpx.Timeout(read, connect=self.connect_timeout)
+
     def _auth_headers(self) -> dict:
         headers: dict[str, str] = {}
         if self.api_key:
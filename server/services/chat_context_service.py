@@ -0,0 +1,306 @@
+"""Token-budgeted prompt context for general chat.
+
+``build_chat_messages`` fills ``CHAT_CONTEXT_TOKEN_BUDGET`` (estimated at
+four characters per token) in priority order:
+
+1. the system prompt, plus the linked project's tasks;
+2. recent turns, newest first, up to ``RECENT_SHARE`` of what is left
+   (the newest message always goes in);
+3. the conversation's rolling summary of older turns;
+4. items relevant to the latest user message: older messages of this
+   conversation and todos, found through the ``*_fts`` indexes (any
+   content word matches, bm25 orders them), plus vault notes when the
+   semantic index is open.
+
+Retrieved items are ``snippet()`` excerpts, not whole rows.  Summaries are
+cached in ``conversation_summaries``.  After a turn, ``refresh_summary``
+checks whether ``CHAT_SUMMARY_BATCH`` messages have scrolled out of the
+recent window since the last summary.  If so, it folds them in with one
+background LLM call, so no chat turn ever waits on summarization.
+"""
+
+import asyncio
+import logging
+import re
+from dataclasses import dataclass
+from datetime import datetime
+
+from sqlalchemy import delete, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from config import settings
+from constants import SYSTEM_PROMPT
+from database import db_writer
+from models.conversation import Conversation
+from models.conversation_summary import ConversationSummary
+from models.message import Message
+from models.todo import Todo
+from services import embedding_service
+from services.llm_scheduler import Priority, with_priority
+
+logger = logging.getLogger(__name__)
+
+CHARS_PER_TOKEN = 4
+RECENT_SHARE = 0.6  # of the budget left after the system prompt
+SUMMARY_SHARE = 0.15
+SNIPPET_TOKENS = 32
+MAX_QUERY_TERMS = 12
+SUMMARY_MESSAGE_CHARS = 600  # per message fed to the summarizer
+
+_WORD = re.compile(r"\w+")
+_STOPWORDS = frozenset(
+    "about after again also and any are because been before but can could did does "
+    "doing for from had has have her here him his how into its just like me more "
+    "most my not now our out over please she should some tell than that the their "
+    "them then there these they this those too was we were what when where which "
+    "who why will with would you your".split()
+)
+
+_SUMMARY_PROMPT = (
+    "You maintain a running summary of a chat between a user and their assistant. "
+    "Merge the new messages into the summary so far. Keep facts, decisions, names, "
+    "dates and open questions; drop small talk. Reply with the updated summary only, "
+    "at most 200 words."
+)
+
+# summary refreshes in flight, keyed by conversation (also keeps the tasks alive)
+_refreshing: dict[str, asyncio.Task] = {}
+
+
+def estimate_tokens(content: str) -> int:
+    return len(content) // CHARS_PER_TOKEN + 1
+
+
+def _truncate(content: str, tokens: int) -> str:
+    limit = tokens * CHARS_PER_TOKEN
+    return content if len(content) <= limit else content[:limit].rstrip() + "…"
+
+
+def match_query(message: str) -> str:
+    """FTS5 query matching any content word of *message*, each quoted."""
+    words = dict.fromkeys(
+        w for w in _WORD.findall(message.lower()) if len(w) > 2 and w not in _STOPWORDS
+    )
+    return " OR ".join(f'"{w}"' for w in list(words)[:MAX_QUERY_TERMS])
+
+
+async def build_project_context(db: AsyncSession, project_todo_id: str) -> str:
+    """Build project context string for AI system prompt."""
+    project = await db.get(Todo, project_todo_id)
+    if not project:
+        return ""
+    q = select(Todo).where(Todo.parent_id == project_todo_id)
+    subtasks = (await db.execute(q)).scalars().all()
+
+    ctx = f"\n\n[Project: {project.title}]\n"
+    if project.description:
+        ctx += f"Project Notes:\n{project.description}\n"
+    if subtasks:
+        ctx += f"Tasks ({len(subtasks)}):\n"
+        for t in subtasks:
+            ctx += f"  - [{t.status}] {t.title}"
+            if t.priority != "medium":
+                ctx += f" ({t.priority})"
+            ctx += "\n"
+    return ctx
+
+
+async def _older_messages(db: AsyncSession, conversation_id: str, before_id: str, match: str) -> list[str]:
+    # CROSS JOIN keeps the MATCH scan outermost; driven from the messages
+    # index instead, the rowid probes into the index came back empty
+    rows = (await db.execute(
+        text(f"""
+            SELECT m.role, snippet(messages_fts, 1, '', '', '…', {SNIPPET_TOKENS}) AS excerpt
+            FROM messages_fts CROSS JOIN messages AS m ON m.rowid = messages_fts.rowid
+            WHERE messages_fts MATCH :q AND m.conversation_id = :cid
+              AND m.created_at < (SELECT created_at FROM messages WHERE id = :before)
+            ORDER BY bm25(messages_fts)
+            LIMIT :k
+        """),
+        {"q": match, "cid": conversation_id, "before": before_id, "k": settings.chat_context_retrieved_items},
+    )).all()
+    return [f"- Earlier, {r.role}: {r.excerpt}" for r in rows]
+
+
+async def _related_todos(db: AsyncSession, match: str) -> list[str]:
+    rows = (await db.execute(
+        text(f"""
+            SELECT t.title, t.status, t.due_date,
+                   snippet(todos_fts, 2, '', '', '…', {SNIPPET_TOKENS}) AS excerpt
+            FROM todos_fts JOIN todos AS t ON t.rowid = todos_fts.rowid
+            WHERE todos_fts MATCH :q
+            ORDER BY bm25(todos_fts)
+            LIMIT :k
+        """),
+        {"q": match, "k": settings.chat_context_retrieved_items},
+    )).all()
+    lines = []
+    for r in rows:
+        line = f"- Todo [{r.status}] {r.title}"
+        if r.due_date:
+            line += f" (due {str(r.due_date)[:10]})"
+        if r.excerpt:
+            line += f": {r.excerpt}"
+        lines.append(line)
+    return lines
+
+
+async def _related_notes(message: str) -> list[str]:
+    hits = await embedding_service.query(message, ["note"], settings.chat_context_retrieved_items)
+    return [f"- Note {h.title}: {h.preview}" for h in hits]
+
+
+async def build_chat_messages(db: AsyncSession, conversation_id: str) -> list[dict]:
+    """System prompt with summary and retrieved context, then recent turns, within budget."""
+    system_content = SYSTEM_PROMPT
+    conv = await db.get(Conversation, conversation_id)
+    if conv and conv.project_todo_id:
+        system_content += await build_project_context(db, conv.project_todo_id)
+    available = settings.chat_context_token_budget - estimate_tokens(system_content)
+
+    q = (
+        select(Message)
+        .where(Message.conversation_id == conversation_id)
+        .order_by(Message.created_at.desc())
+        .limit(settings.chat_context_recent_messages)
+    )
+    rows = (await db.execute(q)).scalars().all()
+    history, used = [], 0
+    for msg in rows:
+        cost = estimate_tokens(msg.content)
+        if history and used + cost > available * RECENT_SHARE:
+            break
+        history.append(msg)
+        used += cost
+    history.reverse()
+    remaining = available - used
+
+    sections = []
+    summary = await db.get(ConversationSummary, conversation_id)
+    if summary and summary.summary and remaining > 0:
+        body = _truncate(summary.summary, min(remaining, int(available * SUMMARY_SHARE)))
+        sections.append(f"[Earlier in this conversation]\n{body}")
+        remaining -= estimate_tokens(body)
+
+    latest = next((m.content for m in reversed(history) if m.role == "user"), "")
+    match = match_query(latest)
+    if match and remaining > 0:
+        lines = await _older_messages(db, conversation_id, history[0].id, match)
+        lines += await _related_todos(db, match)
+        lines += await _related_notes(latest)
+        picked = []
+        for line in lines:
+            cost = estimate_tokens(line)
+            if cost > remaining:
+                continue
+            picked.append(line)
+            remaining -= cost
+        if picked:
+            sections.append("[Possibly relevant context]\n" + "\n".join(picked))
+
+    if sections:
+        system_content += "\n\n" + "\n\n".join(sections)
+    messages = [{"role": "system", "content": system_content}]
+    for msg in history:
+        messages.append({"role": msg.role, "content": msg.content})
+    return messages
+
+
+# ---------------------------------------------------------------------------
+# Rolling summaries
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class _SummaryJob:
+    conversation_id: str
+    previous: str
+    message_count: int
+    transcript: str
+    folded: int
+    through_at: datetime
+
+
+async def _pending_summary(db: AsyncSession, conversation_id: str) -> _SummaryJob | None:
+    """The next batch of turns that left the recent window unsummarized, if full."""
+    batch = settings.chat_summary_batch
+    boundary = (await db.execute(
+        select(Message.created_at)
+        .where(Message.conversation_id == conversation_id)
+        .order_by(Message.created_at.desc())
+        .offset(settings.chat_context_recent_messages)
+        .limit(1)
+    )).scalar()
+    if boundary is None:
+        return None
+
+    summary = await db.get(ConversationSummary, conversation_id)
+    q = (
+        select(Message.role, Message.content, Message.created_at)
+        .where(Message.conversation_id == conversation_id, Message.created_at <= boundary)
+        .order_by(Message.created_at)
+        .limit(batch)
+    )
+    if summary:
+        q = q.where(Message.created_at > summary.through_at)
+    rows = (await db.execute(q)).all()
+    if len(rows) < batch:
+        return None
+    return _SummaryJob(
+        conversation_id=conversation_id,
+        previous=summary.summary if summary else "",
+        message_count=summary.message_count if summary else 0,
+        transcript="\n".join(f"{r.role}: {r.content[:SUMMARY_MESSAGE_CHARS]}" for r in rows),
+        folded=len(rows),
+        through_at=rows[-1].created_at,
+    )
+
+
+@with_priority(Priority.BACKGROUND)
+async def _run_summary(ai_service, job: _SummaryJob) -> None:
+    try:
+        summary = await ai_service.generate_completion(
+            _SUMMARY_PROMPT,
+            f"Summary so far:\n{job.previous or '(none)'}\n\nNew messages:\n{job.transcript}",
+        )
+    except Exception:
+        logger.warning("Summary refresh failed for conversation %s", job.conversation_id, exc_info=True)
+        return
+    if not summary:
+        return
+
+    async def save(db: AsyncSession) -> None:
+        row = await db.get(ConversationSummary, job.conversation_id)
+        if row is None:
+            row = ConversationSummary(conversation_id=job.conversation_id)
+            db.add(row)
+        elif row.through_at >= job.through_at:
+            return  # a newer refresh already landed
+        row.summary = summary.strip()
+        row.through_at = job.through_at
+        row.message_count = job.message_count + job.folded
+
+    await db_writer.run(save)
+
+
+async def refresh_summary(db: AsyncSession, conversation_id: str, ai_service) -> asyncio.Task | None:
+    """Fold the next batch of older turns into the summary, in the background."""
+    if settings.chat_summary_batch <= 0 or conversation_id in _refreshing:
+        return None
+    job = await _pending_summary(db, conversation_id)
+    if job is None:
+        return None
+    task = asyncio.create_task(_run_summary(ai_service, job))
+    _refreshing[conversation_id] = task
+    task.add_done_callback(lambda _t: _refreshing.pop(conversation_id, None))
+    return task
+
+
+async def invalidate_summary(db: AsyncSession, message: Message) -> None:
+    """Drop the summary if it covers an edited or deleted *message*; it is rebuilt."""
+    await db.execute(
+        delete(ConversationSummary).where(
+            ConversationSummary.conversation_id == message.conversation_id,
+            ConversationSummary.through_at >= message.created_at,
+        )
+    )
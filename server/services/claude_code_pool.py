@@ -0,0 +1,373 @@
+"""Warm pool of long-lived Claude Code CLI workers.
+
+Spawning ``claude --print`` costs hundreds of milliseconds to seconds per
+call.  The pool keeps ``size`` CLI processes started ahead of time in
+streaming-JSON input mode (``--input-format stream-json``), waiting on stdin.
+A request writes one user message as a JSON line and reads stream-json events
+until the ``result`` event, so CLI start-up is paid off the critical path.
+
+The CLI keeps conversation history for the lifetime of a process, so a worker
+serves at most ``max_requests`` requests before it is recycled.  The default of
+1 means every request gets a fresh session (pre-spawned, never shared);
+raising it trades isolation for fewer spawns.  Dead or misbehaving workers are
+discarded and replaced by the periodic health check.
+
+A worker's system prompt is fixed by ``--system-prompt`` when it is spawned,
+so idle workers are kept per prompt and a request only takes a worker started
+with its own prompt.  The pool is pre-filled with default-prompt workers; a
+recycled worker is replaced by one for the same prompt, so repeated prompts
+(titles, classification) stay warm.  At most ``max_workers`` requests hold a
+worker at once; further requests wait for a slot instead of spawning more CLI
+processes.
+
+Uses ``asyncio.create_subprocess_exec``, so it is only enabled off Windows
+(see ``ClaudeCodeProvider``).
+"""
+
+import asyncio
+import json
+import logging
+import time
+from collections import deque
+from collections.abc import AsyncIterator
+
+logger = logging.getLogger(__name__)
+
+# stream-json lines can carry whole responses; raise asyncio's 64 KiB default.
+_STREAM_LIMIT = 4 * 1024 * 1024
+
+# stderr is drained continuously (a full pipe would block the CLI); keep the
+# last few chunks for error messages.
+_STDERR_TAIL_CHUNKS = 16
+
+
+class WorkerPoolError(Exception):
+    """The pool could not serve a request; callers fall back to a one-shot CLI."""
+
+
+def worker_command(cli: str, system_prompt: str | None = None) -> list[str]:
+    cmd = [
+        cli, "--print",
+        "--input-format", "stream-json",
+        "--output-format", "stream-json",
+        "--max-turns", "1",
+        "--verbose",
+    ]
+    if system_prompt:
+        cmd.extend(["--system-prompt", system_prompt])
+    return cmd
+
+
+def format_user_message(message: str) -> bytes:
+    payload = {
+        "type": "user",
+        "message": {"role": "user", "content": [{"type": "text", "text": message}]},
+    }
+    return (json.dumps(payload) + "\n").encode("utf-8")
+
+
+def parse_stream_event(event: dict) -> tuple[str | None, bool]:
+    """Return ``(text_delta, is_final)`` for one stream-json event."""
+    event_type = event.get("type", "")
+    if event_type == "content_block_delta":
+        delta = event.get("delta", {})
+        if delta.get("type") == "text_delta":
+            return delta.get("text") or None, False
+    elif event_type == "result":
+        return event.get("result") or None, True
+    return None, False
+
+
+class _Worker:
+    def __init__(self, proc: asyncio.subprocess.Process, system_prompt: str | None = None):
+        self.proc = proc
+        self.system_prompt = system_prompt
+        self.requests = 0
+        self.started_at = time.monotonic()
+        self.idle_since = self.started_at
+        self._stderr_tail: deque[bytes] = deque(maxlen=_STDERR_TAIL_CHUNKS)
+        self._stderr_task = asyncio.create_task(self._drain_stderr()) if proc.stderr else None
+
+    @property
+    def alive(self) -> bool:
+        return self.proc.returncode is None
+
+    async def _drain_stderr(self) -> None:
+        while chunk := await self.proc.stderr.read(4096):
+            self._stderr_tail.append(chunk)
+
+    async def stderr_text(self) -> str:
+        """The tail of stderr once the worker has exited (waits briefly for EOF)."""
+        if self._stderr_task:
+            try:
+                await asyncio.wait_for(asyncio.shield(self._stderr_task), timeout=1)
+            except asyncio.TimeoutError:
+                pass
+        return b"".join(self._stderr_tail).decode("utf-8", "replace")
+
+    async def stop(self) -> None:
+        if self._stderr_task:
+            self._stderr_task.cancel()
+        if self.alive:
+            try:
+                self.proc.kill()
+            except ProcessLookupError:
+                pass
+        try:
+            await asyncio.wait_for(self.proc.wait(), timeout=5)
+        except (asyncio.TimeoutError, ProcessLookupError):
+            pass
+
+
+class ClaudeCodeWorkerPool:
+    """Keep warm CLI workers and hand them out one request at a time."""
+
+    def __init__(
+        self,
+        cli_path: str,
+        size: int = 2,
+        max_requests: int = 1,
+        max_workers: int = 4,
+        request_timeout: float = 180.0,
+        health_interval: float = 30.0,
+    ):
+        self.cli_path = cli_path
+        self.size = size
+        self.max_requests = max(1, max_requests)
+        self.max_workers = max(1, max_workers)
+        self.request_timeout = request_timeout
+        self.health_interval = health_interval
+        self._idle: dict[str | None, list[_Worker]] = {}
+        self._busy = 0
+        self._slots = asyncio.Semaphore(self.max_workers)
+        self._waiting = 0
+        self._pending_spawns: set[asyncio.Task] = set()
+        self._monitor: asyncio.Task | None = None
+        self._closed = False
+        self.spawned = 0
+        self.recycled = 0
+        self.failures = 0
+        self.cold_starts = 0
+        self.queued = 0
+        self.requests = 0
+
+    # --- lifecycle ---
+
+    async def start(self) -> None:
+        await asyncio.gather(*(self._spawn_idle() for _ in range(self.size)))
+        if self.health_interval > 0:
+            self._monitor = asyncio.create_task(self._monitor_loop(), name="claude-code-pool")
+        logger.info("Claude Code worker pool started (%d workers)", self._idle_count())
+
+    async def close(self) -> None:
+        self._closed = True
+        if self._monitor:
+            self._monitor.cancel()
+        for task in list(self._pending_spawns):
+            task.cancel()
+        idle = [w for workers in self._idle.values() for w in workers]
+        self._idle = {}
+        await asyncio.gather(*(w.stop() for w in idle), return_exceptions=True)
+
+    def _idle_count(self) -> int:
+        return sum(len(workers) for workers in self._idle.values())
+
+    async def _spawn(self, system_prompt: str | None = None) -> _Worker:
+        proc = await asyncio.create_subprocess_exec(
+            *worker_command(self.cli_path, system_prompt),
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            limit=_STREAM_LIMIT,
+        )
+        self.spawned += 1
+        return _Worker(proc, system_prompt)
+
+    async def _spawn_idle(self, system_prompt: str | None = None) -> None:
+        try:
+            worker = await self._spawn(system_prompt)
+        except OSError:
+            self.failures += 1
+            logger.warning("Failed to spawn Claude Code worker", exc_info=True)
+            return
+        if self._closed:
+            await worker.stop()
+        else:
+            self._idle.setdefault(system_prompt, []).append(worker)
+
+    async def _evict_idle(self, keep: str | None) -> bool:
+        """Stop the longest-idle worker started with a prompt other than *keep*."""
+        others = [w for prompt, workers in self._idle.items() if prompt != keep for w in workers]
+        if not others:
+            return False
+        victim = min(others, key=lambda w: w.idle_since)
+        self._take_idle(victim)
+        await victim.stop()
+        return True
+
+    def _take_idle(self, worker: _Worker) -> None:
+        workers = self._idle[worker.system_prompt]
+        workers.remove(worker)
+        if not workers:
+            del self._idle[worker.system_prompt]
+
+    def _replenish(self, system_prompt: str | None = None) -> None:
+        """Top the idle workers back up to ``size`` in the background."""
+        missing = self.size - self._idle_count() - self._busy - len(self._pending_spawns)
+        for _ in range(max(0, missing)):
+            task = asyncio.create_task(self._spawn_idle(system_prompt))
+            self._pending_spawns.add(task)
+            task.add_done_callback(self._pending_spawns.discard)
+
+    async def health_check(self) -> dict:
+        """Drop workers that exited on their own and refill the pool."""
+        dead = [w for workers in self._idle.values() for w in workers if not w.alive]
+        if dead:
+            for worker in dead:
+                self._take_idle(worker)
+            self.failures += len(dead)
+            await asyncio.gather(*(w.stop() for w in dead), return_exceptions=True)
+            logger.warning("Replaced %d dead Claude Code worker(s)", len(dead))
+        if not self._closed:
+            self._replenish()
+        return self.snapshot()
+
+    async def _monitor_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.health_interval)
+            try:
+                await self.health_check()
+            except Exception:
+                logger.exception("Claude Code pool health check failed")
+
+    # --- checkout ---
+
+    async def _acquire(self, system_prompt: str | None) -> _Worker:
+        """Take an idle worker for *system_prompt*; the caller holds a slot."""
+        while workers := self._idle.get(system_prompt):
+            worker = workers.pop()
+            if not workers:
+                del self._idle[system_prompt]
+            if worker.alive:
+                self._busy += 1
+                return worker
+            self.failures += 1
+            await worker.stop()
+        # No warm worker for this prompt: start one (bounded by the slots).
+        self.cold_starts += 1
+        try:
+            worker = await self._spawn(system_prompt)
+        except OSError as exc:
+            self.failures += 1
+            raise WorkerPoolError(f"Cannot start Claude Code worker: {exc}") from exc
+        self._busy += 1
+        return worker
+
+    async def _release(self, worker: _Worker, healthy: bool) -> None:
+        self._busy -= 1
+        worker.requests += 1
+        self.requests += 1
+        if healthy and worker.alive and worker.requests < self.max_requests and not self._closed:
+            worker.idle_since = time.monotonic()
+            self._idle.setdefault(worker.system_prompt, []).append(worker)
+            return
+        if not healthy:
+            self.failures += 1
+        else:
+            self.recycled += 1
+        await worker.stop()
+        if self._closed:
+            return
+        # Replace it with a worker for the same prompt, displacing the
+        # longest-idle worker of another prompt if the pool is full.
+        if (
+            worker.system_prompt not in self._idle
+            and self._idle_count() + self._busy + len(self._pending_spawns) >= self.size
+        ):
+            await self._evict_idle(keep=worker.system_prompt)
+        self._replenish(worker.system_prompt)
+
+    # --- requests ---
+
+    async def stream(self, message: str, system_prompt: str | None = None) -> AsyncIterator[str]:
+        """Yield text deltas for one request; raises ``WorkerPoolError`` on failure."""
+        if self._slots.locked():
+            self.queued += 1
+        self._waiting += 1
+        try:
+            await self._slots.acquire()
+        finally:
+            self._waiting -= 1
+        tokens = self._stream_on_worker(message, system_prompt)
+        try:
+            async for text in tokens:
+                yield text
+        finally:
+            # Close explicitly so an abandoned stream frees its worker now, not at GC.
+            await tokens.aclose()
+            self._slots.release()
+
+    async def _stream_on_worker(self, message: str, system_prompt: str | None) -> AsyncIterator[str]:
+        worker = await self._acquire(system_prompt)
+        healthy = False
+        streamed = False
+        try:
+            try:
+                worker.proc.stdin.write(format_user_message(message))
+                await worker.proc.stdin.drain()
+            except (BrokenPipeError, ConnectionResetError) as exc:
+                raise WorkerPoolError("Claude Code worker exited before accepting input") from exc
+
+            while True:
+                try:
+                    line = await asyncio.wait_for(
+                        worker.proc.stdout.readline(), timeout=self.request_timeout
+                    )
+                except asyncio.TimeoutError as exc:
+                    raise WorkerPoolError("Claude Code worker timed out") from exc
+                if not line:
+                    stderr = await worker.stderr_text()
+                    raise WorkerPoolError(stderr[-200:] or "Claude Code worker exited")
+                decoded = line.decode("utf-8", "replace").strip()
+                if not decoded:
+                    continue
+                try:
+                    event = json.loads(decoded)
+                except json.JSONDecodeError:
+                    continue
+                text, final = parse_stream_event(event)
+                if final:
+                    healthy = not event.get("is_error", False)
+                    if not healthy:
+                        raise WorkerPoolError(str(text or "Claude Code returned an error"))
+                    if text and not streamed:
+                        yield text
+                    return
+                if text:
+                    streamed = True
+                    yield text
+        finally:
+            # Cancelled or abandoned mid-response: the worker's session is in an
+            # unknown state, so it is killed rather than reused.
+            await self._release(worker, healthy)
+
+    async def run(self, message: str, system_prompt: str | None = None) -> str:
+        parts = [token async for token in self.stream(message, system_prompt)]
+        return "".join(parts).strip()
+
+    def snapshot(self) -> dict:
+        return {
+            "size": self.size,
+            "idle": self._idle_count(),
+            "idle_prompts": len(self._idle),
+            "busy": self._busy,
+            "waiting": self._waiting,
+            "max_workers": self.max_workers,
+            "max_requests": self.max_requests,
+            "requests": self.requests,
+            "spawned": self.spawned,
+            "recycled": self.recycled,
+            "cold_starts": self.cold_starts,
+            "queued": self.queued,
+            "failures": self.failures,
+        }
@@ -14,6 +14,7 @@ from queue import Empty, Queue
 from typing import Optional
 
 from exceptions import AIUnavailableError
+from services.claude_code_pool import ClaudeCodeWorkerPool, WorkerPoolError
 
 logger = logging.getLogger(__name__)
 
@@ -68,7 +69,22 @@ def _run_cli_sync(cmd: list[str], timeout: int = 120) -> subprocess.CompletedPro
     )
 
 
-def _stream_cli_lines(cmd: list[str], queue: Queue, timeout: int = 180):
+# asyncio subprocesses need a loop with child-process support; on Windows the
+# SelectorEventLoop lacks it, so the thread-based reader is used there.
+USE_ASYNCIO_SUBPROCESS = sys.platform.startswith("linux")
+
+# stream-json lines can carry whole responses; raise asyncio's 64 KiB default.
+_STREAM_LIMIT = 4 * 1024 * 1024
+
+
+class _CLIExitError(Exception):
+    def __init__(self, returncode: int, stderr: str):
+        super().__init__(returncode, stderr)
+        self.returncode = returncode
+        self.stderr = stderr
+
+
+def _stream_cli_lines(cmd: list[str], queue: Queue, timeout: int = 180, procs: list | None = None):
     """Run CLI and push stdout lines to a queue. Runs in a thread."""
     try:
         proc = subprocess.Popen(
@@ -79,6 +95,8 @@ def _stream_cli_lines(cmd: list[str], queue: Queue, timeout: int = 180):
             encoding="utf-8",
             errors="replace",
         )
+        if procs is not None:
+            procs.append(proc)
         for line in proc.stdout:
             queue.put(("line", line.rstrip()))
         proc.wait()
@@ -91,15 +109,134 @@ def _stream_cli_lines(cmd: list[str], queue: Queue, timeout: int = 180):
         queue.put(("done", None))
 
 
+async def iter_cli_lines_thread(cmd: list[str]) -> AsyncIterator[str]:
+    """Yield stdout lines from *cmd* via a reader thread and a polled queue."""
+    queue: Queue = Queue()
+    procs: list[subprocess.Popen] = []
+    thread = threading.Thread(
+        target=_stream_cli_lines, args=(cmd, queue), kwargs={"procs": procs}, daemon=True
+    )
+    thread.start()
+    try:
+        while True:
+            # Poll the queue, yielding control to the event loop between checks
+            try:
+                kind, data = await asyncio.to_thread(queue.get, True, 0.1)
+            except Empty:
+                continue
+
+            if kind == "done":
+                break
+            if kind == "error":
+                raise _CLIExitError(*data)
+            if kind == "line":
+                yield data
+    finally:
+        for proc in procs:
+            if proc.poll() is None:
+                proc.kill()
+        thread.join(timeout=5)
+
+
+async def iter_cli_lines_asyncio(cmd: list[str]) -> AsyncIterator[str]:
+    """Yield stdout lines from *cmd* as they arrive, without a helper thread.
+
+    The child is killed if the consumer stops early (client disconnect,
+    task cancellation).
+    """
+    try:
+        proc = await asyncio.create_subprocess_exec(
+            *cmd,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            limit=_STREAM_LIMIT,
+        )
+    except OSError as exc:
+        raise _CLIExitError(1, str(exc)) from exc
+
+    # Drain stderr concurrently so a chatty child can't block on a full pipe.
+    stderr_task = asyncio.create_task(proc.stderr.read())
+    try:
+        while True:
+            line = await proc.stdout.readline()
+            if not line:
+                break
+            yield line.decode("utf-8", "replace").rstrip()
+        returncode = await proc.wait()
+        if returncode != 0:
+            stderr = (await stderr_task).decode("utf-8", "replace")
+            raise _CLIExitError(returncode, stderr)
+    finally:
+        if proc.returncode is None:
+            try:
+                proc.kill()
+            except ProcessLookupError:
+                pass
+            await proc.wait()
+        if not stderr_task.done():
+            stderr_task.cancel()
+
+
+def iter_cli_lines(cmd: list[str]) -> AsyncIterator[str]:
+    if USE_ASYNCIO_SUBPROCESS:
+        return iter_cli_lines_asyncio(cmd)
+    return iter_cli_lines_thread(cmd)
+
+
 class ClaudeCodeProvider:
     """Wraps the `claude` CLI as an AI provider for ClawChat.
 
-    Uses subprocess.run / subprocess.Popen (via threads) to avoid
-    Windows SelectorEventLoop incompatibility with asyncio subprocesses.
+    Streaming uses asyncio subprocesses on Linux; elsewhere it falls back to
+    subprocess.Popen in a thread to avoid Windows SelectorEventLoop
+    incompatibility with asyncio subprocesses.
     """
 
     def __init__(self):
         self._cli_path: Optional[str] = None
+        self._pool_config: Optional[dict] = None
+        self._pool: Optional[ClaudeCodeWorkerPool] = None
+        self._pool_lock = asyncio.Lock()
+
+    # --- Warm worker pool ---
+
+    def configure_pool(
+        self,
+        size: int,
+        max_requests: int = 1,
+        max_workers: int = 4,
+        health_interval: float = 30.0,
+    ) -> None:
+        """Serve requests from a pool of pre-spawned CLI workers.
+
+        Ignored on Windows, where the default event loop cannot drive asyncio
+        subprocesses; every call then spawns its own CLI as before.
+        """
+        if size <= 0 or sys.platform == "win32":
+            self._pool_config = None
+            return
+        self._pool_config = {
+            "size": size,
+            "max_requests": max_requests,
+            "max_workers": max_workers,
+            "health_interval": health_interval,
+        }
+
+    async def start_pool(self) -> Optional[ClaudeCodeWorkerPool]:
+        """Start the configured pool if it isn't running yet."""
+        if not self._pool_config:
+            return None
+        async with self._pool_lock:
+            if self._pool is None:
+                cli = self._cli_path or _find_claude_cli()
+                if not cli:
+                    return None
+                pool = ClaudeCodeWorkerPool(cli, **self._pool_config)
+                await pool.start()
+                self._pool = pool
+        return self._pool
+
+    def pool_stats(self) -> Optional[dict]:
+        return self._pool.snapshot() if self._pool else None
 
     async def check_availability(self) -> tuple[ClaudeCodeStatus, Optional[str]]:
         """Check if claude CLI is installed.
@@ -134,9 +271,11 @@ class ClaudeCodeProvider:
         session_id: Optional[str] = None,
         system_prompt: Optional[str] = None,
     ) -> AsyncIterator[str]:
-        """Stream a response from Claude Code CLI.
+        """Stream a response from Claude Code CLI and yield text deltas.
 
-        Uses subprocess.Popen in a thread and yields text deltas.
+        Uses a pooled worker when available, otherwise a one-shot CLI read
+        through ``iter_cli_lines`` (asyncio subprocess on Linux, reader
+        thread elsewhere).
         """
         cli = self._cli_path or _find_claude_cli()
         if not cli:
@@ -146,6 +285,19 @@ class ClaudeCodeProvider:
                 recoverable=False,
             )
 
+        pool = await self.start_pool() if session_id is None else None
+        if pool:
+            streamed = False
+            try:
+                async for token in pool.stream(message, system_prompt):
+                    streamed = True
+                    yield token
+                return
+            except WorkerPoolError as exc:
+                if streamed:
+                    raise AIUnavailableError(f"Claude Code worker failed mid-response: {exc}") from exc
+                logger.warning("Claude Code pool unavailable (%s); spawning one-shot CLI", exc)
+
         cmd = [
             cli, "--print",
             "--output-format", "stream-json",
@@ -158,50 +310,37 @@ class ClaudeCodeProvider:
 
         cmd.extend(["-p", message])
 
-        queue: Queue = Queue()
-        thread = threading.Thread(target=_stream_cli_lines, args=(cmd, queue), daemon=True)
-        thread.start()
-
+        lines = iter_cli_lines(cmd)
         has_streamed = False
         try:
-            while True:
-                # Poll the queue, yielding control to the event loop between checks
-                try:
-                    kind, data = await asyncio.to_thread(queue.get, True, 0.1)
-                except Empty:
+            async for line in lines:
+                decoded = line.strip()
+                if not decoded:
                     continue
-
-                if kind == "done":
-                    break
-                if kind == "error":
-                    rc, stderr = data
-                    mapped = self.map_error(rc, stderr)
-                    raise mapped
-                if kind == "line":
-                    decoded = data.strip()
-                    if not decoded:
-                        continue
-                    try:
-                        event = json.loads(decoded)
-                        event_type = event.get("type", "")
-                        if event_type == "content_block_delta":
-                            delta = event.get("delta", {})
-                            if delta.get("type") == "text_delta":
-                                text = delta.get("text", "")
-                                if text:
-                                    has_streamed = True
-                                    yield text
-                        elif event_type == "result":
-                            if not has_streamed:
-                                result_text = event.get("result", "")
-                                if result_text:
-                                    yield result_text
-                    except json.JSONDecodeError:
-                        if decoded:
-                            has_streamed = True
-                            yield decoded
+                try:
+                    event = json.loads(decoded)
+                    event_type = event.get("type", "")
+                    if event_type == "content_block_delta":
+                        delta = event.get("delta", {})
+                        if delta.get("type") == "text_delta":
+                            text = delta.get("text", "")
+                            if text:
+                                has_streamed = True
+                                yield text
+                    elif event_type == "result":
+                        if not has_streamed:
+                            result_text = event.get("result", "")
+                            if result_text:
+                                yield result_text
+                except json.JSONDecodeError:
+                    if decoded:
+                        has_streamed = True
+                        yield decoded
+        except _CLIExitError as exc:
+            raise self.map_error(exc.returncode, exc.stderr) from exc
         finally:
-            thread.join(timeout=5)
+            # Kills the child if we stopped early.
+            await lines.aclose()
 
     def map_error(self, return_code: int, stderr: str) -> ClaudeCodeError:
         """Map CLI errors to structured error types."""
@@ -245,6 +384,13 @@ class ClaudeCodeProvider:
         if not cli:
             raise AIUnavailableError("Claude Code CLI not found")
 
+        pool = await self.start_pool()
+        if pool:
+            try:
+                return await pool.run(prompt, system_prompt)
+            except WorkerPoolError as exc:
+                logger.warning("Claude Code pool unavailable (%s); spawning one-shot CLI", exc)
+
         cmd = [
             cli, "--print",
             "--output-format", "text",
@@ -360,6 +506,7 @@ class ClaudeCodeProvider:
         except (json.JSONDecodeError, Exception) as exc:
             logger.warning("Claude Code function_call JSON parse failed: %s", exc)
             return {
+                "fallback": True,
                 "choices": [{
                     "message": {
                         "tool_calls": [{
@@ -373,5 +520,7 @@ class ClaudeCodeProvider:
             }
 
     async def close(self):
-        """No-op — thread-based subprocesses clean up automatically."""
-        pass
+        """Stop pooled workers; one-shot subprocesses clean up automatically."""
+        if self._pool:
+            await self._pool.close()
+            self._pool = None
@@ -0,0 +1,167 @@
+"""Conversation list queries.
+
+The list is the app's launch screen, so a page is always one statement:
+
+- ``denormalized`` (default) reads ``conversations.last_message_preview`` and
+  ``last_message_at``, which triggers on ``messages`` keep current.
+- otherwise the newest message per conversation on the page is picked with
+  ``ROW_NUMBER() OVER (PARTITION BY conversation_id ...)`` — no extra columns
+  needed, at the cost of touching the page's messages.
+
+In page mode both carry the total as a window count, so no separate COUNT
+query is needed unless the page is past the end.  With a ``cursor`` the page
+is a keyset seek on ``(updated_at, id)`` instead of an OFFSET, and the total
+is skipped unless ``include_total`` asks for it.
+
+``Conversation.messages`` is never loaded implicitly; ``get_conversation``
+takes ``with_messages=True`` for the callers that want the whole history.
+"""
+
+from sqlalchemy import and_, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from models.conversation import Conversation
+from models.message import Message
+from schemas.chat import ConversationResponse
+from utils.pagination import after_cursor, order_by_key, page_rows
+
+PREVIEW_LENGTH = 100
+
+_BASE_COLUMNS = (
+    Conversation.id,
+    Conversation.title,
+    Conversation.created_at,
+    Conversation.updated_at,
+    Conversation.is_archived,
+    Conversation.project_todo_id,
+)
+
+
+async def get_conversation(
+    db: AsyncSession, conversation_id: str, *, with_messages: bool = False
+) -> Conversation | None:
+    """Fetch a conversation; its full message history only when asked for."""
+    if not with_messages:
+        return await db.get(Conversation, conversation_id)
+    # populate_existing: the loader option must apply even if the
+    # conversation is already in the session's identity map
+    return await db.get(
+        Conversation,
+        conversation_id,
+        options=[selectinload(Conversation.messages)],
+        populate_existing=True,
+    )
+
+
+_ORDER = order_by_key(Conversation.updated_at, Conversation.id, descending=True)
+
+
+def _page_query(columns: list, conditions: list, offset: int, limit: int, with_total: bool):
+    if with_total:
+        columns = [*columns, func.count().over().label("total")]
+    return (
+        select(*columns)
+        .where(*conditions)
+        .order_by(*_ORDER)
+        .offset(offset)
+        .limit(limit)
+    )
+
+
+def _denormalized_query(conditions: list, offset: int, limit: int, with_total: bool):
+    return _page_query(
+        [
+            *_BASE_COLUMNS,
+            Conversation.last_message_preview.label("last_message"),
+            Conversation.last_message_at,
+        ],
+        conditions,
+        offset,
+        limit,
+        with_total,
+    )
+
+
+def _windowed_query(conditions: list, offset: int, limit: int, with_total: bool):
+    page = _page_query(list(_BASE_COLUMNS), conditions, offset, limit, with_total).subquery("page")
+    ranked = (
+        select(
+            Message.conversation_id,
+            Message.content,
+            Message.created_at,
+            func.row_number()
+            .over(
+                partition_by=Message.conversation_id,
+                order_by=(Message.created_at.desc(), Message.id.desc()),
+            )
+            .label("rank"),
+        )
+        .where(Message.conversation_id.in_(select(page.c.id)))
+        .subquery("ranked")
+    )
+    return (
+        select(
+            page.c.id,
+            page.c.title,
+            page.c.created_at,
+            page.c.updated_at,
+            page.c.is_archived,
+            page.c.project_todo_id,
+            func.substr(ranked.c.content, 1, PREVIEW_LENGTH).label("last_message"),
+            ranked.c.created_at.label("last_message_at"),
+            *([page.c.total] if with_total else []),
+        )
+        .outerjoin(ranked, and_(ranked.c.conversation_id == page.c.id, ranked.c.rank == 1))
+        .order_by(page.c.updated_at.desc(), page.c.id.desc())
+    )
+
+
+async def list_conversations(
+    db: AsyncSession,
+    *,
+    archived: bool = False,
+    project_todo_id: str | None = None,
+    page: int = 1,
+    limit: int = 20,
+    cursor: str | None = None,
+    include_total: bool = False,
+    denormalized: bool = True,
+) -> tuple[list[ConversationResponse], int | None, str | None]:
+    """Return ``(items, total, next_cursor)``; ``total`` is None for cursor pages."""
+    conditions = [Conversation.is_archived == archived]
+    if project_todo_id is not None:
+        conditions.append(Conversation.project_todo_id == project_todo_id)
+
+    build = _denormalized_query if denormalized else _windowed_query
+    if cursor:
+        seek = after_cursor(Conversation.updated_at, Conversation.id, cursor, descending=True)
+        query = build([*conditions, seek], 0, limit + 1, with_total=False)
+    else:
+        query = build(conditions, (page - 1) * limit, limit + 1, with_total=True)
+    rows, next_cursor = page_rows((await db.execute(query)).all(), limit, "updated_at")
+
+    if cursor and not include_total:
+        total = None
+    elif rows and not cursor:
+        total = rows[0].total
+    elif page > 1 or cursor:
+        count_q = select(func.count(Conversation.id)).where(*conditions)
+        total = (await db.execute(count_q)).scalar() or 0
+    else:
+        total = 0
+
+    items = [
+        ConversationResponse(
+            id=row.id,
+            title=row.title,
+            created_at=row.created_at,
+            updated_at=row.updated_at,
+            is_archived=row.is_archived,
+            last_message=row.last_message,
+            last_message_at=row.last_message_at,
+            project_todo_id=row.project_todo_id,
+        )
+        for row in rows
+    ]
+    return items, total, next_cursor
@@ -0,0 +1,164 @@
+"""Local text embeddings for semantic search (optional, needs numpy).
+
+``EMBEDDING_MODEL=hashing`` (the default) is a dependency-free hashing
+vectorizer: words and character trigrams are hashed into
+``EMBEDDING_DIM`` signed buckets, so inflections and partial words
+("cleaning" / "cleanings", "dentist" / "dental") land close together.
+Any other value names a sentence-transformers model (for example
+``all-MiniLM-L6-v2``), run on CPU.  It catches true paraphrases
+("dentist" / "teeth cleaning") if that package is installed.
+
+The index is opened once per process (``open_index``).  ``embedding_worker``
+fills it and ``search_service`` queries it.  Without numpy, or with
+``EMBEDDING_ENABLED=false``, ``get_index`` returns ``None`` and search stays
+keyword-only.
+"""
+
+import asyncio
+import hashlib
+import logging
+import re
+import zlib
+from functools import lru_cache
+
+from config import settings
+from services.vector_index import VectorHit, VectorIndex
+
+try:
+    import numpy as np
+except ImportError:  # optional: pip install numpy
+    np = None
+
+logger = logging.getLogger(__name__)
+
+_WORD = re.compile(r"\w+")
+_STOPWORDS = frozenset(
+    "a an and are as at be by for from has have i in is it my of on or that the "
+    "this to was were will with you your".split()
+)
+_TRIGRAM_WEIGHT = 0.5
+
+_index: VectorIndex | None = None
+_embedder = None
+
+
+def available() -> bool:
+    return np is not None
+
+
+def text_digest(text: str) -> str:
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()[:16]
+
+
+@lru_cache(maxsize=65536)
+def _bucket(feature: str, dim: int) -> tuple[int, float]:
+    h = zlib.crc32(feature.encode("utf-8"))
+    return (h >> 1) % dim, 1.0 if h & 1 else -1.0
+
+
+class HashingEmbedder:
+    """Signed feature hashing over words and character trigrams."""
+
+    def __init__(self, dim: int):
+        self.name = "hashing"
+        self.dim = dim
+
+    def _features(self, text: str):
+        for word in _WORD.findall(text.lower()):
+            if word in _STOPWORDS:
+                continue
+            yield word, 1.0
+            padded = f"#{word}#"
+            for i in range(len(padded) - 2):
+                yield padded[i:i + 3], _TRIGRAM_WEIGHT
+
+    def embed(self, texts: list[str]) -> "np.ndarray":
+        out = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for feature, weight in self._features(text):
+                bucket, sign = _bucket(feature, self.dim)
+                out[row, bucket] += sign * weight
+        norms = np.linalg.norm(out, axis=1, keepdims=True)
+        return out / np.where(norms > 0, norms, 1.0)
+
+
+class SentenceTransformerEmbedder:
+    """A sentence-transformers model on CPU (``pip install sentence-transformers``)."""
+
+    def __init__(self, model: str):
+        from sentence_transformers import SentenceTransformer
+
+        self.name = model
+        self._model = SentenceTransformer(model, device="cpu")
+        self.dim = self._model.get_sentence_embedding_dimension()
+
+    def embed(self, texts: list[str]) -> "np.ndarray":
+        return self._model.encode(
+            texts, normalize_embeddings=True, convert_to_numpy=True
+        ).astype(np.float32)
+
+
+def get_embedder():
+    global _embedder
+    if _embedder is None:
+        if settings.embedding_model == "hashing":
+            _embedder = HashingEmbedder(settings.embedding_dim)
+        else:
+            _embedder = SentenceTransformerEmbedder(settings.embedding_model)
+    return _embedder
+
+
+def open_index() -> VectorIndex | None:
+    """Open (or create) the on-disk index; ``None`` when semantic search is off."""
+    global _index
+    if _index is not None or not settings.embedding_enabled:
+        return _index
+    if not available():
+        logger.warning(
+            "EMBEDDING_ENABLED is set but numpy is not installed — semantic search "
+            "disabled. Install with: pip install numpy"
+        )
+        return None
+    try:
+        embedder = get_embedder()
+    except ImportError:
+        logger.warning(
+            "sentence-transformers not installed — semantic search disabled. "
+            "Install with: pip install sentence-transformers, or set EMBEDDING_MODEL=hashing"
+        )
+        return None
+    _index = VectorIndex(
+        settings.embedding_index_dir,
+        embedder.dim,
+        embedder.name,
+        ivf_min_rows=settings.embedding_ivf_min_rows,
+        nprobe=settings.embedding_ivf_nprobe,
+    )
+    logger.info("Vector index opened: %d rows (%s)", len(_index), embedder.name)
+    return _index
+
+
+def get_index() -> VectorIndex | None:
+    return _index
+
+
+def close_index() -> None:
+    global _index, _embedder
+    if _index is not None:
+        _index.close()
+    _index = None
+    _embedder = None
+
+
+async def embed(texts: list[str]) -> "np.ndarray":
+    return await asyncio.to_thread(get_embedder().embed, texts)
+
+
+async def query(text: str, kinds: list[str] | None, k: int) -> list[VectorHit]:
+    """Nearest rows to *text* scoring at least ``EMBEDDING_MIN_SCORE``."""
+    index = get_index()
+    if index is None or not text.strip():
+        return []
+    vector = (await embed([text]))[0]
+    hits = await asyncio.to_thread(index.query, vector, k, kinds)
+    return [h for h in hits if h.score >= settings.embedding_min_score]
@@ -0,0 +1,215 @@
+"""Background worker that keeps the vector index in step with the database.
+
+Writes never embed anything themselves.  The worker follows ``change_log``
+(the same trigger-fed log that serves delta sync) from a cursor stored in
+the index, so it sees every insert, update and delete of messages, todos
+and events, including raw-SQL ones.  A row is re-embedded only when its
+indexed text changed (completing a todo costs a digest comparison).  A
+cursor the log can no longer answer (first run, pruned log, restored
+database) triggers a full pass instead.
+
+When a vault is configured, its Markdown notes are rescanned every
+``OBSIDIAN_SCAN_INTERVAL_MINUTES``; files are re-read only when their
+mtime or size changed.
+"""
+
+import asyncio
+import logging
+import os
+import time
+
+from sqlalchemy import bindparam, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from config import settings
+from database import SEARCH_INDEXED_COLUMNS
+from services import embedding_service, sync_service
+from services.vector_index import VectorIndex, VectorItem
+
+logger = logging.getLogger(__name__)
+
+# change_log entity -> index kind (the search hit type)
+KINDS = {"messages": "message", "todos": "todo", "events": "event"}
+NOTE_KIND = "note"
+
+_CURSOR_KEY = "change_seq"
+_MAX_TEXT_CHARS = 8000
+_NOTE_PREVIEW_CHARS = 200
+
+
+def _row_text(table: str, row) -> str:
+    parts = (getattr(row, col) for col in SEARCH_INDEXED_COLUMNS[table])
+    return "\n".join(p for p in parts if p)[:_MAX_TEXT_CHARS]
+
+
+class EmbeddingWorker:
+    def __init__(self, session_factory: async_sessionmaker[AsyncSession], index: VectorIndex):
+        self.session_factory = session_factory
+        self.index = index
+        self._task: asyncio.Task | None = None
+        self._last_vault_scan = 0.0
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._loop(), name="embedding-worker")
+        logger.info("Embedding worker started")
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _loop(self) -> None:
+        try:
+            while True:
+                try:
+                    busy = await self.run_once()
+                except Exception:
+                    logger.exception("Error in embedding worker")
+                    busy = False
+                if not busy:
+                    await asyncio.sleep(settings.embedding_interval_seconds)
+        except asyncio.CancelledError:
+            logger.debug("Embedding worker cancelled")
+
+    async def run_once(self) -> bool:
+        """Process one batch; True when more changes are already waiting."""
+        async with self.session_factory() as db:
+            head = await sync_service.current_seq(db)
+            cursor = self.index.get_meta(_CURSOR_KEY)
+            if cursor is None or not await sync_service.is_answerable(db, int(cursor), head):
+                await self._full_pass(db)
+                more = False
+                cursor = head
+            else:
+                cursor, more = await self._follow_log(db, int(cursor), head)
+        self.index.set_meta(_CURSOR_KEY, str(cursor))
+
+        interval = settings.obsidian_scan_interval_minutes * 60
+        if settings.obsidian_vault_path and time.monotonic() - self._last_vault_scan >= interval:
+            self._last_vault_scan = time.monotonic()
+            await self.scan_vault(settings.obsidian_vault_path)
+        return more
+
+    async def _follow_log(self, db: AsyncSession, cursor: int, head: int) -> tuple[int, bool]:
+        limit = settings.embedding_batch_size
+        rows = (await db.execute(
+            text("""
+                SELECT entity, entity_id, op, MAX(seq) AS seq
+                FROM change_log
+                WHERE seq > :since AND seq <= :head AND entity IN :entities
+                GROUP BY entity, entity_id
+                ORDER BY seq
+                LIMIT :limit
+            """).bindparams(bindparam("entities", expanding=True)),
+            {"since": cursor, "head": head, "entities": list(KINDS), "limit": limit + 1},
+        )).all()
+        more = len(rows) > limit
+        rows = rows[:limit]
+
+        changed: dict[str, list[str]] = {table: [] for table in KINDS}
+        for row in rows:
+            changed[row.entity].append(row.entity_id)
+        for table, ids in changed.items():
+            if ids:
+                await self._sync_rows(db, table, ids)
+        return (rows[-1].seq if more else head), more
+
+    async def _full_pass(self, db: AsyncSession) -> None:
+        for table in KINDS:
+            ids = (await db.execute(text(f"SELECT id FROM {table}"))).scalars().all()
+            known = await asyncio.to_thread(self.index.digests, KINDS[table])
+            gone = list(set(known) - set(ids))
+            if gone:
+                await asyncio.to_thread(self.index.remove, KINDS[table], gone)
+            for start in range(0, len(ids), settings.embedding_batch_size):
+                await self._sync_rows(db, table, ids[start:start + settings.embedding_batch_size], known)
+        logger.info("Embedding full pass done: %d rows", len(self.index))
+
+    async def _sync_rows(
+        self, db: AsyncSession, table: str, ids: list[str], known: dict[str, str] | None = None
+    ) -> None:
+        """Embed *ids* whose text changed; drop the ones no longer in *table*."""
+        kind = KINDS[table]
+        columns = ", ".join(SEARCH_INDEXED_COLUMNS[table])
+        rows = (await db.execute(
+            text(f"SELECT id, {columns} FROM {table} WHERE id IN :ids").bindparams(
+                bindparam("ids", expanding=True)
+            ),
+            {"ids": ids},
+        )).all()
+        if known is None:
+            known = await asyncio.to_thread(self.index.digests, kind)
+
+        pending = []
+        for row in rows:
+            body = _row_text(table, row)
+            digest = embedding_service.text_digest(body)
+            if known.get(row.id) != digest:
+                pending.append((row.id, body, digest))
+        await self._embed_and_store(kind, pending)
+
+        gone = list(set(ids) - {row.id for row in rows})
+        if gone:
+            await asyncio.to_thread(self.index.remove, kind, gone)
+
+    async def _embed_and_store(self, kind: str, pending: list[tuple]) -> None:
+        """Embed ``(ref, body, digest, *extras)`` tuples and store them."""
+        if not pending:
+            return
+        vectors = await embedding_service.embed([body for _ref, body, _digest, *_ in pending])
+        items = [
+            VectorItem(kind, ref, digest, vector, *rest)
+            for (ref, _body, digest, *rest), vector in zip(pending, vectors)
+        ]
+        await asyncio.to_thread(self.index.upsert, items)
+
+    async def scan_vault(self, vault_path: str) -> None:
+        notes = await asyncio.to_thread(_list_notes, vault_path)
+        known = await asyncio.to_thread(self.index.digests, NOTE_KIND)
+        gone = list(set(known) - set(notes))
+        if gone:
+            await asyncio.to_thread(self.index.remove, NOTE_KIND, gone)
+
+        stale = [(rel, digest, mtime) for rel, (digest, mtime) in notes.items() if known.get(rel) != digest]
+        for start in range(0, len(stale), settings.embedding_batch_size):
+            batch = stale[start:start + settings.embedding_batch_size]
+            bodies = await asyncio.to_thread(
+                lambda: [_read_note(os.path.join(vault_path, rel)) for rel, _d, _m in batch]
+            )
+            pending = [
+                (rel, body, digest, _note_title(rel), " ".join(body.split())[:_NOTE_PREVIEW_CHARS], mtime)
+                for (rel, digest, mtime), body in zip(batch, bodies)
+            ]
+            await self._embed_and_store(NOTE_KIND, pending)
+
+
+def _note_title(rel_path: str) -> str:
+    return os.path.splitext(os.path.basename(rel_path))[0]
+
+
+def _list_notes(vault_path: str) -> dict[str, tuple[str, float]]:
+    """``{relative path: (mtime:size digest, mtime)}`` for every Markdown note."""
+    notes: dict[str, tuple[str, float]] = {}
+    for root, dirs, files in os.walk(vault_path):
+        dirs[:] = [d for d in dirs if not d.startswith(".")]
+        for name in files:
+            if name.startswith(".") or not name.endswith(".md"):
+                continue
+            path = os.path.join(root, name)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            rel = os.path.relpath(path, vault_path).replace(os.sep, "/")
+            notes[rel] = (f"{st.st_mtime_ns}:{st.st_size}", st.st_mtime)
+    return notes
+
+
+def _read_note(path: str) -> str:
+    try:
+        with open(path, encoding="utf-8", errors="replace") as f:
+            return f.read(_MAX_TEXT_CHARS)
+    except OSError:
+        logger.debug("Could not read note: %s", path)
+        return ""
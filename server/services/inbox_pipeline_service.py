@@ -1,4 +1,8 @@
-"""Inbox pipeline — classifies and plans newly captured todos via AI."""
+"""Inbox pipeline — classifies and plans newly captured todos via AI.
+
+The pipeline holds its todo across LLM calls, so its writes go through
+``db_writer.save`` / ``db_writer.run`` and the session it is given only reads.
+"""
 
 import json
 import logging
@@ -6,10 +10,14 @@ from datetime import datetime, timezone
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from database import db_writer
 from models.todo import Todo
 from models.agent_task import AgentTask
 from services.ai_service import AIService
+from services.llm_scheduler import Priority, with_priority
 from services.obsidian_context_service import list_project_folders, resolve_project_folder
+from services import sync_service
+from services.project_service import project_cache
 from config import settings
 from utils import make_id, serialize_tags
 from ws.manager import ws_manager
@@ -21,13 +29,12 @@ logger = logging.getLogger(__name__)
 # ---------------------------------------------------------------------------
 
 
-async def _notify_todo_change():
-    await ws_manager.send_json("user", {
-        "type": "module_data_changed",
-        "data": {"module": "todos"},
-    })
+async def _notify_todo_change(db: AsyncSession):
+    project_cache.invalidate()
+    await ws_manager.send_json("user", await sync_service.change_notification(db, "todos"))
 
 
+@with_priority(Priority.BACKGROUND)
 async def process_todo(db: AsyncSession, ai_service: AIService, todo_id: str) -> None:
     """Run the inbox classification and optional planning pipeline for a todo."""
     todo = await db.get(Todo, todo_id)
@@ -38,7 +45,7 @@ async def process_todo(db: AsyncSession, ai_service: AIService, todo_id: str) ->
     try:
         # Step 1 — classify
         todo.inbox_state = "classifying"
-        await db.commit()
+        await db_writer.save(todo)
 
         classification = await _classify_todo(ai_service, todo)
 
@@ -73,24 +80,24 @@ async def process_todo(db: AsyncSession, ai_service: AIService, todo_id: str) ->
             word_count = len(task_text.split())
             if word_count < 30:
                 todo.inbox_state = "questioning"
-                await db.commit()
-                await _notify_todo_change()
+                await db_writer.save(todo)
+                await _notify_todo_change(db)
                 await _generate_clarification_questions(db, ai_service, todo)
             else:
                 todo.inbox_state = "planning"
-                await db.commit()
-                await _notify_todo_change()
+                await db_writer.save(todo)
+                await _notify_todo_change(db)
                 await _trigger_planning(db, ai_service, todo)
         else:
             todo.inbox_state = "captured"
-            await db.commit()
-            await _notify_todo_change()
+            await db_writer.save(todo)
+            await _notify_todo_change(db)
 
     except Exception as exc:
         logger.exception("Inbox pipeline failed for todo %s", todo_id)
         todo.inbox_state = "error"
         todo.automation_error = str(exc)
-        await db.commit()
+        await db_writer.save(todo)
 
 
 # ---------------------------------------------------------------------------
@@ -98,6 +105,7 @@ async def process_todo(db: AsyncSession, ai_service: AIService, todo_id: str) ->
 # ---------------------------------------------------------------------------
 
 
+@with_priority(Priority.BACKGROUND)
 async def resume_after_answers(db: AsyncSession, ai_service: AIService, todo_id: str) -> None:
     """Transition a todo from questioning to planning, using Q&A context."""
     todo = await db.get(Todo, todo_id)
@@ -107,15 +115,15 @@ async def resume_after_answers(db: AsyncSession, ai_service: AIService, todo_id:
 
     try:
         todo.inbox_state = "planning"
-        await db.commit()
-        await _notify_todo_change()
+        await db_writer.save(todo)
+        await _notify_todo_change(db)
         await _trigger_planning(db, ai_service, todo)
     except Exception as exc:
         logger.exception("Planning after answers failed for todo %s", todo_id)
         todo.inbox_state = "error"
         todo.automation_error = str(exc)
-        await db.commit()
-        await _notify_todo_change()
+        await db_writer.save(todo)
+        await _notify_todo_change(db)
 
 
 # ---------------------------------------------------------------------------
@@ -154,8 +162,8 @@ async def _generate_clarification_questions(
             ]
 
         todo.clarification_questions = json.dumps(questions)
-        await db.commit()
-        await _notify_todo_change()
+        await db_writer.save(todo)
+        await _notify_todo_change(db)
 
     except Exception:
         logger.exception("Failed to generate clarification questions for todo %s", todo.id)
@@ -166,8 +174,8 @@ async def _generate_clarification_questions(
             "Are there any deadlines or time constraints?",
         ]
         todo.clarification_questions = json.dumps(fallback)
-        await db.commit()
-        await _notify_todo_change()
+        await db_writer.save(todo)
+        await _notify_todo_change(db)
 
 
 # ---------------------------------------------------------------------------
@@ -295,8 +303,11 @@ async def _trigger_planning(db: AsyncSession, ai_service: AIService, todo: Todo)
         status="queued",
         skill_chain='["plan"]',
     )
-    db.add(agent_task)
-    await db.flush()
+
+    async def insert(session: AsyncSession) -> None:
+        session.add(agent_task)
+
+    await db_writer.run(insert)
 
     try:
         from services import todo_planning_service
@@ -307,8 +318,8 @@ async def _trigger_planning(db: AsyncSession, ai_service: AIService, todo: Todo)
         agent_task.completed_at = datetime.now(timezone.utc)
 
         todo.inbox_state = "plan_ready"
-        await db.commit()
-        await _notify_todo_change()
+        await db_writer.save(agent_task, todo)
+        await _notify_todo_change(db)
 
     except Exception as exc:
         logger.exception("Planning failed for todo %s", todo.id)
@@ -318,5 +329,5 @@ async def _trigger_planning(db: AsyncSession, ai_service: AIService, todo: Todo)
 
         todo.inbox_state = "error"
         todo.automation_error = str(exc)
-        await db.commit()
-        await _notify_todo_change()
+        await db_writer.save(agent_task, todo)
+        await _notify_todo_change(db)
@@ -2,7 +2,9 @@ import json
 import logging
 from dataclasses import dataclass, field
 
+from config import settings
 from services.ai_service import AIService
+from services.intent_fast_path import classify_local
 
 logger = logging.getLogger(__name__)
 
@@ -119,9 +121,36 @@ INTENT_TOOLS_SCHEMA = [
 class IntentResult:
     intent: str = "general_chat"
     params: dict = field(default_factory=dict)
+    confidence: float = 0.0
+    source: str = "llm"  # "rules" | "model" | "llm"
+
+
+def classify_intent_fast(message: str) -> IntentResult | None:
+    """Return the local fast-path result when it is confident enough, else None."""
+    if not settings.intent_fast_path_enabled:
+        return None
+    local = classify_local(message)
+    if local.confidence < settings.intent_fast_path_threshold:
+        return None
+    logger.debug("Intent fast path: %s (%.2f via %s)", local.intent, local.confidence, local.tier)
+    return IntentResult(
+        intent=local.intent,
+        params=local.params,
+        confidence=local.confidence,
+        source=local.tier,
+    )
 
 
 async def classify_intent(message: str, ai_service: AIService) -> IntentResult:
+    # Local fast path — skips the LLM round trip for common, unambiguous messages.
+    fast = classify_intent_fast(message)
+    if fast is not None:
+        return fast
+    return await classify_intent_llm(message, ai_service)
+
+
+async def classify_intent_llm(message: str, ai_service: AIService) -> IntentResult:
+    """Classify *message* with an LLM function call (no local fast path)."""
     try:
         response = await ai_service.function_call(
             system_prompt=CLASSIFIER_SYSTEM_PROMPT,
@@ -146,7 +175,7 @@ async def classify_intent(message: str, ai_service: AIService) -> IntentResult:
         # Remove None values from params
         params = {k: v for k, v in args.items() if v is not None}
 
-        return IntentResult(intent=intent, params=params)
+        return IntentResult(intent=intent, params=params, confidence=1.0)
 
     except Exception:
         logger.exception("Intent classification failed, falling back to general_chat")
@@ -0,0 +1,391 @@
+"""Local fast-path intent classifier that runs in front of the LLM.
+
+Two tiers, both CPU-only and dependency-free:
+
+1. Anchored regex rules for phrasings we see constantly ("what are my
+   tasks?", "complete buy milk").  Rules also extract the parameters the
+   module handlers need (title, query).
+2. A small multinomial naive Bayes model over word unigrams and bigrams,
+   trained at import time on ``_SEED_CORPUS``.
+
+Each tier yields an intent plus a confidence in [0, 1].  ``classify_intent``
+only trusts the local answer when the confidence clears
+``settings.intent_fast_path_threshold``; everything else falls through to the
+LLM.  Intents that need parameters the rules cannot extract (due dates,
+priorities, start times) are deliberately capped below any sane threshold.
+"""
+
+import math
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+
+# Intents whose handlers need no extracted parameters.  The naive Bayes tier
+# may answer these on its own; everything else needs a rule match.
+PARAM_FREE_INTENTS = frozenset({
+    "general_chat",
+    "query_todos",
+    "query_events",
+    "daily_briefing",
+    "weekly_review",
+    "analyze_schedule",
+})
+
+# Confidence assigned when a message needs structured extraction we can't do
+# locally.  Kept well under the default threshold so the LLM handles it.
+_NEEDS_LLM_CONFIDENCE = 0.3
+
+# Messages longer than this are rarely simple commands; leave them to the LLM.
+_MAX_WORDS = 24
+
+# Words that imply a due date, time, priority or recurrence the LLM must parse.
+_STRUCTURED_HINTS = re.compile(
+    r"\b("
+    r"today|tonight|tomorrow|yesterday|morning|afternoon|evening|noon|midnight|"
+    r"monday|tuesday|wednesday|thursday|friday|saturday|sunday|weekend|"
+    r"next|this week|this month|every|daily|weekly|monthly|yearly|"
+    r"urgent|asap|important|priority|"
+    r"january|february|march|april|may|june|july|august|september|october|november|december|"
+    r"am|pm|o'?clock|minutes?|hours?|days?|weeks?|months?"
+    r")\b|\d",
+    re.IGNORECASE,
+)
+
+
+@dataclass
+class FastPathResult:
+    intent: str
+    confidence: float
+    params: dict = field(default_factory=dict)
+    tier: str = "rules"  # "rules" | "model"
+
+
+# ---------------------------------------------------------------------------
+# Tier 1: rules
+# ---------------------------------------------------------------------------
+
+_TRAILING_PUNCT = re.compile(r"[\s?.!]+$")
+_TRAILING_NOUN = re.compile(r"\s+(task|todo)$", re.IGNORECASE)
+
+
+def _title(match: re.Match) -> dict:
+    title = _TRAILING_PUNCT.sub("", match.group("title")).strip(" \"'")
+    title = _TRAILING_NOUN.sub("", title)
+    return {"title": title} if title else {}
+
+
+def _query(match: re.Match) -> dict:
+    query = _TRAILING_PUNCT.sub("", match.group("query")).strip(" \"'")
+    return {"query": query} if query else {}
+
+
+_RULES: list[tuple[str, re.Pattern, object, float]] = [
+    (
+        "general_chat",
+        re.compile(
+            r"^(hi|hello|hey|yo|thanks|thank you|thx|good (morning|afternoon|evening|night)|"
+            r"ok|okay|cool|nice|great|bye|goodbye|see you)( there| so much| a lot)?[\s!.,]*$",
+            re.IGNORECASE,
+        ),
+        None,
+        0.97,
+    ),
+    (
+        "query_todos",
+        re.compile(
+            r"^(what are|what're|show( me)?|list|display|see) (all )?(of )?my "
+            r"(tasks|todos|to-?dos|to do list|to-?do list|open tasks|pending tasks)[\s?.!]*$",
+            re.IGNORECASE,
+        ),
+        None,
+        0.95,
+    ),
+    (
+        "query_events",
+        re.compile(
+            r"^(what'?s|what is|show( me)?|list|check) (on )?my (calendar|schedule|events|agenda)[\s?.!]*$",
+            re.IGNORECASE,
+        ),
+        None,
+        0.93,
+    ),
+    (
+        "daily_briefing",
+        re.compile(
+            r"^((what'?s|what does|how does) my day look(ing)?( like)?( today)?|"
+            r"(give me |show me )?(my |a |the )?(daily |morning )?briefing)[\s?.!]*$",
+            re.IGNORECASE,
+        ),
+        None,
+        0.95,
+    ),
+    (
+        "weekly_review",
+        re.compile(
+            r"^((let'?s |can we |start |do )?(do )?(a |my |the )?weekly review|review my week)[\s?.!]*$",
+            re.IGNORECASE,
+        ),
+        None,
+        0.96,
+    ),
+    (
+        "analyze_schedule",
+        re.compile(r"^how (busy|packed|full) (am i|is my (week|schedule))( this week)?[\s?.!]*$", re.IGNORECASE),
+        None,
+        0.93,
+    ),
+    # Completion verbs are everyday English ("complete this sentence", "mark
+    # my words", "I did my best"), so only explicit todo wording is trusted.
+    (
+        "complete_todo",
+        re.compile(
+            r"^(complete|finish|mark( off)?|check off|tick off|done with) "
+            r"(the )?(task|todo) (?P<title>.+?)( as (done|complete|completed|finished))?[\s.!]*$",
+            re.IGNORECASE,
+        ),
+        _title,
+        0.92,
+    ),
+    (
+        "complete_todo",
+        re.compile(
+            r"^mark (the )?(?P<title>.+?) (task |todo )?as (done|complete|completed|finished)[\s.!]*$",
+            re.IGNORECASE,
+        ),
+        _title,
+        0.92,
+    ),
+    # Without task/todo wording "check off my list of complaints" fits too:
+    # take a short title with no follow-up request, and let the LLM confirm.
+    (
+        "complete_todo",
+        re.compile(
+            r"^(check|tick) off (the )?"
+            r"(?P<title>(?!.*(\b(and|then|tell me|for me)\b|[,;]))\S+( \S+){0,5}?)[\s.!]*$",
+            re.IGNORECASE,
+        ),
+        _title,
+        _NEEDS_LLM_CONFIDENCE,
+    ),
+    # Deletion is irreversible and "delete the todo list app idea" reads like
+    # a command too: the rule only labels the intent, the LLM confirms it.
+    (
+        "delete_todo",
+        re.compile(r"^(delete|remove) (the )?(task|todo) (?P<title>.+)$", re.IGNORECASE),
+        _title,
+        _NEEDS_LLM_CONFIDENCE,
+    ),
+    (
+        "create_todo",
+        re.compile(
+            r"^(remind me to|add (a )?(new )?(task|todo)( to)?:?|create (a )?(new )?(task|todo)( to)?:?|"
+            r"new (task|todo):?|todo:|add to my (todo|task) list:?) (?P<title>.+)$",
+            re.IGNORECASE,
+        ),
+        _title,
+        0.92,
+    ),
+    (
+        "search",
+        re.compile(
+            r"^(search( for)?|find (everything|anything|all) (about|on|related to|for)) "
+            # a short query with no follow-up request ("... and tell me")
+            r"(?P<query>(?!.*(\b(and|then|tell me|for me)\b|[,;]))\S+( \S+){0,5})$",
+            re.IGNORECASE,
+        ),
+        _query,
+        0.92,
+    ),
+]
+
+
+def _match_rules(message: str) -> FastPathResult | None:
+    for intent, pattern, extractor, confidence in _RULES:
+        match = pattern.match(message)
+        if not match:
+            continue
+        params = extractor(match) if extractor else {}
+        if extractor and not params:
+            continue
+        if intent not in PARAM_FREE_INTENTS and _STRUCTURED_HINTS.search(message):
+            # Dates, times or priorities need the LLM's structured extraction.
+            confidence = _NEEDS_LLM_CONFIDENCE
+        return FastPathResult(intent=intent, confidence=confidence, params=params, tier="rules")
+    return None
+
+
+# ---------------------------------------------------------------------------
+# Tier 2: naive Bayes token classifier
+# ---------------------------------------------------------------------------
+
+_SEED_CORPUS: dict[str, tuple[str, ...]] = {
+    "general_chat": (
+        "hello", "hi there", "how are you", "thanks for the help", "good morning",
+        "what is the capital of france", "explain how photosynthesis works",
+        "tell me a joke", "can you help me write a poem", "what do you think about this idea",
+        "how do i cook rice", "what is machine learning", "who are you",
+        "translate this sentence into spanish", "why is the sky blue",
+    ),
+    "create_todo": (
+        "remind me to buy groceries", "add a task to call mom", "create a todo to pay rent",
+        "i need to renew my passport", "add buy milk to my list", "new task clean the garage",
+        "put fix the bike on my todo list", "todo water the plants", "add task review pull request",
+        "remember to email the landlord",
+    ),
+    "query_todos": (
+        "what are my tasks", "show my todos", "list my tasks", "what do i need to do",
+        "what's on my todo list", "show me my pending tasks", "which tasks are open",
+        "what tasks do i have", "list all my todos", "do i have any tasks left",
+    ),
+    "update_todo": (
+        "change the priority of buy milk to high", "rename the task call mom",
+        "update the groceries task description", "set the due date of pay rent to friday",
+        "make the report task urgent", "edit my task about the dentist",
+        "move the deadline for taxes", "change the task title",
+    ),
+    "delete_todo": (
+        "delete the task buy milk", "remove the todo call mom", "delete my groceries task",
+        "get rid of the task about the garage", "remove task pay rent", "drop the laundry task",
+    ),
+    "complete_todo": (
+        "complete buy milk", "mark call mom as done", "i finished the report",
+        "check off groceries", "finish the task pay rent", "done with the laundry",
+        "mark the dentist task complete", "i completed the taxes",
+    ),
+    "create_event": (
+        "schedule a meeting tomorrow at 3pm", "add an event on friday", "book a dentist appointment",
+        "put lunch with sarah on my calendar", "create an event for the team sync",
+        "set up a call with john next monday", "add dinner to my calendar",
+        "schedule a doctor visit next week",
+    ),
+    "query_events": (
+        "what's on my calendar", "show my schedule", "what events do i have",
+        "list my events", "what meetings do i have", "show me my calendar",
+        "do i have any appointments", "what's on my agenda",
+    ),
+    "update_event": (
+        "move my meeting to 4pm", "reschedule the dentist appointment", "change the location of the team sync",
+        "push lunch with sarah to thursday", "update the event time", "rename my calendar event",
+    ),
+    "delete_event": (
+        "cancel my meeting with john", "delete the dentist appointment", "remove the team sync from my calendar",
+        "cancel lunch with sarah", "delete that event", "cancel tomorrow's call",
+    ),
+    "search": (
+        "find everything about vla", "search for the project notes", "search my messages for budget",
+        "find anything related to the trip", "look through my notes for recipes",
+        "search for dentist", "find all mentions of the report",
+    ),
+    "delegate_task": (
+        "research the best laptops and write a summary", "investigate competitors and draft a report",
+        "can you research flights to tokyo in the background", "compile a comprehensive report on solar panels",
+        "look into options for health insurance and summarize", "draft an email to the team about the launch",
+    ),
+    "daily_briefing": (
+        "what's my day look like", "give me my daily briefing", "morning briefing",
+        "summarize my day", "what does today look like", "brief me on today",
+        "how does my day look",
+    ),
+    "suggest_time": (
+        "when should i schedule a team meeting", "find a good time for a call",
+        "suggest a time for lunch with sarah", "when am i free for an hour",
+        "what's the best time to meet this week", "find a free slot for a workout",
+    ),
+    "check_conflicts": (
+        "do i have anything at 3pm", "am i free tomorrow afternoon", "is there a conflict on friday",
+        "do i have a clash with the team sync", "am i busy at noon", "anything scheduled at 10am",
+    ),
+    "analyze_schedule": (
+        "how busy am i this week", "analyze my schedule", "how packed is my week",
+        "give me an overview of my week", "which days are busiest", "how much free time do i have this week",
+    ),
+    "weekly_review": (
+        "let's do a weekly review", "review my week", "start my weekly review",
+        "weekly review please", "do the weekly review", "time for a weekly review",
+    ),
+}
+
+_TOKEN_RE = re.compile(r"[a-z0-9']+")
+
+
+def _features(text: str) -> list[str]:
+    tokens = _TOKEN_RE.findall(text.lower())
+    return tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+
+
+class _NaiveBayes:
+    """Multinomial naive Bayes with Laplace smoothing."""
+
+    def __init__(self, corpus: dict[str, tuple[str, ...]]):
+        self.labels = list(corpus)
+        self.vocab: set[str] = set()
+        self.counts: dict[str, Counter] = {}
+        self.totals: dict[str, int] = {}
+        n_docs = sum(len(docs) for docs in corpus.values())
+        self.log_prior: dict[str, float] = {}
+        for label, docs in corpus.items():
+            counter: Counter = Counter()
+            for doc in docs:
+                counter.update(_features(doc))
+            self.counts[label] = counter
+            self.totals[label] = sum(counter.values())
+            self.vocab.update(counter)
+            self.log_prior[label] = math.log(len(docs) / n_docs)
+
+    def predict(self, text: str) -> tuple[str, float, float]:
+        """Return (label, posterior, vocabulary coverage) for *text*."""
+        feats = _features(text)
+        if not feats:
+            return "general_chat", 0.0, 0.0
+        known = [f for f in feats if f in self.vocab]
+        coverage = len(known) / len(feats)
+        v = len(self.vocab)
+        scores = {}
+        for label in self.labels:
+            counter = self.counts[label]
+            denom = math.log(self.totals[label] + v)
+            scores[label] = self.log_prior[label] + sum(
+                math.log(counter.get(f, 0) + 1) - denom for f in known
+            )
+        best = max(scores, key=scores.get)
+        top = scores[best]
+        norm = sum(math.exp(s - top) for s in scores.values())
+        return best, 1.0 / norm, coverage
+
+
+_model = _NaiveBayes(_SEED_CORPUS)
+
+
+def _predict_model(message: str) -> FastPathResult:
+    intent, posterior, coverage = _model.predict(message)
+    # Scale by coverage so out-of-vocabulary messages never look confident.
+    confidence = posterior * coverage
+    if intent not in PARAM_FREE_INTENTS:
+        confidence = min(confidence, _NEEDS_LLM_CONFIDENCE)
+    return FastPathResult(intent=intent, confidence=confidence, tier="model")
+
+
+# ---------------------------------------------------------------------------
+# Public entry point
+# ---------------------------------------------------------------------------
+
+
+def classify_local(message: str) -> FastPathResult:
+    """Classify *message* without calling the LLM.
+
+    Rules win when they match; the model's vote only adjusts their
+    confidence.  Without a rule match the model answers alone, capped for
+    intents that need parameter extraction.
+    """
+    text = " ".join(message.split())
+    if not text or len(text.split()) > _MAX_WORDS:
+        return FastPathResult(intent="general_chat", confidence=0.0, tier="model")
+
+    rule = _match_rules(text)
+    model = _predict_model(text)
+    if rule is None:
+        return model
+    if model.intent != rule.intent and model.confidence >= 0.5:
+        # The model confidently disagrees: don't trust the rule on its own.
+        rule.confidence = min(rule.confidence, 1.0 - model.confidence)
+    return rule
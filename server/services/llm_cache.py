@@ -0,0 +1,238 @@
+"""Persistent response cache for deterministic utility LLM calls.
+
+Titles, intent classification, skill selection and inbox classification are
+short, deterministic prompts that frequently see the same input (retries,
+repeated quick captures, "hi" as a first message).  ``CachedAIProvider`` wraps
+an ``AIService`` or ``ClaudeCodeProvider`` and answers ``generate_title`` and
+``function_call`` from a small SQLite file when it can; every other attribute
+is passed straight through, so callers need no changes.
+
+Entries are keyed on (provider, model, prompt hash, normalized user message),
+expire after ``ttl_seconds`` and are evicted least-recently-used once the table
+exceeds ``max_entries``.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+_FALLBACK_TITLE = "New Conversation"
+
+# Relative dates resolve differently tomorrow; never cache answers to them.
+_RELATIVE_TIME = re.compile(
+    r"\b(now|today|tonight|tomorrow|yesterday|next|this|last|in \d+|ago|"
+    r"monday|tuesday|wednesday|thursday|friday|saturday|sunday|weekend)\b",
+    re.IGNORECASE,
+)
+
+_SCHEMA = [
+    """CREATE TABLE IF NOT EXISTS llm_cache (
+        key TEXT PRIMARY KEY,
+        kind TEXT NOT NULL,
+        provider TEXT NOT NULL,
+        model TEXT NOT NULL,
+        response TEXT NOT NULL,
+        size_bytes INTEGER NOT NULL,
+        created_at REAL NOT NULL,
+        last_used_at REAL NOT NULL,
+        hits INTEGER NOT NULL DEFAULT 0
+    )""",
+    "CREATE INDEX IF NOT EXISTS idx_llm_cache_last_used ON llm_cache(last_used_at)",
+]
+
+
+def normalize_message(message: str) -> str:
+    """Case- and whitespace-insensitive form of a user message."""
+    return " ".join(message.split()).casefold().strip(" .!?")
+
+
+def make_key(provider: str, model: str, kind: str, prompt: str, message: str) -> str:
+    prompt_hash = hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+    raw = "\x1f".join((provider, model, kind, prompt_hash, normalize_message(message)))
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class LLMResponseCache:
+    """SQLite-backed key/value store with TTL and LRU eviction."""
+
+    def __init__(self, path: str, ttl_seconds: int = 86400, max_entries: int = 5000):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        if path != ":memory:":
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock:
+            for stmt in _SCHEMA:
+                self._conn.execute(stmt)
+            self._conn.commit()
+
+    # --- sync helpers (run in a worker thread) ---
+
+    def _get_sync(self, key: str) -> str | None:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response, created_at FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            response, created_at = row
+            if now - created_at > self.ttl_seconds:
+                self._conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                self._conn.commit()
+                return None
+            self._conn.execute(
+                "UPDATE llm_cache SET last_used_at = ?, hits = hits + 1 WHERE key = ?",
+                (now, key),
+            )
+            self._conn.commit()
+            return response
+
+    def _set_sync(self, key: str, kind: str, provider: str, model: str, response: str) -> None:
+        now = time.time()
+        size = len(response.encode("utf-8"))
+        with self._lock:
+            self._conn.execute(
+                """INSERT OR REPLACE INTO llm_cache
+                   (key, kind, provider, model, response, size_bytes, created_at, last_used_at, hits)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, 0)""",
+                (key, kind, provider, model, response, size, now, now),
+            )
+            self._conn.execute(
+                "DELETE FROM llm_cache WHERE created_at < ?", (now - self.ttl_seconds,)
+            )
+            self._conn.execute(
+                """DELETE FROM llm_cache WHERE key IN (
+                       SELECT key FROM llm_cache ORDER BY last_used_at DESC LIMIT -1 OFFSET ?
+                   )""",
+                (self.max_entries,),
+            )
+            self._conn.commit()
+
+    def _stats_sync(self) -> tuple[int, int]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size_bytes), 0) FROM llm_cache"
+            ).fetchone()
+        return row[0], row[1]
+
+    def _clear_sync(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM llm_cache")
+            self._conn.commit()
+
+    # --- async API ---
+
+    async def get(self, key: str) -> str | None:
+        try:
+            value = await asyncio.to_thread(self._get_sync, key)
+        except sqlite3.Error:
+            logger.warning("LLM cache read failed", exc_info=True)
+            value = None
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    async def set(self, key: str, kind: str, provider: str, model: str, response: str) -> None:
+        try:
+            await asyncio.to_thread(self._set_sync, key, kind, provider, model, response)
+        except sqlite3.Error:
+            logger.warning("LLM cache write failed", exc_info=True)
+
+    async def clear(self) -> None:
+        await asyncio.to_thread(self._clear_sync)
+
+    async def get_stats(self) -> dict:
+        entries, size = await asyncio.to_thread(self._stats_sync)
+        lookups = self.hits + self.misses
+        return {
+            "entries": entries,
+            "bytes_stored": size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 3) if lookups else 0.0,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class CachedAIProvider:
+    """Drop-in wrapper adding response caching to an AI provider."""
+
+    def __init__(self, inner, cache: LLMResponseCache, provider: str, model: str):
+        self._inner = inner
+        self._cache = cache
+        self._provider = provider
+        self._model = model
+
+    def __getattr__(self, name):
+        return getattr(self._inner, name)
+
+    @property
+    def inner(self):
+        return self._inner
+
+    def _key(self, kind: str, prompt: str, message: str) -> str:
+        return make_key(self._provider, self._model, kind, prompt, message)
+
+    async def generate_title(self, user_message: str) -> str:
+        key = self._key("title", "", user_message)
+        cached = await self._cache.get(key)
+        if cached is not None:
+            return cached
+        title = await self._inner.generate_title(user_message)
+        if title and title != _FALLBACK_TITLE:
+            await self._cache.set(key, "title", self._provider, self._model, title)
+        return title
+
+    async def function_call(
+        self,
+        system_prompt: str,
+        user_message: str,
+        tools: list[dict],
+        tool_choice: dict | str = "auto",
+    ) -> dict:
+        prompt = json.dumps([system_prompt, tools, tool_choice], sort_keys=True)
+        key = self._key("function_call", prompt, user_message)
+        cached = await self._cache.get(key)
+        if cached is not None:
+            return json.loads(cached)
+        response = await self._inner.function_call(
+            system_prompt=system_prompt,
+            user_message=user_message,
+            tools=tools,
+            tool_choice=tool_choice,
+        )
+        if _is_cacheable_tool_response(response) and not _RELATIVE_TIME.search(user_message):
+            await self._cache.set(
+                key, "function_call", self._provider, self._model, json.dumps(response)
+            )
+        return response
+
+
+def _is_cacheable_tool_response(response: dict) -> bool:
+    """Only cache real tool calls — not empty choices or provider fallbacks."""
+    if not isinstance(response, dict) or response.get("fallback"):
+        return False
+    choices = response.get("choices") or []
+    if not choices:
+        return False
+    return bool(choices[0].get("message", {}).get("tool_calls"))
@@ -0,0 +1,231 @@
+"""Priority-aware admission control for LLM calls.
+
+Every provider call (OpenClaw or Claude Code) passes through one shared
+``LLMScheduler``.  Calls are tagged with a priority class taken from a context
+variable, so call sites don't change — background entry points just run under
+``llm_priority(...)`` (or the ``with_priority`` decorator) and everything they
+await inherits the class:
+
+- ``INTERACTIVE`` — the user's typed message: chat streams, intent
+  classification, titles.  The default.
+- ``BACKGROUND`` — work the user kicked off: agent tasks, inbox pipeline.
+- ``SCHEDULED`` — briefings, nudges, weekly reviews from the scheduler.
+
+When the backend is saturated, queued work is granted strictly by class, so a
+newly typed message jumps ahead of every queued background job.  Each class
+has its own concurrency cap and non-interactive work may never take the last
+``reserved_interactive`` slots.  Work that is already running is never
+interrupted; preemption applies to the queue only.
+"""
+
+import asyncio
+import functools
+import itertools
+import logging
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from enum import IntEnum
+
+logger = logging.getLogger(__name__)
+
+
+class Priority(IntEnum):
+    INTERACTIVE = 0
+    BACKGROUND = 1
+    SCHEDULED = 2
+
+
+_current_priority: ContextVar[Priority] = ContextVar(
+    "llm_priority", default=Priority.INTERACTIVE
+)
+
+
+def current_priority() -> Priority:
+    return _current_priority.get()
+
+
+@contextmanager
+def llm_priority(priority: Priority):
+    """Run LLM calls in this block at *priority* or lower — never higher.
+
+    A scheduled job that triggers an inbox pipeline stays ``SCHEDULED``.
+    """
+    token = _current_priority.set(max(_current_priority.get(), priority))
+    try:
+        yield
+    finally:
+        _current_priority.reset(token)
+
+
+def with_priority(priority: Priority):
+    """Decorator form of :func:`llm_priority` for async entry points."""
+
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            with llm_priority(priority):
+                return await func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+class _ClassStats:
+    __slots__ = ("in_flight", "waiting", "completed", "preempted", "total_wait_ms", "max_wait_ms")
+
+    def __init__(self):
+        self.in_flight = 0
+        self.waiting = 0
+        self.completed = 0
+        self.preempted = 0
+        self.total_wait_ms = 0.0
+        self.max_wait_ms = 0.0
+
+    def snapshot(self, limit: int) -> dict:
+        return {
+            "limit": limit,
+            "in_flight": self.in_flight,
+            "waiting": self.waiting,
+            "completed": self.completed,
+            "preempted": self.preempted,
+            "avg_wait_ms": round(self.total_wait_ms / self.completed, 1) if self.completed else 0.0,
+            "max_wait_ms": round(self.max_wait_ms, 1),
+        }
+
+
+class LLMScheduler:
+    """Grant LLM call slots by priority class under global and per-class caps."""
+
+    def __init__(
+        self,
+        max_concurrency: int = 4,
+        class_limits: dict[Priority, int] | None = None,
+        reserved_interactive: int = 1,
+    ):
+        self.max_concurrency = max_concurrency
+        self.class_limits = {
+            Priority.INTERACTIVE: max_concurrency,
+            Priority.BACKGROUND: max_concurrency,
+            Priority.SCHEDULED: max_concurrency,
+            **(class_limits or {}),
+        }
+        self.reserved_interactive = min(reserved_interactive, max_concurrency - 1)
+        self._in_flight = 0
+        self._waiters: list[tuple[Priority, int, asyncio.Future]] = []
+        self._seq = itertools.count()
+        self._stats = {p: _ClassStats() for p in Priority}
+
+    def _can_start(self, priority: Priority) -> bool:
+        if self._in_flight >= self.max_concurrency:
+            return False
+        if self._stats[priority].in_flight >= self.class_limits[priority]:
+            return False
+        if priority != Priority.INTERACTIVE:
+            return self._in_flight < self.max_concurrency - self.reserved_interactive
+        return True
+
+    def _dispatch(self) -> None:
+        """Grant queued requests in (priority, arrival) order while slots remain."""
+        self._waiters.sort(key=lambda w: (w[0], w[1]))
+        remaining = []
+        for priority, seq, future in self._waiters:
+            if future.done():
+                continue
+            if self._can_start(priority):
+                self._start(priority)
+                future.set_result(None)
+            else:
+                remaining.append((priority, seq, future))
+        self._waiters = remaining
+
+    def _start(self, priority: Priority) -> None:
+        self._in_flight += 1
+        self._stats[priority].in_flight += 1
+
+    def _finish(self, priority: Priority) -> None:
+        self._in_flight -= 1
+        stats = self._stats[priority]
+        stats.in_flight -= 1
+        stats.completed += 1
+        self._dispatch()
+
+    @asynccontextmanager
+    async def slot(self, priority: Priority | None = None):
+        priority = current_priority() if priority is None else priority
+        stats = self._stats[priority]
+        started = time.perf_counter()
+
+        future = asyncio.get_running_loop().create_future()
+        seq = next(self._seq)
+        # Count lower-priority requests this one overtakes in the queue.
+        for other, _, _ in self._waiters:
+            if other > priority:
+                self._stats[other].preempted += 1
+        self._waiters.append((priority, seq, future))
+        stats.waiting += 1
+        try:
+            self._dispatch()
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Granted just before the cancellation landed — give it back.
+                self._finish(priority)
+            else:
+                self._waiters = [w for w in self._waiters if w[2] is not future]
+            raise
+        finally:
+            stats.waiting -= 1
+
+        wait_ms = (time.perf_counter() - started) * 1000
+        stats.total_wait_ms += wait_ms
+        stats.max_wait_ms = max(stats.max_wait_ms, wait_ms)
+        try:
+            yield
+        finally:
+            self._finish(priority)
+
+    def snapshot(self) -> dict:
+        return {
+            "max_concurrency": self.max_concurrency,
+            "reserved_interactive": self.reserved_interactive,
+            "in_flight": self._in_flight,
+            "waiting": len(self._waiters),
+            "classes": {
+                p.name.lower(): self._stats[p].snapshot(self.class_limits[p]) for p in Priority
+            },
+        }
+
+
+class ScheduledAIProvider:
+    """Drop-in wrapper that routes provider calls through an ``LLMScheduler``."""
+
+    def __init__(self, inner, scheduler: LLMScheduler):
+        self._inner = inner
+        self._scheduler = scheduler
+
+    def __getattr__(self, name):
+        return getattr(self._inner, name)
+
+    @property
+    def inner(self):
+        return self._inner
+
+    async def stream_completion(self, messages: list[dict]) -> AsyncIterator[str]:
+        async with self._scheduler.slot():
+            async for token in self._inner.stream_completion(messages):
+                yield token
+
+    async def function_call(self, *args, **kwargs) -> dict:
+        async with self._scheduler.slot():
+            return await self._inner.function_call(*args, **kwargs)
+
+    async def generate_completion(self, *args, **kwargs) -> str:
+        async with self._scheduler.slot():
+            return await self._inner.generate_completion(*args, **kwargs)
+
+    async def generate_title(self, *args, **kwargs) -> str:
+        async with self._scheduler.slot():
+            return await self._inner.generate_title(*args, **kwargs)
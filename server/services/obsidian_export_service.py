@@ -72,6 +72,48 @@ def remove_todo_from_vault(vault_path: str, todo_id: str) -> None:
         logger.exception("Failed to remove todo %s from vault", todo_id)
 
 
+def export_todos(
+    vault_path: str, todos: list[Todo], project_names: dict[str, str | None]
+) -> ExportResult:
+    """Export many todos at once (bulk edits).
+
+    *project_names* maps todo id to its parent's title.  The vault is walked
+    once to drop lines left in other files, and each target file is written
+    once for its whole group, instead of a walk and a write per todo.
+    """
+    result = ExportResult()
+    grouped: dict[str, list[Todo]] = {}
+    for t in todos:
+        abs_path = _get_file_path(vault_path, project_names.get(t.id), source_id=t.source_id)
+        grouped.setdefault(abs_path, []).append(t)
+
+    try:
+        _strip_markers(vault_path, {t.id: path for path, group in grouped.items() for t in group})
+    except Exception:
+        logger.exception("Failed to clear stale vault lines for %d todos", len(todos))
+
+    for abs_path, group in grouped.items():
+        try:
+            if not os.path.isfile(abs_path):
+                _create_file_via_cli_or_fs(vault_path, abs_path)
+            _export_group(abs_path, group)
+            result.exported += len(group)
+            result.file_count += 1
+        except Exception:
+            logger.exception("Failed to export group to %s", abs_path)
+            result.errors += len(group)
+    return result
+
+
+def remove_todos_from_vault(vault_path: str, todo_ids: list[str]) -> int:
+    """Remove the lines of many todos in one vault walk; returns lines removed."""
+    try:
+        return _strip_markers(vault_path, dict.fromkeys(todo_ids))
+    except Exception:
+        logger.exception("Failed to remove %d todos from vault", len(todo_ids))
+        return 0
+
+
 def export_all_todos(vault_path: str, todos: list[Todo]) -> ExportResult:
     """Full export of all todos to the vault.
 
@@ -100,9 +142,7 @@ def export_all_todos(vault_path: str, todos: list[Todo]) -> ExportResult:
 
     # Remove existing markers for every todo before writing to prevent
     # duplicates when todos move between folders.
-    for group in grouped.values():
-        for t in group:
-            _remove_all_markers(vault_path, t.id)
+    _strip_markers(vault_path, {t.id: None for group in grouped.values() for t in group})
 
     files_written: set[str] = set()
     for abs_path, group in grouped.items():
@@ -240,6 +280,34 @@ def _remove_all_markers(vault_path: str, todo_id: str) -> None:
             _remove_line(abs_path, todo_id)
 
 
+def _strip_markers(vault_path: str, keep: dict[str, str | None]) -> int:
+    """Single-walk removal of marker lines for every todo id in *keep*.
+
+    A line survives only in the file its todo maps to (``None`` removes it
+    everywhere).  Each file is rewritten at most once.  Returns lines removed.
+    """
+    keep = {
+        todo_id: os.path.normpath(path) if path else None for todo_id, path in keep.items()
+    }
+    removed = 0
+    for dirpath, _dirs, filenames in os.walk(vault_path):
+        for fname in filenames:
+            if not fname.endswith(".md"):
+                continue
+            abs_path = os.path.normpath(os.path.join(dirpath, fname))
+            lines = _read_lines(abs_path)
+            kept = []
+            for line in lines:
+                m = _MARKER_RE.search(line)
+                if m and m.group(1) in keep and keep[m.group(1)] != abs_path:
+                    continue
+                kept.append(line)
+            if len(kept) != len(lines):
+                removed += len(lines) - len(kept)
+                _write_lines(abs_path, kept)
+    return removed
+
+
 def _ensure_section_header(path: str, lines: list[str]) -> None:
     """Add the ``## ClawChat`` section header if it is missing."""
     for line in lines:
@@ -6,7 +6,8 @@ from datetime import datetime, timedelta, timezone
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
-from constants import SYSTEM_PROMPT
+from config import settings
+from database import db_writer
 from exceptions import AIUnavailableError
 from models.agent_task import AgentTask
 from models.conversation import Conversation
@@ -15,13 +16,17 @@ from models.todo import Todo
 from services import (
     agent_task_service,
     briefing_service,
+    chat_context_service,
     calendar_service,
+    project_service,
     scheduling_service,
     search_service,
+    sync_service,
     todo_service,
 )
 from services.ai_service import AIService
-from services.intent_classifier import classify_intent
+from services.intent_classifier import classify_intent_fast, classify_intent_llm
+from services.speculative_chat import SpeculativeStream
 from utils import make_id
 from ws.manager import ConnectionManager
 
@@ -43,6 +48,18 @@ MODULE_INTENTS = {
     "analyze_schedule": "analyze your schedule",
 }
 
+# Intents routed somewhere other than the general-chat stream
+NON_CHAT_INTENTS = set(MODULE_INTENTS) | {"search", "delegate_task", "daily_briefing", "weekly_review"}
+
+
+async def _in_writer(fn, *args, **kwargs):
+    """Run the service mutation ``fn(session, *args, **kwargs)`` as one writer job."""
+
+    async def job(session: AsyncSession):
+        return await fn(session, *args, **kwargs)
+
+    return await db_writer.run(job)
+
 
 def _find_by_title(items, title: str):
     """Case-insensitive title substring match; prefers exact match."""
@@ -55,6 +72,13 @@ def _find_by_title(items, title: str):
 
 
 class Orchestrator:
+    """Classify each chat message and act on it.
+
+    ``session_factory`` should hand out read-pool sessions: every write a turn
+    makes (intent, replies, todos, events, agent tasks, titles) is a
+    ``db_writer`` job, so no write transaction stays open across LLM calls.
+    """
+
     def __init__(
         self,
         ai_service: AIService,
@@ -82,21 +106,32 @@ class Orchestrator:
         content: str,
     ):
         async with self.session_factory() as db:
+            speculation: SpeculativeStream | None = None
             try:
-                # 1. Classify intent (uses the active AI provider)
-                intent_result = await classify_intent(content, self.active_ai)
+                # 1. Classify intent — local fast path first, then the active AI
+                # provider.  In speculative mode the general-chat completion
+                # starts alongside the LLM classification.
+                intent_result = classify_intent_fast(content)
+                if intent_result is None:
+                    if settings.speculative_chat_enabled:
+                        messages = await self._build_chat_messages(db, conversation_id)
+                        speculation = SpeculativeStream(self.active_ai.stream_completion(messages))
+                        await db.commit()  # don't hold a read connection while classifying
+                    intent_result = await classify_intent_llm(content, self.active_ai)
                 intent = intent_result.intent
                 params = intent_result.params
 
-                # Update user message with classified intent
-                user_msg = await db.get(Message, message_id)
-                if user_msg:
-                    user_msg.intent = intent
+                if speculation and intent in NON_CHAT_INTENTS:
+                    await speculation.cancel()
+                    speculation = None
+
+                # Persist the classified intent before any streaming starts
+                await self._save_intent(message_id, intent)
 
                 # 2. Route based on intent
                 if intent == "general_chat":
                     await self._handle_general_chat(
-                        db, user_id, conversation_id, content
+                        db, user_id, conversation_id, content, speculation
                     )
                 elif intent in MODULE_INTENTS:
                     await self._handle_module_action(
@@ -121,7 +156,7 @@ class Orchestrator:
                 else:
                     # Fallback to general chat
                     await self._handle_general_chat(
-                        db, user_id, conversation_id, content
+                        db, user_id, conversation_id, content, speculation
                     )
 
                 # Auto-generate title for non-general-chat intents
@@ -129,24 +164,31 @@ class Orchestrator:
                 if intent != "general_chat":
                     conv = await db.get(Conversation, conversation_id)
                     if conv and not conv.title:
-                        await self._generate_title(db, conv, content, user_id)
-
-                await db.commit()
+                        await self._generate_title(user_id, conversation_id, content)
 
             except AIUnavailableError as exc:
                 logger.error("AI unavailable: %s", exc)
                 await self._send_error_message(
-                    db, user_id, conversation_id,
+                    user_id, conversation_id,
                     "I'm sorry, I can't reach the AI provider right now. Please check that your AI service is running.",
                 )
-                await db.commit()
             except Exception:
                 logger.exception("Orchestrator error")
                 await self._send_error_message(
-                    db, user_id, conversation_id,
+                    user_id, conversation_id,
                     "Something went wrong processing your message. Please try again.",
                 )
-                await db.commit()
+            finally:
+                if speculation:
+                    await speculation.cancel()
+
+    async def _save_intent(self, message_id: str, intent: str) -> None:
+        async def save(session: AsyncSession) -> None:
+            msg = await session.get(Message, message_id)
+            if msg:
+                msg.intent = intent
+
+        await db_writer.run(save)
 
     async def _handle_delegate_task(
         self,
@@ -165,17 +207,19 @@ class Orchestrator:
         skill_chain = await select_skills(self.active_ai, instruction)
         agent_type = skill_chain[0] if skill_chain else "general"
 
-        task = await agent_task_service.create_task(
-            db,
-            task_type=task_type,
-            instruction=instruction,
-            conversation_id=conversation_id,
-            message_id=message_id,
-            agent_type=agent_type,
-        )
-        # Set the skill chain on the new task.
-        task.skill_chain = json.dumps(skill_chain)
-        await db.flush()
+        async def insert(session: AsyncSession) -> AgentTask:
+            task = await agent_task_service.create_task(
+                session,
+                task_type=task_type,
+                instruction=instruction,
+                conversation_id=conversation_id,
+                message_id=message_id,
+                agent_type=agent_type,
+            )
+            task.skill_chain = json.dumps(skill_chain)
+            return task
+
+        task = await db_writer.run(insert)
 
         is_multi_skill = len(skill_chain) > 1
         if is_multi_skill:
@@ -191,7 +235,6 @@ class Orchestrator:
             )
 
         await self._send_assistant_message(
-            db,
             user_id,
             conversation_id,
             "delegate_task",
@@ -225,7 +268,7 @@ class Orchestrator:
     ):
         briefing = await briefing_service.generate_briefing(db, self.active_ai)
         await self._send_assistant_message(
-            db, user_id, conversation_id, "daily_briefing", briefing
+            user_id, conversation_id, "daily_briefing", briefing
         )
 
     async def _handle_weekly_review(
@@ -237,33 +280,30 @@ class Orchestrator:
         from services import weekly_review_service
         review = await weekly_review_service.generate_weekly_review(db, self.active_ai)
         await self._send_assistant_message(
-            db, user_id, conversation_id, "weekly_review", review
+            user_id, conversation_id, "weekly_review", review
         )
 
+    async def _build_chat_messages(self, db: AsyncSession, conversation_id: str) -> list[dict]:
+        """Budgeted chat context: recent turns, rolling summary and retrieved items."""
+        return await chat_context_service.build_chat_messages(db, conversation_id)
+
     async def _handle_general_chat(
         self,
         db: AsyncSession,
         user_id: str,
         conversation_id: str,
         content: str,
+        speculation: SpeculativeStream | None = None,
     ):
-        # Load last 20 messages for context
-        q = (
-            select(Message)
-            .where(Message.conversation_id == conversation_id)
-            .order_by(Message.created_at.desc())
-            .limit(20)
-        )
-        rows = (await db.execute(q)).scalars().all()
-        history = list(reversed(rows))
-
-        system_content = SYSTEM_PROMPT
+        if speculation:
+            token_iterator = speculation.claim()
+        else:
+            messages = await self._build_chat_messages(db, conversation_id)
+            token_iterator = self.active_ai.stream_completion(messages)
         conv = await db.get(Conversation, conversation_id)
-        if conv and conv.project_todo_id:
-            system_content += await self._build_project_context(db, conv.project_todo_id)
-        messages = [{"role": "system", "content": system_content}]
-        for msg in history:
-            messages.append({"role": msg.role, "content": msg.content})
+        needs_title = conv is not None and not conv.title
+        # Hand the pooled read connection back for the length of the stream
+        await db.commit()
 
         # Create assistant message placeholder
         assistant_msg_id = make_id("msg_")
@@ -274,7 +314,7 @@ class Orchestrator:
                 user_id=user_id,
                 message_id=assistant_msg_id,
                 conversation_id=conversation_id,
-                token_iterator=self.active_ai.stream_completion(messages),
+                token_iterator=token_iterator,
             )
         except Exception:
             # Send stream_end for the orphaned stream_start so the client doesn't hang
@@ -284,22 +324,28 @@ class Orchestrator:
             })
             raise
 
-        # Save assistant message
-        assistant_msg = Message(
-            id=assistant_msg_id,
-            conversation_id=conversation_id,
-            role="assistant",
-            content=full_content,
-            intent="general_chat",
-        )
-        db.add(assistant_msg)
+        # Auto-generate the title before the write, so one job saves both
+        title = await self._new_title(conversation_id, content) if needs_title else None
 
-        # Update conversation timestamp + auto-generate title
-        conv = await db.get(Conversation, conversation_id)
-        if conv:
-            conv.updated_at = datetime.now(timezone.utc)
-            if not conv.title:
-                await self._generate_title(db, conv, content, user_id)
+        async def save_reply(session: AsyncSession) -> None:
+            session.add(Message(
+                id=assistant_msg_id,
+                conversation_id=conversation_id,
+                role="assistant",
+                content=full_content,
+                intent="general_chat",
+            ))
+            save_conv = await session.get(Conversation, conversation_id)
+            if save_conv:
+                save_conv.updated_at = datetime.now(timezone.utc)
+                if title and not save_conv.title:
+                    save_conv.title = title
+
+        await db_writer.run(save_reply)
+        if title:
+            await self._announce_title(user_id, conversation_id, title)
+
+        await chat_context_service.refresh_summary(db, conversation_id, self.active_ai)
 
     async def _handle_search(
         self,
@@ -311,31 +357,32 @@ class Orchestrator:
     ):
         query = params.get("query", content)
         try:
-            hits, total = await search_service.search(db, query)
+            result = await search_service.search(db, query)
         except Exception:
             logger.exception("Search failed for query: %s", query)
             await self._send_assistant_message(
-                db, user_id, conversation_id, "search",
+                user_id, conversation_id, "search",
                 f"Sorry, I had trouble searching for '{query}'. Please try again.",
             )
             return
 
-        if not hits:
+        if not result.hits:
             await self._send_assistant_message(
-                db, user_id, conversation_id, "search",
+                user_id, conversation_id, "search",
                 f"No results found for '{query}'.",
             )
             return
 
-        lines = [f"Found {total} result(s) for '{query}':"]
-        for h in hits[:10]:
+        found = f"{result.total}{'+' if result.total_capped else ''}"
+        lines = [f"Found {found} result(s) for '{query}':"]
+        for h in result.hits[:10]:
             label = h.title or h.type
             preview = h.preview[:80] + "..." if len(h.preview) > 80 else h.preview
             lines.append(f"- **[{h.type}]** {label}: {preview}")
-        if total > 10:
-            lines.append(f"...and {total - 10} more.")
+        if result.total > 10:
+            lines.append(f"...and {result.total - 10} more.")
         await self._send_assistant_message(
-            db, user_id, conversation_id, "search", "\n".join(lines),
+            user_id, conversation_id, "search", "\n".join(lines),
         )
 
     async def _handle_module_action(
@@ -348,15 +395,16 @@ class Orchestrator:
     ):
         response_text, action_metadata = await self._execute_module_intent(db, intent, params, conversation_id)
         await self._send_assistant_message(
-            db, user_id, conversation_id, intent, response_text, metadata=action_metadata
+            user_id, conversation_id, intent, response_text, metadata=action_metadata
         )
 
         # Notify frontend to refresh module data
         if action_metadata:
-            await self.ws.send_json(user_id, {
-                "type": "module_data_changed",
-                "data": {"module": action_metadata.get("module")},
-            })
+            if action_metadata.get("module") == "todos":
+                project_service.project_cache.invalidate()
+            await self.ws.send_json(
+                user_id, await sync_service.change_notification(db, action_metadata.get("module"))
+            )
 
     async def _execute_module_intent(
         self, db: AsyncSession, intent: str, params: dict, conversation_id: str | None = None
@@ -369,8 +417,8 @@ class Orchestrator:
                     conv = await db.get(Conversation, conversation_id)
                     if conv and conv.project_todo_id:
                         parent_id = conv.project_todo_id
-                todo = await todo_service.create_todo(
-                    db,
+                todo = await _in_writer(
+                    todo_service.create_todo,
                     title=params.get("title", "Untitled task"),
                     description=params.get("description"),
                     priority=params.get("priority", "medium"),
@@ -402,7 +450,7 @@ class Orchestrator:
                 todo = _find_by_title(todos, title)
                 if not todo:
                     return f"I couldn't find a task matching '{title}'. Try listing your tasks first.", None
-                todo = await todo_service.update_todo(db, todo.id, status="completed")
+                todo = await _in_writer(todo_service.update_todo, todo.id, status="completed")
                 return (
                     f"Marked '{todo.title}' as complete.",
                     {"action_type": "todo_completed", "module": "todos", "todo_id": todo.id, "todo_title": todo.title},
@@ -417,8 +465,8 @@ class Orchestrator:
                         "When should it be?",
                         None,
                     )
-                event = await calendar_service.create_event(
-                    db,
+                event = await _in_writer(
+                    calendar_service.create_event,
                     title=title,
                     description=params.get("description"),
                     start_time=datetime.fromisoformat(start_time),
@@ -466,7 +514,7 @@ class Orchestrator:
                     updates["status"] = params["status"]
                 if not updates:
                     return f"I found '{todo.title}', but I'm not sure what to change. What would you like to update?", None
-                todo = await todo_service.update_todo(db, todo.id, **updates)
+                todo = await _in_writer(todo_service.update_todo, todo.id, **updates)
                 return (
                     f"Updated task '{todo.title}'.",
                     {"action_type": "todo_updated", "module": "todos", "todo_id": todo.id, "todo_title": todo.title},
@@ -482,7 +530,7 @@ class Orchestrator:
                     return f"I couldn't find a task matching '{title}'. Try listing your tasks first.", None
                 deleted_title = todo.title
                 deleted_id = todo.id
-                await todo_service.delete_todo(db, todo.id)
+                await _in_writer(todo_service.delete_todo, todo.id)
                 return (
                     f"Deleted task '{deleted_title}'.",
                     {"action_type": "todo_deleted", "module": "todos", "todo_id": deleted_id, "todo_title": deleted_title},
@@ -507,7 +555,7 @@ class Orchestrator:
                     updates["location"] = params["location"]
                 if not updates:
                     return f"I found '{event.title}', but I'm not sure what to change. What would you like to update?", None
-                event = await calendar_service.update_event(db, event.id, **updates)
+                event = await _in_writer(calendar_service.update_event, event.id, **updates)
                 return (
                     f"Updated event '{event.title}'.",
                     {"action_type": "event_updated", "module": "events", "event_id": event.id, "event_title": event.title},
@@ -523,7 +571,7 @@ class Orchestrator:
                     return f"I couldn't find an event matching '{title}'. Try checking your calendar first.", None
                 deleted_title = event.title
                 deleted_id = event.id
-                await calendar_service.delete_event(db, event.id)
+                await _in_writer(calendar_service.delete_event, event.id)
                 return (
                     f"Deleted event '{deleted_title}'.",
                     {"action_type": "event_deleted", "module": "events", "event_id": deleted_id, "event_title": deleted_title},
@@ -603,48 +651,35 @@ class Orchestrator:
             action = MODULE_INTENTS.get(intent, intent)
             return f"I tried to {action} but something went wrong. Please try again.", None
 
-    async def _build_project_context(self, db: AsyncSession, project_todo_id: str) -> str:
-        """Build project context string for AI system prompt."""
-        project = await db.get(Todo, project_todo_id)
-        if not project:
-            return ""
-        q = select(Todo).where(Todo.parent_id == project_todo_id)
-        subtasks = (await db.execute(q)).scalars().all()
-
-        ctx = f"\n\n[Project: {project.title}]\n"
-        if project.description:
-            ctx += f"Project Notes:\n{project.description}\n"
-        if subtasks:
-            ctx += f"Tasks ({len(subtasks)}):\n"
-            for t in subtasks:
-                ctx += f"  - [{t.status}] {t.title}"
-                if t.priority != "medium":
-                    ctx += f" ({t.priority})"
-                ctx += "\n"
-        return ctx
-
-    async def _generate_title(
-        self,
-        db: AsyncSession,
-        conv: Conversation,
-        user_message: str,
-        user_id: str,
-    ):
-        """Auto-generate a conversation title from the first user message."""
+    async def _new_title(self, conversation_id: str, user_message: str) -> str | None:
         try:
-            title = await self.active_ai.generate_title(user_message)
-            conv.title = title
-            # Notify client of title update via WS
-            await self.ws.send_json(user_id, {
-                "type": "conversation_updated",
-                "data": {"conversation_id": conv.id, "title": title},
-            })
+            return await self.active_ai.generate_title(user_message)
         except Exception:
-            logger.warning("Failed to generate title for conversation %s", conv.id)
+            logger.warning("Failed to generate title for conversation %s", conversation_id)
+            return None
+
+    async def _announce_title(self, user_id: str, conversation_id: str, title: str) -> None:
+        await self.ws.send_json(user_id, {
+            "type": "conversation_updated",
+            "data": {"conversation_id": conversation_id, "title": title},
+        })
+
+    async def _generate_title(self, user_id: str, conversation_id: str, user_message: str):
+        """Auto-generate a conversation title from the first user message."""
+        title = await self._new_title(conversation_id, user_message)
+        if not title:
+            return
+
+        async def save(session: AsyncSession) -> None:
+            conv = await session.get(Conversation, conversation_id)
+            if conv and not conv.title:
+                conv.title = title
+
+        await db_writer.run(save)
+        await self._announce_title(user_id, conversation_id, title)
 
     async def _send_assistant_message(
         self,
-        db: AsyncSession,
         user_id: str,
         conversation_id: str,
         intent: str,
@@ -652,19 +687,21 @@ class Orchestrator:
         metadata: dict | None = None,
     ):
         msg_id = make_id("msg_")
-        msg = Message(
-            id=msg_id,
-            conversation_id=conversation_id,
-            role="assistant",
-            content=text,
-            intent=intent,
-            metadata_json=json.dumps(metadata) if metadata else None,
-        )
-        db.add(msg)
 
-        conv = await db.get(Conversation, conversation_id)
-        if conv:
-            conv.updated_at = datetime.now(timezone.utc)
+        async def insert(session: AsyncSession) -> None:
+            session.add(Message(
+                id=msg_id,
+                conversation_id=conversation_id,
+                role="assistant",
+                content=text,
+                intent=intent,
+                metadata_json=json.dumps(metadata) if metadata else None,
+            ))
+            conv = await session.get(Conversation, conversation_id)
+            if conv:
+                conv.updated_at = datetime.now(timezone.utc)
+
+        await db_writer.run(insert)
 
         await self.ws.send_json(user_id, {
             "type": "stream_start",
@@ -684,20 +721,25 @@ class Orchestrator:
 
     async def _send_error_message(
         self,
-        db: AsyncSession,
         user_id: str,
         conversation_id: str,
         text: str,
     ):
         msg_id = make_id("msg_")
-        msg = Message(
-            id=msg_id,
-            conversation_id=conversation_id,
-            role="assistant",
-            content=text,
-            message_type="system",
-        )
-        db.add(msg)
+
+        async def insert(session: AsyncSession) -> None:
+            session.add(Message(
+                id=msg_id,
+                conversation_id=conversation_id,
+                role="assistant",
+                content=text,
+                message_type="system",
+            ))
+
+        try:
+            await db_writer.run(insert)
+        except Exception:
+            logger.exception("Failed to save error message for conversation %s", conversation_id)
 
         await self.ws.send_json(user_id, {
             "type": "stream_start",
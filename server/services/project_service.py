@@ -0,0 +1,167 @@
+"""Project list query and its response cache.
+
+A root todo is a project if it has subtasks, a linked (unarchived)
+conversation, or an explicit source such as ``obsidian_project``.  The list is
+built by one statement: subtask counts and the linked conversation come from
+grouped subqueries that are LEFT JOINed onto the root todos, and the total
+comes from a window count over the same rows.
+
+Results are cached per (filters, page) for ``projects_cache_ttl_seconds``.
+Todo writes call ``project_cache.invalidate()`` via ``_notify_todo_change``;
+the TTL bounds staleness for writers that don't broadcast (e.g. vault sync).
+"""
+
+import time
+
+from sqlalchemy import case, func, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from config import settings
+from models.conversation import Conversation
+from models.todo import Todo
+from schemas.todo import ProjectTodoResponse
+from utils import deserialize_tags
+
+
+class ProjectListCache:
+    """Small TTL cache keyed by query parameters, dropped wholesale on change."""
+
+    def __init__(self, ttl_seconds: float, max_entries: int = 64):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: dict[tuple, tuple[float, object]] = {}
+        # Bumped on every invalidation so a query that raced with a write
+        # doesn't store its (possibly stale) result.
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: tuple):
+        entry = self._entries.get(key)
+        if entry is None or entry[0] < time.monotonic():
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry[1]
+
+    def set(self, key: tuple, value, generation: int) -> None:
+        if self.ttl_seconds <= 0 or generation != self.generation:
+            return
+        if len(self._entries) >= self.max_entries:
+            self._entries.clear()
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+
+    def invalidate(self) -> None:
+        self.generation += 1
+        self._entries.clear()
+
+
+project_cache = ProjectListCache(settings.projects_cache_ttl_seconds)
+
+
+def _projects_query(*, status: str | None, source: str | None, search: str | None):
+    subtasks = (
+        select(
+            Todo.parent_id.label("project_id"),
+            func.count().label("subtask_count"),
+            func.count(case((Todo.status == "completed", 1))).label("completed_count"),
+        )
+        .where(Todo.parent_id.is_not(None))
+        .group_by(Todo.parent_id)
+        .subquery()
+    )
+    conversations = (
+        select(
+            Conversation.project_todo_id.label("project_id"),
+            func.min(Conversation.id).label("conversation_id"),
+        )
+        .where(
+            Conversation.project_todo_id.is_not(None),
+            Conversation.is_archived == False,  # noqa: E712
+        )
+        .group_by(Conversation.project_todo_id)
+        .subquery()
+    )
+
+    conditions = [
+        Todo.parent_id.is_(None),
+        or_(
+            subtasks.c.subtask_count > 0,
+            conversations.c.conversation_id.is_not(None),
+            func.coalesce(Todo.source, "") != "",
+        ),
+    ]
+    if status is not None:
+        conditions.append(Todo.status == status)
+    if source is not None:
+        conditions.append(Todo.source == source)
+    if search:
+        conditions.append(Todo.title.ilike(f"%{search}%"))
+
+    return (
+        select(
+            Todo,
+            func.coalesce(subtasks.c.subtask_count, 0),
+            func.coalesce(subtasks.c.completed_count, 0),
+            conversations.c.conversation_id,
+            func.count().over().label("total"),
+        )
+        .outerjoin(subtasks, subtasks.c.project_id == Todo.id)
+        .outerjoin(conversations, conversations.c.project_id == Todo.id)
+        .where(*conditions)
+        .order_by(Todo.updated_at.desc(), Todo.id)
+    )
+
+
+async def list_projects(
+    db: AsyncSession,
+    *,
+    status: str | None = None,
+    source: str | None = None,
+    search: str | None = None,
+    page: int = 1,
+    limit: int = 100,
+) -> tuple[list[ProjectTodoResponse], int]:
+    key = (status, source, search, page, limit)
+    cached = project_cache.get(key)
+    if cached is not None:
+        return cached
+
+    generation = project_cache.generation
+    q = _projects_query(status=status, source=source, search=search)
+    rows = (await db.execute(q.offset((page - 1) * limit).limit(limit))).all()
+    if rows:
+        total = rows[0].total
+    elif page > 1:
+        # Past the last page the window count has no row to ride on.
+        count_q = select(func.count()).select_from(q.order_by(None).subquery())
+        total = (await db.execute(count_q)).scalar() or 0
+    else:
+        total = 0
+
+    items = [
+        ProjectTodoResponse(
+            id=todo.id,
+            title=todo.title,
+            description=todo.description,
+            status=todo.status,
+            priority=todo.priority,
+            due_date=todo.due_date,
+            completed_at=todo.completed_at,
+            tags=deserialize_tags(todo.tags) if todo.tags else None,
+            parent_id=todo.parent_id,
+            sort_order=todo.sort_order,
+            source=todo.source,
+            source_id=todo.source_id,
+            assignee=todo.assignee,
+            created_at=todo.created_at,
+            updated_at=todo.updated_at,
+            conversation_id=conversation_id,
+            subtask_count=subtask_count,
+            completed_subtask_count=completed_count,
+        )
+        for todo, subtask_count, completed_count, conversation_id, _ in rows
+    ]
+    result = (items, total)
+    project_cache.set(key, result, generation)
+    return result
@@ -6,9 +6,11 @@ from datetime import datetime, time, timedelta, timezone
 
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
+import database
 from config import settings
 from services import briefing_service, reminder_service, nudge_service, weekly_review_service
 from services.ai_service import AIService
+from services.llm_scheduler import Priority, llm_priority
 from ws.manager import ConnectionManager
 
 # Lazy imports for optional vault services
@@ -54,12 +56,24 @@ class Scheduler:
         self._tasks: list[asyncio.Task] = []
 
     def start(self) -> None:
+        # Tasks copy the current context, so every loop inherits SCHEDULED priority.
+        with llm_priority(Priority.SCHEDULED):
+            self._start_loops()
+        logger.info("Scheduler started with %d background tasks", len(self._tasks))
+
+    def _start_loops(self) -> None:
         self._tasks = [
             asyncio.create_task(self._reminder_loop(), name="scheduler-reminders"),
             asyncio.create_task(self._briefing_loop(), name="scheduler-briefing"),
             asyncio.create_task(self._midnight_reset_loop(), name="scheduler-midnight"),
         ]
 
+        # SQLite maintenance (PRAGMA optimize + WAL checkpoint)
+        if settings.database_url.startswith("sqlite") and settings.sqlite_tuning_enabled:
+            self._tasks.append(
+                asyncio.create_task(self._sqlite_maintenance_loop(), name="scheduler-sqlite")
+            )
+
         # Weekly review loop
         if settings.enable_weekly_review:
             self._tasks.append(
@@ -85,8 +99,6 @@ class Scheduler:
                 asyncio.create_task(self._vault_queue_flush_loop(), name="scheduler-vault-queue")
             )
 
-        logger.info("Scheduler started with %d background tasks", len(self._tasks))
-
     async def stop(self) -> None:
         for task in self._tasks:
             task.cancel()
@@ -169,6 +181,33 @@ class Scheduler:
         except asyncio.CancelledError:
             logger.debug("Midnight reset loop cancelled")
 
+    async def _sqlite_maintenance_loop(self) -> None:
+        checkpoint_every = settings.sqlite_checkpoint_interval_minutes * 60
+        optimize_every = settings.sqlite_optimize_interval_minutes * 60
+        interval = min(i for i in (checkpoint_every, optimize_every, 3600) if i > 0)
+        logger.info("SQLite maintenance loop started (interval: %ds)", interval)
+        last_checkpoint = last_optimize = asyncio.get_running_loop().time()
+        try:
+            while True:
+                await asyncio.sleep(interval)
+                now = asyncio.get_running_loop().time()
+                try:
+                    if checkpoint_every > 0 and now - last_checkpoint >= checkpoint_every:
+                        busy, wal_pages, done = await database.checkpoint_wal()
+                        last_checkpoint = now
+                        logger.debug("WAL checkpoint: %d/%d pages (busy=%d)", done, wal_pages, busy)
+                    if optimize_every > 0 and now - last_optimize >= optimize_every:
+                        await database.optimize_db()
+                        pruned = await database.prune_change_log(
+                            settings.sync_change_log_retention_days
+                        )
+                        last_optimize = now
+                        logger.debug("PRAGMA optimize complete, pruned %d change-log rows", pruned)
+                except Exception:
+                    logger.exception("Error in SQLite maintenance loop")
+        except asyncio.CancelledError:
+            logger.debug("SQLite maintenance loop cancelled")
+
     async def _weekly_review_loop(self) -> None:
         """Run weekly on configured day/time to generate a GTD review."""
         logger.info(
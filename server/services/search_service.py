@@ -1,11 +1,282 @@
-from datetime import datetime
+"""Full-text search across messages, todos and events.
 
-from sqlalchemy import text
+Queries go through tiers until one matches (``TIERS``):
+
+- ``exact``  — every token as a literal on the ``*_fts`` tables;
+- ``prefix`` — every token as a prefix (``"sched"*``), answered by the
+  ``prefix='2 3'`` indexes, so search-as-you-type works from two letters;
+- ``fuzzy``  — rows sharing at least two trigrams with a token, on the
+  ``*_trigram`` shadow tables, so misspellings still find and rank the
+  closest rows first.  Skipped when SQLite lacks the trigram tokenizer or
+  ``SEARCH_FUZZY_ENABLED`` is off.
+
+Each tier's time is reported with the result.  Within a tier, one statement
+ranks and pages every enabled table: a ``UNION ALL`` of
+``(type, rowid, bm25)`` legs, ordered and limited inside SQLite (each leg is
+a top-N sort, merged), so only the page's rows ever reach Python.  Titles,
+timestamps and ``snippet()`` previews are then joined onto those rows alone;
+the indexes are external-content, so an index rowid is its source row's rowid.
+
+Totals are exact up to ``SEARCH_TOTAL_CAP`` and reported as capped beyond
+it; when the page itself shows where the results end, no count runs at all.
+
+``semantic_search`` answers ``mode=semantic`` from the local vector index
+(``embedding_service``), which also covers vault notes, and ``mode=hybrid``
+by fusing that ranking with the keyword one (reciprocal rank fusion).
+Without an index both fall back to keyword search.
+"""
+
+import logging
+import re
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+
+from sqlalchemy import bindparam, text
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from config import settings
 from schemas.search import SearchHit
+from services import embedding_service
+
+logger = logging.getLogger(__name__)
 
 ALL_TYPES = ["messages", "todos", "events"]
+TIERS = ("exact", "prefix", "fuzzy")
+MODES = ("keyword", "semantic", "hybrid")
+NOTE_TYPE = "notes"  # vault notes: semantic and hybrid modes only
+
+SNIPPET_TOKENS = 24
+FUZZY_MAX_TRIGRAMS = 8  # per token; bounds the pairwise fuzzy query
+HIGHLIGHT_OPEN = "<mark>"
+HIGHLIGHT_CLOSE = "</mark>"
+RRF_K = 60  # reciprocal rank fusion damping; 60 is the usual choice
+PREVIEW_CHARS = 160  # previews of rows found by the vector index alone
+
+
+@dataclass
+class SearchResult:
+    hits: list[SearchHit]
+    total: int
+    total_capped: bool = False
+    tier: str | None = None  # the tier that produced the hits
+    timings_ms: dict[str, float] = field(default_factory=dict)
+    mode: str = "keyword"  # the mode that answered
+
+
+@dataclass(frozen=True)
+class _Source:
+    hit_type: str
+    table: str
+    title: str  # SQL expression over the base-table alias, or NULL
+    column: int  # snippet column; -1 lets FTS5 pick the best-matching one
+    body: str  # SQL preview text for hits without a snippet, over the same alias
+
+
+_SOURCES = {
+    "messages": _Source("message", "messages", "NULL", 1, "{alias}.content"),
+    "todos": _Source(
+        "todo", "todos", "{alias}.title", -1, "COALESCE({alias}.description, {alias}.title)"
+    ),
+    "events": _Source(
+        "event", "events", "{alias}.title", -1,
+        "COALESCE({alias}.description, {alias}.location, {alias}.title)",
+    ),
+}
+
+# vector index kind per requested type
+_VECTOR_KINDS = {**{t: s.hit_type for t, s in _SOURCES.items()}, NOTE_TYPE: "note"}
+
+# index table suffix per tier
+_TIER_INDEX = {"exact": "_fts", "prefix": "_fts", "fuzzy": "_trigram"}
+
+
+def _quote(term: str) -> str:
+    return '"{}"'.format(term.replace('"', '""'))
+
+
+def _fts_query(query: str) -> str:
+    """Quote every token so FTS5 treats user input as literals."""
+    return " ".join(_quote(token) for token in query.split())
+
+
+def _prefix_query(query: str) -> str:
+    return " ".join(f"{_quote(token)}*" for token in query.split())
+
+
+def _fuzzy_query(query: str) -> str:
+    """Match rows sharing at least two trigrams with some query token.
+
+    One shared trigram ("den" in garden/dentist) is noise, so a token with
+    three or more trigrams becomes an OR of trigram pairs; bm25 then ranks
+    rows sharing more of them first.
+    """
+    clauses = []
+    for token in dict.fromkeys(query.lower().split()):
+        trigrams = list(dict.fromkeys(token[i:i + 3] for i in range(len(token) - 2)))
+        trigrams = trigrams[:FUZZY_MAX_TRIGRAMS]
+        if len(trigrams) < 3:
+            clauses += [_quote(t) for t in trigrams]
+            continue
+        clauses += [
+            f"({_quote(a)} AND {_quote(b)})"
+            for i, a in enumerate(trigrams)
+            for b in trigrams[i + 1:]
+        ]
+    return " OR ".join(dict.fromkeys(clauses))
+
+
+_TIER_QUERY = {"exact": _fts_query, "prefix": _prefix_query, "fuzzy": _fuzzy_query}
+
+_WORD = re.compile(r"\w+")
+
+
+def _trigrams(word: str) -> set[str]:
+    return {word[i:i + 3] for i in range(len(word) - 2)}
+
+
+def _fuzzy_excerpt(texts: list[str], query: str) -> tuple[str, str]:
+    """Preview and highlight for a fuzzy hit, built from the row's own text.
+
+    ``snippet()`` on a trigram index marks overlapping trigrams, which garbles
+    the text ("<mark>den</mark>tist<mark>ent</mark>ist"), so whole words that
+    share trigrams with a query token are marked here instead, under the same
+    rule as ``_fuzzy_query``.  The first of *texts* with such a word is used.
+    """
+    tokens = [t for t in (_trigrams(w) for w in dict.fromkeys(query.lower().split())) if t]
+    body, spans = texts[0], []
+    for candidate in texts:
+        spans = [
+            m.span() for m in _WORD.finditer(candidate)
+            if any(len(_trigrams(m.group().lower()) & t) >= min(2, len(t)) for t in tokens)
+        ]
+        if spans:
+            body = candidate
+            break
+    start = 0
+    if spans and len(body) > PREVIEW_CHARS:
+        start = max(0, min(spans[0][0] - PREVIEW_CHARS // 4, len(body) - PREVIEW_CHARS))
+    end = min(len(body), start + PREVIEW_CHARS)
+    head = "…" if start else ""
+    tail = "…" if end < len(body) else ""
+    marked, pos = [], start
+    for a, b in spans:
+        if a < start or b > end:
+            continue
+        marked += [body[pos:a], HIGHLIGHT_OPEN, body[a:b], HIGHLIGHT_CLOSE]
+        pos = b
+    marked.append(body[pos:end])
+    return head + body[start:end] + tail, head + "".join(marked) + tail
+
+
+def _snippet(index: str, column: int, open_mark: str, close_mark: str) -> str:
+    # the FTS5 hidden column shares the table's name, whatever the alias
+    return (
+        f"snippet({index}, {column}, '{open_mark}', '{close_mark}', "
+        f"'…', {SNIPPET_TOKENS})"
+    )
+
+
+def _page_sql(sources: list[_Source], suffix: str, snippets: bool = True) -> str:
+    legs = " UNION ALL ".join(
+        f"SELECT '{s.hit_type}' AS type, rowid AS rid, bm25({s.table}{suffix}) AS rank"
+        f" FROM {s.table}{suffix} WHERE {s.table}{suffix} MATCH :q"
+        for s in sources
+    )
+    joins, ids, titles, created, previews, highlights = [], [], [], [], [], []
+    for i, s in enumerate(sources):
+        f, b, index = f"f{i}", f"b{i}", f"{s.table}{suffix}"
+        # snippet() must only run on the row its own table matched, so every
+        # per-type column is a lazily evaluated CASE on page.type
+        if snippets:
+            joins.append(
+                f"LEFT JOIN {index} AS {f} ON page.type = '{s.hit_type}'"
+                f" AND {f}.rowid = page.rid AND {index} MATCH :q"
+            )
+        joins.append(
+            f"LEFT JOIN {s.table} AS {b} ON page.type = '{s.hit_type}' AND {b}.rowid = page.rid"
+        )
+        ids.append(f"WHEN '{s.hit_type}' THEN {b}.id")
+        created.append(f"WHEN '{s.hit_type}' THEN {b}.created_at")
+        titles.append(f"WHEN '{s.hit_type}' THEN {s.title.format(alias=b)}")
+        if snippets:
+            previews.append(f"WHEN '{s.hit_type}' THEN {_snippet(index, s.column, '', '')}")
+            highlights.append(
+                f"WHEN '{s.hit_type}' THEN "
+                f"{_snippet(index, s.column, HIGHLIGHT_OPEN, HIGHLIGHT_CLOSE)}"
+            )
+        else:
+            # fuzzy tier: the source text, excerpted by _fuzzy_excerpt
+            previews.append(f"WHEN '{s.hit_type}' THEN {s.body.format(alias=b)}")
+            highlights.append(f"WHEN '{s.hit_type}' THEN NULL")
+    return f"""
+        WITH page AS (
+            SELECT type, rid, rank FROM ({legs})
+            ORDER BY rank, type, rid
+            LIMIT :limit OFFSET :offset
+        )
+        SELECT page.type, page.rank,
+            CASE page.type {" ".join(ids)} END AS id,
+            CASE page.type {" ".join(titles)} END AS title,
+            CASE page.type {" ".join(created)} END AS created_at,
+            CASE page.type {" ".join(previews)} END AS preview,
+            CASE page.type {" ".join(highlights)} END AS highlight
+        FROM page
+        {" ".join(joins)}
+        ORDER BY page.rank, page.type, page.rid
+    """
+
+
+def _count_sql(sources: list[_Source], suffix: str) -> str:
+    legs = " + ".join(
+        f"(SELECT count(*) FROM (SELECT 1 FROM {s.table}{suffix}"
+        f" WHERE {s.table}{suffix} MATCH :q LIMIT :cap))"
+        for s in sources
+    )
+    return f"SELECT {legs}"
+
+
+async def _has_trigram_index(db: AsyncSession) -> bool:
+    row = await db.execute(
+        text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'messages_trigram'")
+    )
+    return row.scalar() is not None
+
+
+async def _search_tier(
+    db: AsyncSession, sources: list[_Source], tier: str, query: str, page: int, limit: int
+) -> tuple[list[SearchHit], int, bool]:
+    offset = (page - 1) * limit
+    suffix, match, fuzzy = _TIER_INDEX[tier], _TIER_QUERY[tier](query), tier == "fuzzy"
+    rows = (await db.execute(
+        text(_page_sql(sources, suffix, snippets=not fuzzy)),
+        {"q": match, "limit": limit, "offset": offset},
+    )).fetchall()
+    hits = []
+    for r in rows:
+        preview, highlight = r.preview, r.highlight
+        texts = [t for t in (preview, r.title) if t]
+        if fuzzy and texts:
+            preview, highlight = _fuzzy_excerpt(texts, query)
+        hits.append(SearchHit(
+            type=r.type,
+            id=r.id,
+            title=r.title,
+            preview=preview or r.title or "",
+            highlight=highlight,
+            rank=r.rank,
+            created_at=_parse_dt(r.created_at),
+        ))
+
+    # a short page (with rows, or on page 1) already tells where the results end
+    if len(rows) < limit and (rows or page == 1):
+        return hits, offset + len(rows), False
+
+    cap = settings.search_total_cap
+    counted = (await db.execute(
+        text(_count_sql(sources, suffix)), {"q": match, "cap": cap + 1}
+    )).scalar() or 0
+    return hits, min(counted, cap), counted > cap
 
 
 async def search(
@@ -14,90 +285,125 @@ async def search(
     types: list[str] | None = None,
     page: int = 1,
     limit: int = 20,
-) -> tuple[list[SearchHit], int]:
-    """Full-text search across messages, todos, and events."""
-    enabled = types or ALL_TYPES
-    hits: list[SearchHit] = []
+    tiers: tuple[str, ...] = TIERS,
+) -> SearchResult:
+    """One page of ranked results from the first tier that matches anything."""
+    sources = [_SOURCES[t] for t in (types or ALL_TYPES) if t in _SOURCES]
+    timings: dict[str, float] = {}
+    if not sources:
+        return SearchResult([], 0)
 
-    # Sanitize query for FTS5: wrap each token in double quotes to treat as literals
-    fts_query = " ".join(f'"{token}"' for token in query.split() if token)
-    if not fts_query:
-        return [], 0
+    for tier in tiers:
+        match = _TIER_QUERY[tier](query)
+        if not match:
+            continue
+        if tier == "fuzzy" and not (
+            settings.search_fuzzy_enabled and await _has_trigram_index(db)
+        ):
+            continue
+        started = time.perf_counter()
+        hits, total, capped = await _search_tier(db, sources, tier, query, page, limit)
+        timings[tier] = round((time.perf_counter() - started) * 1000, 2)
+        if total:
+            logger.debug("Search %r answered by %s tier (%s)", query, tier, timings)
+            return SearchResult(hits, total, capped, tier, timings)
 
-    if "messages" in enabled:
-        rows = (await db.execute(
-            text("""
-                SELECT f.id, f.content, bm25(messages_fts) AS rank, m.created_at
-                FROM messages_fts f
-                JOIN messages m ON m.id = f.id
-                WHERE messages_fts MATCH :q
-                ORDER BY rank
-            """),
-            {"q": fts_query},
-        )).fetchall()
-        for r in rows:
-            preview = r.content[:200] if r.content else ""
-            hits.append(SearchHit(
-                type="message",
-                id=r.id,
-                title=None,
-                preview=preview,
-                rank=r.rank,
-                created_at=_parse_dt(r.created_at),
-            ))
+    return SearchResult([], 0, timings_ms=timings)
 
-    if "todos" in enabled:
-        rows = (await db.execute(
-            text("""
-                SELECT f.id, f.title, f.description, bm25(todos_fts) AS rank, t.created_at
-                FROM todos_fts f
-                JOIN todos t ON t.id = f.id
-                WHERE todos_fts MATCH :q
-                ORDER BY rank
-            """),
-            {"q": fts_query},
-        )).fetchall()
-        for r in rows:
-            preview = r.description[:200] if r.description else r.title
-            hits.append(SearchHit(
-                type="todo",
-                id=r.id,
-                title=r.title,
-                preview=preview,
-                rank=r.rank,
-                created_at=_parse_dt(r.created_at),
-            ))
 
-    if "events" in enabled:
+async def _load_hits(db: AsyncSession, keys: list[tuple[str, str]]) -> dict[tuple[str, str], SearchHit]:
+    """Hits for (type, id) keys found by the vector index alone, one query per type."""
+    hits = {}
+    for source in _SOURCES.values():
+        ids = [ref for hit_type, ref in keys if hit_type == source.hit_type]
+        if not ids:
+            continue
         rows = (await db.execute(
-            text("""
-                SELECT f.id, f.title, f.description, f.location, bm25(events_fts) AS rank, e.created_at
-                FROM events_fts f
-                JOIN events e ON e.id = f.id
-                WHERE events_fts MATCH :q
-                ORDER BY rank
-            """),
-            {"q": fts_query},
-        )).fetchall()
+            text(
+                f"SELECT id, {source.title.format(alias=source.table)} AS title,"
+                f" substr({source.body.format(alias=source.table)}, 1, {PREVIEW_CHARS}) AS preview,"
+                f" created_at"
+                f" FROM {source.table} WHERE id IN :ids"
+            ).bindparams(bindparam("ids", expanding=True)),
+            {"ids": ids},
+        )).all()
         for r in rows:
-            parts = [p for p in [r.description, r.location] if p]
-            preview = " | ".join(parts)[:200] if parts else r.title
-            hits.append(SearchHit(
-                type="event",
+            hits[(source.hit_type, r.id)] = SearchHit(
+                type=source.hit_type,
                 id=r.id,
                 title=r.title,
-                preview=preview,
-                rank=r.rank,
+                preview=r.preview or r.title or "",
+                rank=0.0,
                 created_at=_parse_dt(r.created_at),
-            ))
+            )
+    return hits
+
+
+def _note_hit(hit) -> SearchHit:
+    return SearchHit(
+        type="note",
+        id=hit.ref,
+        title=hit.title,
+        preview=hit.preview or "",
+        rank=0.0,
+        created_at=datetime.fromtimestamp(hit.updated_at or 0, timezone.utc),
+    )
+
+
+async def semantic_search(
+    db: AsyncSession,
+    query: str,
+    types: list[str] | None = None,
+    page: int = 1,
+    limit: int = 20,
+    mode: str = "semantic",
+) -> SearchResult:
+    """One page ranked by embedding similarity, or fused with bm25 (``hybrid``).
+
+    Each ranking contributes its top ``SEARCH_HYBRID_CANDIDATES`` (or enough
+    for the page), so the fused total is bounded by that depth.  ``rank`` is
+    the negated score, keeping "lower is better" as with bm25.
+    """
+    types = types or [*ALL_TYPES, NOTE_TYPE]
+    keyword_types = [t for t in types if t in _SOURCES]
+    if embedding_service.get_index() is None:
+        return await search(db, query, keyword_types, page, limit)
+
+    kinds = [_VECTOR_KINDS[t] for t in types if t in _VECTOR_KINDS]
+    depth = max(settings.search_hybrid_candidates, page * limit)
+    started = time.perf_counter()
+    vector_hits = await embedding_service.query(query, kinds, depth)
+    timings = {"semantic": round((time.perf_counter() - started) * 1000, 2)}
 
-    # Sort all hits by bm25 rank (lower = more relevant)
-    hits.sort(key=lambda h: h.rank)
-    total = len(hits)
+    scores: dict[tuple[str, str], float] = {}
+    found: dict[tuple[str, str], SearchHit] = {}
+    tier = None
+    if mode == "hybrid" and keyword_types:
+        keyword = await search(db, query, keyword_types, 1, depth)
+        timings.update(keyword.timings_ms)
+        tier = keyword.tier
+        for position, hit in enumerate(keyword.hits):
+            key = (hit.type, hit.id)
+            found[key] = hit
+            scores[key] = 1 / (RRF_K + position + 1)
+    for position, hit in enumerate(vector_hits):
+        key = (hit.kind, hit.ref)
+        if hit.kind == "note":
+            found[key] = _note_hit(hit)
+        if mode == "hybrid":
+            scores[key] = scores.get(key, 0.0) + 1 / (RRF_K + position + 1)
+        else:
+            scores[key] = hit.score
 
-    # Paginate
-    start = (page - 1) * limit
-    return hits[start : start + limit], total
+    ranked = sorted(scores, key=lambda key: (-scores[key], key))
+    window = ranked[(page - 1) * limit:page * limit]
+    found.update(await _load_hits(db, [key for key in window if key not in found]))
+    # a row deleted since it was embedded is simply skipped
+    hits = [
+        found[key].model_copy(update={"rank": -scores[key]})
+        for key in window if key in found
+    ]
+    return SearchResult(hits, len(ranked), False, tier, timings, mode)
 
 
 def _parse_dt(val) -> datetime:
@@ -0,0 +1,123 @@
+"""Speculative general-chat streaming.
+
+When enabled, the orchestrator starts the general-chat completion at the same
+time as LLM intent classification instead of after it.  Tokens are buffered
+(nothing reaches the client, so no ``stream_start`` is sent) until the
+classifier answers:
+
+- ``general_chat`` → the buffered tokens are replayed and the stream continues
+  live, saving up to one full classification round trip of first-token latency.
+- any other intent → the stream is cancelled and the work is counted as wasted.
+"""
+
+import asyncio
+import logging
+import time
+from collections.abc import AsyncIterator
+from dataclasses import dataclass
+
+logger = logging.getLogger(__name__)
+
+_DONE = object()
+
+
+@dataclass
+class SpeculationStats:
+    started: int = 0
+    used: int = 0
+    wasted: int = 0
+    wasted_tokens: int = 0
+    wasted_ms_total: float = 0.0
+    saved_ms_total: float = 0.0
+
+    def snapshot(self) -> dict:
+        decided = self.used + self.wasted
+        return {
+            "started": self.started,
+            "used": self.used,
+            "wasted": self.wasted,
+            "waste_ratio": round(self.wasted / decided, 3) if decided else 0.0,
+            "wasted_tokens": self.wasted_tokens,
+            "wasted_ms_total": round(self.wasted_ms_total, 1),
+            "saved_ms_total": round(self.saved_ms_total, 1),
+            "avg_saved_ms": round(self.saved_ms_total / self.used, 1) if self.used else 0.0,
+        }
+
+
+speculation_stats = SpeculationStats()
+
+
+class SpeculativeStream:
+    """Pull tokens from *token_iterator* in the background until claimed or cancelled."""
+
+    def __init__(self, token_iterator: AsyncIterator[str]):
+        self._iterator = token_iterator
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._buffered = 0
+        self._started_at = time.perf_counter()
+        self._first_token_at: float | None = None
+        self._settled = False
+        speculation_stats.started += 1
+        self._task = asyncio.create_task(self._pump(), name="speculative-chat")
+
+    async def _pump(self) -> None:
+        try:
+            async for token in self._iterator:
+                if self._first_token_at is None:
+                    self._first_token_at = time.perf_counter()
+                self._buffered += 1
+                self._queue.put_nowait(token)
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            # Re-raised on the consumer side so the caller's error handling applies.
+            self._queue.put_nowait(exc)
+        finally:
+            self._queue.put_nowait(_DONE)
+
+    async def claim(self) -> AsyncIterator[str]:
+        """Yield buffered tokens, then the rest of the live stream."""
+        classified_at = time.perf_counter()
+        self._settled = True
+        speculation_stats.used += 1
+        first = True
+        try:
+            while True:
+                item = await self._queue.get()
+                if item is _DONE:
+                    return
+                if isinstance(item, BaseException):
+                    raise item
+                if first:
+                    first = False
+                    # Without speculation the first token would have arrived one
+                    # classification round trip later than it does now.
+                    ttft = (self._first_token_at or time.perf_counter()) - self._started_at
+                    classify = classified_at - self._started_at
+                    speculation_stats.saved_ms_total += min(ttft, classify) * 1000
+                yield item
+        finally:
+            # The consumer stopped early (disconnect, downstream error): stop
+            # pulling the rest of the completion in the background.
+            await self._stop_pump()
+
+    async def _stop_pump(self) -> None:
+        if self._task.done():
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        except Exception:
+            logger.debug("Speculative stream raised during cancellation", exc_info=True)
+
+    async def cancel(self) -> None:
+        """Abort the speculative completion and record it as wasted."""
+        if self._settled:
+            return
+        self._settled = True
+        speculation_stats.wasted += 1
+        speculation_stats.wasted_tokens += self._buffered
+        speculation_stats.wasted_ms_total += (time.perf_counter() - self._started_at) * 1000
+        await self._stop_pump()
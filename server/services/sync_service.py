@@ -0,0 +1,146 @@
+"""Delta sync over the trigger-fed ``change_log``.
+
+Triggers on todos, events, conversations and messages append one row per
+insert, update or delete (see ``database.SYNCED_TABLES``).  A sync token is a
+``change_log.seq``; ``changes_since`` collapses the rows after it to the last
+operation per entity, then loads the surviving rows with one ``IN`` query per
+table.  A request therefore costs O(changes), not O(rows).
+
+A token the log can no longer answer — older than the pruned horizon, or
+ahead of the database (a restored or recreated file) — yields ``reset=True``:
+the client refetches its lists and continues from the returned token.
+"""
+
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from exceptions import ValidationError
+from models.conversation import Conversation
+from models.event import Event
+from models.message import Message
+from models.todo import Todo
+from schemas.calendar import EventResponse
+from schemas.chat import ConversationResponse, MessageResponse
+from schemas.sync import SyncResponse
+from services import todo_service
+from utils import deserialize_tags
+
+_MODELS = {
+    "todos": Todo,
+    "events": Event,
+    "conversations": Conversation,
+    "messages": Message,
+}
+
+
+def _parse_token(token: str) -> int:
+    try:
+        seq = int(token)
+    except ValueError:
+        raise ValidationError("Invalid sync token")
+    if seq < 0:
+        raise ValidationError("Invalid sync token")
+    return seq
+
+
+async def current_seq(db: AsyncSession) -> int:
+    """Highest change-log sequence ever issued (survives pruning)."""
+    row = await db.execute(text("SELECT seq FROM sqlite_sequence WHERE name = 'change_log'"))
+    return row.scalar() or 0
+
+
+async def current_token(db: AsyncSession) -> str:
+    return str(await current_seq(db))
+
+
+async def change_notification(db: AsyncSession, module: str) -> dict:
+    """``module_data_changed`` payload carrying the token after the change."""
+    return {
+        "type": "module_data_changed",
+        "data": {"module": module, "sync_token": await current_token(db)},
+    }
+
+
+async def is_answerable(db: AsyncSession, since: int, head: int) -> bool:
+    """Whether the log still holds every change after *since* up to *head*."""
+    if since > head:
+        return False
+    if since == head:
+        return True
+    oldest = (await db.execute(text("SELECT MIN(seq) FROM change_log"))).scalar()
+    return oldest is not None and since >= oldest - 1
+
+
+def _event_response(event: Event) -> EventResponse:
+    resp = EventResponse.model_validate(event)
+    if event.tags:
+        resp.tags = deserialize_tags(event.tags)
+    return resp
+
+
+def _conversation_response(conv: Conversation) -> ConversationResponse:
+    return ConversationResponse(
+        id=conv.id,
+        title=conv.title,
+        created_at=conv.created_at,
+        updated_at=conv.updated_at,
+        is_archived=conv.is_archived,
+        last_message=conv.last_message_preview,
+        last_message_at=conv.last_message_at,
+        project_todo_id=conv.project_todo_id,
+    )
+
+
+async def changes_since(db: AsyncSession, since: str | None, limit: int) -> SyncResponse:
+    """Everything created, updated or deleted after *since*, at most *limit* entities."""
+    head = await current_seq(db)
+    if since is None:
+        return SyncResponse(token=str(head), reset=True)
+    since_seq = _parse_token(since)
+    if not await is_answerable(db, since_seq, head):
+        return SyncResponse(token=str(head), reset=True)
+
+    # Bare columns next to MAX() come from the row holding the maximum, so
+    # ``op`` is each entity's latest operation.
+    rows = (await db.execute(
+        text("""
+            SELECT entity, entity_id, op, MAX(seq) AS seq
+            FROM change_log
+            WHERE seq > :since AND seq <= :head
+            GROUP BY entity, entity_id
+            ORDER BY seq
+            LIMIT :limit
+        """),
+        {"since": since_seq, "head": head, "limit": limit + 1},
+    )).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    token = rows[-1].seq if has_more else head
+
+    upserts: dict[str, list[str]] = {entity: [] for entity in _MODELS}
+    deleted: dict[str, list[str]] = {entity: [] for entity in _MODELS}
+    for row in rows:
+        if row.entity in _MODELS:
+            (deleted if row.op == "delete" else upserts)[row.entity].append(row.entity_id)
+
+    loaded: dict[str, list] = {}
+    for entity, ids in upserts.items():
+        if not ids:
+            loaded[entity] = []
+            continue
+        model = _MODELS[entity]
+        found = (await db.execute(select(model).where(model.id.in_(ids)))).scalars().all()
+        loaded[entity] = list(found)
+        # deleted after the head was read: report it as gone
+        missing = set(ids) - {obj.id for obj in found}
+        deleted[entity].extend(i for i in ids if i in missing)
+
+    return SyncResponse(
+        token=str(token),
+        has_more=has_more,
+        todos=await todo_service.build_todo_responses(db, loaded["todos"]),
+        events=[_event_response(e) for e in loaded["events"]],
+        conversations=[_conversation_response(c) for c in loaded["conversations"]],
+        messages=[MessageResponse.model_validate(m) for m in loaded["messages"]],
+        deleted={entity: ids for entity, ids in deleted.items() if ids},
+    )
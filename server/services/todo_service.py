@@ -1,16 +1,26 @@
 """Async service layer for todo CRUD operations."""
 
+import json
 import logging
+from collections.abc import Sequence
 from datetime import datetime, timezone
 
-from sqlalchemy import func, select
+from sqlalchemy import case, delete, func, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from config import settings
 from exceptions import NotFoundError
+from models.agent_task import AgentTask
 from models.todo import Todo
-from services.obsidian_export_service import export_todo, remove_todo_from_vault
-from utils import apply_model_updates, make_id, serialize_tags
+from schemas.todo import TodoResponse
+from services.obsidian_export_service import (
+    export_todo,
+    export_todos,
+    remove_todo_from_vault,
+    remove_todos_from_vault,
+)
+from utils import apply_model_updates, deserialize_tags, make_id, serialize_tags
+from utils.inbox_display import get_next_action
 
 logger = logging.getLogger(__name__)
 
@@ -148,3 +158,156 @@ async def delete_todo(db: AsyncSession, todo_id: str) -> None:
 
     if settings.obsidian_vault_path:
         remove_todo_from_vault(settings.obsidian_vault_path, deleted_id)
+
+
+async def bulk_update_todos(
+    db: AsyncSession,
+    ids: list[str],
+    *,
+    values: dict,
+    delete_rows: bool = False,
+    reorder: bool = False,
+) -> tuple[list[str], list[str], list[str]]:
+    """Apply one change to many todos with set-based statements.
+
+    *values* holds the columns to set (``status``, ``priority``, ``tags``,
+    ``parent_id``); ``reorder`` sets ``sort_order`` to each id's position in
+    *ids*.  Returns ``(updated_ids, deleted_ids, errors)``; the caller commits
+    and then runs ``export_bulk_to_vault``.
+    """
+    ids = list(dict.fromkeys(ids))
+    found = set((await db.execute(select(Todo.id).where(Todo.id.in_(ids)))).scalars())
+    errors = [f"Todo {todo_id} not found" for todo_id in ids if todo_id not in found]
+    targets = [todo_id for todo_id in ids if todo_id in found]
+    if not targets:
+        return [], [], errors
+
+    if delete_rows:
+        await db.execute(delete(Todo).where(Todo.id.in_(targets)))
+        return [], targets, errors
+
+    now = datetime.now(timezone.utc)
+    values = {**values, "updated_at": now}
+    if "status" in values:
+        # completed keeps an existing completion time; anything else clears it
+        values["completed_at"] = (
+            func.coalesce(Todo.completed_at, now) if values["status"] == "completed" else None
+        )
+    if "parent_id" in values and values["parent_id"] is not None:
+        if values["parent_id"] in targets:
+            return [], [], errors + ["A todo cannot become its own parent"]
+        if await db.get(Todo, values["parent_id"]) is None:
+            return [], [], errors + [f"Parent todo {values['parent_id']} not found"]
+    if reorder:
+        values["sort_order"] = case(
+            {todo_id: position for position, todo_id in enumerate(targets)}, value=Todo.id
+        )
+
+    await db.execute(
+        update(Todo)
+        .where(Todo.id.in_(targets))
+        .values(values)
+        .execution_options(synchronize_session=False)
+    )
+    return targets, [], errors
+
+
+async def export_bulk_to_vault(
+    db: AsyncSession, updated_ids: list[str], deleted_ids: list[str]
+) -> None:
+    """Mirror a bulk change into the vault: one walk, one write per file."""
+    if not settings.obsidian_vault_path:
+        return
+    if deleted_ids:
+        remove_todos_from_vault(settings.obsidian_vault_path, deleted_ids)
+    if not updated_ids:
+        return
+    todos = (await db.execute(
+        select(Todo).where(Todo.id.in_(updated_ids)).execution_options(populate_existing=True)
+    )).scalars().all()
+    parent_ids = {t.parent_id for t in todos if t.parent_id}
+    titles = dict((await db.execute(
+        select(Todo.id, Todo.title).where(Todo.id.in_(parent_ids))
+    )).all()) if parent_ids else {}
+    export_todos(
+        settings.obsidian_vault_path,
+        list(todos),
+        {t.id: titles.get(t.parent_id) for t in todos if t.parent_id},
+    )
+
+
+# ---------------------------------------------------------------------------
+# Response building
+# ---------------------------------------------------------------------------
+
+
+def humanize_folder_name(source_id: str | None) -> str | None:
+    """Derive a human-readable project label from source_id (folder name)."""
+    if not source_id:
+        return None
+    return source_id.replace("_", " ").replace("-", " ").strip().title()
+
+
+def compute_sync_status(source: str | None) -> str | None:
+    """Derive Obsidian sync status from source field."""
+    if source == "obsidian_project":
+        return "synced"
+    if source and source.startswith("obsidian"):
+        return "linked"
+    return None
+
+
+async def latest_plan_summaries(db: AsyncSession, todo_ids: Sequence[str]) -> dict[str, str]:
+    """Summary of the newest completed plan for each todo, in one query."""
+    if not todo_ids:
+        return {}
+    ranked = (
+        select(
+            AgentTask.todo_id,
+            AgentTask.payload_json,
+            func.row_number()
+            .over(partition_by=AgentTask.todo_id, order_by=AgentTask.created_at.desc())
+            .label("rank"),
+        )
+        .where(
+            AgentTask.todo_id.in_(todo_ids),
+            AgentTask.task_type == "plan_todo",
+            AgentTask.status == "completed",
+        )
+        .subquery()
+    )
+    rows = await db.execute(
+        select(ranked.c.todo_id, ranked.c.payload_json).where(ranked.c.rank == 1)
+    )
+    summaries = {}
+    for todo_id, payload_json in rows:
+        if payload_json:
+            summary = json.loads(payload_json).get("summary")
+            if summary:
+                summaries[todo_id] = summary
+    return summaries
+
+
+def todo_to_response(todo: Todo, plan_summary: str | None = None) -> TodoResponse:
+    """Build a TodoResponse with computed display fields (no I/O)."""
+    resp = TodoResponse.model_validate(todo)
+    if todo.tags:
+        resp.tags = deserialize_tags(todo.tags)
+    resp.is_recurring = bool(todo.recurrence_rule)
+    resp.next_action = get_next_action(todo.inbox_state or "none", todo.status or "pending")
+    resp.sync_status = compute_sync_status(todo.source)
+    resp.project_label = humanize_folder_name(todo.source_id)
+    resp.plan_summary = plan_summary
+    return resp
+
+
+async def build_todo_responses(db: AsyncSession, todos: Sequence[Todo]) -> list[TodoResponse]:
+    """Batch form of :func:`todo_to_response` that also fills ``plan_summary``.
+
+    Plan summaries are only shown for ``plan_ready`` todos; all of them are
+    fetched with a single query however many rows are passed in.
+    """
+    summaries = await latest_plan_summaries(
+        db, [t.id for t in todos if t.inbox_state == "plan_ready"]
+    )
+    return [todo_to_response(t, summaries.get(t.id)) for t in todos]
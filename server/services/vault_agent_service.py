@@ -6,6 +6,7 @@ Three agent roles create and update vault documents:
 - **executor**: Updates ``TODO.md`` with progress and completion markers
 
 All document operations use the CLI service (with filesystem fallback).
+Task state is written through ``db_writer``; the given session only reads.
 """
 
 import json
@@ -16,6 +17,7 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from config import settings
+from database import db_writer
 from models.agent_task import AgentTask
 from models.todo import Todo
 from services.ai_service import AIService
@@ -51,7 +53,7 @@ async def execute_agent_task(
         skill_ids = _json.loads(agent_task.skill_chain)
         agent_task.status = "in_progress"
         agent_task.started_at = datetime.now(timezone.utc)
-        await db.commit()
+        await db_writer.save(agent_task)
 
         try:
             for skill_id in skill_ids:
@@ -68,13 +70,13 @@ async def execute_agent_task(
             agent_task.status = "completed"
             agent_task.payload_json = json.dumps({"result": result}) if result else None
             agent_task.completed_at = datetime.now(timezone.utc)
-            await db.commit()
+            await db_writer.save(agent_task)
         except Exception as exc:
             logger.exception("Skill-based vault task %s failed", agent_task.id)
             agent_task.status = "failed"
             agent_task.error = str(exc)
             agent_task.completed_at = datetime.now(timezone.utc)
-            await db.commit()
+            await db_writer.save(agent_task)
         return
 
     # Legacy persona-based handlers.
@@ -89,25 +91,25 @@ async def execute_agent_task(
         agent_task.status = "failed"
         agent_task.error = f"Unknown agent type: {agent_task.agent_type}"
         agent_task.completed_at = datetime.now(timezone.utc)
-        await db.commit()
+        await db_writer.save(agent_task)
         return
 
     agent_task.status = "in_progress"
     agent_task.started_at = datetime.now(timezone.utc)
-    await db.commit()
+    await db_writer.save(agent_task)
 
     try:
         result = await handler(db, ai_service, agent_task)
         agent_task.status = "completed"
         agent_task.payload_json = json.dumps(result) if isinstance(result, dict) else result
         agent_task.completed_at = datetime.now(timezone.utc)
-        await db.commit()
+        await db_writer.save(agent_task)
     except Exception as exc:
         logger.exception("Agent task %s failed", agent_task.id)
         agent_task.status = "failed"
         agent_task.error = str(exc)
         agent_task.completed_at = datetime.now(timezone.utc)
-        await db.commit()
+        await db_writer.save(agent_task)
 
 
 # ---------------------------------------------------------------------------
@@ -21,6 +21,7 @@ from sqlalchemy import select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from config import settings
+from database import db_writer
 from models.todo import Todo
 from utils import deserialize_tags, serialize_tags
 
@@ -178,6 +179,7 @@ async def _do_scan(
         todo_ids = list(all_markers.keys())
         stmt = select(Todo).where(Todo.id.in_(todo_ids))
         db_todos = {t.id: t for t in (await db.execute(stmt)).scalars().all()}
+        changed: list[Todo] = []
 
         for todo_id, vault_data in all_markers.items():
             db_todo = db_todos.get(todo_id)
@@ -193,6 +195,8 @@ async def _do_scan(
                 try:
                     _apply_change(db_todo, change)
                     result.changes_applied += 1
+                    if not changed or changed[-1] is not db_todo:
+                        changed.append(db_todo)
                 except Exception:
                     logger.warning(
                         "Failed to apply change %s=%s for todo %s",
@@ -205,7 +209,8 @@ async def _do_scan(
 
         if result.changes_applied > 0:
             try:
-                await db.commit()
+                # Only the changed columns are written, in one writer job
+                await db_writer.save(*changed)
             except Exception:
                 logger.exception("Failed to commit vault sync changes")
                 await db.rollback()
@@ -0,0 +1,365 @@
+"""Compact on-disk vector index for semantic search.
+
+Vectors are L2-normalised float16 rows in one memory-mapped file
+(``vectors.f16``), so 100k 384-dimension embeddings cost ~73 MiB of page
+cache instead of Python objects.  A small SQLite file beside it maps each
+row ("slot") to the entity it embeds and stores a digest of the embedded
+text, so unchanged rows are never re-embedded.  Freed slots are zeroed and
+reused; the file doubles when full.
+
+Below ``ivf_min_rows`` live rows a query scans every vector.  Above it an
+IVF index (spherical k-means centroids, one inverted list per centroid)
+scores only the ``nprobe`` lists closest to the query.  Centroids are
+retrained once the index has doubled since the last training.
+
+Every method is synchronous and guarded by one lock; async callers run them
+with ``asyncio.to_thread``.  Requires numpy.
+"""
+
+import logging
+import os
+import sqlite3
+import threading
+from dataclasses import dataclass
+
+try:
+    import numpy as np
+except ImportError:  # optional: pip install numpy
+    np = None
+
+logger = logging.getLogger(__name__)
+
+_INITIAL_CAPACITY = 1024
+_SCORE_CHUNK = 65536  # rows converted and scored per matrix product
+_KMEANS_ITERATIONS = 10
+_KMEANS_SAMPLE_PER_LIST = 64
+
+_SCHEMA = [
+    """CREATE TABLE IF NOT EXISTS slots (
+        slot INTEGER PRIMARY KEY,
+        kind TEXT NOT NULL,
+        ref TEXT NOT NULL,
+        digest TEXT NOT NULL,
+        title TEXT,
+        preview TEXT,
+        updated_at REAL
+    )""",
+    "CREATE UNIQUE INDEX IF NOT EXISTS idx_slots_ref ON slots(kind, ref)",
+    "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)",
+]
+
+
+@dataclass(frozen=True)
+class VectorHit:
+    kind: str
+    ref: str
+    score: float  # cosine similarity
+    title: str | None = None
+    preview: str | None = None
+    updated_at: float | None = None
+
+
+@dataclass(frozen=True)
+class VectorItem:
+    kind: str
+    ref: str
+    digest: str
+    vector: "np.ndarray"
+    title: str | None = None
+    preview: str | None = None
+    updated_at: float | None = None
+
+
+class VectorIndex:
+    """float16 memmap of embeddings with an IVF index and a SQLite key map."""
+
+    def __init__(
+        self,
+        directory: str,
+        dim: int,
+        model: str,
+        ivf_min_rows: int = 2000,
+        nprobe: int = 8,
+    ):
+        if np is None:
+            raise RuntimeError("numpy is required for the vector index")
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.dim = dim
+        self.model = model
+        self.ivf_min_rows = ivf_min_rows
+        self.nprobe = nprobe
+        self._lock = threading.Lock()
+        self._vectors_path = os.path.join(directory, "vectors.f16")
+        self._centroids_path = os.path.join(directory, "centroids.npy")
+        self._conn = sqlite3.connect(os.path.join(directory, "index.db"), check_same_thread=False)
+        with self._lock:
+            for stmt in _SCHEMA:
+                self._conn.execute(stmt)
+            self._conn.commit()
+            if self._meta("model") != model or self._meta("dim") != str(dim):
+                self._reset()
+            self._load()
+
+    # --- state ---
+
+    def _meta(self, key: str) -> str | None:
+        row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_meta(self, key: str, value: str) -> None:
+        self._conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+    def _reset(self) -> None:
+        """Drop every vector: the model or dimension changed."""
+        self._conn.execute("DELETE FROM slots")
+        self._conn.execute("DELETE FROM meta")
+        self._set_meta("model", self.model)
+        self._set_meta("dim", str(self.dim))
+        self._conn.commit()
+        for path in (self._vectors_path, self._centroids_path):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def _load(self) -> None:
+        rows = self._conn.execute("SELECT slot, kind, ref FROM slots").fetchall()
+        high = max((r[0] for r in rows), default=-1) + 1
+        capacity = max(_INITIAL_CAPACITY, high)
+        if os.path.exists(self._vectors_path):
+            capacity = max(capacity, os.path.getsize(self._vectors_path) // (2 * self.dim))
+        self._open_vectors(capacity)
+
+        self._kind_codes: dict[str, int] = {}
+        self._codes = np.full(capacity, -1, dtype=np.int16)  # -1 marks a free slot
+        self._refs: list[tuple[str, str] | None] = [None] * capacity
+        self._slot_of: dict[tuple[str, str], int] = {}
+        for slot, kind, ref in rows:
+            self._codes[slot] = self._code(kind)
+            self._refs[slot] = (kind, ref)
+            self._slot_of[(kind, ref)] = slot
+        self._high = high
+        self._free = [s for s in range(high) if self._codes[s] < 0]
+
+        self._centroids = None
+        self._assign = np.full(capacity, -1, dtype=np.int32)
+        self._lists: list[list[int]] = []
+        self._trained_rows = int(self._meta("trained_rows") or 0)
+        if os.path.exists(self._centroids_path):
+            centroids = np.load(self._centroids_path)
+            if centroids.shape[1:] == (self.dim,):
+                self._centroids = centroids
+                self._assign_slots(self._live_slots())
+
+    def _open_vectors(self, capacity: int) -> None:
+        size = capacity * self.dim * 2
+        with open(self._vectors_path, "ab") as f:
+            if f.tell() < size:
+                f.truncate(size)
+        self._vectors = np.memmap(
+            self._vectors_path, dtype=np.float16, mode="r+", shape=(capacity, self.dim)
+        )
+        self._capacity = capacity
+
+    def _grow(self, needed: int) -> None:
+        capacity = max(needed, self._capacity * 2)
+        self._vectors.flush()
+        del self._vectors
+        self._open_vectors(capacity)
+        extra = capacity - len(self._codes)
+        self._codes = np.concatenate([self._codes, np.full(extra, -1, dtype=np.int16)])
+        self._assign = np.concatenate([self._assign, np.full(extra, -1, dtype=np.int32)])
+        self._refs.extend([None] * extra)
+
+    def _code(self, kind: str) -> int:
+        return self._kind_codes.setdefault(kind, len(self._kind_codes))
+
+    def _live_slots(self) -> "np.ndarray":
+        return np.flatnonzero(self._codes[:self._high] >= 0)
+
+    def __len__(self) -> int:
+        return len(self._slot_of)
+
+    # --- writes ---
+
+    def get_meta(self, key: str) -> str | None:
+        with self._lock:
+            return self._meta(key)
+
+    def set_meta(self, key: str, value: str) -> None:
+        with self._lock:
+            self._set_meta(key, value)
+            self._conn.commit()
+
+    def digests(self, kind: str) -> dict[str, str]:
+        with self._lock:
+            rows = self._conn.execute("SELECT ref, digest FROM slots WHERE kind = ?", (kind,))
+            return dict(rows.fetchall())
+
+    def upsert(self, items: list[VectorItem]) -> None:
+        if not items:
+            return
+        with self._lock:
+            slots = []
+            for item in items:
+                slot = self._slot_of.get((item.kind, item.ref))
+                if slot is None:
+                    slot = self._take_slot()
+                else:
+                    self._unassign(slot)
+                self._vectors[slot] = item.vector
+                self._codes[slot] = self._code(item.kind)
+                self._refs[slot] = (item.kind, item.ref)
+                self._slot_of[(item.kind, item.ref)] = slot
+                slots.append(slot)
+            self._conn.executemany(
+                """INSERT OR REPLACE INTO slots
+                   (slot, kind, ref, digest, title, preview, updated_at)
+                   VALUES (?, ?, ?, ?, ?, ?, ?)""",
+                [
+                    (s, i.kind, i.ref, i.digest, i.title, i.preview, i.updated_at)
+                    for s, i in zip(slots, items)
+                ],
+            )
+            self._conn.commit()
+            self._vectors.flush()
+            if self._needs_training():
+                self._train()
+            elif self._centroids is not None:
+                self._assign_slots(np.asarray(slots))
+
+    def remove(self, kind: str, refs: list[str]) -> int:
+        with self._lock:
+            slots = [s for s in (self._slot_of.pop((kind, r), None) for r in refs) if s is not None]
+            for slot in slots:
+                self._unassign(slot)
+                self._vectors[slot] = 0
+                self._codes[slot] = -1
+                self._refs[slot] = None
+                self._free.append(slot)
+            self._conn.executemany("DELETE FROM slots WHERE slot = ?", [(s,) for s in slots])
+            self._conn.commit()
+            return len(slots)
+
+    def _take_slot(self) -> int:
+        if self._free:
+            return self._free.pop()
+        if self._high >= self._capacity:
+            self._grow(self._high + 1)
+        self._high += 1
+        return self._high - 1
+
+    # --- IVF ---
+
+    def _needs_training(self) -> bool:
+        live = len(self._slot_of)
+        return live >= self.ivf_min_rows and live >= 2 * self._trained_rows
+
+    def _train(self) -> None:
+        live = self._live_slots()
+        nlist = int(min(4096, max(16, np.sqrt(len(live)))))
+        rng = np.random.default_rng(0)
+        sample = live
+        if len(live) > nlist * _KMEANS_SAMPLE_PER_LIST:
+            sample = np.sort(rng.choice(live, nlist * _KMEANS_SAMPLE_PER_LIST, replace=False))
+        data = self._vectors[sample].astype(np.float32)
+        centroids = data[rng.choice(len(data), nlist, replace=False)]
+        for _ in range(_KMEANS_ITERATIONS):
+            labels = np.argmax(data @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, labels, data)
+            norms = np.linalg.norm(sums, axis=1, keepdims=True)
+            filled = norms[:, 0] > 0  # an empty list keeps its centroid
+            centroids[filled] = sums[filled] / norms[filled]
+
+        self._centroids = centroids
+        self._trained_rows = len(live)
+        self._assign[:] = -1
+        self._lists = [[] for _ in range(nlist)]
+        self._assign_slots(live)
+        np.save(self._centroids_path, centroids)
+        self._set_meta("trained_rows", str(self._trained_rows))
+        self._conn.commit()
+        logger.info("Vector index trained: %d rows in %d lists", len(live), nlist)
+
+    def _assign_slots(self, slots: "np.ndarray") -> None:
+        if not self._lists:
+            self._lists = [[] for _ in range(len(self._centroids))]
+        for start in range(0, len(slots), _SCORE_CHUNK):
+            chunk = slots[start:start + _SCORE_CHUNK]
+            labels = np.argmax(self._vectors[chunk].astype(np.float32) @ self._centroids.T, axis=1)
+            for slot, label in zip(chunk.tolist(), labels.tolist()):
+                self._assign[slot] = label
+                self._lists[label].append(slot)
+
+    def _unassign(self, slot: int) -> None:
+        label = self._assign[slot]
+        if label >= 0:
+            self._lists[label].remove(slot)
+            self._assign[slot] = -1
+
+    # --- reads ---
+
+    def query(
+        self,
+        vector: "np.ndarray",
+        k: int,
+        kinds: list[str] | None = None,
+        nprobe: int | None = None,
+        exact: bool = False,
+    ) -> list[VectorHit]:
+        """The *k* nearest rows by cosine similarity, best first."""
+        q = np.asarray(vector, dtype=np.float32)
+        with self._lock:
+            if exact or self._centroids is None or len(self._slot_of) < self.ivf_min_rows:
+                candidates = self._live_slots()
+            else:
+                probe = np.argsort(-(self._centroids @ q))[:nprobe or self.nprobe]
+                candidates = np.sort(np.fromiter(
+                    (s for c in probe.tolist() for s in self._lists[c]), dtype=np.int64
+                ))
+            if kinds is not None:
+                codes = [self._kind_codes[k] for k in kinds if k in self._kind_codes]
+                candidates = candidates[np.isin(self._codes[candidates], codes)]
+            if not len(candidates):
+                return []
+
+            scores = np.concatenate([
+                self._vectors[candidates[i:i + _SCORE_CHUNK]].astype(np.float32) @ q
+                for i in range(0, len(candidates), _SCORE_CHUNK)
+            ])
+            top = np.argpartition(-scores, k - 1)[:k] if len(scores) > k else np.arange(len(scores))
+            top = top[np.argsort(-scores[top])]
+            refs = [self._refs[candidates[i]] for i in top.tolist()]
+            extras = self._extras(refs)
+        return [
+            VectorHit(kind, ref, float(scores[i]), *extras.get((kind, ref), (None, None, None)))
+            for (kind, ref), i in zip(refs, top.tolist())
+        ]
+
+    def _extras(self, refs: list[tuple[str, str]]) -> dict[tuple[str, str], tuple]:
+        """Stored title/preview/updated_at for rows that carry them (vault notes)."""
+        slots = [self._slot_of[r] for r in refs]
+        if not slots:
+            return {}
+        marks = ",".join("?" * len(slots))
+        rows = self._conn.execute(
+            f"SELECT kind, ref, title, preview, updated_at FROM slots"
+            f" WHERE slot IN ({marks}) AND preview IS NOT NULL",
+            slots,
+        ).fetchall()
+        return {(r[0], r[1]): r[2:] for r in rows}
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "rows": len(self._slot_of),
+                "capacity": self._capacity,
+                "bytes": self._capacity * self.dim * 2,
+                "lists": len(self._lists) if self._centroids is not None else 0,
+                "trained_rows": self._trained_rows,
+            }
+
+    def close(self) -> None:
+        with self._lock:
+            self._vectors.flush()
+            self._conn.close()
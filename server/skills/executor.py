@@ -39,24 +39,20 @@ async def execute_skill_chain(
     try:
         chain: list[str] = json.loads(task.skill_chain)  # type: ignore[arg-type]
     except (json.JSONDecodeError, TypeError):
-        await mark_failed(db, task, f"Invalid skill_chain: {task.skill_chain}")
-        await db.commit()
+        await mark_failed(task, f"Invalid skill_chain: {task.skill_chain}")
         return
 
     if not chain:
-        await mark_failed(db, task, "Empty skill_chain")
-        await db.commit()
+        await mark_failed(task, "Empty skill_chain")
         return
 
     # Validate all skill ids up-front.
     for sid in chain:
         if sid not in SKILL_REGISTRY:
-            await mark_failed(db, task, f"Unknown skill '{sid}' in chain")
-            await db.commit()
+            await mark_failed(task, f"Unknown skill '{sid}' in chain")
             return
 
-    await mark_running(db, task)
-    await db.commit()
+    await mark_running(task)
 
     previous_result: str | None = None
 
@@ -78,9 +74,8 @@ async def execute_skill_chain(
 
             progress = int((i / len(chain)) * 80) + 10
             await update_progress(
-                db, task, progress, f"Running {skill.name}…", ws_manager, user_id,
+                task, progress, f"Running {skill.name}…", ws_manager, user_id,
             )
-            await db.commit()
 
             result = await ai_service.generate_completion(
                 system_prompt=skill.system_prompt,
@@ -94,9 +89,8 @@ async def execute_skill_chain(
             previous_result = result
 
         # Final
-        await update_progress(db, task, 95, "Finalizing…", ws_manager, user_id)
-        await mark_completed(db, task, previous_result or "")
-        await db.commit()
+        await update_progress(task, 95, "Finalizing…", ws_manager, user_id)
+        await mark_completed(task, previous_result or "")
 
         await ws_manager.send_json(user_id, {
             "type": "task_completed",
@@ -113,8 +107,7 @@ async def execute_skill_chain(
     except Exception as exc:
         logger.exception("Skill chain execution failed for task %s", task.id)
         error_msg = f"Skill '{chain[task.current_skill_index]}' failed: {exc}"
-        await mark_failed(db, task, error_msg)
-        await db.commit()
+        await mark_failed(task, error_msg)
 
         await ws_manager.send_json(user_id, {
             "type": "task_failed",
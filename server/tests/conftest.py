@@ -4,6 +4,7 @@ import os
 import pytest
 import pytest_asyncio
 from httpx import ASGITransport, AsyncClient
+from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
 # Override settings before any app code imports config
@@ -18,8 +19,9 @@ os.environ.update({
     "DEBUG": "false",
 })
 
-from database import Base, get_db  # noqa: E402
+from database import Base, db_writer, get_db, get_read_db, run_migrations  # noqa: E402
 from main import app  # noqa: E402
+from services.project_service import project_cache  # noqa: E402
 
 _test_engine = create_async_engine("sqlite+aiosqlite:///:memory:", echo=False)
 _test_session_factory = async_sessionmaker(_test_engine, class_=AsyncSession, expire_on_commit=False)
@@ -30,7 +32,16 @@ async def _override_get_db():
         yield session
 
 
+_UNMAPPED_TABLES = (
+    "messages_fts", "todos_fts", "events_fts",
+    "messages_trigram", "todos_trigram", "events_trigram",
+    "schema_version", "change_log",
+)
+
 app.dependency_overrides[get_db] = _override_get_db
+app.dependency_overrides[get_read_db] = _override_get_db
+# The writer is never started under test, so jobs run inline on the test engine
+db_writer.session_factory = _test_session_factory
 
 
 @pytest.fixture(scope="session")
@@ -43,11 +54,17 @@ def event_loop():
 @pytest_asyncio.fixture(autouse=True)
 async def setup_db():
     """Create all tables before each test and drop after."""
+    project_cache.invalidate()
     async with _test_engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+    # Triggers and FTS tables live outside the ORM metadata
+    async with _test_session_factory() as session:
+        await run_migrations(session)
     yield
     async with _test_engine.begin() as conn:
         await conn.run_sync(Base.metadata.drop_all)
+        for table in _UNMAPPED_TABLES:
+            await conn.execute(text(f"DROP TABLE IF EXISTS {table}"))
 
 
 @pytest_asyncio.fixture
@@ -66,6 +83,31 @@ async def auth_headers(client: AsyncClient):
     return {"Authorization": f"Bearer {token}"}
 
 
+@pytest.fixture
+def query_counter():
+    """Count SQL statements executed on the test engine inside ``with counter:``."""
+    from sqlalchemy import event
+
+    class _Counter:
+        count = 0
+        statements: list[str] = []
+
+        def _on_execute(self, conn, cursor, statement, parameters, context, executemany):
+            self.count += 1
+            self.statements.append(statement)
+
+        def __enter__(self):
+            self.count = 0
+            self.statements = []
+            event.listen(_test_engine.sync_engine, "before_cursor_execute", self._on_execute)
+            return self
+
+        def __exit__(self, *exc):
+            event.remove(_test_engine.sync_engine, "before_cursor_execute", self._on_execute)
+
+    return _Counter()
+
+
 @pytest_asyncio.fixture
 async def db_session():
     async with _test_session_factory() as session:
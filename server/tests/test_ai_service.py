@@ -0,0 +1,80 @@
+"""Tests for AIService connection pooling, timeouts and concurrency limits."""
+
+import asyncio
+
+import httpx
+import pytest
+
+from schemas.admin import AIPoolStats
+from services.ai_service import AIService, ConcurrencyLimiter
+
+
+def _service(handler, **kwargs) -> AIService:
+    svc = AIService("http://gateway", model="m", **kwargs)
+    svc.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return svc
+
+
+def _completion(text: str) -> dict:
+    return {"choices": [{"message": {"content": text}}]}
+
+
+@pytest.mark.asyncio
+async def test_per_call_type_read_timeouts():
+    seen: list[float] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request.extensions["timeout"]["read"])
+        return httpx.Response(200, json=_completion("Title"))
+
+    svc = _service(handler, timeouts={"title": 5.0, "completion": 45.0})
+    await svc.generate_title("hello")
+    await svc.generate_completion("sys", "hello")
+    await svc.function_call("sys", "hello", [])
+    assert seen == [5.0, 45.0, 30.0]
+    await svc.close()
+
+
+@pytest.mark.asyncio
+async def test_concurrency_limit_queues_excess_requests():
+    active = 0
+    peak = 0
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.02)
+        active -= 1
+        return httpx.Response(200, json=_completion("ok"))
+
+    svc = _service(handler, max_concurrency=2)
+    results = await asyncio.gather(*(svc.generate_completion("s", str(i)) for i in range(6)))
+    assert results == ["ok"] * 6
+    assert peak == 2
+
+    stats = svc.pool_stats()
+    AIPoolStats(**stats)  # shape matches the admin schema
+    assert stats["total_requests"] == 6
+    assert stats["total_queued"] == 4
+    assert stats["peak_waiting"] >= 4
+    assert stats["in_flight"] == 0 and stats["max_wait_ms"] > 0
+    await svc.close()
+
+
+@pytest.mark.asyncio
+async def test_slot_released_on_error():
+    limiter = ConcurrencyLimiter(1)
+    with pytest.raises(RuntimeError):
+        async with limiter.slot():
+            raise RuntimeError("boom")
+    async with limiter.slot():
+        assert limiter.in_flight == 1
+    assert limiter.snapshot()["in_flight"] == 0
+
+
+def test_http2_falls_back_without_h2(monkeypatch):
+    monkeypatch.setattr("services.ai_service._http2_available", lambda: False)
+    svc = AIService("http://gateway", http2=True)
+    assert svc.http2 is False
+    assert svc.pool_stats()["http2"] is False
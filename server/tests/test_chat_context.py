@@ -0,0 +1,137 @@
+"""General-chat context: token budget, FTS retrieval and rolling summaries."""
+
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+import pytest_asyncio
+from httpx import AsyncClient
+
+from config import settings
+from main import app
+from models.conversation import Conversation
+from models.conversation_summary import ConversationSummary
+from models.message import Message
+from models.todo import Todo
+from services import chat_context_service
+from services.chat_context_service import build_chat_messages, estimate_tokens
+
+_BASE = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+@pytest_asyncio.fixture
+async def chat(db_session):
+    """61 long turns; the dentist only comes up in the first one."""
+    conv = Conversation(title="Long chat")
+    db_session.add(conv)
+    await db_session.flush()
+    contents = ["My dentist appointment moved to Friday at 3pm."]
+    contents += [f"turn {i} " + "chatter " * 80 for i in range(1, 60)]
+    contents += ["When is my dentist appointment again?"]
+    db_session.add_all(
+        Message(
+            conversation_id=conv.id,
+            role="user" if i % 2 == 0 else "assistant",
+            content=content,
+            created_at=_BASE + timedelta(minutes=i),
+        )
+        for i, content in enumerate(contents)
+    )
+    db_session.add(Todo(title="Pay dentist invoice", due_date=_BASE))
+    db_session.add(Todo(title="Water the garden"))
+    await db_session.commit()
+    return conv.id
+
+
+def _tokens(messages: list[dict]) -> int:
+    return sum(estimate_tokens(m["content"]) for m in messages)
+
+
+@pytest.mark.asyncio
+async def test_context_fits_budget_and_retrieves_older_context(db_session, chat, monkeypatch):
+    monkeypatch.setattr(settings, "chat_context_token_budget", 1500)
+    messages = await build_chat_messages(db_session, chat)
+
+    assert _tokens(messages) <= 1500
+    assert messages[-1]["content"] == "When is my dentist appointment again?"
+    assert 2 < len(messages) - 1 < settings.chat_context_recent_messages
+    system = messages[0]["content"]
+    assert "- Earlier, user: My dentist appointment moved to Friday at 3pm." in system
+    assert "- Todo [pending] Pay dentist invoice (due 2026-01-01)" in system
+    assert "garden" not in system
+
+
+@pytest.mark.asyncio
+async def test_short_chat_sends_everything(db_session):
+    conv = Conversation(title="Short")
+    db_session.add(conv)
+    await db_session.flush()
+    db_session.add(Message(conversation_id=conv.id, role="user", content="hello there"))
+    await db_session.commit()
+
+    messages = await build_chat_messages(db_session, conv.id)
+    assert [m["role"] for m in messages] == ["system", "user"]
+    assert "[Possibly relevant context]" not in messages[0]["content"]
+
+
+@pytest.mark.asyncio
+async def test_rolling_summary_is_cached_and_invalidated(
+    client: AsyncClient, auth_headers: dict, db_session, chat
+):
+    ai = MagicMock()
+    ai.generate_completion = AsyncMock(return_value="User's dentist moved to Friday 3pm.")
+    task = await chat_context_service.refresh_summary(db_session, chat, ai)
+    await task
+
+    summary = await db_session.get(ConversationSummary, chat)
+    assert summary.message_count == settings.chat_summary_batch
+    prompt = ai.generate_completion.await_args.args[1]
+    assert prompt.startswith("Summary so far:\n(none)") and "turn 19" in prompt and "turn 20" not in prompt
+
+    # 61 messages: 41 left the recent window; 20 are folded, 21 remain
+    task = await chat_context_service.refresh_summary(db_session, chat, ai)
+    await task
+    db_session.expire_all()
+    summary = await db_session.get(ConversationSummary, chat)
+    assert summary.message_count == 40
+    assert await chat_context_service.refresh_summary(db_session, chat, ai) is None
+
+    messages = await build_chat_messages(db_session, chat)
+    assert "[Earlier in this conversation]\nUser's dentist moved to Friday 3pm." in messages[0]["content"]
+
+    first = (await client.get(
+        f"/api/chat/conversations/{chat}/messages", params={"limit": 1}, headers=auth_headers
+    )).json()["items"][0]
+    resp = await client.put(
+        f"/api/chat/conversations/{chat}/messages/{first['id']}",
+        json={"content": "My dentist appointment moved to Monday."},
+        headers=auth_headers,
+    )
+    assert resp.status_code == 200
+    db_session.expire_all()
+    assert await db_session.get(ConversationSummary, chat) is None
+
+
+@pytest.mark.asyncio
+async def test_stream_chat_uses_budgeted_context(
+    client: AsyncClient, auth_headers: dict, chat, monkeypatch
+):
+    async def _reply(messages):
+        yield "Friday"
+
+    ai = MagicMock()
+    ai.stream_completion = MagicMock(side_effect=_reply)
+    ai.generate_completion = AsyncMock(return_value="summary")
+    monkeypatch.setattr(app.state, "ai_service", ai, raising=False)
+    monkeypatch.setattr(app.state, "active_ai", ai, raising=False)
+
+    resp = await client.post(
+        "/api/chat/stream",
+        json={"conversation_id": chat, "content": "Which day is the dentist?"},
+        headers=auth_headers,
+    )
+    assert "[DONE]" in resp.text
+    sent = ai.stream_completion.call_args.args[0]
+    assert _tokens(sent) <= settings.chat_context_token_budget
+    assert "Friday at 3pm" in sent[0]["content"]
+    assert sent[-1] == {"role": "user", "content": "Which day is the dentist?"}
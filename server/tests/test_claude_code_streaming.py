@@ -0,0 +1,95 @@
+"""Tests for the one-shot Claude Code streaming readers."""
+
+import asyncio
+import json
+import os
+import sys
+
+import pytest
+
+from services import claude_code_provider
+from services.claude_code_provider import (
+    ClaudeCodeError,
+    ClaudeCodeProvider,
+    ClaudeCodeStatus,
+    iter_cli_lines_asyncio,
+    iter_cli_lines_thread,
+)
+
+pytestmark = pytest.mark.skipif(sys.platform == "win32", reason="fake CLI uses a POSIX shebang")
+
+_SCRIPT = """\
+import json, sys, time
+print(json.dumps({"type": "content_block_delta", "delta": {"type": "text_delta", "text": "Hi"}}), flush=True)
+print(json.dumps({"type": "content_block_delta", "delta": {"type": "text_delta", "text": " there"}}), flush=True)
+if "--fail" in sys.argv:
+    sys.stderr.write("please login first")
+    sys.exit(2)
+if "--hang" in sys.argv:
+    time.sleep(60)
+print(json.dumps({"type": "result", "result": "Hi there"}), flush=True)
+"""
+
+
+@pytest.fixture
+def fake_cli(tmp_path):
+    path = tmp_path / "claude"
+    path.write_text(f"#!{sys.executable}\n{_SCRIPT}")
+    path.chmod(0o755)
+    return str(path)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("reader", [iter_cli_lines_asyncio, iter_cli_lines_thread])
+async def test_readers_yield_same_lines(fake_cli, reader):
+    lines = [json.loads(line) async for line in reader([fake_cli])]
+    assert [e["type"] for e in lines] == ["content_block_delta", "content_block_delta", "result"]
+
+
+@pytest.mark.asyncio
+async def test_asyncio_reader_kills_child_when_consumer_stops(fake_cli):
+    stream = iter_cli_lines_asyncio([fake_cli, "--hang"])
+    await stream.__anext__()
+    await stream.__anext__()
+    consumer = asyncio.create_task(stream.__anext__())
+    await asyncio.sleep(0.05)
+    consumer.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await consumer
+    await stream.aclose()
+    children = [
+        pid for pid in os.listdir("/proc")
+        if pid.isdigit() and _cmdline(pid).endswith(f"{fake_cli}\0--hang")
+    ] if os.path.isdir("/proc") else []
+    assert children == []
+
+
+def _cmdline(pid: str) -> str:
+    try:
+        with open(f"/proc/{pid}/cmdline") as f:
+            return f.read().rstrip("\0")
+    except OSError:
+        return ""
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("use_asyncio", [True, False])
+async def test_stream_response_without_pool(fake_cli, monkeypatch, use_asyncio):
+    monkeypatch.setattr(claude_code_provider, "USE_ASYNCIO_SUBPROCESS", use_asyncio)
+    provider = ClaudeCodeProvider()
+    provider._cli_path = fake_cli
+    tokens = [t async for t in provider.stream_response("hello")]
+    assert "".join(tokens) == "Hi there"
+
+
+@pytest.mark.asyncio
+async def test_stream_response_maps_cli_errors(fake_cli, monkeypatch, tmp_path):
+    wrapper = tmp_path / "failing-claude"
+    wrapper.write_text(f"#!/bin/sh\nexec {fake_cli} --fail \"$@\"\n")
+    wrapper.chmod(0o755)
+    provider = ClaudeCodeProvider()
+    provider._cli_path = str(wrapper)
+    with pytest.raises(ClaudeCodeError) as excinfo:
+        async for _ in provider.stream_response("hello"):
+            pass
+    assert excinfo.value.status == ClaudeCodeStatus.NOT_AUTHENTICATED
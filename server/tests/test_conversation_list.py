@@ -0,0 +1,91 @@
+"""Conversation list: one query per page, trigger-maintained previews."""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+import pytest_asyncio
+from httpx import AsyncClient
+from sqlalchemy import select
+
+from models.conversation import Conversation
+from models.message import Message
+from services.conversation_service import list_conversations
+
+_BASE = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+@pytest_asyncio.fixture
+async def conversations(db_session):
+    """25 conversations with three messages each; the newest is the longest."""
+    convs = []
+    for i in range(25):
+        conv = Conversation(title=f"Chat {i}", updated_at=_BASE + timedelta(hours=i))
+        db_session.add(conv)
+        await db_session.flush()
+        for j, content in enumerate(["hello", "how are you?", f"reply {i} " + "x" * 200]):
+            db_session.add(Message(
+                conversation_id=conv.id,
+                role="user" if j % 2 == 0 else "assistant",
+                content=content,
+                created_at=_BASE + timedelta(hours=i, minutes=j),
+            ))
+        convs.append(conv)
+    db_session.add(Conversation(title="Empty", updated_at=_BASE - timedelta(days=1)))
+    await db_session.commit()
+    return convs
+
+
+@pytest.mark.asyncio
+async def test_list_is_one_query_with_previews(
+    client: AsyncClient, auth_headers: dict, conversations, query_counter
+):
+    with query_counter:
+        resp = await client.get(
+            "/api/chat/conversations", params={"limit": 100}, headers=auth_headers
+        )
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["total"] == 26
+    first = body["items"][0]
+    assert first["title"] == "Chat 24"
+    assert first["last_message"] == ("reply 24 " + "x" * 200)[:100]
+    assert first["last_message_at"].startswith("2026-01-02T00:02")
+    assert body["items"][-1]["last_message"] is None
+
+    assert len([s for s in query_counter.statements if "conversations" in s]) == 1
+    assert not any("FROM messages" in s for s in query_counter.statements)
+
+
+@pytest.mark.asyncio
+async def test_preview_follows_message_edits_and_deletes(
+    client: AsyncClient, auth_headers: dict, conversations, db_session
+):
+    conv_id = conversations[0].id
+    newest_id = (await db_session.execute(
+        select(Message.id).where(Message.conversation_id == conv_id).order_by(Message.created_at.desc())
+    )).scalars().first()
+
+    await client.put(
+        f"/api/chat/conversations/{conv_id}/messages/{newest_id}",
+        json={"content": "edited"},
+        headers=auth_headers,
+    )
+    items, _, _ = await list_conversations(db_session, limit=100)
+    assert next(c for c in items if c.id == conv_id).last_message == "edited"
+
+    await client.delete(
+        f"/api/chat/conversations/{conv_id}/messages/{newest_id}", headers=auth_headers
+    )
+    items, _, _ = await list_conversations(db_session, limit=100)
+    assert next(c for c in items if c.id == conv_id).last_message == "how are you?"
+
+
+@pytest.mark.asyncio
+async def test_windowed_fallback_matches_columns(db_session, conversations):
+    for page in (1, 2, 3):
+        denormalized = await list_conversations(db_session, page=page, limit=10)
+        windowed = await list_conversations(db_session, page=page, limit=10, denormalized=False)
+        assert windowed == denormalized
+
+    items, total, _ = await list_conversations(db_session, page=9, limit=10, denormalized=False)
+    assert (items, total) == ([], 26)
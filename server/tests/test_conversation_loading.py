@@ -0,0 +1,108 @@
+"""A chat turn must not load a conversation's whole message history."""
+
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+import pytest_asyncio
+from httpx import AsyncClient
+from sqlalchemy import event
+from sqlalchemy.exc import InvalidRequestError
+
+from main import app
+from models.conversation import Conversation
+from models.message import Message
+from services.conversation_service import get_conversation
+from services.orchestrator import Orchestrator
+
+_BASE = datetime(2026, 1, 1, tzinfo=timezone.utc)
+_HISTORY = 500
+_CONTEXT_WINDOW = 20  # messages sent to the model per turn
+
+
+async def _tokens(*tokens):
+    for token in tokens:
+        yield token
+
+
+def _fake_ai():
+    ai = MagicMock()
+    ai.stream_completion = MagicMock(side_effect=lambda messages: _tokens("Sure", "!"))
+    ai.generate_title = AsyncMock(return_value="Title")
+    return ai
+
+
+@pytest.fixture
+def loaded_messages():
+    """Count Message rows materialized as ORM objects."""
+    counter = {"rows": 0}
+
+    def on_load(target, context):
+        counter["rows"] += 1
+
+    event.listen(Message, "load", on_load)
+    yield counter
+    event.remove(Message, "load", on_load)
+
+
+@pytest_asyncio.fixture
+async def long_conversation(db_session):
+    conv = Conversation(title="Long chat")
+    db_session.add(conv)
+    await db_session.flush()
+    db_session.add_all(
+        Message(
+            conversation_id=conv.id,
+            role="user" if i % 2 == 0 else "assistant",
+            content=f"message {i}",
+            created_at=_BASE + timedelta(minutes=i),
+        )
+        for i in range(_HISTORY)
+    )
+    await db_session.commit()
+    return conv.id
+
+
+@pytest.mark.asyncio
+async def test_orchestrator_turn_loads_only_context_window(long_conversation, loaded_messages):
+    from tests.conftest import _test_session_factory
+
+    orch = Orchestrator(ai_service=_fake_ai(), ws_manager=MagicMock(
+        stream_to_user=AsyncMock(return_value="Sure!"), send_json=AsyncMock(),
+    ), session_factory=_test_session_factory)
+
+    async with _test_session_factory() as db:
+        await orch._handle_general_chat(db, "user", long_conversation, "and then?")
+        await db.commit()
+
+    assert loaded_messages["rows"] <= _CONTEXT_WINDOW
+
+
+@pytest.mark.asyncio
+async def test_stream_chat_turn_loads_only_context_window(
+    client: AsyncClient, auth_headers: dict, long_conversation, loaded_messages, monkeypatch
+):
+    ai = _fake_ai()
+    monkeypatch.setattr(app.state, "ai_service", ai, raising=False)
+    monkeypatch.setattr(app.state, "active_ai", ai, raising=False)
+
+    resp = await client.post(
+        "/api/chat/stream",
+        json={"conversation_id": long_conversation, "content": "and then?"},
+        headers=auth_headers,
+    )
+    assert resp.status_code == 200
+    assert "[DONE]" in resp.text
+    assert loaded_messages["rows"] <= _CONTEXT_WINDOW
+
+
+@pytest.mark.asyncio
+async def test_messages_are_opt_in(db_session, long_conversation, loaded_messages):
+    conv = await get_conversation(db_session, long_conversation)
+    with pytest.raises(InvalidRequestError):
+        conv.messages
+    assert loaded_messages["rows"] == 0
+
+    conv = await get_conversation(db_session, long_conversation, with_messages=True)
+    assert len(conv.messages) == _HISTORY
+    assert conv.messages[0].content == "message 0"
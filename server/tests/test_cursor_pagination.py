@@ -0,0 +1,111 @@
+"""Keyset (cursor) pagination on the list endpoints."""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+import pytest_asyncio
+from httpx import AsyncClient
+
+from models.agent_task import AgentTask
+from models.conversation import Conversation
+from models.message import Message
+from models.todo import Todo
+
+_BASE = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+async def _walk(client: AsyncClient, headers: dict, url: str, **params) -> list[dict]:
+    """Follow next_cursor from the first page to the end."""
+    resp = await client.get(url, params=params, headers=headers)
+    assert resp.status_code == 200
+    body = resp.json()
+    items = list(body["items"])
+    while body["next_cursor"]:
+        resp = await client.get(
+            url, params={**params, "cursor": body["next_cursor"]}, headers=headers
+        )
+        assert resp.status_code == 200
+        body = resp.json()
+        assert body["total"] is None
+        items.extend(body["items"])
+    return items
+
+
+@pytest_asyncio.fixture
+async def seeded(db_session):
+    """Rows sharing timestamps in pairs, so the id tie-break matters."""
+    conv = Conversation(title="Chat")
+    db_session.add(conv)
+    await db_session.flush()
+    for i in range(45):
+        stamp = _BASE + timedelta(minutes=i // 2)
+        db_session.add(Todo(title=f"Todo {i}", created_at=stamp, updated_at=stamp))
+        db_session.add(Message(conversation_id=conv.id, role="user", content=f"m{i}", created_at=stamp))
+        db_session.add(AgentTask(task_type="research", instruction=f"t{i}", created_at=stamp))
+        db_session.add(Conversation(title=f"Conv {i}", updated_at=stamp))
+    await db_session.commit()
+    return conv.id
+
+
+@pytest.mark.asyncio
+async def test_cursor_walk_covers_every_row_once(client: AsyncClient, auth_headers: dict, seeded):
+    todos = await _walk(client, auth_headers, "/api/todos", limit=10)
+    assert len(todos) == 45 and len({t["id"] for t in todos}) == 45
+    assert [t["created_at"] for t in todos] == sorted((t["created_at"] for t in todos), reverse=True)
+
+    asc = await _walk(client, auth_headers, "/api/todos", limit=7, order_by="updated_at", order_dir="asc")
+    assert [t["id"] for t in asc] == [t["id"] for t in reversed(todos)]
+
+    tasks = await _walk(client, auth_headers, "/api/tasks", limit=10)
+    assert len({t["id"] for t in tasks}) == 45
+
+    convs = await _walk(client, auth_headers, "/api/chat/conversations", limit=10)
+    assert len({c["id"] for c in convs}) == 46
+
+    messages = await _walk(client, auth_headers, f"/api/chat/conversations/{seeded}/messages", limit=10)
+    assert len({m["id"] for m in messages}) == 45
+    assert [m["created_at"] for m in messages] == sorted(m["created_at"] for m in messages)
+    newest_first = await _walk(
+        client, auth_headers, f"/api/chat/conversations/{seeded}/messages", limit=10, order_dir="desc"
+    )
+    assert [m["id"] for m in newest_first] == [m["id"] for m in reversed(messages)]
+
+
+@pytest.mark.asyncio
+async def test_page_mode_still_counts(client: AsyncClient, auth_headers: dict, seeded):
+    resp = await client.get("/api/todos", params={"page": 2, "limit": 20}, headers=auth_headers)
+    body = resp.json()
+    assert body["total"] == 45 and len(body["items"]) == 20
+    assert body["next_cursor"]
+
+    resp = await client.get(
+        "/api/todos",
+        params={"cursor": body["next_cursor"], "limit": 20, "include_total": True},
+        headers=auth_headers,
+    )
+    body = resp.json()
+    assert body["total"] == 45 and len(body["items"]) == 5 and body["next_cursor"] is None
+
+
+@pytest.mark.asyncio
+async def test_cursor_page_seeks_instead_of_offsetting(
+    client: AsyncClient, auth_headers: dict, seeded, query_counter
+):
+    first = (await client.get("/api/tasks", params={"limit": 40}, headers=auth_headers)).json()
+    with query_counter:
+        resp = await client.get(
+            "/api/tasks", params={"limit": 40, "cursor": first["next_cursor"]}, headers=auth_headers
+        )
+    assert len(resp.json()["items"]) == 5
+    listing = [s for s in query_counter.statements if "FROM agent_tasks" in s]
+    assert len(listing) == 1
+    # SQLite always renders "LIMIT ? OFFSET ?"; the seek is the row-value comparison
+    assert "(agent_tasks.created_at, agent_tasks.id) < (" in listing[0]
+    assert "count(" not in listing[0].lower()
+
+
+@pytest.mark.asyncio
+async def test_bad_cursor_is_rejected(client: AsyncClient, auth_headers: dict, seeded):
+    for cursor in ("not-a-cursor", "W10", "eyJ4IjoxfQ"):
+        resp = await client.get("/api/todos", params={"cursor": cursor}, headers=auth_headers)
+        assert resp.status_code == 400
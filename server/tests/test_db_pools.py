@@ -0,0 +1,292 @@
+"""Tests for the read-only pool and the group-committing DatabaseWriter."""
+
+import asyncio
+import json
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+import pytest_asyncio
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import select, text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from database import (
+    Base,
+    DatabaseWriter,
+    create_read_engine,
+    create_write_engine,
+    db_writer,
+    get_db,
+    get_read_db,
+    run_migrations,
+)
+from main import app
+from models.agent_task import AgentTask
+from models.todo import Todo
+from services import inbox_pipeline_service
+
+
+@pytest_asyncio.fixture
+async def engines(tmp_path):
+    url = f"sqlite+aiosqlite:///{tmp_path / 'pools.db'}"
+    write = create_write_engine(url)
+    read = create_read_engine(url, pool_size=2)
+    async with write.begin() as conn:
+        await conn.execute(text("CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT UNIQUE)"))
+    yield read, write
+    await read.dispose()
+    await write.dispose()
+
+
+def _insert(name: str):
+    async def job(session: AsyncSession) -> str:
+        await session.execute(text("INSERT INTO items (name) VALUES (:n)"), {"n": name})
+        return name
+
+    return job
+
+
+async def _names(engine) -> list[str]:
+    async with engine.connect() as conn:
+        rows = await conn.execute(text("SELECT name FROM items ORDER BY id"))
+        return [r[0] for r in rows]
+
+
+@pytest.mark.asyncio
+async def test_read_engine_rejects_writes(engines):
+    read, _ = engines
+    async with read.connect() as conn:
+        with pytest.raises(OperationalError, match="readonly"):
+            await conn.execute(text("INSERT INTO items (name) VALUES ('x')"))
+
+
+@pytest.mark.asyncio
+async def test_concurrent_writes_share_one_commit(engines):
+    read, write = engines
+    writer = DatabaseWriter(
+        async_sessionmaker(write, class_=AsyncSession, expire_on_commit=False), window_ms=50
+    )
+    await writer.start()
+    try:
+        results = await asyncio.gather(*(writer.run(_insert(f"n{i}")) for i in range(5)))
+    finally:
+        await writer.stop()
+
+    assert results == [f"n{i}" for i in range(5)]
+    assert writer.batches == 1
+    assert writer.jobs == 5
+    assert await _names(read) == results
+
+
+@pytest.mark.asyncio
+async def test_failing_job_rolls_back_alone(engines):
+    read, write = engines
+    writer = DatabaseWriter(
+        async_sessionmaker(write, class_=AsyncSession, expire_on_commit=False), window_ms=50
+    )
+    await writer.start()
+    try:
+        results = await asyncio.gather(
+            writer.run(_insert("a")),
+            writer.run(_insert("a")),  # violates UNIQUE
+            writer.run(_insert("b")),
+            return_exceptions=True,
+        )
+    finally:
+        await writer.stop()
+
+    assert results[0] == "a" and results[2] == "b"
+    assert isinstance(results[1], Exception)
+    assert writer.batches == 1
+    assert await _names(read) == ["a", "b"]
+
+
+@pytest.mark.asyncio
+async def test_max_batch_splits_commits(engines):
+    _, write = engines
+    writer = DatabaseWriter(
+        async_sessionmaker(write, class_=AsyncSession, expire_on_commit=False),
+        window_ms=50,
+        max_batch=2,
+    )
+    await writer.start()
+    try:
+        await asyncio.gather(*(writer.run(_insert(f"n{i}")) for i in range(5)))
+    finally:
+        await writer.stop()
+    assert writer.batches == 3
+    assert writer.jobs == 5
+
+
+@pytest.mark.asyncio
+async def test_unstarted_writer_runs_inline(engines):
+    read, write = engines
+    writer = DatabaseWriter(async_sessionmaker(write, class_=AsyncSession, expire_on_commit=False))
+    assert await writer.run(_insert("inline")) == "inline"
+    assert await _names(read) == ["inline"]
+
+
+@pytest_asyncio.fixture
+async def app_on_file_db(tmp_path, monkeypatch):
+    """The app on a file database: request sessions on the query_only pool, writer started."""
+    url = f"sqlite+aiosqlite:///{tmp_path / 'app.db'}"
+    write = create_write_engine(url)
+    read = create_read_engine(url, pool_size=4)
+    write_factory = async_sessionmaker(write, class_=AsyncSession, expire_on_commit=False)
+    read_factory = async_sessionmaker(read, class_=AsyncSession, expire_on_commit=False)
+    async with write.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with write_factory() as session:
+        await run_migrations(session)
+
+    async def _read_session():
+        async with read_factory() as session:
+            yield session
+
+    monkeypatch.setitem(app.dependency_overrides, get_db, _read_session)
+    monkeypatch.setitem(app.dependency_overrides, get_read_db, _read_session)
+    monkeypatch.setattr(db_writer, "session_factory", write_factory)
+    monkeypatch.setattr(db_writer, "window", 0.05)
+    monkeypatch.setattr(db_writer, "batches", 0)
+    monkeypatch.setattr(db_writer, "jobs", 0)
+    await db_writer.start()
+    try:
+        yield read_factory
+    finally:
+        await db_writer.stop()
+        await read.dispose()
+        await write.dispose()
+
+
+@pytest.mark.asyncio
+async def test_mutations_go_through_the_writer(app_on_file_db, auth_headers):
+    read_factory = app_on_file_db
+    async with read_factory() as session:
+        with pytest.raises(OperationalError, match="readonly"):
+            await session.execute(text("UPDATE todos SET title = 'x'"))
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        created = await asyncio.gather(*(
+            client.post("/api/todos", json={"title": f"todo {i}"}, headers=auth_headers)
+            for i in range(5)
+        ))
+        assert [r.status_code for r in created] == [201] * 5
+        # five concurrent requests, one group commit
+        assert (db_writer.batches, db_writer.jobs) == (1, 5)
+
+        todo_id = created[0].json()["id"]
+        resp = await client.patch(f"/api/todos/{todo_id}", json={"status": "completed"}, headers=auth_headers)
+        assert resp.status_code == 200 and resp.json()["completed_at"]
+        resp = await client.patch("/api/todos/missing", json={"title": "x"}, headers=auth_headers)
+        assert resp.status_code == 404
+        assert (await client.delete(f"/api/todos/{todo_id}", headers=auth_headers)).status_code == 204
+
+    async with read_factory() as session:
+        titles = (await session.execute(select(Todo.title).order_by(Todo.title))).scalars().all()
+    assert titles == [f"todo {i}" for i in range(1, 5)]
+
+
+@pytest.mark.asyncio
+async def test_inbox_pipeline_only_reads_its_session(app_on_file_db):
+    read_factory = app_on_file_db
+    todo = Todo(title="Plan the garden party next spring with friends and family " * 3)
+
+    async def insert(session: AsyncSession) -> None:
+        session.add(todo)
+
+    await db_writer.run(insert)
+
+    ai = MagicMock()
+    ai.function_call = AsyncMock(return_value={"choices": [{"message": {"tool_calls": [{
+        "function": {"arguments": json.dumps({"priority": "high", "tags": ["home"], "needs_planning": True})},
+    }]}}]})
+    ai.generate_completion = AsyncMock(return_value=json.dumps({"summary": "s", "subtasks": []}))
+    async with read_factory() as session:
+        await inbox_pipeline_service.process_todo(session, ai, todo.id)
+
+    async with read_factory() as session:
+        saved = await session.get(Todo, todo.id)
+        plan = (await session.execute(select(AgentTask).where(AgentTask.todo_id == todo.id))).scalar_one()
+    assert (saved.priority, saved.inbox_state) == ("high", "plan_ready")
+    assert plan.status == "completed"
+
+
+@pytest.mark.asyncio
+async def test_chat_turn_writes_only_through_the_writer(app_on_file_db):
+    from models.conversation import Conversation
+    from models.message import Message
+    from services.orchestrator import Orchestrator
+
+    read_factory = app_on_file_db
+    conv = Conversation()
+
+    async def insert(session: AsyncSession) -> list[Message]:
+        session.add(conv)
+        await session.flush()
+        msgs = [Message(conversation_id=conv.id, role="user", content=c) for c in ("hi", "add task: buy milk")]
+        session.add_all(msgs)
+        await session.flush()
+        return msgs
+
+    user_msgs = await db_writer.run(insert)
+
+    ai = MagicMock()
+    ai.stream_completion = MagicMock()
+    ai.generate_title = AsyncMock(return_value="Groceries")
+    ws = MagicMock(send_json=AsyncMock(), stream_to_user=AsyncMock(return_value="Hello!"))
+    # every session the orchestrator opens is query_only: a direct write would fail the turn
+    orch = Orchestrator(ai_service=ai, ws_manager=ws, session_factory=read_factory)
+    for msg in user_msgs:
+        with patch("services.orchestrator.classify_intent_fast", return_value=None), patch(
+            "services.orchestrator.classify_intent_llm",
+            AsyncMock(return_value=MagicMock(
+                intent="general_chat" if msg.content == "hi" else "create_todo",
+                params={"title": "buy milk"},
+            )),
+        ):
+            await orch.handle_message("user", conv.id, msg.id, msg.content)
+
+    async with read_factory() as session:
+        saved = (await session.execute(
+            select(Message.role, Message.intent, Message.content, Message.message_type)
+            .where(Message.conversation_id == conv.id).order_by(Message.created_at, Message.role.desc())
+        )).all()
+        todo = (await session.execute(select(Todo.title))).scalar_one()
+        title = (await session.get(Conversation, conv.id)).title
+    assert [(r.role, r.intent) for r in saved if r.role == "user"] == [
+        ("user", "general_chat"), ("user", "create_todo"),
+    ]
+    assert {r.content for r in saved if r.role == "assistant"} == {
+        "Hello!", "Created task: 'buy milk' with medium priority.",
+    }
+    assert all(r.message_type != "system" for r in saved)  # no error replies
+    assert (todo, title) == ("buy milk", "Groceries")
+
+
+@pytest.mark.asyncio
+async def test_vault_scan_saves_through_the_writer(app_on_file_db, tmp_path, monkeypatch):
+    from config import settings
+    from services import vault_watcher_service
+
+    read_factory = app_on_file_db
+    todo = Todo(title="Pay rent")
+
+    async def insert(session: AsyncSession) -> None:
+        session.add(todo)
+
+    await db_writer.run(insert)
+    vault = tmp_path / "vault"
+    (vault / "Home").mkdir(parents=True)
+    (vault / "Home" / "TODO.md").write_text(f"- [x] Pay rent @high <!-- claw:{todo.id} -->\n")
+    monkeypatch.setattr(settings, "obsidian_vault_path", str(vault))
+    monkeypatch.setattr(vault_watcher_service, "_file_hashes", {})
+
+    async with read_factory() as session:
+        result = await vault_watcher_service.scan_vault(session)
+    assert (result.changes_applied, result.errors) == (2, 0)
+
+    async with read_factory() as session:
+        saved = await session.get(Todo, todo.id)
+    assert (saved.status, saved.priority) == ("completed", "high") and saved.completed_at
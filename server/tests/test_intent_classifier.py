@@ -0,0 +1,114 @@
+"""Tests for the local intent fast path and its fall-through to the LLM."""
+
+import json
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from benchmarks.intent_classifier import load_corpus
+from services.intent_classifier import classify_intent
+from services.intent_fast_path import _SEED_CORPUS, _features, classify_local
+
+
+def _llm_service(intent: str = "general_chat", **params):
+    ai = MagicMock()
+    ai.function_call = AsyncMock(return_value={
+        "choices": [{
+            "message": {
+                "tool_calls": [{
+                    "function": {
+                        "name": "classify_intent",
+                        "arguments": json.dumps({"intent": intent, **params}),
+                    }
+                }]
+            }
+        }]
+    })
+    return ai
+
+
+class TestClassifyLocal:
+    @pytest.mark.parametrize("message,intent", [
+        ("what are my tasks?", "query_todos"),
+        ("What's on my calendar?", "query_events"),
+        ("what's my day look like?", "daily_briefing"),
+        ("let's do a weekly review", "weekly_review"),
+        ("how busy am I this week?", "analyze_schedule"),
+        ("thanks!", "general_chat"),
+    ])
+    def test_param_free_rules(self, message, intent):
+        result = classify_local(message)
+        assert result.intent == intent
+        assert result.confidence >= 0.85
+
+    def test_complete_extracts_title(self):
+        result = classify_local("mark buy milk as done")
+        assert result.intent == "complete_todo"
+        assert result.params == {"title": "buy milk"}
+        assert result.confidence >= 0.85
+
+    def test_check_off_takes_a_short_title(self):
+        assert classify_local("check off the dry cleaning").params == {"title": "dry cleaning"}
+        compound = classify_local("check off the report and email the boss")
+        assert compound.params.get("title") != "report and email the boss"
+
+    @pytest.mark.parametrize("message", [
+        "complete this sentence: the quick brown fox",
+        "I did my best",
+        "mark my words",
+        "finish the essay for me please",
+        "delete the todo list app idea from my notes",
+        "delete the task buy milk",
+        "search for a good recipe for dinner and tell me what you think",
+        "check off the report and email the boss",
+        "check off my list of complaints",
+    ])
+    def test_chat_lookalikes_defer_to_llm(self, message):
+        """Mutations need explicit todo wording; deletions always go to the LLM."""
+        assert classify_local(message).confidence < 0.85
+
+    def test_search_extracts_query(self):
+        result = classify_local("find everything about VLA")
+        assert result.intent == "search"
+        assert result.params == {"query": "VLA"}
+
+    def test_dates_defer_to_llm(self):
+        """A due date needs the LLM's structured extraction."""
+        result = classify_local("remind me to call mom tomorrow at 5pm")
+        assert result.intent == "create_todo"
+        assert result.confidence < 0.85
+
+    def test_unknown_vocabulary_is_not_confident(self):
+        assert classify_local("explain quantum chromodynamics succinctly").confidence < 0.85
+
+    def test_benchmark_corpus_is_held_out(self):
+        seed = {tuple(_features(doc)) for docs in _SEED_CORPUS.values() for doc in docs}
+        assert not [row["message"] for row in load_corpus() if tuple(_features(row["message"])) in seed]
+
+
+class TestClassifyIntent:
+    @pytest.mark.asyncio
+    async def test_fast_path_skips_llm(self):
+        ai = _llm_service()
+        result = await classify_intent("complete the task buy milk", ai)
+        assert result.intent == "complete_todo"
+        assert result.params == {"title": "buy milk"}
+        assert result.source == "rules"
+        ai.function_call.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_low_confidence_falls_through(self):
+        ai = _llm_service("create_event", title="Sync", start_time="2026-01-05T15:00:00")
+        result = await classify_intent("set up a sync with the design team on monday at 3", ai)
+        assert result.intent == "create_event"
+        assert result.source == "llm"
+        ai.function_call.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    @patch("services.intent_classifier.settings")
+    async def test_disabled_always_calls_llm(self, mock_settings):
+        mock_settings.intent_fast_path_enabled = False
+        ai = _llm_service("query_todos")
+        result = await classify_intent("what are my tasks?", ai)
+        assert result.source == "llm"
+        ai.function_call.assert_awaited_once()
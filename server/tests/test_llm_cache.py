@@ -0,0 +1,90 @@
+"""Tests for the persistent LLM response cache."""
+
+import json
+import time
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from services.llm_cache import CachedAIProvider, LLMResponseCache, make_key
+
+
+def _tool_response(args: dict) -> dict:
+    return {"choices": [{"message": {"tool_calls": [{
+        "function": {"name": "classify_intent", "arguments": json.dumps(args)},
+    }]}}]}
+
+
+@pytest.fixture
+def cache():
+    c = LLMResponseCache(":memory:", ttl_seconds=60, max_entries=3)
+    yield c
+    c.close()
+
+
+def _provider(cache, **methods):
+    inner = MagicMock()
+    for name, value in methods.items():
+        setattr(inner, name, AsyncMock(return_value=value))
+    return inner, CachedAIProvider(inner, cache, "openclaw", "test-model")
+
+
+@pytest.mark.asyncio
+async def test_title_cached_across_near_identical_messages(cache):
+    inner, ai = _provider(cache, generate_title="Grocery Planning")
+    assert await ai.generate_title("Help me plan groceries") == "Grocery Planning"
+    assert await ai.generate_title("  help me plan   GROCERIES? ") == "Grocery Planning"
+    inner.generate_title.assert_awaited_once()
+
+    stats = await cache.get_stats()
+    assert stats["hits"] == 1 and stats["misses"] == 1
+    assert stats["entries"] == 1 and stats["bytes_stored"] == len("Grocery Planning")
+
+
+@pytest.mark.asyncio
+async def test_function_call_keyed_on_prompt_and_tools(cache):
+    inner, ai = _provider(cache, function_call=_tool_response({"intent": "query_todos"}))
+    tools = [{"type": "function", "function": {"name": "classify_intent"}}]
+    await ai.function_call("prompt A", "list stuff", tools)
+    await ai.function_call("prompt A", "list stuff", tools)
+    await ai.function_call("prompt B", "list stuff", tools)
+    assert inner.function_call.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_fallbacks_and_relative_dates_not_cached(cache):
+    inner, ai = _provider(cache, generate_title="New Conversation")
+    await ai.generate_title("hello")
+    await ai.generate_title("hello")
+    assert inner.generate_title.await_count == 2
+
+    inner, ai = _provider(cache, function_call=_tool_response({"intent": "create_todo"}))
+    await ai.function_call("p", "pay rent tomorrow", [])
+    await ai.function_call("p", "pay rent tomorrow", [])
+    assert inner.function_call.await_count == 2
+
+    inner, ai = _provider(cache, function_call={"fallback": True, **_tool_response({"intent": "general_chat"})})
+    await ai.function_call("p", "gibberish", [])
+    await ai.function_call("p", "gibberish", [])
+    assert inner.function_call.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_lru_eviction_and_ttl(cache):
+    for i in range(4):
+        await cache.set(f"k{i}", "title", "openclaw", "m", f"v{i}")
+        time.sleep(0.001)
+    assert await cache.get("k0") is None  # evicted: max_entries=3
+    assert await cache.get("k3") == "v3"
+
+    cache.ttl_seconds = 0
+    time.sleep(0.001)
+    assert await cache.get("k3") is None
+
+
+def test_passthrough_attributes(cache):
+    inner = MagicMock()
+    inner.base_url = "http://gateway"
+    ai = CachedAIProvider(inner, cache, "openclaw", "m")
+    assert ai.base_url == "http://gateway"
+    assert make_key("a", "m", "title", "", "Hi!") == make_key("a", "m", "title", "", "hi")
@@ -0,0 +1,119 @@
+"""Tests for the priority-aware LLM scheduler."""
+
+import asyncio
+from unittest.mock import MagicMock
+
+import pytest
+
+from services.llm_scheduler import (
+    LLMScheduler,
+    Priority,
+    ScheduledAIProvider,
+    current_priority,
+    llm_priority,
+    with_priority,
+)
+
+
+async def _hold(scheduler, priority, log, name, release: asyncio.Event):
+    async with scheduler.slot(priority):
+        log.append(name)
+        await release.wait()
+
+
+@pytest.mark.asyncio
+async def test_interactive_jumps_queued_background_work():
+    scheduler = LLMScheduler(max_concurrency=1, reserved_interactive=0)
+    log: list[str] = []
+    gate = asyncio.Event()
+
+    first = asyncio.create_task(_hold(scheduler, Priority.SCHEDULED, log, "scheduled-1", gate))
+    await asyncio.sleep(0)
+    queued = [
+        asyncio.create_task(_hold(scheduler, Priority.SCHEDULED, log, "scheduled-2", gate)),
+        asyncio.create_task(_hold(scheduler, Priority.BACKGROUND, log, "background", gate)),
+    ]
+    await asyncio.sleep(0)
+    queued.append(asyncio.create_task(_hold(scheduler, Priority.INTERACTIVE, log, "chat", gate)))
+    await asyncio.sleep(0)
+
+    gate.set()
+    await asyncio.gather(first, *queued)
+    assert log == ["scheduled-1", "chat", "background", "scheduled-2"]
+    classes = scheduler.snapshot()["classes"]
+    assert classes["scheduled"]["preempted"] == 2
+    assert classes["background"]["preempted"] == 1
+    assert classes["interactive"]["preempted"] == 0
+
+
+@pytest.mark.asyncio
+async def test_class_caps_and_reserved_interactive_slot():
+    scheduler = LLMScheduler(
+        max_concurrency=3,
+        class_limits={Priority.BACKGROUND: 5},
+        reserved_interactive=1,
+    )
+    gate = asyncio.Event()
+    log: list[str] = []
+    background = [
+        asyncio.create_task(_hold(scheduler, Priority.BACKGROUND, log, f"bg{i}", gate))
+        for i in range(3)
+    ]
+    await asyncio.sleep(0)
+    assert scheduler.snapshot()["in_flight"] == 2  # last slot kept for interactive
+
+    chat = asyncio.create_task(_hold(scheduler, Priority.INTERACTIVE, log, "chat", gate))
+    await asyncio.sleep(0)
+    assert "chat" in log
+
+    gate.set()
+    await asyncio.gather(chat, *background)
+    assert scheduler.snapshot()["in_flight"] == 0
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_leaves_queue():
+    scheduler = LLMScheduler(max_concurrency=1, reserved_interactive=0)
+    gate = asyncio.Event()
+    holder = asyncio.create_task(_hold(scheduler, Priority.INTERACTIVE, [], "a", gate))
+    await asyncio.sleep(0)
+    waiter = asyncio.create_task(_hold(scheduler, Priority.BACKGROUND, [], "b", gate))
+    await asyncio.sleep(0)
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+    assert scheduler.snapshot()["waiting"] == 0
+    gate.set()
+    await holder
+    assert scheduler.snapshot()["in_flight"] == 0
+
+
+@pytest.mark.asyncio
+async def test_priority_context_never_raises_and_flows_to_provider():
+    seen: list[Priority] = []
+
+    class FakeAI:
+        async def generate_completion(self, system_prompt, user_message):
+            seen.append(current_priority())
+            return "ok"
+
+    scheduler = LLMScheduler(max_concurrency=2)
+    ai = ScheduledAIProvider(FakeAI(), scheduler)
+
+    @with_priority(Priority.BACKGROUND)
+    async def pipeline():
+        return await ai.generate_completion("s", "m")
+
+    with llm_priority(Priority.SCHEDULED):
+        await pipeline()
+    await pipeline()
+    await ai.generate_completion("s", "m")
+
+    assert seen == [Priority.SCHEDULED, Priority.BACKGROUND, Priority.INTERACTIVE]
+    assert scheduler.snapshot()["classes"]["background"]["completed"] == 1
+
+
+def test_passthrough_attributes():
+    inner = MagicMock()
+    inner.base_url = "http://gateway"
+    assert ScheduledAIProvider(inner, LLMScheduler()).base_url == "http://gateway"
@@ -0,0 +1,144 @@
+"""GET /api/todos/projects: aggregation, filters, pagination and caching."""
+
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+import pytest_asyncio
+from httpx import AsyncClient
+from sqlalchemy import text
+
+_BASE = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+_INSERT_TODO = text(
+    "INSERT INTO todos (id, title, status, priority, sort_order, inbox_state, source,"
+    " parent_id, created_at, updated_at)"
+    " VALUES (:id, :title, :status, 'medium', 0, 'none', :source, :parent_id, :ts, :ts)"
+)
+_INSERT_CONV = text(
+    "INSERT INTO conversations (id, title, is_archived, project_todo_id, created_at, updated_at)"
+    " VALUES (:id, :title, :archived, :todo_id, :ts, :ts)"
+)
+
+
+def _todo(title, *, parent_id=None, status="pending", source=None, minutes=0):
+    return {
+        "id": f"todo_{uuid.uuid4().hex[:12]}",
+        "title": title,
+        "status": status,
+        "source": source,
+        "parent_id": parent_id,
+        "ts": (_BASE + timedelta(minutes=minutes)).isoformat(),
+    }
+
+
+@pytest_asyncio.fixture
+async def small_projects(db_session):
+    """Four root todos: three qualify as projects, one is a plain task."""
+    with_subtasks = _todo("Kitchen remodel", minutes=4)
+    with_conv = _todo("Trip planning", minutes=3)
+    with_source = _todo("Vault project", source="obsidian_project", minutes=2)
+    plain = _todo("Buy milk", minutes=1)
+    rows = [with_subtasks, with_conv, with_source, plain]
+    rows += [
+        _todo("Pick tiles", parent_id=with_subtasks["id"], status="completed"),
+        _todo("Call plumber", parent_id=with_subtasks["id"]),
+    ]
+    await db_session.execute(_INSERT_TODO, rows)
+    await db_session.execute(_INSERT_CONV, [
+        {"id": "conv_live", "title": "t", "archived": False, "todo_id": with_conv["id"], "ts": _BASE.isoformat()},
+        {"id": "conv_old", "title": "t", "archived": True, "todo_id": plain["id"], "ts": _BASE.isoformat()},
+    ])
+    await db_session.commit()
+    return {"subtasks": with_subtasks, "conv": with_conv, "source": with_source, "plain": plain}
+
+
+@pytest_asyncio.fixture
+async def many_todos(db_session):
+    """10k todos: 2k roots, 1k of which have 8 subtasks each."""
+    roots = [_todo(f"Root {i}", minutes=i, source="obsidian_project" if i % 7 == 0 else None) for i in range(2000)]
+    subtasks = [
+        _todo(f"Sub {i}.{j}", parent_id=roots[i]["id"], status="completed" if j % 2 else "pending")
+        for i in range(1000)
+        for j in range(8)
+    ]
+    await db_session.execute(_INSERT_TODO, roots + subtasks)
+    await db_session.execute(_INSERT_CONV, [
+        {"id": f"conv_{i}", "title": "t", "archived": False, "todo_id": roots[i]["id"], "ts": _BASE.isoformat()}
+        for i in range(1000, 1500)
+    ])
+    await db_session.commit()
+    return roots
+
+
+@pytest.mark.asyncio
+async def test_projects_aggregate_counts(client: AsyncClient, auth_headers: dict, small_projects):
+    resp = await client.get("/api/todos/projects", headers=auth_headers)
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["total"] == 3
+    by_title = {p["title"]: p for p in body["items"]}
+    assert list(by_title) == ["Kitchen remodel", "Trip planning", "Vault project"]
+
+    kitchen = by_title["Kitchen remodel"]
+    assert (kitchen["subtask_count"], kitchen["completed_subtask_count"]) == (2, 1)
+    assert kitchen["conversation_id"] is None
+    assert by_title["Trip planning"]["conversation_id"] == "conv_live"
+    assert by_title["Vault project"]["subtask_count"] == 0
+
+
+@pytest.mark.asyncio
+async def test_projects_filters_and_pages(client: AsyncClient, auth_headers: dict, small_projects):
+    resp = await client.get("/api/todos/projects", params={"source": "obsidian_project"}, headers=auth_headers)
+    assert [p["title"] for p in resp.json()["items"]] == ["Vault project"]
+
+    resp = await client.get("/api/todos/projects", params={"q": "TRIP"}, headers=auth_headers)
+    assert [p["title"] for p in resp.json()["items"]] == ["Trip planning"]
+
+    resp = await client.get("/api/todos/projects", params={"limit": 2, "page": 2}, headers=auth_headers)
+    body = resp.json()
+    assert body["total"] == 3
+    assert [p["title"] for p in body["items"]] == ["Vault project"]
+
+    resp = await client.get("/api/todos/projects", params={"limit": 2, "page": 5}, headers=auth_headers)
+    assert resp.json() == {"items": [], "total": 3, "page": 5, "limit": 2, "next_cursor": None}
+
+
+@pytest.mark.asyncio
+async def test_projects_cache_invalidated_by_todo_change(
+    client: AsyncClient, auth_headers: dict, small_projects, query_counter
+):
+    await client.get("/api/todos/projects", headers=auth_headers)
+    with query_counter:
+        resp = await client.get("/api/todos/projects", headers=auth_headers)
+    assert resp.json()["total"] == 3
+    assert not any("FROM todos" in s for s in query_counter.statements)
+
+    # Adding a subtask promotes "Buy milk" to a project.
+    resp = await client.post(
+        "/api/todos",
+        json={"title": "Oat milk", "parent_id": small_projects["plain"]["id"]},
+        headers=auth_headers,
+    )
+    assert resp.status_code == 201
+    resp = await client.get("/api/todos/projects", headers=auth_headers)
+    assert resp.json()["total"] == 4
+
+
+@pytest.mark.asyncio
+async def test_projects_query_count_bounded(
+    client: AsyncClient, auth_headers: dict, many_todos, query_counter
+):
+    with query_counter:
+        resp = await client.get("/api/todos/projects", params={"limit": 500}, headers=auth_headers)
+    assert resp.status_code == 200
+    body = resp.json()
+    # Roots 0-999 have subtasks, 1000-1499 a conversation, plus every 7th of the rest.
+    assert body["total"] == 1500 + len([i for i in range(1500, 2000) if i % 7 == 0])
+    assert len(body["items"]) == 500
+    assert body["items"][0]["title"] == "Root 1995"  # newest root that qualifies
+    assert body["items"][-1]["conversation_id"] is not None
+    # One statement for the page (plus whatever auth needs), independent of row count.
+    todo_queries = [s for s in query_counter.statements if "todos" in s]
+    assert len(todo_queries) == 1
+    assert query_counter.count <= 3
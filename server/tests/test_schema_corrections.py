@@ -8,10 +8,13 @@ from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
 from database import (
+    MIGRATIONS,
     Base,
+    Migration,
     _apply_schema_corrections,
     _run_data_migrations,
     _setup_fts,
+    run_migrations,
 )
 
 
@@ -46,7 +49,7 @@ async def fresh_db():
     async with _engine.begin() as conn:
         await conn.run_sync(Base.metadata.drop_all)
         # Drop FTS virtual tables that aren't tracked by ORM metadata
-        for tbl in ("messages_fts", "todos_fts", "events_fts"):
+        for tbl in ("messages_fts", "todos_fts", "events_fts", "schema_version", "change_log"):
             await conn.execute(text(f"DROP TABLE IF EXISTS {tbl}"))
 
 
@@ -209,3 +212,64 @@ async def test_fts_backfill(fresh_db: AsyncSession):
     fts_row = row.fetchone()
     assert fts_row is not None, "Backfill should have populated FTS for pre-existing todo"
     assert fts_row[1] == "Pre-existing task"
+
+
+# ---- Versioned migration tests ----
+
+
+@pytest.mark.asyncio
+async def test_migrations_apply_once(fresh_db: AsyncSession):
+    """Every registered migration runs on a new database, then never again."""
+    applied = await run_migrations(fresh_db)
+    assert applied == [m.version for m in MIGRATIONS]
+
+    rows = await fresh_db.execute(text("SELECT version, name FROM schema_version ORDER BY version"))
+    assert [(r[0], r[1]) for r in rows.fetchall()] == [(m.version, m.name) for m in MIGRATIONS]
+
+    assert await run_migrations(fresh_db) == []
+
+
+@pytest.mark.asyncio
+async def test_only_pending_migrations_run(fresh_db: AsyncSession):
+    """Recorded versions are skipped; new ones run in version order."""
+    calls: list[str] = []
+
+    def step(name: str):
+        async def apply(session: AsyncSession) -> None:
+            calls.append(name)
+
+        return apply
+
+    registry = [Migration(1, "one", step("one")), Migration(2, "two", step("two"))]
+    assert await run_migrations(fresh_db, registry) == [1, 2]
+
+    registry.append(Migration(3, "three", step("three")))
+    assert await run_migrations(fresh_db, registry) == [3]
+    assert calls == ["one", "two", "three"]
+
+
+@pytest.mark.asyncio
+async def test_fts_backfill_skipped_when_applied(fresh_db: AsyncSession):
+    """Once the FTS migration is recorded, startup no longer backfills."""
+    await run_migrations(fresh_db)
+    # Rows written behind the triggers' back stay unindexed on later starts.
+    await fresh_db.execute(text("DROP TRIGGER todos_fts_ai"))
+    tid, stmt, params = _todo_insert()
+    await fresh_db.execute(stmt, params)
+    await fresh_db.commit()
+
+    await run_migrations(fresh_db)
+
+    row = await fresh_db.execute(
+        text("SELECT 1 FROM todos_fts WHERE todos_fts MATCH :q"), {"q": f'"{params["title"]}"'}
+    )
+    assert row.scalar() is None
+
+
+@pytest.mark.asyncio
+async def test_migration_versions_must_ascend(fresh_db: AsyncSession):
+    async def noop(session: AsyncSession) -> None:
+        pass
+
+    with pytest.raises(RuntimeError, match="ascending"):
+        await run_migrations(fresh_db, [Migration(2, "b", noop), Migration(1, "a", noop)])
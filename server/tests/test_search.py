@@ -0,0 +1,206 @@
+"""Search: one ranked, paginated FTS5 statement with snippets and capped totals."""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+import pytest_asyncio
+from httpx import AsyncClient
+from sqlalchemy import select, text
+
+from config import settings
+from models.conversation import Conversation
+from models.event import Event
+from models.message import Message
+from models.todo import Todo
+from services import search_service
+
+_BASE = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+@pytest_asyncio.fixture
+async def corpus(db_session):
+    conv = Conversation(title="Chat")
+    db_session.add(conv)
+    await db_session.flush()
+    db_session.add_all(
+        Message(
+            conversation_id=conv.id,
+            role="user",
+            content=f"note {i} about the garden " + "filler " * 30 + ("and the dentist" if i % 10 == 0 else ""),
+            created_at=_BASE + timedelta(minutes=i),
+        )
+        for i in range(120)
+    )
+    db_session.add(Todo(title="Call the dentist", description="Ask about the cleaning"))
+    db_session.add(Todo(title="Water the garden"))
+    db_session.add(Event(title="Dentist", location="Main street clinic", start_time=_BASE))
+    await db_session.commit()
+
+
+@pytest.mark.asyncio
+async def test_ranked_pages_across_types(client: AsyncClient, auth_headers: dict, corpus, query_counter):
+    with query_counter:
+        resp = await client.get("/api/search", params={"q": "dentist", "limit": 5}, headers=auth_headers)
+    body = resp.json()
+    assert body["total"] == 14 and body["total_capped"] is False
+    assert [h["rank"] for h in body["items"]] == sorted(h["rank"] for h in body["items"])
+    assert len([s for s in query_counter.statements if "_fts" in s]) == 2
+
+    items = body["items"]
+    for page in (2, 3):
+        resp = await client.get(
+            "/api/search", params={"q": "dentist", "limit": 5, "page": page}, headers=auth_headers
+        )
+        items += resp.json()["items"]
+    assert len({h["id"] for h in items}) == 14
+    assert {h["type"] for h in items} == {"message", "todo", "event"}
+
+    todo = next(h for h in items if h["type"] == "todo")
+    assert todo["title"] == "Call the dentist"
+    assert "<mark>dentist</mark>" in todo["highlight"]
+    assert "<mark>" not in todo["preview"]
+
+
+@pytest.mark.asyncio
+async def test_short_page_skips_count_and_snippets_are_bounded(db_session, corpus, query_counter):
+    with query_counter:
+        result = await search_service.search(db_session, "garden", ["messages"], limit=200)
+    assert (result.total, result.total_capped) == (120, False)
+    assert len(query_counter.statements) == 1
+    assert all(h.type == "message" and h.title is None for h in result.hits)
+    assert all(len(h.preview.split()) <= search_service.SNIPPET_TOKENS + 1 for h in result.hits)
+
+
+@pytest.mark.asyncio
+async def test_total_is_capped(db_session, corpus, monkeypatch):
+    monkeypatch.setattr(settings, "search_total_cap", 50)
+    result = await search_service.search(db_session, "garden", limit=10, page=2)
+    assert len(result.hits) == 10 and (result.total, result.total_capped) == (50, True)
+
+    result = await search_service.search(db_session, "garden", limit=10, page=20)
+    assert result.hits == [] and result.total_capped is True
+
+
+@pytest.mark.asyncio
+async def test_query_text_is_literal(db_session, corpus):
+    for query in ('dentist"', "dentist OR", "NEAR(", "*"):
+        await search_service.search(db_session, query)
+    result = await search_service.search(db_session, "   ")
+    assert (result.hits, result.total) == ([], 0)
+
+
+@pytest.mark.asyncio
+async def test_tiers_fall_through_exact_prefix_fuzzy(
+    client: AsyncClient, auth_headers: dict, corpus, db_session, monkeypatch
+):
+    resp = await client.get("/api/search", params={"q": "dentist"}, headers=auth_headers)
+    assert resp.json()["tier"] == "exact" and set(resp.json()["timings_ms"]) == {"exact"}
+
+    for partial in ("de", "dent"):
+        result = await search_service.search(db_session, partial, ["todos"])
+        assert result.tier == "prefix"
+        assert [h.title for h in result.hits] == ["Call the dentist"]
+
+    resp = await client.get("/api/search", params={"q": "dentsit", "types": "todos,events"}, headers=auth_headers)
+    body = resp.json()
+    assert body["tier"] == "fuzzy" and set(body["timings_ms"]) == {"exact", "prefix", "fuzzy"}
+    assert {h["title"] for h in body["items"][:2]} == {"Call the dentist", "Dentist"}
+    todo = next(h for h in body["items"] if h["type"] == "todo")
+    # whole words, not the trigram index's overlapping snippet() fragments
+    assert todo["preview"] == "Call the dentist"
+    assert todo["highlight"] == "Call the <mark>dentist</mark>"
+
+    monkeypatch.setattr(settings, "search_fuzzy_enabled", False)
+    result = await search_service.search(db_session, "dentsit")
+    assert result.hits == [] and set(result.timings_ms) == {"exact", "prefix"}
+
+
+@pytest.mark.asyncio
+async def test_indexes_follow_edits_and_reindex(db_session, corpus):
+    from services.admin_service import reindex_fts
+
+    sql = (await db_session.execute(
+        text("SELECT sql FROM sqlite_master WHERE name = 'todos_fts'")
+    )).scalar()
+    assert "prefix='2 3'" in sql
+
+    todo = (await db_session.execute(select(Todo).where(Todo.title == "Water the garden"))).scalar_one()
+    todo.title = "Repot the orchids"
+    await db_session.commit()
+    fuzzy = await search_service.search(db_session, "orchd", ["todos"])
+    assert fuzzy.tier == "fuzzy" and fuzzy.hits[0].highlight == "Repot the <mark>orchids</mark>"
+    assert (await search_service.search(db_session, "garden", ["todos"])).hits == []
+
+    assert set(await reindex_fts(db_session)) == {
+        f"{t}{s}" for t in ("messages", "todos", "events") for s in ("_fts", "_trigram")
+    }
+    assert (await search_service.search(db_session, "orch", ["todos"])).tier == "prefix"
+
+
+async def _index_fingerprint(db_session, index: str):
+    return (await db_session.execute(
+        text(f"SELECT count(*), sum(length(block)), group_concat(rowid) FROM {index}_data")
+    )).one()
+
+
+@pytest.mark.asyncio
+async def test_external_content_indexes_skip_unindexed_updates(db_session, corpus):
+    shadow = (await db_session.execute(
+        text("SELECT name FROM sqlite_master WHERE name LIKE '%\\_content' ESCAPE '\\'")
+    )).scalars().all()
+    assert shadow == []
+
+    todo = (await db_session.execute(select(Todo).where(Todo.title == "Call the dentist"))).scalar_one()
+    before = {i: await _index_fingerprint(db_session, i) for i in ("todos_fts", "todos_trigram")}
+    todo.status, todo.priority, todo.sort_order = "completed", "high", 7
+    await db_session.commit()
+    assert {i: await _index_fingerprint(db_session, i) for i in before} == before
+
+    todo.description = "Ask about whitening"
+    await db_session.commit()
+    assert await _index_fingerprint(db_session, "todos_fts") != before["todos_fts"]
+    assert [h.title for h in (await search_service.search(db_session, "whitening")).hits] == ["Call the dentist"]
+    assert (await search_service.search(db_session, "cleaning", tiers=("exact",))).hits == []
+
+    await db_session.delete(todo)
+    await db_session.commit()
+    assert (await search_service.search(db_session, "dentist", ["todos"])).hits == []
+
+
+@pytest.mark.asyncio
+async def test_vacuum_rebuilds_indexes_after_rowids_move(tmp_path):
+    from sqlalchemy.exc import DatabaseError
+    from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+    from database import Base, create_write_engine, run_migrations, vacuum_db
+
+    write = create_write_engine(f"sqlite+aiosqlite:///{tmp_path / 'vacuum.db'}")
+    factory = async_sessionmaker(write, class_=AsyncSession, expire_on_commit=False)
+    try:
+        async with write.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        async with factory() as session:
+            await run_migrations(session)
+            session.add_all(Todo(title=f"filler {i}") for i in range(20))
+            session.add(Todo(title="Call the dentist"))
+            await session.commit()
+            await session.execute(text("DELETE FROM todos WHERE title LIKE 'filler %'"))
+            await session.commit()
+
+        async def hits() -> list[str | None]:
+            async with factory() as session:
+                return [h.title for h in (await search_service.search(session, "dentist", ["todos"])).hits]
+
+        assert await hits() == ["Call the dentist"]
+        # VACUUM may renumber implicit rowids; do it explicitly, which the
+        # column-aware triggers don't see either
+        async with factory() as session:
+            await session.execute(text("UPDATE todos SET rowid = rowid + 1000"))
+            await session.commit()
+        with pytest.raises(DatabaseError):  # the index points at rowids that moved
+            await hits()
+
+        assert "todos_fts" in await vacuum_db(write)
+        assert await hits() == ["Call the dentist"]
+    finally:
+        await write.dispose()
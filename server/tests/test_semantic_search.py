@@ -0,0 +1,133 @@
+"""Semantic search: local embeddings, the memmapped IVF index and hybrid fusion."""
+
+import pytest
+import pytest_asyncio
+from httpx import AsyncClient
+from sqlalchemy import select
+
+from config import settings
+from models.todo import Todo
+from services import embedding_service
+from services.embedding_worker import EmbeddingWorker
+from services.vector_index import VectorIndex, VectorItem
+from tests.conftest import _test_session_factory
+
+np = pytest.importorskip("numpy")
+
+
+def _clustered(n: int, dim: int = 32, clusters: int = 20, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(clusters, dim))
+    data = centers[rng.integers(clusters, size=n)] + 0.3 * rng.normal(size=(n, dim))
+    return (data / np.linalg.norm(data, axis=1, keepdims=True)).astype(np.float32)
+
+
+def test_ivf_index_recall_growth_and_reopen(tmp_path):
+    data = _clustered(3000)
+    index = VectorIndex(str(tmp_path), 32, "test", ivf_min_rows=500, nprobe=4)
+    index.upsert([VectorItem("todo", str(i), "d", v) for i, v in enumerate(data)])
+    stats = index.stats()
+    assert stats["rows"] == 3000 and stats["capacity"] >= 3000 and stats["lists"] >= 16
+
+    queries = _clustered(50, seed=1)
+    recall = np.mean([
+        len({h.ref for h in index.query(q, 10)} & {h.ref for h in index.query(q, 10, exact=True)}) / 10
+        for q in queries
+    ])
+    assert recall >= 0.8
+
+    assert index.remove("todo", ["0", "1", "missing"]) == 2
+    assert "0" not in {h.ref for h in index.query(data[0], 5, exact=True)}
+    index.upsert([VectorItem("note", "a.md", "d", data[0], "a", "preview", 1.0)])
+    [hit] = index.query(data[0], 1, kinds=["note"])
+    assert (hit.ref, hit.title, hit.preview) == ("a.md", "a", "preview")
+    index.close()
+
+    reopened = VectorIndex(str(tmp_path), 32, "test", ivf_min_rows=500, nprobe=4)
+    assert len(reopened) == 2999
+    assert reopened.query(data[5], 1)[0].ref == "5"
+    reopened.close()
+    # a different model starts from scratch
+    assert len(VectorIndex(str(tmp_path), 32, "other")) == 0
+
+
+@pytest_asyncio.fixture
+async def vector_index(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "embedding_enabled", True)
+    monkeypatch.setattr(settings, "embedding_index_dir", str(tmp_path / "embeddings"))
+    monkeypatch.setattr(settings, "obsidian_vault_path", "")
+    index = embedding_service.open_index()
+    yield index
+    embedding_service.close_index()
+
+
+@pytest.mark.asyncio
+async def test_worker_follows_change_log(db_session, vector_index):
+    worker = EmbeddingWorker(_test_session_factory, vector_index)
+    db_session.add_all([Todo(title="Teeth cleaning at the dentist"), Todo(title="Buy groceries")])
+    await db_session.commit()
+    await worker.run_once()  # first run: full pass
+    assert len(vector_index) == 2
+
+    todo = (await db_session.execute(select(Todo).where(Todo.title.like("Teeth%")))).scalar_one()
+    before = vector_index.digests("todo")
+    todo.status = "completed"
+    await db_session.commit()
+    await worker.run_once()
+    assert vector_index.digests("todo") == before
+
+    todo.title = "Teeth whitening"
+    await db_session.commit()
+    await worker.run_once()
+    assert vector_index.digests("todo")[todo.id] != before[todo.id]
+
+    await db_session.delete(todo)
+    await db_session.commit()
+    await worker.run_once()
+    assert set(vector_index.digests("todo")) == set(before) - {todo.id}
+
+
+@pytest.mark.asyncio
+async def test_semantic_and_hybrid_modes(
+    client: AsyncClient, auth_headers: dict, db_session, vector_index, tmp_path
+):
+    db_session.add_all([
+        Todo(title="Book teeth cleanings", description="Ask the dental office"),
+        Todo(title="Water the garden"),
+    ])
+    await db_session.commit()
+    vault = tmp_path / "vault"
+    (vault / ".obsidian").mkdir(parents=True)
+    (vault / ".obsidian" / "skip.md").write_text("teeth")
+    (vault / "Health.md").write_text("Dental plan: a teeth cleaning twice a year.")
+    worker = EmbeddingWorker(_test_session_factory, vector_index)
+    await worker.run_once()
+    await worker.scan_vault(str(vault))
+    assert vector_index.digests("note").keys() == {"Health.md"}
+
+    params = {"q": "teeth cleaning", "mode": "semantic"}
+    body = (await client.get("/api/search", params=params, headers=auth_headers)).json()
+    assert body["mode"] == "semantic" and "semantic" in body["timings_ms"]
+    assert {h["type"] for h in body["items"][:2]} == {"todo", "note"}
+    assert "Water the garden" not in {h["title"] for h in body["items"]}
+    note = next(h for h in body["items"] if h["type"] == "note")
+    assert (note["id"], note["title"]) == ("Health.md", "Health")
+
+    # "cleaning" alone misses the keyword index ("cleanings"), semantic still finds it
+    params = {"q": "dental cleaning", "mode": "hybrid", "types": "todos"}
+    body = (await client.get("/api/search", params=params, headers=auth_headers)).json()
+    assert body["mode"] == "hybrid"
+    assert body["items"][0]["title"] == "Book teeth cleanings"
+    assert body["items"][0]["rank"] < 0
+
+
+@pytest.mark.asyncio
+async def test_semantic_mode_falls_back_without_index(client: AsyncClient, auth_headers: dict, db_session):
+    db_session.add(Todo(title="Call the dentist"))
+    await db_session.commit()
+    params = {"q": "dentist", "mode": "hybrid"}
+    body = (await client.get("/api/search", params=params, headers=auth_headers)).json()
+    assert body["mode"] == "keyword" and body["tier"] == "exact" and body["total"] == 1
+
+    resp = await client.get("/api/search", params={"q": "x", "mode": "vector"}, headers=auth_headers)
+    assert resp.status_code == 422
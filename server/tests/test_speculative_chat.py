@@ -0,0 +1,116 @@
+"""Tests for speculative general-chat streaming."""
+
+import asyncio
+import json
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from services import speculative_chat
+from services.speculative_chat import SpeculationStats, SpeculativeStream
+
+
+@pytest.fixture(autouse=True)
+def fresh_stats(monkeypatch):
+    monkeypatch.setattr(speculative_chat, "speculation_stats", SpeculationStats())
+
+
+async def _tokens(*tokens, delay=0.0):
+    for token in tokens:
+        await asyncio.sleep(delay)
+        yield token
+
+
+@pytest.mark.asyncio
+async def test_claim_replays_buffered_tokens():
+    stream = SpeculativeStream(_tokens("Hel", "lo", "!", delay=0.002))
+    await asyncio.sleep(0.02)  # let the stream run ahead of classification
+    assert [t async for t in stream.claim()] == ["Hel", "lo", "!"]
+
+    stats = speculative_chat.speculation_stats.snapshot()
+    assert stats["used"] == 1
+    assert stats["wasted"] == 0
+    assert stats["saved_ms_total"] > 0
+
+
+@pytest.mark.asyncio
+async def test_cancel_records_waste():
+    stream = SpeculativeStream(_tokens("a", "b", "c", delay=0.05))
+    await asyncio.sleep(0.07)
+    await stream.cancel()
+    await stream.cancel()  # idempotent
+
+    stats = speculative_chat.speculation_stats.snapshot()
+    assert stats["wasted"] == 1
+    assert stats["wasted_tokens"] == 1
+    assert stats["waste_ratio"] == 1.0
+
+
+@pytest.mark.asyncio
+async def test_claim_reraises_stream_errors():
+    async def _broken():
+        yield "partial"
+        raise RuntimeError("backend dropped")
+
+    stream = SpeculativeStream(_broken())
+    received = []
+    with pytest.raises(RuntimeError):
+        async for token in stream.claim():
+            received.append(token)
+    assert received == ["partial"]
+
+
+@pytest.mark.asyncio
+async def test_closing_claim_early_stops_the_stream():
+    pulled = []
+
+    async def _long():
+        for i in range(1000):
+            await asyncio.sleep(0.001)
+            pulled.append(i)
+            yield str(i)
+
+    stream = SpeculativeStream(_long())
+    claimed = stream.claim()
+    assert await claimed.__anext__() == "0"
+    await claimed.aclose()  # consumer went away
+    stopped_at = len(pulled)
+    await asyncio.sleep(0.05)
+    assert len(pulled) == stopped_at < 1000
+
+
+@pytest.mark.asyncio
+@patch("services.orchestrator.settings")
+async def test_module_intent_suppresses_speculative_stream(mock_settings, db_session):
+    from models.conversation import Conversation
+    from models.message import Message
+    from services.orchestrator import Orchestrator
+    from tests.conftest import _test_session_factory
+
+    mock_settings.speculative_chat_enabled = True
+
+    conv = Conversation(title="t")
+    db_session.add(conv)
+    await db_session.flush()
+    msg = Message(conversation_id=conv.id, role="user", content="what did I plan for the garden project")
+    db_session.add(msg)
+    await db_session.commit()
+
+    ai = MagicMock()
+    ai.stream_completion = MagicMock(return_value=_tokens("should", "not", "send", delay=0.01))
+    ai.function_call = AsyncMock(return_value={"choices": [{"message": {"tool_calls": [{
+        "function": {"name": "classify_intent", "arguments": json.dumps({"intent": "query_todos"})},
+    }]}}]})
+    ws = MagicMock()
+    ws.send_json = AsyncMock()
+    ws.stream_to_user = AsyncMock()
+
+    orch = Orchestrator(ai_service=ai, ws_manager=ws, session_factory=_test_session_factory)
+    await orch.handle_message("user", conv.id, msg.id, msg.content)
+
+    ai.stream_completion.assert_called_once()
+    ws.stream_to_user.assert_not_awaited()
+    sent = [call.args[1]["data"].get("content") for call in ws.send_json.await_args_list
+            if call.args[1]["type"] == "stream_chunk"]
+    assert sent and all("should" not in (c or "") for c in sent)
+    assert speculative_chat.speculation_stats.wasted == 1
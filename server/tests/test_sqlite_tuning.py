@@ -0,0 +1,67 @@
+"""Tests for the SQLite connection tuning profile and maintenance helpers."""
+
+from unittest.mock import patch
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+import database
+
+
+@pytest_asyncio.fixture
+async def file_engine(tmp_path):
+    eng = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'tuned.db'}")
+    event.listen(eng.sync_engine, "connect", database._apply_sqlite_pragmas)
+    yield eng
+    await eng.dispose()
+
+
+@pytest.mark.asyncio
+async def test_profile_applied_to_new_connections(file_engine):
+    async with file_engine.connect() as conn:
+        pragmas = {
+            name: (await conn.execute(text(f"PRAGMA {name}"))).scalar()
+            for name in ("journal_mode", "synchronous", "temp_store", "busy_timeout", "cache_size")
+        }
+    assert pragmas == {
+        "journal_mode": "wal",
+        "synchronous": 1,  # NORMAL
+        "temp_store": 2,  # MEMORY
+        "busy_timeout": 5000,
+        "cache_size": -65536,
+    }
+
+
+@pytest.mark.asyncio
+async def test_profile_can_be_disabled(file_engine):
+    with patch.object(database.settings, "sqlite_tuning_enabled", False):
+        assert database.sqlite_pragmas() == {}
+        async with file_engine.connect() as conn:
+            mode = (await conn.execute(text("PRAGMA journal_mode"))).scalar()
+    assert mode == "delete"
+
+
+@pytest.mark.asyncio
+async def test_checkpoint_and_optimize_record_maintenance(file_engine):
+    async with file_engine.begin() as conn:
+        await conn.execute(text("CREATE TABLE t (x INTEGER)"))
+        await conn.execute(text("INSERT INTO t VALUES (1), (2), (3)"))
+
+    with patch.object(database, "engine", file_engine):
+        busy, wal_pages, done = await database.checkpoint_wal()
+        await database.optimize_db()
+
+    assert busy == 0 and done == wal_pages
+    assert database.maintenance_stats["last_checkpoint_at"] is not None
+    assert database.maintenance_stats["last_optimize_at"] is not None
+
+
+@pytest.mark.asyncio
+async def test_overview_reports_sqlite_settings(client, auth_headers):
+    resp = await client.get("/api/admin/overview", headers=auth_headers)
+    assert resp.status_code == 200
+    sqlite = resp.json()["sqlite"]
+    assert sqlite["tuning_enabled"] is True
+    assert "journal_mode" in sqlite and "last_checkpoint_at" in sqlite
@@ -0,0 +1,119 @@
+"""Delta sync: GET /api/sync returns only what changed since a token."""
+
+from unittest.mock import AsyncMock
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import text
+
+from models.message import Message
+
+
+async def _sync(client: AsyncClient, headers: dict, **params) -> dict:
+    resp = await client.get("/api/sync", params=params, headers=headers)
+    assert resp.status_code == 200
+    return resp.json()
+
+
+@pytest.mark.asyncio
+async def test_sync_returns_only_changes_since_token(
+    client: AsyncClient, auth_headers: dict, db_session
+):
+    await client.post("/api/todos", json={"title": "Old"}, headers=auth_headers)
+    start = await _sync(client, auth_headers)
+    assert start["reset"] is True and start["todos"] == []
+
+    todo = (await client.post("/api/todos", json={"title": "Buy milk"}, headers=auth_headers)).json()
+    await client.patch(f"/api/todos/{todo['id']}", json={"title": "Buy oat milk"}, headers=auth_headers)
+    doomed = (await client.post("/api/todos", json={"title": "Doomed"}, headers=auth_headers)).json()
+    await client.delete(f"/api/todos/{doomed['id']}", headers=auth_headers)
+    event = (await client.post(
+        "/api/events",
+        json={"title": "Dentist", "start_time": "2026-03-01T10:00:00Z"},
+        headers=auth_headers,
+    )).json()
+    conv = (await client.post("/api/chat/conversations", json={"title": "Chat"}, headers=auth_headers)).json()
+    db_session.add(Message(conversation_id=conv["id"], role="user", content="hi"))
+    await db_session.commit()
+
+    delta = await _sync(client, auth_headers, since=start["token"])
+    assert delta["reset"] is False and delta["has_more"] is False
+    assert [t["title"] for t in delta["todos"]] == ["Buy oat milk"]
+    assert delta["deleted"] == {"todos": [doomed["id"]]}
+    assert [e["id"] for e in delta["events"]] == [event["id"]]
+    assert [c["last_message"] for c in delta["conversations"]] == ["hi"]
+    assert [m["content"] for m in delta["messages"]] == ["hi"]
+    assert int(delta["token"]) > int(start["token"])
+
+    again = await _sync(client, auth_headers, since=delta["token"])
+    assert again["token"] == delta["token"]
+    assert again["todos"] == again["messages"] == [] and again["deleted"] == {}
+
+
+@pytest.mark.asyncio
+async def test_sync_pages_with_has_more(client: AsyncClient, auth_headers: dict):
+    start = await _sync(client, auth_headers)
+    for i in range(5):
+        await client.post("/api/todos", json={"title": f"Todo {i}"}, headers=auth_headers)
+
+    seen, token = [], start["token"]
+    while True:
+        delta = await _sync(client, auth_headers, since=token, limit=2)
+        seen.extend(t["title"] for t in delta["todos"])
+        token = delta["token"]
+        if not delta["has_more"]:
+            break
+    assert sorted(seen) == [f"Todo {i}" for i in range(5)]
+
+
+@pytest.mark.asyncio
+async def test_ws_notification_carries_token(client: AsyncClient, auth_headers: dict, monkeypatch):
+    from routers import todo as todo_router
+
+    send = AsyncMock()
+    monkeypatch.setattr(todo_router.ws_manager, "send_json", send)
+    await client.post("/api/todos", json={"title": "Ping"}, headers=auth_headers)
+
+    payload = send.await_args.args[1]
+    assert payload["type"] == "module_data_changed"
+    assert payload["data"]["module"] == "todos"
+    assert payload["data"]["sync_token"] == (await _sync(client, auth_headers))["token"]
+
+
+@pytest.mark.asyncio
+async def test_pruned_or_foreign_token_resets(client: AsyncClient, auth_headers: dict, db_session):
+    for title in ("a", "b", "c"):
+        await client.post("/api/todos", json={"title": title}, headers=auth_headers)
+    head = (await _sync(client, auth_headers))["token"]
+
+    await db_session.execute(text("DELETE FROM change_log WHERE seq <= 2"))
+    await db_session.commit()
+    assert (await _sync(client, auth_headers, since="0"))["reset"] is True
+    assert (await _sync(client, auth_headers, since="2"))["reset"] is False
+    assert (await _sync(client, auth_headers, since=str(int(head) + 10)))["reset"] is True
+
+    resp = await client.get("/api/sync", params={"since": "abc"}, headers=auth_headers)
+    assert resp.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_bootstrap_reset_requires_full_refetch(
+    client: AsyncClient, auth_headers: dict, db_session
+):
+    todo = (await client.post("/api/todos", json={"title": "Legacy"}, headers=auth_headers)).json()
+    # as if the row predates the change log (migration 7)
+    await db_session.execute(text("DELETE FROM change_log"))
+    await db_session.commit()
+
+    start = await _sync(client, auth_headers)
+    assert start["reset"] is True and start["todos"] == [] and start["deleted"] == {}
+    assert (await _sync(client, auth_headers, since=start["token"]))["todos"] == []
+
+    # the refetch the reset asks for is what surfaces the pre-existing row
+    listed = (await client.get("/api/todos", headers=auth_headers)).json()["items"]
+    assert [t["title"] for t in listed] == ["Legacy"]
+
+    await client.patch(f"/api/todos/{todo['id']}", json={"title": "Legacy v2"}, headers=auth_headers)
+    delta = await _sync(client, auth_headers, since=start["token"])
+    assert delta["reset"] is False
+    assert [t["title"] for t in delta["todos"]] == ["Legacy v2"]
@@ -0,0 +1,124 @@
+"""Bulk todo edits run as set-based statements and batch the vault export."""
+
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+import pytest
+import pytest_asyncio
+from httpx import AsyncClient
+from sqlalchemy import select
+
+from config import settings
+from models.todo import Todo
+from services import obsidian_export_service
+
+_DONE_AT = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+@pytest_asyncio.fixture
+async def many_todos(db_session):
+    """Three projects with 300 subtasks each, plus 100 inbox todos."""
+    parents = [Todo(title=f"Project {p}") for p in range(3)]
+    db_session.add_all(parents)
+    await db_session.flush()
+    todos = [Todo(title=f"Task {p}.{i}", parent_id=parents[p].id) for p in range(3) for i in range(300)]
+    todos += [Todo(title=f"Inbox {i}") for i in range(100)]
+    todos[0].status, todos[0].completed_at = "completed", _DONE_AT
+    db_session.add_all(todos)
+    await db_session.commit()
+    return parents, [t.id for t in todos]
+
+
+async def _rows(db_session, ids):
+    rows = (await db_session.execute(
+        select(Todo).where(Todo.id.in_(ids)).execution_options(populate_existing=True)
+    )).scalars().all()
+    return {t.id: t for t in rows}
+
+
+@pytest.mark.asyncio
+async def test_bulk_update_is_a_few_statements(
+    client: AsyncClient, auth_headers: dict, many_todos, db_session, query_counter
+):
+    _parents, ids = many_todos
+    with query_counter:
+        resp = await client.patch(
+            "/api/todos/bulk",
+            json={"ids": ids + ["todo_missing"], "status": "completed", "tags": ["done"]},
+            headers=auth_headers,
+        )
+    assert resp.json() == {"updated": 1000, "deleted": 0, "errors": ["Todo todo_missing not found"]}
+    assert len([s for s in query_counter.statements if "todos" in s]) <= 3
+
+    rows = await _rows(db_session, ids)
+    assert all(t.status == "completed" and t.tags == '["done"]' for t in rows.values())
+    assert rows[ids[0]].completed_at.replace(tzinfo=timezone.utc) == _DONE_AT
+    assert all(t.completed_at is not None for t in rows.values())
+
+    await client.patch("/api/todos/bulk", json={"ids": ids, "status": "pending"}, headers=auth_headers)
+    assert all(t.completed_at is None for t in (await _rows(db_session, ids)).values())
+
+
+@pytest.mark.asyncio
+async def test_bulk_move_reorder_and_delete(
+    client: AsyncClient, auth_headers: dict, many_todos, db_session, query_counter
+):
+    parents, ids = many_todos
+    inbox = ids[-100:]
+    moved = list(reversed(inbox[:10]))
+    resp = await client.patch(
+        "/api/todos/bulk",
+        json={"ids": moved, "parent_id": parents[1].id, "reorder": True},
+        headers=auth_headers,
+    )
+    assert resp.json()["updated"] == 10
+    rows = await _rows(db_session, moved)
+    assert [rows[i].sort_order for i in moved] == list(range(10))
+    assert {t.parent_id for t in rows.values()} == {parents[1].id}
+
+    await client.patch("/api/todos/bulk", json={"ids": moved, "parent_id": None}, headers=auth_headers)
+    assert {t.parent_id for t in (await _rows(db_session, moved)).values()} == {None}
+
+    resp = await client.patch(
+        "/api/todos/bulk", json={"ids": [parents[0].id], "parent_id": parents[0].id}, headers=auth_headers
+    )
+    assert resp.json()["updated"] == 0 and resp.json()["errors"]
+
+    with query_counter:
+        resp = await client.patch("/api/todos/bulk", json={"ids": ids[:900], "delete": True}, headers=auth_headers)
+    assert resp.json()["deleted"] == 900
+    assert len([s for s in query_counter.statements if "todos" in s]) <= 3
+    assert await _rows(db_session, ids[:900]) == {}
+
+
+@pytest.mark.asyncio
+async def test_bulk_export_writes_each_file_once(
+    client: AsyncClient, auth_headers: dict, many_todos, tmp_path, monkeypatch
+):
+    parents, ids = many_todos
+    stale = tmp_path / "00_Inbox" / "TODO.md"
+    stale.parent.mkdir()
+    stale.write_text(f"## ClawChat\n- [ ] Task 0.1 <!-- claw:{ids[1]} -->\n- [ ] keep <!-- claw:other -->\n")
+
+    monkeypatch.setattr(settings, "obsidian_vault_path", str(tmp_path))
+    writes = []
+    real_write = obsidian_export_service._write_lines
+    with patch.object(
+        obsidian_export_service, "_write_lines",
+        side_effect=lambda path, lines: (writes.append(path), real_write(path, lines)),
+    ):
+        resp = await client.patch(
+            "/api/todos/bulk", json={"ids": ids[:900], "priority": "high"}, headers=auth_headers
+        )
+    assert resp.json()["updated"] == 900
+
+    project_files = [str(tmp_path / f"Project {p}" / "TODO.md") for p in range(3)]
+    assert sorted(writes) == sorted([str(stale), *project_files])
+    for p, path in enumerate(project_files):
+        with open(path) as f:
+            assert f.read().count("@high") == 300
+    assert stale.read_text() == "## ClawChat\n- [ ] keep <!-- claw:other -->\n"
+
+    resp = await client.patch("/api/todos/bulk", json={"ids": ids[:300], "delete": True}, headers=auth_headers)
+    with open(project_files[0]) as f:
+        assert "claw:" not in f.read()
@@ -0,0 +1,82 @@
+"""Todo list responses fetch plan summaries in one batch, not per row."""
+
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+import pytest_asyncio
+from httpx import AsyncClient
+
+from models.agent_task import AgentTask
+from models.todo import Todo
+
+_BASE = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def _plan(todo_id: str, summary: str, *, minutes: int, status: str = "completed") -> AgentTask:
+    return AgentTask(
+        task_type="plan_todo",
+        instruction="plan",
+        status=status,
+        todo_id=todo_id,
+        payload_json=json.dumps({"summary": summary}),
+        created_at=_BASE + timedelta(minutes=minutes),
+    )
+
+
+@pytest_asyncio.fixture
+async def planned_todos(db_session):
+    """30 plan_ready todos, each with an old plan, a newer plan and a newest failed one."""
+    todos = [Todo(title=f"Todo {i}", inbox_state="plan_ready") for i in range(30)]
+    todos.append(Todo(title="Captured", inbox_state="captured"))
+    db_session.add_all(todos)
+    await db_session.flush()
+    for todo in todos[:30]:
+        db_session.add_all([
+            _plan(todo.id, f"old {todo.title}", minutes=1),
+            _plan(todo.id, f"new {todo.title}", minutes=2),
+            _plan(todo.id, "broken", minutes=3, status="failed"),
+        ])
+    await db_session.commit()
+    return todos
+
+
+@pytest.mark.asyncio
+async def test_list_todos_batches_plan_summaries(
+    client: AsyncClient, auth_headers: dict, planned_todos, query_counter
+):
+    with query_counter:
+        resp = await client.get("/api/todos", params={"limit": 100}, headers=auth_headers)
+    assert resp.status_code == 200
+    items = resp.json()["items"]
+    assert len(items) == 31
+
+    summaries = {t["title"]: t["plan_summary"] for t in items}
+    assert summaries["Todo 7"] == "new Todo 7"
+    assert summaries["Captured"] is None
+
+    plan_queries = [s for s in query_counter.statements if "agent_tasks" in s]
+    assert len(plan_queries) == 1
+
+
+@pytest.mark.asyncio
+async def test_single_todo_uses_latest_completed_plan(
+    client: AsyncClient, auth_headers: dict, planned_todos
+):
+    resp = await client.get(f"/api/todos/{planned_todos[3].id}", headers=auth_headers)
+    assert resp.json()["plan_summary"] == "new Todo 3"
+
+
+@pytest.mark.asyncio
+async def test_today_needs_review_has_plan_summaries(
+    client: AsyncClient, auth_headers: dict, planned_todos, query_counter
+):
+    with query_counter:
+        resp = await client.get("/api/today", headers=auth_headers)
+    assert resp.status_code == 200
+    review = resp.json()["needs_review"]
+    assert len(review) == 5
+    assert all(
+        t["plan_summary"] == f"new {t['title']}" for t in review if t["title"] != "Captured"
+    )
+    assert len([s for s in query_counter.statements if "agent_tasks" in s]) == 1
@@ -0,0 +1,218 @@
+"""Tests for WebSocket delivery: per-socket queues and stream coalescing."""
+
+import asyncio
+
+import pytest
+
+from ws.manager import ConnectionManager
+
+
+class FakeSocket:
+    def __init__(self, delay: float = 0.0, block: asyncio.Event | None = None):
+        self.sent: list[dict] = []
+        self.delay = delay
+        self.block = block
+        self.closed = False
+
+    async def accept(self):
+        pass
+
+    async def send_json(self, data):
+        if self.block:
+            await self.block.wait()
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        self.sent.append(data)
+
+    async def close(self, code=1000, reason=""):
+        self.closed = True
+
+
+async def _tokens(items, delay=0.0):
+    for item in items:
+        if delay:
+            await asyncio.sleep(delay)
+        yield item
+
+
+def _chunks(ws):
+    return [m["data"]["content"] for m in ws.sent if m["type"] == "stream_chunk"]
+
+
+@pytest.mark.asyncio
+async def test_stream_coalesces_tokens_into_few_frames():
+    manager = ConnectionManager(queue_size=64)
+    ws = FakeSocket()
+    await manager.connect(ws, "u")
+    tokens = [f"t{i} " for i in range(200)]
+
+    full = await manager.stream_to_user("u", "m1", "c1", _tokens(tokens), coalesce_ms=50, coalesce_bytes=100)
+    await manager.flush("u")
+
+    assert full == "".join(tokens)
+    chunks = _chunks(ws)
+    assert "".join(chunks) == full
+    assert len(chunks) <= len(tokens) // 10
+    assert [m["type"] for m in (ws.sent[0], ws.sent[-1])] == ["stream_start", "stream_end"]
+    assert [m["data"]["index"] for m in ws.sent if m["type"] == "stream_chunk"] == list(range(len(chunks)))
+
+
+@pytest.mark.asyncio
+async def test_timer_flushes_partial_frame_when_model_pauses():
+    manager = ConnectionManager()
+    ws = FakeSocket()
+    await manager.connect(ws, "u")
+
+    async def slow():
+        yield "Hello"
+        await asyncio.sleep(0.1)
+        assert _chunks(ws) == ["Hello"]  # flushed by the timer, not the next token
+        yield " world"
+
+    await manager.stream_to_user("u", "m", "c", slow(), coalesce_ms=10, coalesce_bytes=1000)
+    await manager.flush("u")
+    assert _chunks(ws) == ["Hello", " world"]
+
+
+@pytest.mark.asyncio
+async def test_zero_window_sends_every_token():
+    manager = ConnectionManager()
+    ws = FakeSocket()
+    await manager.connect(ws, "u")
+    await manager.stream_to_user("u", "m", "c", _tokens(["a", "b", "c"]), coalesce_ms=0)
+    await manager.flush("u")
+    assert _chunks(ws) == ["a", "b", "c"]
+
+
+@pytest.mark.asyncio
+async def test_slow_socket_does_not_stall_other_devices():
+    manager = ConnectionManager(queue_size=4)
+    gate = asyncio.Event()
+    stuck, phone = FakeSocket(block=gate), FakeSocket()
+    await manager.connect(stuck, "u")
+    await manager.connect(phone, "u")
+
+    for i in range(3):
+        await asyncio.wait_for(manager.send_json("u", {"type": "n", "i": i}), timeout=0.1)
+    await asyncio.sleep(0)
+    assert [m["i"] for m in phone.sent] == [0, 1, 2]
+
+    # Overflowing the stuck socket's queue disconnects only that socket.
+    for i in range(3, 10):
+        await manager.send_json("u", {"type": "n", "i": i})
+        await asyncio.sleep(0)
+    assert manager.active_connections["u"] == [phone]
+    assert stuck.closed
+    gate.set()
+
+
+@pytest.mark.asyncio
+async def test_overflow_coalesces_droppable_messages_before_evicting():
+    manager = ConnectionManager(queue_size=5)
+    gate = asyncio.Event()
+    ws = FakeSocket(block=gate)
+    await manager.connect(ws, "u")
+    await asyncio.sleep(0)  # writer takes the first message and blocks
+
+    await manager.send_json("u", {"type": "stream_start"})
+    for p in (10, 20, 30):
+        await manager.send_json("u", {"type": "task_progress", "data": {"task_id": "t", "progress": p}})
+    await manager.send_json("u", {"type": "heartbeat"})
+    await manager.send_json("u", {"type": "heartbeat"})  # queue full -> compact
+    await manager.send_json("u", {"type": "reminder"})
+
+    stats = manager.connection_stats()[0]
+    assert stats["coalesced"] == 3 and stats["dropped"] == 0
+    assert "u" in manager.active_connections
+
+    for i in range(2):
+        await manager.send_json("u", {"type": "todo", "i": i})
+    await manager.send_json("u", {"type": "heartbeat"})  # nothing left to compact: dropped
+    assert manager.connection_stats()[0]["dropped"] == 1
+
+    await manager.send_json("u", {"type": "todo", "i": 2})  # non-droppable overflow: evict
+    assert "u" not in manager.active_connections
+    assert manager.evicted == 1
+    gate.set()
+
+
+@pytest.mark.asyncio
+async def test_full_queue_keeps_the_newest_progress():
+    manager = ConnectionManager(queue_size=3)
+    gate = asyncio.Event()
+    ws = FakeSocket(block=gate)
+    await manager.connect(ws, "u")
+    await manager.send_json("u", {"type": "stream_start"})
+    await asyncio.sleep(0)  # writer takes it and blocks
+
+    await manager.send_json("u", {"type": "todo"})
+    await manager.send_json("u", {"type": "task_progress", "data": {"task_id": "a", "progress": 10}})
+    await manager.send_json("u", {"type": "event"})
+    # full, nothing to compact: the queued progress for the task is overwritten
+    await manager.send_json("u", {"type": "task_progress", "data": {"task_id": "a", "progress": 90}})
+    # another task's progress displaces the oldest droppable entry
+    await manager.send_json("u", {"type": "task_progress", "data": {"task_id": "b", "progress": 50}})
+    assert "u" in manager.active_connections
+
+    gate.set()
+    for _ in range(10):
+        await asyncio.sleep(0)
+    progress = [(m["data"]["task_id"], m["data"]["progress"]) for m in ws.sent if m["type"] == "task_progress"]
+    assert progress == [("b", 50)]
+    assert [m["type"] for m in ws.sent] == ["stream_start", "todo", "event", "task_progress"]
+    stats = manager.connection_stats()[0]
+    assert (stats["coalesced"], stats["dropped"]) == (1, 1)
+
+
+@pytest.mark.asyncio
+async def test_sessions_endpoint_reports_queue_stats(client, auth_headers):
+    from ws.manager import ws_manager
+
+    ws = FakeSocket()
+    await ws_manager.connect(ws, "device-user")
+    try:
+        resp = await client.get("/api/admin/sessions", headers=auth_headers)
+        assert resp.status_code == 200
+        session = next(s for s in resp.json()["active_connections"] if s["user_id"] == "device-user")
+        assert session["queue_capacity"] > 0 and session["dropped"] == 0
+    finally:
+        ws_manager.disconnect("device-user")
+
+
+@pytest.mark.asyncio
+async def test_events_carry_monotonic_seq_and_resume_replays_missed():
+    manager = ConnectionManager(replay_size=10)
+    first = FakeSocket()
+    await manager.connect(first, "u")
+    await manager.stream_to_user("u", "m", "c", _tokens(["a", "b"]), coalesce_ms=0)
+    await manager.flush("u")
+    seqs = [m["seq"] for m in first.sent]
+    assert seqs == list(range(1, len(seqs) + 1))
+
+    # Network switch: the socket drops after seq 2, events keep flowing.
+    manager.disconnect("u", first)
+    await manager.send_json("u", {"type": "reminder"})
+
+    resumed = FakeSocket()
+    await manager.connect(resumed, "u", last_seq=2)
+    await manager.send_json("u", {"type": "live"})
+    await manager.flush("u")
+    assert [m["seq"] for m in resumed.sent] == list(range(3, manager.current_seq("u") + 1))
+    assert resumed.sent[-2]["type"] == "reminder" and resumed.sent[-1]["type"] == "live"
+
+
+@pytest.mark.asyncio
+async def test_resume_outside_buffer_reports_gap():
+    manager = ConnectionManager(replay_size=3)
+    for i in range(6):
+        await manager.send_json("u", {"type": "n", "i": i})
+
+    behind = FakeSocket()
+    await manager.connect(behind, "u", last_seq=1)
+    ahead = FakeSocket()  # e.g. server restarted and seq counters reset
+    await manager.connect(ahead, "u", last_seq=99)
+    await manager.flush("u")
+
+    for ws in (behind, ahead):
+        assert [m["type"] for m in ws.sent] == ["replay_gap"]
+    assert behind.sent[0]["data"] == {"last_seq": 1, "oldest_seq": 4, "current_seq": 6}
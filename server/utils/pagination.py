@@ -0,0 +1,65 @@
+"""Keyset (cursor) pagination helpers.
+
+A cursor is the sort key of the last row on a page — ``(sort value, id)`` —
+packed as URL-safe base64 JSON.  The next page is ``WHERE (sort, id) > key``
+(or ``<`` for descending order), which an index on the sort column answers
+directly, so page 5000 costs the same as page 1.  Clients treat cursors as
+opaque strings.
+"""
+
+import base64
+import json
+from datetime import datetime
+
+from sqlalchemy import DateTime, literal, tuple_
+from sqlalchemy.orm import InstrumentedAttribute
+
+from exceptions import ValidationError
+
+
+def encode_cursor(value, row_id: str) -> str:
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    raw = json.dumps([value, row_id], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort_column: InstrumentedAttribute) -> tuple:
+    """Return ``(sort value, id)``; raises ``ValidationError`` on a bad cursor."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        value, row_id = json.loads(base64.urlsafe_b64decode(padded))
+        if isinstance(sort_column.type, DateTime) and value is not None:
+            value = datetime.fromisoformat(value)
+    except (ValueError, TypeError):
+        raise ValidationError("Invalid cursor")
+    return value, row_id
+
+
+def after_cursor(
+    sort_column: InstrumentedAttribute,
+    id_column: InstrumentedAttribute,
+    cursor: str,
+    descending: bool,
+):
+    """WHERE clause selecting rows after *cursor* in ``(sort, id)`` order."""
+    sort_value, row_id = decode_cursor(cursor, sort_column)
+    key = tuple_(sort_column, id_column)
+    # bind with the columns' types so datetimes serialize as stored
+    value = tuple_(literal(sort_value, sort_column.type), literal(row_id, id_column.type))
+    return key < value if descending else key > value
+
+
+def order_by_key(sort_column: InstrumentedAttribute, id_column: InstrumentedAttribute, descending: bool):
+    if descending:
+        return sort_column.desc(), id_column.desc()
+    return sort_column.asc(), id_column.asc()
+
+
+def page_rows(rows: list, limit: int, sort_attr: str) -> tuple[list, str | None]:
+    """Trim a ``limit + 1`` fetch to *limit* rows and derive the next cursor."""
+    if len(rows) <= limit:
+        return list(rows), None
+    rows = list(rows[:limit])
+    last = rows[-1]
+    return rows, encode_cursor(getattr(last, sort_attr), last.id)
@@ -26,15 +26,24 @@ async def websocket_endpoint(websocket: WebSocket):
         await websocket.close(code=4001, reason="Invalid or expired token")
         return
 
-    await ws_manager.connect(websocket, user_id)
-    logger.info("WebSocket connected: %s", user_id)
+    # Resume: replay buffered events newer than the client's last seen seq
+    last_seq: int | None = None
+    raw_last_seq = websocket.query_params.get("last_seq")
+    if raw_last_seq is not None:
+        try:
+            last_seq = max(0, int(raw_last_seq))
+        except ValueError:
+            last_seq = None
+
+    await ws_manager.connect(websocket, user_id, last_seq=last_seq)
+    logger.info("WebSocket connected: %s (last_seq=%s)", user_id, last_seq)
 
     async def _heartbeat():
         """Send periodic heartbeat to keep the connection alive through proxies."""
         try:
             while True:
                 await asyncio.sleep(HEARTBEAT_INTERVAL)
-                await websocket.send_json({"type": "heartbeat"})
+                await ws_manager.send_to(user_id, websocket, {"type": "heartbeat"})
         except Exception:
             pass  # Connection closed; task will be cancelled
 
@@ -46,7 +55,7 @@ async def websocket_endpoint(websocket: WebSocket):
             msg_type = data.get("type")
 
             if msg_type == "ping":
-                await websocket.send_json({"type": "pong"})
+                await ws_manager.send_to(user_id, websocket, {"type": "pong"})
             elif msg_type == "typing":
                 pass  # Typing indicators — no server action needed for single-user
             else:
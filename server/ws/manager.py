@@ -1,25 +1,194 @@
+import asyncio
 import logging
+import time
+from collections import deque
 from collections.abc import AsyncIterator
 
 from fastapi import WebSocket
 
+from config import settings
+
 logger = logging.getLogger(__name__)
 
 
+# Message types a slow consumer can miss without losing state: heartbeats are
+# pure liveness, and only the latest task_progress per task matters.
+DROPPABLE_TYPES = frozenset({"heartbeat", "task_progress"})
+
+
+class _Outbox:
+    """Bounded send queue drained by one writer task per WebSocket.
+
+    Enqueueing never waits on the network, so one slow device cannot hold up
+    sends to the user's other devices (or the coroutine producing them).
+    When the queue is full, droppable messages are coalesced first; a new
+    ``task_progress`` then takes the place of a queued droppable message
+    rather than being lost.  Only a non-droppable message that finds no room
+    reports the consumer as too slow.
+    """
+
+    def __init__(self, manager: "ConnectionManager", user_id: str, websocket: WebSocket, maxsize: int):
+        self.manager = manager
+        self.user_id = user_id
+        self.websocket = websocket
+        self.maxsize = maxsize
+        self.queue: deque[dict] = deque()
+        self._ready = asyncio.Event()
+        self.sent = 0
+        self.dropped = 0
+        self.coalesced = 0
+        self.max_depth = 0
+        self.connected_at = time.time()
+        self.task = asyncio.create_task(self._writer(), name=f"ws-writer-{user_id}")
+
+    def offer(self, data: dict) -> bool:
+        if len(self.queue) >= self.maxsize:
+            self._compact()
+        if len(self.queue) >= self.maxsize:
+            kind = data.get("type")
+            if kind == "task_progress" and self._replace_progress(data):
+                return True
+            if kind in DROPPABLE_TYPES:
+                # The newest progress outranks anything already queued; a
+                # heartbeat is only worth sending if there is room anyway.
+                self.dropped += 1
+                if kind == "task_progress" and self._evict_droppable():
+                    self._append(data)
+                return True
+            return False
+        self._append(data)
+        return True
+
+    def _append(self, data: dict) -> None:
+        self.queue.append(data)
+        self.max_depth = max(self.max_depth, len(self.queue))
+        self._ready.set()
+
+    def _replace_progress(self, data: dict) -> bool:
+        """Overwrite the queued progress for the same task in place."""
+        task_id = data.get("data", {}).get("task_id")
+        for i, msg in enumerate(self.queue):
+            if msg.get("type") == "task_progress" and msg.get("data", {}).get("task_id") == task_id:
+                self.queue[i] = data
+                self.coalesced += 1
+                return True
+        return False
+
+    def _evict_droppable(self) -> bool:
+        """Remove the oldest queued droppable message."""
+        for i, msg in enumerate(self.queue):
+            if msg.get("type") in DROPPABLE_TYPES:
+                del self.queue[i]
+                return True
+        return False
+
+    def _compact(self) -> None:
+        """Drop queued heartbeats and all but the newest progress per task."""
+        latest_progress: dict[str, int] = {}
+        for i, msg in enumerate(self.queue):
+            if msg.get("type") == "task_progress":
+                latest_progress[msg.get("data", {}).get("task_id")] = i
+        kept: deque[dict] = deque()
+        for i, msg in enumerate(self.queue):
+            kind = msg.get("type")
+            if kind == "heartbeat" or (
+                kind == "task_progress"
+                and latest_progress.get(msg.get("data", {}).get("task_id")) != i
+            ):
+                continue
+            kept.append(msg)
+        self.coalesced += len(self.queue) - len(kept)
+        self.queue = kept
+
+    async def _writer(self) -> None:
+        while True:
+            if not self.queue:
+                self._ready.clear()
+                await self._ready.wait()
+                continue
+            data = self.queue.popleft()
+            try:
+                await self.websocket.send_json(data)
+            except Exception:
+                logger.warning("Failed to send WS message to %s, removing connection", self.user_id)
+                self.manager.disconnect(self.user_id, self.websocket)
+                return
+            self.sent += 1
+
+    def close(self) -> None:
+        if not self.task.done():
+            self.task.cancel()
+
+    def stats(self) -> dict:
+        return {
+            "connected_at": self.connected_at,
+            "queue_depth": len(self.queue),
+            "max_queue_depth": self.max_depth,
+            "queue_capacity": self.maxsize,
+            "sent": self.sent,
+            "coalesced": self.coalesced,
+            "dropped": self.dropped,
+        }
+
+
 class ConnectionManager:
-    def __init__(self):
+    """Track each user's sockets and fan messages out to them.
+
+    Every message sent through ``send_json`` carries a per-user ``seq`` that
+    increases monotonically, and the last ``replay_size`` messages are kept
+    so a reconnecting client can pass ``last_seq`` and receive only what it
+    missed.  Per-socket control frames (heartbeat, pong) have no ``seq``.
+    """
+
+    def __init__(self, queue_size: int | None = None, replay_size: int | None = None):
         self.active_connections: dict[str, list[WebSocket]] = {}
+        self._outboxes: dict[WebSocket, _Outbox] = {}
+        self._queue_size = queue_size
+        self._replay_size = replay_size
+        self._seq: dict[str, int] = {}
+        self._replay: dict[str, deque[dict]] = {}
+        self.evicted = 0
 
-    async def connect(self, websocket: WebSocket, user_id: str):
+    async def connect(self, websocket: WebSocket, user_id: str, last_seq: int | None = None):
         await websocket.accept()
+        outbox = _Outbox(self, user_id, websocket, self._queue_size or settings.ws_send_queue_size)
+        # Replay and registration happen without an await in between, so no
+        # live message can slip in ahead of (or be duplicated by) the replay.
+        if last_seq is not None:
+            self._replay_into(user_id, outbox, last_seq)
         if user_id not in self.active_connections:
             self.active_connections[user_id] = []
         self.active_connections[user_id].append(websocket)
+        self._outboxes[websocket] = outbox
+
+    def current_seq(self, user_id: str) -> int:
+        return self._seq.get(user_id, 0)
+
+    def _replay_into(self, user_id: str, outbox: _Outbox, last_seq: int) -> None:
+        current = self.current_seq(user_id)
+        buffered = self._replay.get(user_id, ())
+        oldest = buffered[0]["seq"] if buffered else current + 1
+        missed = [m for m in buffered if m["seq"] > last_seq]
+        if last_seq > current or last_seq + 1 < oldest or len(missed) > outbox.maxsize:
+            # Server restarted or the client fell too far behind: it must
+            # reload state instead of relying on a replay.
+            outbox.offer({
+                "type": "replay_gap",
+                "data": {"last_seq": last_seq, "oldest_seq": oldest, "current_seq": current},
+            })
+            return
+        for message in missed:
+            outbox.offer(message)
 
     def disconnect(self, user_id: str, websocket: WebSocket | None = None):
         conns = self.active_connections.get(user_id)
         if not conns:
             return
+        removed = [websocket] if websocket else list(conns)
+        for ws in removed:
+            outbox = self._outboxes.pop(ws, None)
+            if outbox:
+                outbox.close()
         if websocket:
             conns[:] = [ws for ws in conns if ws is not websocket]
             if not conns:
@@ -27,21 +196,69 @@ class ConnectionManager:
         else:
             del self.active_connections[user_id]
 
+    def _enqueue(self, user_id: str, websocket: WebSocket, data: dict) -> None:
+        outbox = self._outboxes.get(websocket)
+        if outbox is None or outbox.offer(data):
+            return
+        logger.warning(
+            "WS send queue full for %s (%d messages), disconnecting slow consumer",
+            user_id, outbox.maxsize,
+        )
+        self.evicted += 1
+        self.disconnect(user_id, websocket)
+        asyncio.create_task(self._close_quietly(websocket))
+
+    @staticmethod
+    async def _close_quietly(websocket: WebSocket) -> None:
+        try:
+            await websocket.close(code=1013, reason="Send queue overflow")
+        except Exception:
+            pass
+
+    def _stamp(self, user_id: str, data: dict) -> dict:
+        seq = self._seq.get(user_id, 0) + 1
+        self._seq[user_id] = seq
+        message = {**data, "seq": seq}
+        buffer = self._replay.get(user_id)
+        if buffer is None:
+            buffer = self._replay[user_id] = deque(
+                maxlen=self._replay_size or settings.ws_replay_buffer_size
+            )
+        buffer.append(message)
+        return message
+
     async def send_json(self, user_id: str, data: dict):
+        # Stamped and buffered even with no socket open, so a phone that is
+        # between networks can catch up when it reconnects.
+        data = self._stamp(user_id, data)
         conns = self.active_connections.get(user_id)
         if not conns:
             return
-        dead: list[WebSocket] = []
-        for ws in conns:
-            try:
-                await ws.send_json(data)
-            except Exception:
-                logger.warning("Failed to send WS message to %s, removing connection", user_id)
-                dead.append(ws)
-        if dead:
-            conns[:] = [ws for ws in conns if ws not in dead]
-            if not conns:
-                del self.active_connections[user_id]
+        for ws in list(conns):
+            self._enqueue(user_id, ws, data)
+
+    async def send_to(self, user_id: str, websocket: WebSocket, data: dict):
+        """Send to one socket through its queue (keeps frames ordered)."""
+        self._enqueue(user_id, websocket, data)
+
+    async def flush(self, user_id: str, timeout: float = 5.0) -> None:
+        """Wait until every queued message for *user_id* has been written."""
+        deadline = time.monotonic() + timeout
+        for ws in list(self.active_connections.get(user_id, [])):
+            outbox = self._outboxes.get(ws)
+            while outbox and outbox.queue and not outbox.task.done():
+                if time.monotonic() > deadline:
+                    return
+                await asyncio.sleep(0.005)
+
+    def connection_stats(self) -> list[dict]:
+        """Per-socket queue depth and drop counters for the admin API."""
+        return [
+            {"user_id": user_id, **outbox.stats()}
+            for user_id, conns in self.active_connections.items()
+            for ws in conns
+            if (outbox := self._outboxes.get(ws))
+        ]
 
     async def stream_to_user(
         self,
@@ -49,22 +266,68 @@ class ConnectionManager:
         message_id: str,
         conversation_id: str,
         token_iterator: AsyncIterator[str],
+        coalesce_ms: int | None = None,
+        coalesce_bytes: int | None = None,
     ) -> str:
+        """Relay tokens as ``stream_chunk`` frames and return the full text.
+
+        Tokens are buffered and sent as one frame once ``coalesce_bytes`` have
+        accumulated or ``coalesce_ms`` have passed since the first buffered
+        token, whichever comes first.  ``coalesce_ms=0`` sends every token.
+        """
+        window = (settings.ws_stream_coalesce_ms if coalesce_ms is None else coalesce_ms) / 1000
+        max_bytes = settings.ws_stream_coalesce_bytes if coalesce_bytes is None else coalesce_bytes
+
         await self.send_json(user_id, {
             "type": "stream_start",
             "data": {"message_id": message_id, "conversation_id": conversation_id},
         })
 
-        full_content = ""
+        parts: list[str] = []
+        pending: list[str] = []
+        pending_bytes = 0
         index = 0
-        async for token in token_iterator:
-            full_content += token
+        first_pending_at = 0.0
+
+        async def flush_pending() -> None:
+            nonlocal pending, pending_bytes, index
+            if not pending:
+                return
+            content = "".join(pending)
+            pending, pending_bytes = [], 0
             await self.send_json(user_id, {
                 "type": "stream_chunk",
-                "data": {"message_id": message_id, "content": token, "index": index},
+                "data": {"message_id": message_id, "content": content, "index": index},
             })
             index += 1
 
+        async def flush_on_timer() -> None:
+            # Flush a partial frame when the model pauses mid-answer.
+            while True:
+                await asyncio.sleep(window)
+                if pending and time.monotonic() - first_pending_at >= window:
+                    await flush_pending()
+
+        timer = asyncio.create_task(flush_on_timer()) if window > 0 else None
+        try:
+            async for token in token_iterator:
+                parts.append(token)
+                if not pending:
+                    first_pending_at = time.monotonic()
+                pending.append(token)
+                pending_bytes += len(token.encode("utf-8"))
+                if (
+                    window <= 0
+                    or pending_bytes >= max_bytes
+                    or time.monotonic() - first_pending_at >= window
+                ):
+                    await flush_pending()
+        finally:
+            if timer:
+                timer.cancel()
+        await flush_pending()
+
+        full_content = "".join(parts)
         await self.send_json(user_id, {
             "type": "stream_end",
             "data": {"message_id": message_id, "full_content": full_content},
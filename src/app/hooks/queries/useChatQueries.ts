@@ -13,14 +13,28 @@ import { queryKeys } from './queryKeys';
 // Query hooks — data lives in TanStack Query cache
 // ---------------------------------------------------------------------------
 
+const PROJECTS_PAGE_SIZE = 500;
+
 export function useProjectsQuery() {
   const serverUrl = useAuthStore((s) => s.serverUrl);
 
   return useQuery({
     queryKey: queryKeys.projects,
     queryFn: async () => {
-      const res = await apiClient.get('/todos/projects');
-      const raw = res.data ?? [];
+      // The endpoint is paginated (max 500 per page); walk every page so
+      // projects past the first page don't silently disappear.
+      const raw: unknown[] = [];
+      for (let page = 1; ; page++) {
+        const res = await apiClient.get('/todos/projects', { params: { limit: PROJECTS_PAGE_SIZE, page } });
+        if (Array.isArray(res.data)) {
+          raw.push(...res.data);
+          break;
+        }
+        const items: unknown[] = res.data?.items ?? [];
+        raw.push(...items);
+        const total: number = res.data?.total ?? raw.length;
+        if (items.length < PROJECTS_PAGE_SIZE || raw.length >= total) break;
+      }
       return z.array(ProjectTodoResponseSchema).parse(raw);
     },
     enabled: !!serverUrl,
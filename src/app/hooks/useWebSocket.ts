@@ -231,12 +231,18 @@ export default function useWebSocket(): void {
       }
     };
 
+    // Reconnected too late for the server to replay what we missed — refetch everything
+    const handleReplayGap = () => {
+      queryClient.invalidateQueries();
+    };
+
     // Server liveness signals — wsClient already tracked lastMessageTime; ignore here
     const handleLivenessNoop = () => {};
     wsClient.on('tick', handleLivenessNoop);
     wsClient.on('heartbeat', handleLivenessNoop);
     wsClient.on('pong', handleLivenessNoop);
 
+    wsClient.on('replay_gap', handleReplayGap);
     wsClient.on('module_data_changed', handleModuleChange);
     wsClient.on('reminder', handleReminder);
     wsClient.on('nudge', handleNudge);
@@ -259,6 +265,7 @@ export default function useWebSocket(): void {
       wsClient.off('tick', handleLivenessNoop);
       wsClient.off('heartbeat', handleLivenessNoop);
       wsClient.off('pong', handleLivenessNoop);
+      wsClient.off('replay_gap', handleReplayGap);
       wsClient.off('module_data_changed', handleModuleChange);
       wsClient.off('reminder', handleReminder);
       wsClient.off('nudge', handleNudge);
@@ -125,6 +125,20 @@ describe('wsClient', () => {
     expect(statusCb).not.toHaveBeenCalled();
   });
 
+  it('resumes from the last seen seq on reconnect', async () => {
+    wsClient.connect('http://localhost:3000', 'token');
+    await vi.advanceTimersByTimeAsync(10);
+
+    const ws = (wsClient as any).ws as MockWebSocket;
+    ws.onmessage?.({ data: JSON.stringify({ type: 'stream_chunk', seq: 41, data: {} }) });
+    ws.onmessage?.({ data: JSON.stringify({ type: 'stream_chunk', seq: 42, data: {} }) });
+    ws.onclose?.({ code: 1006, reason: '' });
+    await vi.advanceTimersByTimeAsync(1000);
+
+    const resumed = (wsClient as any).ws as MockWebSocket;
+    expect(resumed.url).toContain('last_seq=42');
+  });
+
   it('schedules reconnect on close when shouldReconnect is true', async () => {
     const statusCb = vi.fn();
     wsClient.onStatusChange(statusCb);
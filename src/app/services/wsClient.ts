@@ -1,6 +1,7 @@
 /**
  * WebSocket client singleton for real-time server communication.
- * Handles auto-reconnect with exponential backoff.
+ * Handles auto-reconnect with exponential backoff, resuming from the last
+ * seen event sequence number so the server only replays missed frames.
  */
 
 import type { ConnectionStatus } from '../stores/useAuthStore';
@@ -25,6 +26,7 @@ class WSClient {
   private keepaliveTimer: ReturnType<typeof setInterval> | null = null;
   private livenessTimer: ReturnType<typeof setInterval> | null = null;
   private lastMessageTime: number = 0;
+  private lastSeq = 0;
   onDisconnect: (() => void) | null = null;
   onAuthFailure: (() => void) | null = null;
 
@@ -40,6 +42,7 @@ class WSClient {
   connect(serverUrl: string, token: string): void {
     this.serverUrl = serverUrl;
     this.token = token;
+    this.lastSeq = 0;
     this.shouldReconnect = true;
     this._connect();
     this.startWatchdog();
@@ -75,7 +78,8 @@ class WSClient {
   private _connect(): void {
     if (this.ws?.readyState === WebSocket.OPEN || this.ws?.readyState === WebSocket.CONNECTING) return;
 
-    const wsUrl = this.serverUrl.replace(/^http/, 'ws') + `/ws?token=${encodeURIComponent(this.token)}`;
+    let wsUrl = this.serverUrl.replace(/^http/, 'ws') + `/ws?token=${encodeURIComponent(this.token)}`;
+    if (this.lastSeq > 0) wsUrl += `&last_seq=${this.lastSeq}`;
 
     try {
       this.ws = new WebSocket(wsUrl);
@@ -93,6 +97,10 @@ class WSClient {
         try {
           const msg = JSON.parse(event.data);
           const type = msg.type as string;
+          if (typeof msg.seq === 'number') this.lastSeq = msg.seq;
+          // Missed events fell out of the server's replay buffer (or it
+          // restarted); listeners should refetch, and we resume from now.
+          if (type === 'replay_gap') this.lastSeq = msg.data?.current_seq ?? 0;
           // Server liveness signals — already tracked via lastMessageTime, skip dispatch
           if (type === 'tick' || type === 'heartbeat' || type === 'pong') return;
           const handlers = this.listeners.get(type);
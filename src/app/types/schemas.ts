@@ -216,6 +216,7 @@ export const SearchHitSchema = z.object({
   id: z.string(),
   title: z.string().nullable().optional(),
   preview: z.string(),
+  highlight: z.string().nullable().optional(),
   rank: z.number(),
   created_at: z.string(),
 });
@@ -225,6 +226,10 @@ export const SearchResponseSchema = z.object({
   total: z.number(),
   page: z.number(),
   limit: z.number(),
+  total_capped: z.boolean().optional(),
+  tier: z.enum(['exact', 'prefix', 'fuzzy']).nullable().optional(),
+  timings_ms: z.record(z.string(), z.number()).optional(),
+  mode: z.enum(['keyword', 'semantic', 'hybrid']).optional(),
 });
 
 // -- Today ------------------------------------------------------------------